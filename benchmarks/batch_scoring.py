@@ -0,0 +1,91 @@
+"""Benchmark batch scoring of search results against per-result scoring.
+
+Scores every URL in the search cache (``campaign_search_cache.json``) with
+:func:`camplinks.search.score_campaign_url` in a Python loop and with
+:func:`camplinks.search.score_campaign_urls` in one call, checks that the
+two agree, and prints how many URLs clear each Tier-2 threshold -- the
+numbers to watch when tuning them. The cache keeps no result titles or
+snippets, so the contact label stands in for the title.
+
+Usage:
+    python benchmarks/batch_scoring.py
+    python benchmarks/batch_scoring.py --cache other_cache.json --copies 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import polars as pl
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from camplinks.cache import CACHE_FILE, load_cache  # noqa: E402
+from camplinks.search import score_campaign_url, score_campaign_urls  # noqa: E402
+
+THRESHOLDS = (0.25, 0.3, 0.4, 0.5)
+
+
+def load_results(cache_path: str, copies: int) -> pl.DataFrame:
+    """Build a result frame from the search cache.
+
+    Args:
+        cache_path: Search cache file.
+        copies: Times to repeat the corpus (to time larger inputs).
+
+    Returns:
+        Frame with url, title, body, last_name and state columns.
+    """
+    rows: list[tuple[str, str, str, str, str]] = []
+    for key, contacts in load_cache(cache_path).items():
+        # Keys are "person|name|state" or legacy "party|state|district|name"
+        parts = key.split("|")
+        if parts[0] == "person":
+            name, state = parts[1], parts[2]
+        else:
+            name, state = parts[3], parts[1]
+        last = name.split()[-1] if name.split() else name
+        rows.extend(
+            (url, label, "", last, state)
+            for label, url in contacts.items()
+            if url.startswith("http")
+        )
+    frame = pl.DataFrame(
+        rows, schema=["url", "title", "body", "last_name", "state"], orient="row"
+    )
+    return pl.concat([frame] * copies)
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cache", default=CACHE_FILE)
+    parser.add_argument("--copies", type=int, default=1)
+    args = parser.parse_args()
+
+    results = load_results(args.cache, args.copies)
+    if results.is_empty():
+        sys.exit(f"No URLs found in {args.cache}")
+
+    start = time.perf_counter()
+    loop = [score_campaign_url(*row) for row in results.iter_rows()]
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = score_campaign_urls(results)
+    batch_s = time.perf_counter() - start
+
+    mismatches = sum(a != b for a, b in zip(loop, batch.to_list(), strict=True))
+    print(
+        f"{results.height} results | loop {loop_s * 1000:.0f} ms | "
+        f"batch {batch_s * 1000:.0f} ms | {loop_s / batch_s:.1f}x | "
+        f"{mismatches} mismatches"
+    )
+    for threshold in THRESHOLDS:
+        print(f"  score >= {threshold}: {int((batch >= threshold).sum())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark the import time of the CLI entry point.
+
+Imports each module with ``python -X importtime`` in a fresh interpreter,
+``--repeat`` times, and prints the best cumulative import time next to
+the budget. Eagerly importing every scraper took ~230 ms; with the lazy
+scraper registry ``camplinks.__main__`` takes ~25 ms. The import-graph
+checks in ``tests/test_startup.py`` guard the cause; this tracks the time.
+
+Usage:
+    python benchmarks/cli_startup.py
+    python benchmarks/cli_startup.py --repeat 20 camplinks.__main__ camplinks.pipeline
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+# Cumulative import time of the CLI entry point, in microseconds
+STARTUP_BUDGET_US = 100_000
+
+
+def import_time(module: str) -> int:
+    """Import *module* in a fresh interpreter.
+
+    Args:
+        module: Module name.
+
+    Returns:
+        Its cumulative import time in microseconds.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise ValueError(f"{module} was not imported")
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=["camplinks.__main__"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    over = False
+    for module in args.modules:
+        best = min(import_time(module) for _ in range(args.repeat))
+        print(f"{module:<30} {best / 1000:8.1f} ms")
+        over |= module == "camplinks.__main__" and best > STARTUP_BUDGET_US
+    if over:
+        print(
+            f"camplinks.__main__ is over its {STARTUP_BUDGET_US / 1000:.0f} ms budget."
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
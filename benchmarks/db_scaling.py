@@ -0,0 +1,248 @@
+"""Benchmark the database queries of every stage as the database grows.
+
+Builds (or reuses) synthetic databases of each ``--sizes`` candidate count
+with ``benchmarks/synthetic_db.py`` and times, best of ``--repeat``, the
+queries that select each stage's work and the reporting queries:
+
+- enrich: candidates missing a Wikipedia URL, and those with one but no
+  campaign site (:mod:`camplinks.db` getters used by :mod:`camplinks.enrich`);
+- search: candidates missing a campaign site (one year and all years),
+  missing social links, and with a campaign site (``--replay``);
+- validate: campaign sites not yet checked against the Wayback Machine;
+- archive: candidates not yet looked up in the email archive;
+- the end-of-run summary (``camplinks.pipeline._print_summary``);
+- ``code/compute_campaign_magnitude.py``: all candidates and a 1% subset;
+- ``export_missing_x_links.py``: invalid and missing X links.
+
+Times are per query with a warm page cache. Growth between sizes is shown
+next to each time; queries that grow faster than the data (more than twice
+the size ratio) are flagged.
+
+Usage:
+    python benchmarks/db_scaling.py
+    python benchmarks/db_scaling.py --sizes 10000,100000 --repeat 5
+    python benchmarks/db_scaling.py --db-dir /data/synthetic --rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import logging
+import sqlite3
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from camplinks.db import (  # noqa: E402
+    get_candidates_missing_link,
+    get_candidates_missing_social_links,
+    get_candidates_missing_wikipedia_url,
+    get_candidates_needing_archive_lookup,
+    get_candidates_needing_wikipedia_enrichment,
+    get_candidates_with_link,
+    open_db,
+)
+from camplinks.pipeline import _print_summary  # noqa: E402
+
+YEAR = 2024
+STAGE = "general"
+
+Query = Callable[[sqlite3.Connection], int]
+
+
+def _load_script(path: Path) -> ModuleType:
+    """Import a top-level script by path (``code`` shadows the stdlib)."""
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+synthetic_db = _load_script(ROOT / "benchmarks" / "synthetic_db.py")
+magnitude = _load_script(ROOT / "code" / "compute_campaign_magnitude.py")
+export_x = _load_script(ROOT / "export_missing_x_links.py")
+
+
+def _summary(conn: sqlite3.Connection) -> int:
+    _print_summary(conn, YEAR)
+    return 0
+
+
+def _magnitude_subset(conn: sqlite3.Connection) -> int:
+    subset = range(
+        100,
+        conn.execute("SELECT MAX(candidate_id) FROM candidates").fetchone()[0] + 1,
+        100,
+    )
+    return len(magnitude.compute_magnitudes(conn, subset))
+
+
+def _export(conn: sqlite3.Connection) -> int:
+    invalid, missing = export_x.query_x_links(conn)
+    return len(invalid) + len(missing)
+
+
+QUERIES: dict[str, Query] = {
+    "enrich: missing wikipedia url": lambda conn: len(
+        get_candidates_missing_wikipedia_url(conn, year=YEAR, election_stage=STAGE)
+    ),
+    "enrich: wikipedia, no site": lambda conn: len(
+        get_candidates_needing_wikipedia_enrichment(conn, election_stage=STAGE)
+    ),
+    "search: missing site": lambda conn: len(
+        get_candidates_missing_link(
+            conn, "campaign_site", year=YEAR, election_stage=STAGE
+        )
+    ),
+    "search: missing site, all years": lambda conn: len(
+        get_candidates_missing_link(
+            conn, "campaign_site", year=synthetic_db.YEARS, election_stage=STAGE
+        )
+    ),
+    "search: missing social": lambda conn: len(
+        get_candidates_missing_social_links(conn, year=YEAR, election_stage=STAGE)
+    ),
+    "search: replay targets": lambda conn: len(
+        get_candidates_with_link(conn, "campaign_site", year=YEAR, election_stage=STAGE)
+    ),
+    "validate: unarchived sites": lambda conn: len(
+        get_candidates_with_link(
+            conn,
+            "campaign_site",
+            exclude_link_type="campaign_site_archived",
+            year=YEAR,
+            election_stage=STAGE,
+        )
+    ),
+    "archive: not looked up": lambda conn: len(
+        get_candidates_needing_archive_lookup(conn, year=YEAR, election_stage=STAGE)
+    ),
+    "pipeline: summary": _summary,
+    "magnitude: all": lambda conn: len(magnitude.compute_magnitudes(conn)),
+    "magnitude: 1% subset": _magnitude_subset,
+    "export: missing x links": _export,
+}
+
+
+def database(db_dir: Path, candidates: int, seed: int, rebuild: bool) -> Path:
+    """Return a synthetic database of *candidates*, building it if needed.
+
+    Args:
+        db_dir: Where synthetic databases are kept between runs.
+        candidates: Number of candidates.
+        seed: Generator seed.
+        rebuild: Build again even if the database exists.
+    """
+    path = db_dir / f"synthetic-{candidates}-seed{seed}.db"
+    if path.exists() and not rebuild:
+        return path
+    path.unlink(missing_ok=True)
+    db_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Building {path.name}...", flush=True)
+    start = time.perf_counter()
+    synthetic_db.build(str(path), candidates, seed=seed)
+    print(f"  built in {time.perf_counter() - start:.0f}s", flush=True)
+    return path
+
+
+def bench(path: Path, repeat: int) -> dict[str, tuple[float, int]]:
+    """Time every query on one database.
+
+    Args:
+        path: Synthetic database.
+        repeat: Repetitions (the best time is kept).
+
+    Returns:
+        Best time in seconds and number of rows, per query.
+    """
+    conn = open_db(str(path))  # the pipeline's pragmas (64 MB cache, WAL)
+    magnitude.ensure_column(conn)
+    results: dict[str, tuple[float, int]] = {}
+    for name, query in QUERIES.items():
+        best = float("inf")
+        rows = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = query(conn)
+            best = min(best, time.perf_counter() - start)
+        results[name] = (best, rows)
+    conn.close()
+    return results
+
+
+def report(sizes: list[int], results: dict[int, dict[str, tuple[float, int]]]) -> int:
+    """Print a table of query times per size.
+
+    Args:
+        sizes: Candidate counts, ascending.
+        results: Results of :func:`bench` per size.
+
+    Returns:
+        Number of (query, size step) pairs that grew faster than the data.
+    """
+    print(f"{'query':<34}" + "".join(f"{n:>30,}" for n in sizes))
+    flagged = 0
+    for name in QUERIES:
+        line = f"{name:<34}"
+        previous: tuple[int, float] | None = None
+        for n in sizes:
+            seconds, rows = results[n][name]
+            cell = f"{seconds * 1000:,.1f} ms ({rows:,})"
+            if previous is not None and previous[1] > 0:
+                growth = seconds / previous[1]
+                superlinear = growth > 2 * n / previous[0]
+                flagged += superlinear
+                cell += f" x{growth:.0f}" + ("!" if superlinear else "")
+            line += f"{cell:>30}"
+            previous = (n, seconds)
+        print(line)
+    return flagged
+
+
+def _sizes(value: str) -> list[int]:
+    return sorted({int(part) for part in value.split(",")})
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=_sizes,
+        default=[10_000, 100_000, 1_000_000],
+        help="Comma-separated candidate counts.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--db-dir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "camplinks-synthetic",
+        help="Where synthetic databases are kept between runs.",
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Regenerate the databases."
+    )
+    args = parser.parse_args()
+    # The summary logs its counts (and the scripts configure INFO logging on
+    # import); only the timings are of interest here
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results: dict[int, dict[str, tuple[float, int]]] = {}
+    for n in args.sizes:
+        path = database(args.db_dir, n, args.seed, args.rebuild)
+        results[n] = bench(path, args.repeat)
+    flagged = report(args.sizes, results)
+    if flagged:
+        print(f"{flagged} query step(s) grew faster than the data (!).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark URL classification against the non-campaign domain lists.
+
+Compares the previous checks -- substring tests against every entry of the
+search skip list, and the exact/suffix deny-list test of
+``validate_campaign_urls.is_denied`` -- with one lookup in
+:func:`camplinks.domains.default_matcher`, over every URL in the search
+cache (``campaign_search_cache.json``) plus the URLs in
+``bad_aggregator_urls.csv``. It also counts the URLs on which the old
+substring test and the matcher disagree.
+
+Usage:
+    python benchmarks/domain_matcher.py
+    python benchmarks/domain_matcher.py --cache other_cache.json --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from camplinks.cache import CACHE_FILE, load_cache  # noqa: E402
+from camplinks.domains import (  # noqa: E402
+    AGGREGATOR_DOMAINS,
+    NEWS_DOMAINS,
+    REFERENCE_DOMAINS,
+    SOCIAL_DOMAINS,
+    default_matcher,
+    host_of,
+)
+
+_SKIP_DOMAINS = frozenset(SOCIAL_DOMAINS + NEWS_DOMAINS + REFERENCE_DOMAINS)
+_DENYLIST = frozenset(_SKIP_DOMAINS | set(AGGREGATOR_DOMAINS))
+
+
+def substring_skip(url: str) -> bool:
+    """The former ``score_campaign_url`` test."""
+    domain = host_of(url)
+    return any(skip in domain for skip in _SKIP_DOMAINS) or ".gov" in domain
+
+
+def suffix_deny(url: str) -> bool:
+    """The former ``validate_campaign_urls.is_denied`` test."""
+    host = host_of(url).removeprefix("www.")
+    return (
+        not host
+        or host in _DENYLIST
+        or any(host.endswith("." + d) for d in _DENYLIST)
+        or host.endswith(".gov")
+    )
+
+
+def trie(url: str) -> bool:
+    """One lookup in the compiled matcher."""
+    return default_matcher().match(url) is not None
+
+
+def load_urls(cache_path: str, csv_path: str) -> list[str]:
+    """Collect URLs from the search cache and the aggregator CSV."""
+    urls = [
+        url
+        for contacts in load_cache(cache_path).values()
+        for url in contacts.values()
+        if url.startswith("http")
+    ]
+    if Path(csv_path).exists():
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            urls.extend(row["bad_campaign_url"] for row in csv.DictReader(f))
+    return urls
+
+
+def _time(fn: Callable[[str], bool], urls: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for url in urls:
+            fn(url)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cache", default=CACHE_FILE)
+    parser.add_argument("--csv", default="bad_aggregator_urls.csv")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    urls = load_urls(args.cache, args.csv)
+    if not urls:
+        sys.exit(f"No URLs found in {args.cache} or {args.csv}")
+    default_matcher()  # compile outside the timed loops
+
+    timings = {
+        label: _time(fn, urls, args.repeat)
+        for label, fn in (
+            ("substring skip list", substring_skip),
+            ("suffix deny list", suffix_deny),
+            ("domain trie", trie),
+        )
+    }
+    base = timings["domain trie"]
+    print(f"{len(urls)} URLs, best of {args.repeat} (ratio vs. domain trie)")
+    for label, elapsed in timings.items():
+        print(
+            f"  {label:20s} {elapsed * 1000:8.1f} ms "
+            f"{elapsed / len(urls) * 1e6:6.2f} us/url  {elapsed / base:5.1f}x"
+        )
+
+    differ = [u for u in urls if substring_skip(u) and not trie(u)]
+    print(f"  {len(differ)} URLs rejected by substring match only, e.g.:")
+    for url in sorted(set(differ))[:5]:
+        print(f"    {url}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Benchmark heading lookups on large state legislative pages.
+
+Compares the per-table sibling walk of ``find_preceding_heading`` with a
+:class:`camplinks.wiki_parsing.HeadingIndex`, using the same lookups
+``StateLegislativeScraper.parse_state_page`` performs for every wikitable
+(stage classification, primary party, district heading).
+
+By default a synthetic page shaped like the New Hampshire House results
+page (counties as h2, districts as h3, one or more result tables each) is
+generated. Pass ``--url`` one or more times to benchmark real pages instead.
+
+Usage:
+    python benchmarks/heading_index.py
+    python benchmarks/heading_index.py --districts 800
+    python benchmarks/heading_index.py --url \\
+        https://en.wikipedia.org/wiki/2024_New_Hampshire_House_of_Representatives_election
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import requests
+from bs4 import BeautifulSoup, Tag
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from camplinks.http import fetch_soup  # noqa: E402
+from camplinks.wiki_parsing import (  # noqa: E402
+    HeadingIndex,
+    classify_election_table,
+    extract_primary_party,
+    find_preceding_heading,
+)
+
+_ROW = (
+    '<tr class="vcard"><td>x</td><td class="org">{party}</td>'
+    '<td class="fn"><a href="/wiki/{name}">{name}</a></td>'
+    "<td>{votes}</td><td>{pct}%</td></tr>"
+)
+
+
+def synthetic_page(districts: int, per_county: int = 40) -> BeautifulSoup:
+    """Build a large state-house-style results page.
+
+    Args:
+        districts: Number of district sections.
+        per_county: Districts per county (h2) section.
+
+    Returns:
+        Parsed page.
+    """
+    parts = ["<html><head><title>2024 New Hampshire House election</title></head>"]
+    parts.append('<body><div class="mw-parser-output">')
+    for d in range(districts):
+        if d % per_county == 0:
+            parts.append(
+                '<div class="mw-heading mw-heading2">'
+                f"<h2>County {d // per_county}</h2></div><p>Intro.</p>"
+            )
+        parts.append(
+            f'<div class="mw-heading mw-heading3"><h3>District {d + 1}</h3></div>'
+        )
+        rows = "".join(
+            _ROW.format(party=p, name=f"Cand_{d}_{i}", votes=1000 + i, pct=50)
+            for i, p in enumerate(("Republican", "Democratic"))
+        )
+        parts.append(
+            '<table class="wikitable plainrowheaders">'
+            f"<caption>General election</caption>{rows}</table>"
+        )
+    parts.append("</div></body></html>")
+    return BeautifulSoup("".join(parts), "lxml")
+
+
+def _lookups(soup: BeautifulSoup, index: HeadingIndex | None) -> int:
+    """Run the per-table lookups of the state legislative scraper."""
+    found = 0
+    tables = soup.find_all(
+        "table",
+        class_=lambda c: c and "wikitable" in c and "plainrowheaders" in c,
+    )
+    for table in tables:
+        stage = classify_election_table(table, index)
+        if stage is None:
+            continue
+        if stage != "general":
+            extract_primary_party(table, index)
+        h2 = find_preceding_heading(table, ("h2",), index)
+        if h2 is None:
+            h2 = find_preceding_heading(table, ("h3",), index)
+        found += h2 is not None
+    return found
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(label: str, soup: BeautifulSoup, repeat: int) -> None:
+    """Time the lookups with and without an index and print a summary.
+
+    Args:
+        label: Name printed for the page.
+        soup: Parsed page.
+        repeat: Timing repetitions (best is reported).
+    """
+    n_tables = len(soup.find_all("table"))
+    walk = _time(lambda: _lookups(soup, None), repeat)
+    indexed = _time(lambda: _lookups(soup, HeadingIndex(soup)), repeat)
+    print(
+        f"{label}: {n_tables} tables | sibling walk {walk * 1000:.1f} ms | "
+        f"index (incl. build) {indexed * 1000:.1f} ms | {walk / indexed:.1f}x"
+    )
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--districts", type=int, default=400)
+    parser.add_argument("--per-county", type=int, default=40)
+    parser.add_argument("--url", action="append", default=[])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.url:
+        for url in args.url:
+            try:
+                soup = fetch_soup(url)
+            except requests.RequestException as exc:
+                print(f"{url}: fetch failed ({exc})")
+                continue
+            title = soup.find("title")
+            bench(
+                title.get_text() if isinstance(title, Tag) else url, soup, args.repeat
+            )
+    else:
+        for n in (args.districts // 4, args.districts // 2, args.districts):
+            page = synthetic_page(n, args.per_county)
+            bench(f"synthetic {n} districts", page, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
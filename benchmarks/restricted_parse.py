@@ -0,0 +1,136 @@
+"""Benchmark full vs strainer-restricted parsing of election pages.
+
+Parses the same HTML with and without the scraper's ``parse_only``
+strainer and reports parse time and peak allocated memory (tracemalloc).
+
+By default a synthetic Wikipedia state-house page is used: results tables
+and headings interleaved with the prose, references and navigation boxes
+that make up most of a real page. Pass ``--file`` with saved HTML pages
+(e.g. downloaded Wikipedia or Ballotpedia election pages) to benchmark
+real documents; ``--ballotpedia`` selects the votebox strainer.
+
+Usage:
+    python benchmarks/restricted_parse.py
+    python benchmarks/restricted_parse.py --file page.html [--ballotpedia]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from bs4 import SoupStrainer
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from camplinks.http import parse_html  # noqa: E402
+from camplinks.scrapers.ballotpedia_parsing import VOTEBOX_STRAINER  # noqa: E402
+from camplinks.wiki_parsing import RESULTS_PAGE_STRAINER  # noqa: E402
+
+_PROSE = (
+    "<p>The election was held on November 5 alongside other contests. "
+    '<a href="/wiki/X">Link</a> <sup class="reference"><a href="#c">[1]</a></sup>'
+    "</p>"
+)
+_NAVBOX = (
+    '<div class="navbox"><table class="nowraplinks">'
+    + "".join(f'<tr><td><a href="/wiki/N{i}">Nav {i}</a></td></tr>' for i in range(30))
+    + "</table></div>"
+)
+_ROW = (
+    '<tr class="vcard"><td class="org">Republican</td>'
+    '<td class="fn"><a href="/wiki/C">Candidate</a></td><td>1,000</td><td>50%</td></tr>'
+)
+
+
+def synthetic_page(districts: int) -> str:
+    """Build raw HTML for a large state-house results page.
+
+    Args:
+        districts: Number of district sections.
+
+    Returns:
+        HTML string.
+    """
+    parts = ["<html><head><title>2024 State House election</title></head><body>"]
+    parts.append('<div class="mw-parser-output">')
+    for d in range(districts):
+        parts.append(
+            f'<div class="mw-heading mw-heading3"><h3>District {d + 1}</h3></div>'
+        )
+        parts.append(_PROSE * 3)
+        parts.append(
+            '<table class="wikitable plainrowheaders">'
+            f"<caption>General election</caption>{_ROW * 3}</table>"
+        )
+    parts.append(_PROSE * 50)
+    parts.append(_NAVBOX * 5)
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def measure(html: str, strainer: SoupStrainer | None) -> tuple[float, float]:
+    """Parse *html* and return (seconds, peak MiB).
+
+    Time is measured without tracing (best of three); memory is the peak
+    traced allocation of a separate parse.
+
+    Args:
+        html: Document to parse.
+        strainer: Optional parse_only strainer.
+
+    Returns:
+        Elapsed time and peak traced memory.
+    """
+    elapsed = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        parse_html(html, strainer)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    tracemalloc.start()
+    soup = parse_html(html, strainer)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del soup
+    return elapsed, peak / 2**20
+
+
+def report(label: str, html: str, strainer: SoupStrainer) -> None:
+    """Print full vs restricted parse cost for one document.
+
+    Args:
+        label: Name printed for the document.
+        html: Document to parse.
+        strainer: Strainer the scraper declares.
+    """
+    full_s, full_mb = measure(html, None)
+    part_s, part_mb = measure(html, strainer)
+    print(
+        f"{label} ({len(html) / 2**20:.1f} MiB): "
+        f"full {full_s * 1000:.0f} ms / {full_mb:.1f} MiB | "
+        f"restricted {part_s * 1000:.0f} ms / {part_mb:.1f} MiB"
+    )
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", type=Path, action="append", default=[])
+    parser.add_argument("--ballotpedia", action="store_true")
+    parser.add_argument("--districts", type=int, default=400)
+    args = parser.parse_args()
+
+    strainer = VOTEBOX_STRAINER if args.ballotpedia else RESULTS_PAGE_STRAINER
+    if args.file:
+        for path in args.file:
+            report(path.name, path.read_text(encoding="utf-8"), strainer)
+    else:
+        html = synthetic_page(args.districts)
+        report(f"synthetic {args.districts} districts", html, strainer)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,767 @@
+"""Generate a realistic synthetic camplinks database for scaling tests.
+
+Builds every table the pipeline and the analysis scripts read -- elections,
+candidates, contact_links, archive lookups/organizations/messages,
+search_results, page_revisions, tweets and campaign_site_content (with the
+detection columns the scoring scripts add) -- for any number of candidates.
+
+The shape follows the bundled ``camplinks.db.bak``:
+
+- candidates per election: mostly two-way races with a long tail of
+  crowded primaries and mayoral races (up to ~30 candidates);
+- party mix, the share of candidates with Wikipedia/Ballotpedia URLs and
+  the rate of each contact link type and source;
+- winners and statewide/federal candidates are likelier to have links, so
+  link coverage is skewed the way real lookups are.
+
+Tweets per account and messages per archive organization are log-normal
+(a few prolific accounts, most quiet), and recent years have more
+elections than older ones. Output is deterministic for a given seed.
+
+``--describe`` prints the same distributions from a real database, opened
+read-only, to recalibrate the constants below.
+
+Usage:
+    python benchmarks/synthetic_db.py --candidates 100000 --out /tmp/synthetic.db
+    python benchmarks/synthetic_db.py --candidates 1000000 --out big.db --seed 7
+    python benchmarks/synthetic_db.py --describe camplinks.db.bak
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sqlite3
+import sys
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from camplinks.db import init_schema  # noqa: E402
+
+YEARS: tuple[int, ...] = tuple(range(2018, 2027))
+
+STATES: tuple[str, ...] = (
+    "California", "Texas", "Florida", "New York", "Pennsylvania", "Illinois",
+    "Ohio", "Georgia", "North Carolina", "Michigan", "New Jersey", "Virginia",
+    "Washington", "Arizona", "Tennessee", "Massachusetts", "Indiana",
+    "Maryland", "Missouri", "Wisconsin", "Colorado", "Minnesota",
+    "South Carolina", "Alabama", "Louisiana", "Kentucky", "Oregon", "Oklahoma",
+    "Connecticut", "Utah", "Iowa", "Nevada", "Arkansas", "Mississippi",
+    "Kansas", "New Mexico", "Nebraska", "Idaho", "West Virginia", "Hawaii",
+    "New Hampshire", "Maine", "Montana", "Rhode Island", "Delaware",
+    "South Dakota", "North Dakota", "Alaska", "Vermont", "Wyoming",
+)  # fmt: skip
+
+# race_type -> (weight, districts per state; 0 for statewide races)
+RACES: dict[str, tuple[float, int]] = {
+    "US House": (0.30, 9),
+    "State House": (0.30, 100),
+    "State Senate": (0.10, 40),
+    "Mayor": (0.14, 12),
+    "US Senate": (0.03, 0),
+    "Governor": (0.04, 0),
+    "Attorney General": (0.03, 0),
+    "State Supreme Court": (0.06, 0),
+}
+STAGES: dict[str, float] = {"general": 0.6, "primary": 0.35, "runoff": 0.05}
+
+# Candidates per election in the bundled database
+CANDIDATES_PER_ELECTION: dict[int, float] = {
+    1: 52, 2: 498, 3: 22, 4: 35, 5: 23, 6: 8, 7: 6, 8: 3, 9: 2, 10: 5,
+    11: 2, 12: 7, 14: 1, 15: 1, 18: 1, 28: 1,
+}  # fmt: skip
+
+PARTIES: dict[str, float] = {
+    "Republican": 663,
+    "Democratic": 705,
+    "": 245,
+    "Nonpartisan": 45,
+    "Independent": 31,
+    "Write-in": 10,
+    "Libertarian": 9,
+    "Green": 5,
+}
+
+# link_type -> (share of candidates with it, {source: weight})
+LINKS: dict[str, tuple[float, dict[str, float]]] = {
+    "campaign_site": (
+        0.90,
+        {"csv_import": 807, "ballotpedia": 382, "wikipedia": 238, "web_search": 131},
+    ),
+    "campaign_facebook": (
+        0.33,
+        {"csv_import": 260, "ballotpedia": 260, "web_search": 65},
+    ),
+    "campaign_x": (0.22, {"csv_import": 229, "ballotpedia": 136, "web_search": 22}),
+    "campaign_instagram": (
+        0.23,
+        {"csv_import": 211, "ballotpedia": 146, "web_search": 41},
+    ),
+    "personal_facebook": (
+        0.29,
+        {"ballotpedia": 236, "csv_import": 221, "web_search": 48},
+    ),
+    "personal_linkedin": (
+        0.30,
+        {"ballotpedia": 241, "csv_import": 219, "web_search": 53},
+    ),
+    "personal_website": (0.02, {"ballotpedia": 18, "csv_import": 12, "web_search": 6}),
+}
+# Share of campaign sites that were found dead and archived
+ARCHIVED_SHARE = 0.14
+# Share of campaign_x links that are not profile URLs (status links, bare domain)
+INVALID_X_SHARE = 0.03
+
+FIRST_NAMES: tuple[str, ...] = (
+    "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+    "David", "Elizabeth", "James", "Barbara", "William", "Susan", "Richard",
+    "Jessica", "Joseph", "Sarah", "Thomas", "Karen", "Carlos", "Maria",
+    "Daniel", "Nancy", "Kevin", "Lisa", "Brian", "Ashley", "Jamal", "Mei",
+    "Priya",
+)  # fmt: skip
+SYLLABLES: tuple[str, ...] = (
+    "an", "ber", "cal", "dor", "el", "fin", "gar", "har", "is", "jon", "kel",
+    "lin", "mor", "nas", "or", "pet", "quin", "ros", "son", "tal", "ver",
+    "wil", "yor", "zan",
+)  # fmt: skip
+
+WORDS: tuple[str, ...] = (
+    "community", "families", "jobs", "schools", "taxes", "healthcare",
+    "safety", "veterans", "housing", "roads", "water", "energy", "future",
+    "fight", "vote", "together", "district", "state", "local", "budget",
+    "plan", "small", "business", "working", "proud", "support", "endorse",
+    "thank", "volunteers", "event", "tonight", "join", "us", "our", "the",
+    "for", "and", "to", "we", "will",
+)  # fmt: skip
+
+TWEETS_SQL = """\
+CREATE TABLE IF NOT EXISTS tweets (
+    tweet_db_id         INTEGER PRIMARY KEY,
+    tweet_id            TEXT    NOT NULL,
+    candidate_id        INTEGER NOT NULL REFERENCES candidates(candidate_id),
+    candidate_name      TEXT    NOT NULL,
+    x_handle            TEXT    NOT NULL,
+    created_at          TEXT,
+    text                TEXT,
+    like_count          INTEGER,
+    retweet_count       INTEGER,
+    reply_count         INTEGER,
+    view_count          INTEGER,
+    image_urls          TEXT,
+    image_paths         TEXT,
+    year                INTEGER,
+    race_type           TEXT,
+    required_compliance TEXT,
+    token_length        INTEGER,
+    text_AI_result      TEXT,
+    assistance_score    REAL,
+    confidence          TEXT,
+    fraction_ai         REAL,
+    fraction_human      REAL,
+    num_ai_segments     INTEGER,
+    image_AI_result     TEXT,
+    UNIQUE(tweet_id)
+);
+CREATE INDEX IF NOT EXISTS idx_tweets_candidate ON tweets(candidate_id);
+"""
+
+CONTENT_SQL = """\
+CREATE TABLE IF NOT EXISTS campaign_site_content (
+    content_id          INTEGER PRIMARY KEY,
+    candidate_id        INTEGER NOT NULL REFERENCES candidates(candidate_id),
+    candidate_name      TEXT    NOT NULL,
+    page_url            TEXT    NOT NULL,
+    page_type           TEXT    NOT NULL,
+    link_type           TEXT,
+    race_type           TEXT,
+    year                INTEGER,
+    unprocessed_text    TEXT,
+    cleaned_text        TEXT,
+    sampled_text        TEXT,
+    sample_60           TEXT,
+    content_type        TEXT,
+    image_path          TEXT,
+    state               TEXT,
+    required_compliance TEXT,
+    text_AI_result      TEXT,
+    assistance_score    REAL,
+    confidence          TEXT,
+    fraction_ai         REAL,
+    fraction_human      REAL,
+    num_ai_segments     INTEGER,
+    token_length        INTEGER,
+    image_AI_result     TEXT,
+    UNIQUE(candidate_id, page_url)
+);
+CREATE INDEX IF NOT EXISTS idx_campaign_site_content_candidate
+    ON campaign_site_content(candidate_id);
+"""
+
+BATCH_ROWS = 50_000
+
+
+class _Writer:
+    """Buffers rows per table and inserts them in batches.
+
+    Rows are positional, in the column order of a freshly created schema.
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.rows: dict[str, list[tuple[object, ...]]] = {}
+        self.counts: dict[str, int] = {}
+
+    def add(self, table: str, row: tuple[object, ...]) -> None:
+        batch = self.rows.setdefault(table, [])
+        batch.append(row)
+        if len(batch) >= BATCH_ROWS:
+            self.flush(table)
+
+    def flush(self, table: str | None = None) -> None:
+        for name in [table] if table is not None else list(self.rows):
+            batch = self.rows.get(name)
+            if not batch:
+                continue
+            marks = ",".join("?" * len(batch[0]))
+            self.conn.executemany(f"INSERT INTO {name} VALUES ({marks})", batch)
+            self.counts[name] = self.counts.get(name, 0) + len(batch)
+            batch.clear()
+
+
+class _Generator:
+    """Draws synthetic rows from the production-shaped distributions."""
+
+    def __init__(
+        self,
+        writer: _Writer,
+        seed: int,
+        tweets_per_account: float,
+        pages_per_site: float,
+        messages_per_org: float,
+        text_words: int,
+    ) -> None:
+        self.w = writer
+        self.rng = random.Random(seed)
+        self.tweets_per_account = tweets_per_account
+        self.pages_per_site = pages_per_site
+        self.messages_per_org = messages_per_org
+        self.text_words = text_words
+        self.candidate_id = 0
+        self.election_id = 0
+        self.ids = {"tweet": 0, "content": 0, "link": 0, "message": 0, "org": 0}
+        self.used_statewide: set[tuple[str, str, int, str]] = set()
+        # Elections of one state, race and year share a Wikipedia page
+        self.pages: set[str] = set()
+        self.queries: set[str] = set()
+        self.district_counter: dict[tuple[str, str, int, str], int] = {}
+        self.year_weights = [1.0 + i * 0.25 for i in range(len(YEARS))]
+        # Bigger states have more districts and more candidates
+        self.state_weights = [1 / (rank + 1) ** 0.6 for rank in range(len(STATES))]
+
+    def _pick(self, weights: dict[str, float]) -> str:
+        return self.rng.choices(list(weights), weights=list(weights.values()))[0]
+
+    def _lognormal(self, mean: float, sigma: float = 1.2) -> int:
+        if mean <= 0:
+            return 0
+        mu = math.log(mean) - sigma**2 / 2
+        return int(self.rng.lognormvariate(mu, sigma))
+
+    def _text(self, words: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=words))
+
+    def _name(self) -> str:
+        last = "".join(self.rng.choices(SYLLABLES, k=self.rng.randint(2, 3)))
+        return f"{self.rng.choice(FIRST_NAMES)} {last.capitalize()}"
+
+    def _slug(self, name: str) -> str:
+        return name.lower().replace(" ", "")
+
+    def election(self, max_candidates: int) -> int:
+        """Add one election with its candidates.
+
+        Returns:
+            Number of candidates added.
+        """
+        rng = self.rng
+        year = rng.choices(YEARS, weights=self.year_weights)[0]
+        state = rng.choices(STATES, weights=self.state_weights)[0]
+        stage = self._pick(STAGES)
+        race = self._pick({race: w for race, (w, _) in RACES.items()})
+        districts = RACES[race][1]
+        district: str | None = None
+        if districts == 0:
+            key = (state, race, year, stage)
+            if key in self.used_statewide:
+                race, districts = "State House", RACES["State House"][1]
+            else:
+                self.used_statewide.add(key)
+        if districts:
+            key = (state, race, year, stage)
+            self.district_counter[key] = self.district_counter.get(key, 0) + 1
+            district = str(self.district_counter[key])
+
+        self.election_id += 1
+        slug = f"{year}_{state}_{race}".replace(" ", "_")
+        wiki = f"https://en.wikipedia.org/wiki/{slug}" if rng.random() < 0.9 else None
+        special = int(rng.random() < 0.02)
+        self.w.add(
+            "elections",
+            (self.election_id, state, race, year, district, stage, wiki, special),
+        )
+        if wiki is not None and wiki not in self.pages:
+            self.pages.add(wiki)
+            self.w.add(
+                "page_revisions",
+                (
+                    wiki,
+                    rng.randint(1, 10**9),
+                    f"{year}-11-30T00:00:00Z",
+                    f"{year}-12-01",
+                ),
+            )
+
+        size = rng.choices(
+            list(CANDIDATES_PER_ELECTION),
+            weights=list(CANDIDATES_PER_ELECTION.values()),
+        )[0]
+        size = min(size + (stage == "primary"), max_candidates)
+        names: set[str] = set()
+        shares = sorted((rng.random() for _ in range(size)), reverse=True)
+        total = sum(shares) or 1.0
+        for rank, share in enumerate(shares):
+            if rng.random() < 0.003 and "" not in names:
+                name = ""  # unnamed write-in rows the scrapers sometimes keep
+            else:
+                name = self._name()
+                while name in names:
+                    name = self._name()
+            names.add(name)
+            self.candidate(name, year, state, race, stage, rank, share / total)
+        return size
+
+    def candidate(
+        self,
+        name: str,
+        year: int,
+        state: str,
+        race: str,
+        stage: str,
+        rank: int,
+        vote_share: float,
+    ) -> None:
+        """Add one candidate with links, tweets, site content and archive rows."""
+        rng = self.rng
+        self.candidate_id += 1
+        cid = self.candidate_id
+        if stage == "primary" or rng.random() < 0.1:
+            outcome = "unknown"
+        else:
+            outcome = "won" if rank == 0 else "lost"
+        slug = self._slug(name) or f"candidate{cid}"
+        wiki = f"https://en.wikipedia.org/wiki/{slug}" if rng.random() < 0.25 else ""
+        ballotpedia = f"https://ballotpedia.org/{slug}" if rng.random() < 0.7 else ""
+        compliance = rng.choice(("none", "disclosure", "disclaimer", None))
+        funding = round(rng.lognormvariate(11, 1.5), 2) if rng.random() < 0.6 else None
+        self.w.add(
+            "candidates",
+            (
+                cid,
+                self.election_id,
+                self._pick(PARTIES),
+                name,
+                wiki,
+                ballotpedia,
+                round(vote_share * 100, 1) if rng.random() < 0.99 else None,
+                outcome,
+                compliance,
+                funding,
+            ),
+        )
+        if not name:
+            return
+
+        # Winners and statewide/federal candidates are better documented
+        boost = {"won": 1.25, "lost": 1.0, "unknown": 0.75}[outcome]
+        if RACES[race][1] == 0 or race == "US House":
+            boost *= 1.15
+        links: dict[str, str] = {}
+        for link_type, (share, sources) in LINKS.items():
+            if rng.random() >= min(share * boost, 0.98):
+                continue
+            url = self._link_url(link_type, slug, year)
+            links[link_type] = url
+            self.ids["link"] += 1
+            self.w.add(
+                "contact_links",
+                (self.ids["link"], cid, link_type, url, self._pick(sources)),
+            )
+        site = links.get("campaign_site")
+        if site is not None and rng.random() < ARCHIVED_SHARE / 0.9:
+            self.ids["link"] += 1
+            self.w.add(
+                "contact_links",
+                (
+                    self.ids["link"],
+                    cid,
+                    "campaign_site_archived",
+                    f"https://web.archive.org/web/{year}1101000000/{site}",
+                    "wayback",
+                ),
+            )
+
+        if "campaign_x" in links:
+            self.tweets(cid, name, slug, year, race, compliance)
+        if site is not None:
+            self.site_content(cid, name, site, year, state, race, compliance)
+        if rng.random() < 0.3:
+            self.search_results(name, state, slug)
+        if rng.random() < 0.5:
+            self.archive_lookup(cid, name, state, race, site)
+
+    def _link_url(self, link_type: str, slug: str, year: int) -> str:
+        rng = self.rng
+        if link_type == "campaign_x":
+            if rng.random() < INVALID_X_SHARE:
+                return rng.choice(
+                    ("https://x.com/", f"https://x.com/{slug}/status/{year}0001")
+                )
+            return f"https://x.com/{slug}"
+        if link_type in ("campaign_facebook", "personal_facebook"):
+            return f"https://www.facebook.com/{slug}"
+        if link_type == "campaign_instagram":
+            return f"https://www.instagram.com/{slug}"
+        if link_type == "personal_linkedin":
+            return f"https://www.linkedin.com/in/{slug}"
+        return f"https://www.{slug}{rng.choice(('', 'for', '4'))}{year}.com"
+
+    def tweets(
+        self,
+        cid: int,
+        name: str,
+        handle: str,
+        year: int,
+        race: str,
+        compliance: str | None,
+    ) -> None:
+        """Add a heavy-tailed number of tweets for one account."""
+        rng = self.rng
+        for _ in range(min(self._lognormal(self.tweets_per_account), 3200)):
+            self.ids["tweet"] += 1
+            tid = self.ids["tweet"]
+            text = self._text(rng.randint(5, 45))
+            images = rng.random() < 0.2
+            scored = rng.random() < 0.7
+            score = rng.betavariate(0.5, 4) if scored else None
+            image_result = None
+            if images and rng.random() < 0.9:
+                image_result = "yes" if rng.random() < 0.1 else "no"
+            self.w.add(
+                "tweets",
+                (
+                    tid,
+                    str(10**17 + tid),
+                    cid,
+                    name,
+                    handle,
+                    f"{year}-{rng.randint(1, 11):02d}-{rng.randint(1, 28):02d}",
+                    text,
+                    self._lognormal(40),
+                    self._lognormal(8),
+                    self._lognormal(5),
+                    self._lognormal(2000),
+                    f'["https://pbs.twimg.com/media/{tid}.jpg"]' if images else "",
+                    f'["tweet_images/{tid}.jpg"]' if images else "",
+                    year,
+                    race,
+                    compliance,
+                    len(text) // 4,
+                    None if score is None else ("AI" if score > 0.5 else "Human"),
+                    score,
+                    None if score is None else rng.choice(("High", "Medium", "Low")),
+                    score,
+                    None if score is None else 1 - score,
+                    None if score is None else int(score * 5),
+                    image_result,
+                ),
+            )
+
+    def site_content(
+        self,
+        cid: int,
+        name: str,
+        site: str,
+        year: int,
+        state: str,
+        race: str,
+        compliance: str | None,
+    ) -> None:
+        """Add scraped text pages and images of one campaign site."""
+        rng = self.rng
+        pages = 1 + self._lognormal(self.pages_per_site - 1, sigma=0.8)
+        for i in range(pages):
+            self.ids["content"] += 1
+            is_image = i > 0 and rng.random() < 0.4
+            text = (
+                ""
+                if is_image
+                else self._text(
+                    rng.randint(self.text_words // 3, self.text_words * 5 // 3)
+                )
+            )
+            score = (
+                rng.betavariate(0.6, 3) if not is_image and rng.random() < 0.8 else None
+            )
+            image_result = None
+            if is_image and rng.random() < 0.85:
+                image_result = "yes" if rng.random() < 0.12 else "no"
+            page_type = "home" if i == 0 else rng.choice(("about", "policy", "unknown"))
+            self.w.add(
+                "campaign_site_content",
+                (
+                    self.ids["content"],
+                    cid,
+                    name,
+                    f"{site}/{page_type}/{i}",
+                    page_type,
+                    "campaign_site",
+                    race,
+                    year,
+                    text or None,
+                    text or None,
+                    text[:400] or None,
+                    text[:300] or None,
+                    "image" if is_image else "text",
+                    f"site_images/{cid}/{i}.jpg" if is_image else None,
+                    state,
+                    compliance,
+                    None if score is None else ("AI" if score > 0.5 else "Human"),
+                    score,
+                    None if score is None else rng.choice(("High", "Medium", "Low")),
+                    score,
+                    None if score is None else 1 - score,
+                    None if score is None else int(score * 5),
+                    None if is_image else len(text) // 4,
+                    image_result,
+                ),
+            )
+
+    def search_results(self, name: str, state: str, slug: str) -> None:
+        """Add one stored DuckDuckGo result page."""
+        query = f'"{name}" {state} campaign website'
+        if query in self.queries:
+            return
+        self.queries.add(query)
+        for rank in range(5):
+            self.w.add(
+                "search_results",
+                (
+                    query,
+                    rank,
+                    f"https://www.{slug}{rank}.com/",
+                    f"{name} for {state}",
+                    self._text(20),
+                    "2024-10-01T00:00:00+00:00",
+                ),
+            )
+
+    def archive_lookup(
+        self, cid: int, name: str, state: str, race: str, site: str | None
+    ) -> None:
+        """Add an email archive lookup, and its organization and messages."""
+        rng = self.rng
+        has_entry = rng.random() < 0.3
+        if not has_entry:
+            self.w.add(
+                "archive_lookups", (cid, 0, 0, None, "no_match", "2025-01-01T00:00:00")
+            )
+            return
+        self.ids["org"] += 1
+        org_id = f"org{self.ids['org']}"
+        messages = min(self._lognormal(self.messages_per_org), 5000)
+        self.w.add(
+            "archive_organizations",
+            (
+                org_id,
+                name,
+                f"https://politicalemails.org/organizations/{self.ids['org']}",
+                "US",
+                state,
+                None,
+                race,
+                site,
+                messages,
+                "2025-01-01T00:00:00",
+            ),
+        )
+        self.w.add(
+            "archive_lookups", (cid, 1, 1, messages, "matched", "2025-01-01T00:00:00")
+        )
+        self.w.add("candidate_archive_matches", (cid, org_id))
+        for _ in range(messages):
+            self.ids["message"] += 1
+            body = self._text(
+                rng.randint(self.text_words // 6, self.text_words * 5 // 6)
+            )
+            self.w.add(
+                "archive_messages",
+                (
+                    f"msg{self.ids['message']}",
+                    org_id,
+                    self._text(6),
+                    "2024-10-01T00:00:00",
+                    f"<p>{body}</p>",
+                    body,
+                    "2025-01-01T00:00:00",
+                ),
+            )
+
+
+def build(
+    path: str,
+    candidates: int,
+    seed: int = 0,
+    tweets_per_account: float = 10.0,
+    pages_per_site: float = 4.0,
+    messages_per_org: float = 20.0,
+    text_words: int = 60,
+) -> dict[str, int]:
+    """Build a synthetic database.
+
+    Args:
+        path: Output database file (must not exist yet).
+        candidates: Number of candidates to generate.
+        seed: Random seed.
+        tweets_per_account: Mean tweets per candidate with an X account.
+        pages_per_site: Mean scraped pages per campaign site.
+        messages_per_org: Mean archived emails per matched organization.
+        text_words: Mean words of scraped page text (emails get half);
+            sets row width, and so the size of the database.
+
+    Returns:
+        Rows generated per table.
+
+    Raises:
+        FileExistsError: If *path* already exists.
+    """
+    if Path(path).exists():
+        raise FileExistsError(path)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    init_schema(conn)
+    conn.executescript(TWEETS_SQL + CONTENT_SQL)
+    conn.execute("ALTER TABLE candidates ADD COLUMN required_compliance TEXT")
+    conn.execute("ALTER TABLE candidates ADD COLUMN total_funding REAL")
+    writer = _Writer(conn)
+    gen = _Generator(
+        writer, seed, tweets_per_account, pages_per_site, messages_per_org, text_words
+    )
+    made = 0
+    with conn:
+        while made < candidates:
+            made += gen.election(candidates - made)
+        writer.flush()
+    conn.execute("ANALYZE")
+    conn.close()
+    return writer.counts
+
+
+def open_reference(path: str) -> sqlite3.Connection:
+    """Open a real database read-only, without creating files next to it.
+
+    ``immutable=1`` as well as ``mode=ro``: ``camplinks.db.bak`` is in WAL
+    mode, and a read-only connection to a WAL database still creates its
+    ``-wal`` and ``-shm`` files.
+
+    Args:
+        path: Database file.
+
+    Returns:
+        A read-only connection.
+    """
+    uri = f"{Path(path).resolve().as_uri()}?mode=ro&immutable=1"
+    return sqlite3.connect(uri, uri=True)
+
+
+def describe_reference(path: str) -> dict[str, dict[str, int]]:
+    """Count the distributions the generator's constants are taken from.
+
+    Args:
+        path: A real camplinks database, e.g. ``camplinks.db.bak``.
+
+    Returns:
+        Counts per candidates-per-election, party, and link type and
+        source.
+    """
+    queries = {
+        "candidates per election": """\
+            SELECT n, COUNT(*) FROM (
+                SELECT COUNT(*) AS n FROM candidates GROUP BY election_id
+            )
+            GROUP BY n ORDER BY n
+        """,
+        "party": """\
+            SELECT COALESCE(party, ''), COUNT(*) FROM candidates
+            GROUP BY 1 ORDER BY 2 DESC
+        """,
+        "link type / source": """\
+            SELECT link_type || ' / ' || source, COUNT(*) FROM contact_links
+            GROUP BY link_type, source ORDER BY 1
+        """,
+    }
+    conn = open_reference(path)
+    try:
+        return {
+            name: {str(key): n for key, n in conn.execute(sql)}
+            for name, sql in queries.items()
+        }
+    finally:
+        conn.close()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=100_000)
+    parser.add_argument("--out", help="Database file to create.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tweets-per-account", type=float, default=10.0)
+    parser.add_argument("--pages-per-site", type=float, default=4.0)
+    parser.add_argument("--messages-per-org", type=float, default=20.0)
+    parser.add_argument("--text-words", type=int, default=60)
+    parser.add_argument(
+        "--describe",
+        metavar="DB",
+        help="Print the distributions of a real database (opened read-only).",
+    )
+    args = parser.parse_args(argv)
+    if args.describe is not None:
+        for name, counts in describe_reference(args.describe).items():
+            print(name)
+            for key, n in counts.items():
+                print(f"  {key or '(none)':<40} {n:>8,}")
+        return
+    if args.out is None:
+        parser.error("--out is required unless --describe is given")
+
+    start = time.perf_counter()
+    counts = build(
+        args.out,
+        args.candidates,
+        seed=args.seed,
+        tweets_per_account=args.tweets_per_account,
+        pages_per_site=args.pages_per_site,
+        messages_per_org=args.messages_per_org,
+        text_words=args.text_words,
+    )
+    for table, n in sorted(counts.items()):
+        print(f"{table:<26} {n:>12,}")
+    print(f"Built {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
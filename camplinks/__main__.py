@@ -5,46 +5,82 @@ Usage::
     python -m camplinks --year 2024 --race house
     python -m camplinks --year 2024 --race senate --stage scrape
     python -m camplinks --year 2024 --race all
+    python -m camplinks --year 2024 --race all --stage scrape --incremental
+    python -m camplinks --year 2024 --race all --stage search --replay
+    python -m camplinks --year 2024 --race all --stream
+    python -m camplinks --year 2024 --race all --resume
+    python -m camplinks --years 2018-2026 --race all
+    python -m camplinks --year 2024 --race all --metrics metrics.prom
+    python -m camplinks --year 2024 --race all --profile profiles --profile-sample 50
 """
 
 from __future__ import annotations
 
 import argparse
 import logging
+import os
 
 from camplinks.models import DB_FILENAME
+from camplinks.scrapers import scraper_names
 
-# Import scrapers to trigger registration via register_scraper()
-import camplinks.scrapers.attorney_general  # noqa: F401
-import camplinks.scrapers.ballotpedia_governor  # noqa: F401
-import camplinks.scrapers.ballotpedia_municipal  # noqa: F401
-import camplinks.scrapers.governor  # noqa: F401
-import camplinks.scrapers.house  # noqa: F401
-import camplinks.scrapers.judicial  # noqa: F401
-import camplinks.scrapers.municipal  # noqa: F401
-import camplinks.scrapers.senate  # noqa: F401
-import camplinks.scrapers.special_house  # noqa: F401
-import camplinks.scrapers.state_leg_special  # noqa: F401
-import camplinks.scrapers.state_legislative  # noqa: F401
-
-
-def main() -> None:
-    """Parse CLI arguments and run the pipeline."""
+
+def parse_years(value: str) -> list[int]:
+    """Parse a ``--years`` value: a range, a comma-separated list, or both.
+
+    Args:
+        value: E.g. ``"2018-2026"``, ``"2022,2024"`` or ``"2018-2020,2024"``.
+
+    Returns:
+        The years, sorted and deduplicated.
+
+    Raises:
+        argparse.ArgumentTypeError: If *value* is not a valid year list.
+    """
+    years: set[int] = set()
+    try:
+        for part in value.split(","):
+            first, _, last = part.strip().partition("-")
+            start = int(first)
+            end = int(last) if last else start
+            if end < start:
+                raise argparse.ArgumentTypeError(f"Empty year range: {part!r}")
+            years.update(range(start, end + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid years {value!r}; expected e.g. 2018-2026 or 2022,2024"
+        ) from None
+    return sorted(years)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse CLI arguments and run the pipeline.
+
+    Args:
+        argv: Command-line arguments (default: ``sys.argv[1:]``).
+    """
     parser = argparse.ArgumentParser(
         prog="camplinks",
         description="Scrape and enrich US political election data.",
     )
-    parser.add_argument(
+    years = parser.add_mutually_exclusive_group(required=True)
+    years.add_argument(
         "--year",
         type=int,
-        required=True,
         help="Election year (e.g. 2024)",
     )
+    years.add_argument(
+        "--years",
+        type=parse_years,
+        help=(
+            "Several election years in one run, e.g. 2018-2026 or 2022,2024. "
+            "Index pages are fetched once, lookups run over all years."
+        ),
+    )
     parser.add_argument(
         "--race",
         type=str,
         required=True,
-        help='Race type: "house", "senate", or "all"',
+        help='Race type: "house", "senate", ..., or "all" (see README)',
     )
     parser.add_argument(
         "--stage",
@@ -73,18 +109,121 @@ def main() -> None:
         help=f"SQLite database path (default: {DB_FILENAME})",
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help=(
+            "Processes used to parse scraped pages (default: CPU count). "
+            "1 parses inline."
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Scrape only Wikipedia pages whose revision changed since they "
+            "were last scraped."
+        ),
+    )
+
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help=(
+            "With --stage search: re-score stored search results with the "
+            "current heuristics and report which campaign sites would change. "
+            "No network access, nothing written."
+        ),
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Run scrape, enrich, search and validate concurrently: candidates "
+            "are looked up as soon as they are scraped, and each stage paces "
+            "its own hosts. Respects --stage."
+        ),
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Continue the last interrupted run with the same arguments, "
+            "skipping the scrapers and stages it completed."
+        ),
+    )
+
+    parser.add_argument(
+        "--metrics",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Write run metrics (requests and bytes per host, crawl delays, "
+            "parse, SQLite and stage timings, cache hits) to PATH: "
+            "Prometheus text if PATH ends in .prom, JSON otherwise."
+        ),
+    )
+
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help=(
+            "Profile each scraper and stage with cProfile; write the profiles "
+            "(.prof) and their hottest functions (.txt) to DIR."
+        ),
+    )
+    parser.add_argument(
+        "--profile-sample",
+        type=int,
+        default=1,
+        metavar="N",
+        help=(
+            "With --profile, profile one in N state pages and candidates of "
+            "each stage instead of whole stages, to keep the overhead low."
+        ),
+    )
+
+    args = parser.parse_args(argv)
+    if args.race != "all" and args.race not in scraper_names():
+        parser.error(
+            f"unknown race {args.race!r}; choose from: "
+            + ", ".join([*scraper_names(), "all"])
+        )
+    if args.replay and args.stage != "search":
+        parser.error("--replay requires --stage search")
+    if args.replay and args.stream:
+        parser.error("--replay cannot be combined with --stream")
+    if args.replay and args.resume:
+        parser.error("--replay cannot be combined with --resume")
+    if args.profile_sample < 1:
+        parser.error("--profile-sample must be at least 1")
+    if args.profile_sample != 1 and args.profile is None:
+        parser.error("--profile-sample requires --profile")
 
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
     from camplinks.pipeline import run_pipeline
 
     run_pipeline(
-        year=args.year,
+        year=args.year if args.years is None else args.years,
         race=args.race,
         stage=args.stage,
         db_path=args.db,
         election_stage=args.election_stage,
+        workers=args.workers,
+        incremental=args.incremental,
+        replay_search=args.replay,
+        stream=args.stream,
+        resume=args.resume,
+        metrics_path=args.metrics,
+        profile_dir=args.profile,
+        profile_sample=args.profile_sample,
     )
 
 
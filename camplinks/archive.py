@@ -14,6 +14,7 @@ import logging
 import re
 import sqlite3
 import time
+from collections.abc import Collection
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from urllib.parse import urlencode
@@ -29,6 +30,8 @@ from camplinks.db import (
     upsert_archive_organization,
 )
 from camplinks.http import HEADERS
+from camplinks.metrics import RESPONSE_HOOKS, count_delay
+from camplinks.profiling import PROFILER
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +83,7 @@ class ArchiveClient:
         """
         self.session = requests.Session()
         self.session.headers.update(HEADERS)
+        self.session.hooks["response"].extend(RESPONSE_HOOKS["response"])
         self.delay_s = delay_s
         self.timeout_s = timeout_s
         self._last_call = 0.0
@@ -88,6 +92,7 @@ class ArchiveClient:
         """Sleep until at least delay_s has elapsed since the last call."""
         wait = self.delay_s - (time.monotonic() - self._last_call)
         if wait > 0:
+            count_delay(ARCHIVE_BASE, wait)
             time.sleep(wait)
         self._last_call = time.monotonic()
 
@@ -316,7 +321,7 @@ def lookup_candidate(
 
 def lookup_archive_entries(
     conn: sqlite3.Connection,
-    year: int | None = None,
+    year: int | Collection[int] | None = None,
     race_type: str | None = None,
     election_stage: str | None = "general",
     delay_s: float = ARCHIVE_DELAY_S,
@@ -331,7 +336,7 @@ def lookup_archive_entries(
 
     Args:
         conn: Open database connection.
-        year: Optional filter by election year.
+        year: Optional filter by election year (or years).
         race_type: Optional filter by race type.
         election_stage: Optional filter by election stage. Defaults to
             "general" to match enrich/search/validate convention.
@@ -359,7 +364,10 @@ def lookup_archive_entries(
     commit_every = 25
 
     for i, row in enumerate(
-        tqdm(targets, desc="Archive lookup", unit="candidate"), start=1
+        PROFILER.units(
+            tqdm(targets, desc="Archive lookup", unit="candidate"), "archive"
+        ),
+        start=1,
     ):
         cid: int = row["candidate_id"]
         name: str = row["candidate_name"]
@@ -0,0 +1,400 @@
+"""Resumable OpenAI Batch API jobs for the detection scripts.
+
+The Batch API is half the price of synchronous calls and has much higher
+throughput, but requests are submitted as JSONL files and results arrive
+asynchronously. :class:`BatchRunner` handles that life cycle for any
+detection script:
+
+1. ``submit`` chunks (key, request-writer) items into batches, streams each
+   chunk to a temporary JSONL file, uploads it and creates the batch. Every
+   submitted batch is recorded in a JSON state file together with the
+   ``custom_id -> key`` map, so an interrupted run can resume collection.
+2. ``collect`` polls each pending batch, parses its output and error files
+   and hands ``{key: response body or None}`` to a callback, then drops the
+   batch from the state file.
+
+Results are written with :func:`write_back`, which only fills empty cells by
+default, so collecting the same batch twice (e.g. after a crash between the
+write and the state save) is harmless. Batches that fail or expire are
+dropped after salvaging any partial output; their unlabelled rows are simply
+picked up again by the next submission.
+
+Image requests are written with :func:`write_image_request`, which
+base64-encodes the file straight into the JSONL stream instead of holding
+the encoded image in memory.
+"""
+
+from __future__ import annotations
+
+import base64
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+CHAT_ENDPOINT = "/v1/chat/completions"
+DEFAULT_BATCH_SIZE = 300
+POLL_INTERVAL_S = 60
+TERMINAL_FAILURES = frozenset({"failed", "expired", "cancelled"})
+
+MIME_MAP = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+}
+
+# Read size for streaming base64; a multiple of 3 so chunks encode without
+# padding and can be concatenated.
+_B64_CHUNK = 3 * 64 * 1024
+_B64_MARKER = "\x00b64\x00"
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+RequestWriter = Callable[[IO[bytes], str], None]
+
+
+# ── Request building ───────────────────────────────────────────────────────
+
+
+def write_image_request(
+    fh: IO[bytes],
+    custom_id: str,
+    image_path: Path,
+    model: str,
+    prompt: str,
+    max_completion_tokens: int = 10,
+) -> None:
+    """Write one vision chat-completion request as a JSONL line.
+
+    The image is base64-encoded in chunks directly into *fh*.
+
+    Args:
+        fh: Binary file the JSONL line is appended to.
+        custom_id: Request id echoed back in the batch output.
+        image_path: Local image file.
+        model: Model name.
+        prompt: Text prompt sent with the image.
+        max_completion_tokens: Completion token limit.
+    """
+    mime = MIME_MAP.get(image_path.suffix.lower(), "image/jpeg")
+    template = orjson.dumps(
+        {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": CHAT_ENDPOINT,
+            "body": {
+                "model": model,
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "image_url",
+                                "image_url": {
+                                    "url": f"data:{mime};base64,{_B64_MARKER}"
+                                },
+                            },
+                            {"type": "text", "text": prompt},
+                        ],
+                    }
+                ],
+                "max_completion_tokens": max_completion_tokens,
+            },
+        }
+    )
+    head, tail = template.split(orjson.dumps(_B64_MARKER)[1:-1], 1)
+    fh.write(head)
+    with image_path.open("rb") as img:
+        while chunk := img.read(_B64_CHUNK):
+            fh.write(base64.standard_b64encode(chunk))
+    fh.write(tail)
+    fh.write(b"\n")
+
+
+# ── Result parsing ─────────────────────────────────────────────────────────
+
+
+def iter_results(content: str) -> Iterator[tuple[str, dict[str, Any] | None]]:
+    """Parse batch output or error JSONL.
+
+    Args:
+        content: Raw JSONL text from an output or error file.
+
+    Yields:
+        (custom_id, response body) pairs; the body is None for requests that
+        errored or returned a non-200 status.
+    """
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        item = orjson.loads(line)
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code", 200) != 200:
+            yield item["custom_id"], None
+        else:
+            yield item["custom_id"], response.get("body")
+
+
+def yes_no_label(body: dict[str, Any] | None) -> str:
+    """Map a chat-completion body to the detection label vocabulary.
+
+    Args:
+        body: Response body, or None if the request failed.
+
+    Returns:
+        "yes", "no", "output error" for any other answer, or "API error".
+    """
+    if body is None:
+        return "API error"
+    try:
+        answer = (body["choices"][0]["message"]["content"] or "").strip().lower()
+    except (KeyError, IndexError, TypeError):
+        return "output error"
+    return answer if answer in ("yes", "no") else "output error"
+
+
+# ── Write-back ─────────────────────────────────────────────────────────────
+
+
+def write_back(
+    conn: sqlite3.Connection,
+    table: str,
+    key_column: str,
+    column: str,
+    values: Mapping[Any, Any],
+    overwrite: bool = False,
+) -> int:
+    """Write results into one column of any table (without committing).
+
+    By default only NULL cells are filled, so replaying the same results is
+    a no-op.
+
+    Args:
+        conn: Open SQLite connection.
+        table: Target table.
+        key_column: Column matched against the keys of *values*.
+        column: Column to update.
+        values: Mapping of key -> value.
+        overwrite: Also replace existing non-NULL values.
+
+    Returns:
+        Number of rows updated.
+
+    Raises:
+        ValueError: If a table or column name is not a plain identifier.
+    """
+    for name in (table, key_column, column):
+        if not _IDENTIFIER_RE.match(name):
+            raise ValueError(f"Invalid SQL identifier: {name!r}")
+    guard = "" if overwrite else f" AND {column} IS NULL"
+    before = conn.total_changes
+    conn.executemany(
+        f"UPDATE {table} SET {column} = ? WHERE {key_column} = ?{guard}",
+        [(value, key) for key, value in values.items()],
+    )
+    return conn.total_changes - before
+
+
+# ── Jobs ───────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class BatchJob:
+    """A submitted batch and the caller keys of its requests.
+
+    Attributes:
+        batch_id: OpenAI batch id.
+        keys: Mapping of custom_id -> caller key.
+    """
+
+    batch_id: str
+    keys: dict[str, str]
+
+    @classmethod
+    def from_state(cls, entry: dict[str, Any]) -> BatchJob:
+        """Build a job from a state-file entry.
+
+        Args:
+            entry: Dict with ``batch_id`` and ``requests`` (older state files
+                used ``images`` instead).
+
+        Returns:
+            The job.
+        """
+        keys = entry.get("requests") or entry.get("images") or {}
+        return cls(batch_id=entry["batch_id"], keys=dict(keys))
+
+    def to_state(self) -> dict[str, Any]:
+        """Return the state-file entry for this job."""
+        return {"batch_id": self.batch_id, "requests": self.keys}
+
+
+class BatchRunner:
+    """Submit, persist, poll and collect OpenAI batch jobs."""
+
+    def __init__(
+        self,
+        client: Any,
+        state_file: Path,
+        endpoint: str = CHAT_ENDPOINT,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        poll_interval_s: float = POLL_INTERVAL_S,
+        completion_window: str = "24h",
+    ) -> None:
+        """Load any pending jobs from the state file.
+
+        Args:
+            client: Authenticated ``openai.OpenAI`` client.
+            state_file: JSON file recording submitted batches.
+            endpoint: API endpoint every request in the batch targets.
+            batch_size: Maximum requests per batch.
+            poll_interval_s: Seconds between status checks.
+            completion_window: Batch completion window.
+        """
+        self.client = client
+        self.state_file = state_file
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.poll_interval_s = poll_interval_s
+        self.completion_window = completion_window
+        self.pending: list[BatchJob] = []
+        if state_file.exists():
+            state = orjson.loads(state_file.read_bytes())
+            self.pending = [
+                BatchJob.from_state(e) for e in state.get("pending_batches", [])
+            ]
+
+    def save(self) -> None:
+        """Persist pending jobs, removing the state file when none remain."""
+        if not self.pending:
+            self.state_file.unlink(missing_ok=True)
+            return
+        state = {"pending_batches": [job.to_state() for job in self.pending]}
+        self.state_file.write_bytes(orjson.dumps(state))
+
+    def submit(
+        self,
+        items: Iterable[tuple[str, RequestWriter]],
+        max_batches: int | None = None,
+    ) -> int:
+        """Chunk items into batches and submit them.
+
+        Args:
+            items: (key, writer) pairs; ``writer(fh, custom_id)`` appends one
+                JSONL request line for the item.
+            max_batches: Stop after this many batches (for test runs).
+
+        Returns:
+            Number of batches submitted.
+        """
+        submitted = 0
+        chunk: list[tuple[str, RequestWriter]] = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) == self.batch_size:
+                self._submit_chunk(chunk)
+                submitted += 1
+                chunk = []
+                if max_batches is not None and submitted >= max_batches:
+                    return submitted
+        if chunk:
+            self._submit_chunk(chunk)
+            submitted += 1
+        return submitted
+
+    def _submit_chunk(self, chunk: list[tuple[str, RequestWriter]]) -> None:
+        keys: dict[str, str] = {}
+        with tempfile.NamedTemporaryFile(suffix=".jsonl", delete=False) as tmp:
+            for n, (key, writer) in enumerate(chunk):
+                custom_id = f"req_{n}"
+                writer(tmp, custom_id)
+                keys[custom_id] = key
+            tmp_path = tmp.name
+        try:
+            with open(tmp_path, "rb") as f:
+                uploaded = self.client.files.create(file=f, purpose="batch")
+            batch = self.client.batches.create(
+                input_file_id=uploaded.id,
+                endpoint=self.endpoint,
+                completion_window=self.completion_window,
+            )
+        finally:
+            os.unlink(tmp_path)
+        logger.info("Submitted batch %s (%d requests).", batch.id, len(keys))
+        self.pending.append(BatchJob(batch_id=batch.id, keys=keys))
+        self.save()
+
+    def wait(self, job: BatchJob) -> str | None:
+        """Poll a batch until it finishes.
+
+        Args:
+            job: Batch to wait for.
+
+        Returns:
+            Concatenated output and error JSONL, or None if the batch ended
+            without any output.
+        """
+        while True:
+            batch = self.client.batches.retrieve(job.batch_id)
+            counts = batch.request_counts
+            logger.info(
+                "Batch %s status: %s (%s/%s completed)",
+                job.batch_id,
+                batch.status,
+                counts.completed if counts else "?",
+                counts.total if counts else "?",
+            )
+            if batch.status == "completed" or batch.status in TERMINAL_FAILURES:
+                break
+            time.sleep(self.poll_interval_s)
+
+        if batch.status != "completed":
+            logger.error("Batch %s ended with status: %s", job.batch_id, batch.status)
+        parts = [
+            self.client.files.content(file_id).text
+            for file_id in (batch.output_file_id, batch.error_file_id)
+            if file_id
+        ]
+        return "\n".join(parts) if parts else None
+
+    def collect(
+        self,
+        on_results: Callable[[dict[str, dict[str, Any] | None]], None],
+    ) -> int:
+        """Wait for every pending batch and hand its results to a callback.
+
+        Each finished batch is removed from the state file after the
+        callback returns, so an interrupted collection resumes with the
+        remaining batches.
+
+        Args:
+            on_results: Called with ``{key: response body or None}`` per
+                batch. Keys of requests missing from the output are absent.
+
+        Returns:
+            Number of results delivered.
+        """
+        delivered = 0
+        for job in list(self.pending):
+            content = self.wait(job)
+            if content is not None:
+                results = {
+                    job.keys.get(custom_id, custom_id): body
+                    for custom_id, body in iter_results(content)
+                }
+                on_results(results)
+                delivered += len(results)
+            self.pending.remove(job)
+            self.save()
+        return delivered
@@ -0,0 +1,527 @@
+"""Record and replay the pipeline's HTTP traffic for offline load tests.
+
+:func:`recording` captures every response of a real run -- everything sent
+through ``requests`` (Wikipedia, Ballotpedia, Wayback, campaign sites) and
+every DuckDuckGo search -- into a :class:`Cassette`, an SQLite file keyed by
+method and URL.
+
+:class:`ReplayServer` serves a cassette from a local threaded HTTP server,
+optionally with fixed latency (by default each response takes as long as it
+did when recorded), random 5xx errors and injected 429 rate limits. Under
+:func:`replaying`, requests to any host are rewritten to that server and
+DuckDuckGo searches are answered by it, so the full ``run_pipeline`` runs
+offline through real sockets, threads and retry paths. Crawl delays still
+apply: they are part of what a load test measures.
+
+Usage::
+
+    python -m camplinks.cassette record run.cassette -- --year 2024 --race house
+    python -m camplinks.cassette replay run.cassette --rate-limit-rate 0.05 \\
+        -- --year 2024 --race house --db /tmp/load.db --metrics load.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Self
+from urllib.parse import urlencode
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    method      TEXT    NOT NULL,
+    url         TEXT    NOT NULL,
+    status      INTEGER NOT NULL,
+    headers     TEXT    NOT NULL,
+    body        BLOB    NOT NULL,
+    elapsed_s   REAL    NOT NULL,
+    recorded_at TEXT    NOT NULL,
+    PRIMARY KEY (method, url)
+);
+"""
+
+# Response headers worth replaying; the body is stored decoded, so encoding
+# and length headers are regenerated by the server
+KEPT_HEADERS = {"content-type", "location", "retry-after", "last-modified"}
+
+DDG_KEY_PREFIX = "ddg:text?"
+
+
+@dataclass
+class Recording:
+    """One recorded response.
+
+    Attributes:
+        status: HTTP status code.
+        headers: Response headers from :data:`KEPT_HEADERS`.
+        body: Decoded response body.
+        elapsed_s: Time the original request took.
+    """
+
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    elapsed_s: float
+
+    @property
+    def transient(self) -> bool:
+        """Whether the response was a rate limit or server error."""
+        return self.status == 429 or self.status >= 500
+
+
+def ddg_key(query: str, max_results: int) -> str:
+    """Return the cassette URL under which a DuckDuckGo search is stored.
+
+    Args:
+        query: Search query.
+        max_results: Maximum results requested.
+    """
+    return DDG_KEY_PREFIX + urlencode({"q": query, "max_results": max_results})
+
+
+class Cassette:
+    """Thread-safe store of recorded responses in an SQLite file."""
+
+    def __init__(self, path: str) -> None:
+        """Open (or create) a cassette.
+
+        Args:
+            path: Cassette file path.
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(CASSETTE_SCHEMA)
+
+    def save(self, method: str, url: str, recording: Recording) -> None:
+        """Store a response, replacing an earlier one for the same request.
+
+        A rate limit or server error never replaces a good response, so
+        re-recording over a flaky connection only improves a cassette.
+
+        Args:
+            method: HTTP method.
+            url: Full request URL.
+            recording: The response.
+        """
+        with self._lock:
+            if recording.transient and self._get(method, url) is not None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    method,
+                    url,
+                    recording.status,
+                    orjson.dumps(recording.headers).decode(),
+                    recording.body,
+                    recording.elapsed_s,
+                    datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                ),
+            )
+            self._conn.commit()
+
+    def get(self, method: str, url: str) -> Recording | None:
+        """Return the recorded response to a request.
+
+        A HEAD request falls back to the recorded GET of the same URL.
+
+        Args:
+            method: HTTP method.
+            url: Full request URL.
+
+        Returns:
+            The recording, or None if the request was never recorded.
+        """
+        with self._lock:
+            found = self._get(method, url)
+            if found is None and method == "HEAD":
+                found = self._get("GET", url)
+            return found
+
+    def _get(self, method: str, url: str) -> Recording | None:
+        row = self._conn.execute(
+            "SELECT status, headers, body, elapsed_s FROM responses"
+            " WHERE method = ? AND url = ?",
+            (method, url),
+        ).fetchone()
+        if row is None:
+            return None
+        return Recording(row[0], orjson.loads(row[1]), row[2], row[3])
+
+    def __len__(self) -> int:
+        """Return the number of recorded responses."""
+        with self._lock:
+            return int(
+                self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            )
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._conn.close()
+
+
+def _recording_of(resp: requests.Response, elapsed_s: float) -> Recording:
+    headers = {k: v for k, v in resp.headers.items() if k.lower() in KEPT_HEADERS}
+    return Recording(resp.status_code, headers, resp.content, elapsed_s)
+
+
+class _RecordingSearch:
+    """Stand-in for ``ddgs.DDGS`` that records what the real client returns."""
+
+    def __init__(self, cassette: Cassette, client: Any) -> None:
+        self._cassette = cassette
+        self._client = client
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._client.__exit__(*exc)
+
+    def text(self, query: str, max_results: int = 5) -> list[dict[str, str]]:
+        start = time.perf_counter()
+        results = list(self._client.text(query, max_results=max_results))
+        recording = Recording(
+            200,
+            {"Content-Type": "application/json"},
+            orjson.dumps(results),
+            time.perf_counter() - start,
+        )
+        self._cassette.save("GET", ddg_key(query, max_results), recording)
+        return results
+
+
+@contextmanager
+def recording(cassette: Cassette) -> Iterator[Cassette]:
+    """Record every HTTP response and DuckDuckGo search made in the block.
+
+    Args:
+        cassette: Where responses are stored.
+
+    Yields:
+        The cassette.
+    """
+    import ddgs
+
+    original_send = HTTPAdapter.send
+    original_ddgs = ddgs.DDGS
+
+    def send(
+        self: HTTPAdapter, request: requests.PreparedRequest, *args: Any, **kwargs: Any
+    ) -> requests.Response:
+        start = time.perf_counter()
+        resp = original_send(self, request, *args, **kwargs)
+        elapsed_s = time.perf_counter() - start
+        cassette.save(
+            request.method or "GET", request.url or "", _recording_of(resp, elapsed_s)
+        )
+        return resp
+
+    def search(*args: Any, **kwargs: Any) -> _RecordingSearch:
+        return _RecordingSearch(cassette, original_ddgs(*args, **kwargs))
+
+    HTTPAdapter.send = send  # type: ignore[method-assign]
+    ddgs.DDGS = search  # type: ignore[misc,assignment]
+    try:
+        yield cassette
+    finally:
+        HTTPAdapter.send = original_send  # type: ignore[method-assign]
+        ddgs.DDGS = original_ddgs  # type: ignore[misc]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves ``/<original URL>`` from the server's cassette."""
+
+    server: _Server
+    # Keep-alive, so pooled sessions reuse connections as they do live
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.server.replay.respond(self, "GET")
+
+    def do_HEAD(self) -> None:
+        self.server.replay.respond(self, "HEAD")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format, *args)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], replay: ReplayServer) -> None:
+        super().__init__(address, _Handler)
+        self.replay = replay
+
+
+class ReplayServer:
+    """Local HTTP server replaying a cassette with injected faults.
+
+    Every request is answered after the configured latency with, in order
+    of precedence: an injected 429 (probability *rate_limit_rate*), an
+    injected 503 (probability *error_rate*), the recorded response, or a
+    404 if the request was never recorded.
+
+    Attributes:
+        stats: Responses served so far, by outcome ("replayed", "missing",
+            "rate_limited", "error").
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency_s: float | None = None,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after_s: int = 1,
+        seed: int | None = None,
+        port: int = 0,
+    ) -> None:
+        """Configure the server; it is started with :meth:`start`.
+
+        Args:
+            cassette: Recorded responses.
+            latency_s: Delay before each response; None replays each
+                response's recorded latency.
+            error_rate: Probability of answering 503.
+            rate_limit_rate: Probability of answering 429.
+            retry_after_s: ``Retry-After`` of injected 429s.
+            seed: Seed for the fault injection, for repeatable runs.
+            port: Port on 127.0.0.1 (0 picks a free one).
+        """
+        self.cassette = cassette
+        self.latency_s = latency_s
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after_s = retry_after_s
+        self.stats: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = _Server(("127.0.0.1", port), self)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> Self:
+        """Serve requests from a background thread.
+
+        Returns:
+            The server itself.
+        """
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="replay-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def respond(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        """Answer one request.
+
+        Args:
+            handler: The request handler, whose path is ``/<original URL>``.
+            method: HTTP method.
+        """
+        with self._lock:
+            roll = self._random.random()
+        found = self.cassette.get(method, handler.path[1:])
+        if roll < self.rate_limit_rate:
+            outcome = "rate_limited"
+            reply = Recording(
+                429, {"Retry-After": str(self.retry_after_s)}, b"Too Many Requests", 0.0
+            )
+        elif roll < self.rate_limit_rate + self.error_rate:
+            outcome = "error"
+            reply = Recording(503, {}, b"Service Unavailable", 0.0)
+        elif found is None:
+            outcome = "missing"
+            reply = Recording(404, {}, b"Not in cassette", 0.0)
+        else:
+            outcome = "replayed"
+            reply = found
+        with self._lock:
+            self.stats[outcome] += 1
+
+        latency = self.latency_s if self.latency_s is not None else reply.elapsed_s
+        time.sleep(latency)
+        handler.send_response(reply.status)
+        for name, value in reply.headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(reply.body)))
+        handler.end_headers()
+        if method != "HEAD":
+            handler.wfile.write(reply.body)
+
+
+class _ReplaySearch:
+    """Stand-in for ``ddgs.DDGS`` that asks a :class:`ReplayServer`."""
+
+    def __init__(self, base_url: str) -> None:
+        self._base_url = base_url
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def text(self, query: str, max_results: int = 5) -> list[dict[str, str]]:
+        from ddgs.exceptions import DDGSException, RatelimitException
+
+        resp = requests.get(
+            f"{self._base_url}/{ddg_key(query, max_results)}", timeout=30
+        )
+        if resp.status_code == 429:
+            raise RatelimitException(f"{resp.status_code} Ratelimit")
+        if resp.status_code == 404:
+            return []
+        if not resp.ok:
+            raise DDGSException(f"{resp.status_code} {resp.reason}")
+        results: list[dict[str, str]] = orjson.loads(resp.content)
+        return results
+
+
+@contextmanager
+def replaying(server: ReplayServer) -> Iterator[ReplayServer]:
+    """Route every HTTP request and DuckDuckGo search to *server*.
+
+    Responses keep their original URL, so per-host metrics and relative
+    redirects behave as they do live.
+
+    Args:
+        server: A started replay server.
+
+    Yields:
+        The server.
+    """
+    import ddgs
+
+    original_send = HTTPAdapter.send
+    original_ddgs = ddgs.DDGS
+    base_url = server.url
+
+    def send(
+        self: HTTPAdapter, request: requests.PreparedRequest, *args: Any, **kwargs: Any
+    ) -> requests.Response:
+        url = request.url or ""
+        if url.startswith(base_url):
+            return original_send(self, request, *args, **kwargs)
+        routed = request.copy()
+        routed.url = f"{base_url}/{url}"
+        resp = original_send(self, routed, *args, **kwargs)
+        resp.url = url
+        resp.request = request
+        return resp
+
+    def search(*args: Any, **kwargs: Any) -> _ReplaySearch:
+        return _ReplaySearch(base_url)
+
+    HTTPAdapter.send = send  # type: ignore[method-assign]
+    ddgs.DDGS = search  # type: ignore[misc,assignment]
+    try:
+        yield server
+    finally:
+        HTTPAdapter.send = original_send  # type: ignore[method-assign]
+        ddgs.DDGS = original_ddgs  # type: ignore[misc]
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Record or replay a pipeline run.
+
+    Args:
+        argv: Command-line arguments (default: ``sys.argv[1:]``).
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m camplinks.cassette",
+        description="Record a pipeline run's HTTP traffic, or replay it offline.",
+        epilog="Arguments after -- are passed to python -m camplinks.",
+    )
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("cassette", help="Cassette file (SQLite).")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Replay: fixed latency per response (default: as recorded).",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Replay: fraction of 503s."
+    )
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=0.0, help="Replay: fraction of 429s."
+    )
+    parser.add_argument(
+        "--retry-after", type=int, default=1, help="Replay: Retry-After of 429s."
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Replay: fault seed.")
+    argv = sys.argv[1:] if argv is None else argv
+    split = argv.index("--") if "--" in argv else len(argv)
+    args = parser.parse_args(argv[:split])
+    pipeline_args = argv[split + 1 :]
+
+    from camplinks.__main__ import main as camplinks_main
+
+    cassette = Cassette(args.cassette)
+    try:
+        if args.mode == "record":
+            with recording(cassette):
+                camplinks_main(pipeline_args)
+            logger.info("Cassette %s: %d responses", args.cassette, len(cassette))
+            return
+        server = ReplayServer(
+            cassette,
+            latency_s=args.latency,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            retry_after_s=args.retry_after,
+            seed=args.seed,
+        )
+        start = time.perf_counter()
+        with server, replaying(server):
+            camplinks_main(pipeline_args)
+        logger.info(
+            "Replayed in %.1fs: %s",
+            time.perf_counter() - start,
+            ", ".join(f"{k}={v}" for k, v in sorted(server.stats.items())),
+        )
+    finally:
+        cassette.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,10 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+from collections.abc import Collection, Iterable
+from datetime import datetime, timezone
 
+from camplinks.metrics import METRICS
 from camplinks.models import DB_FILENAME, Candidate, ContactLink, Election
 
 logger = logging.getLogger(__name__)
@@ -94,6 +97,40 @@ CREATE TABLE IF NOT EXISTS archive_messages (
     fetched_at  TEXT    NOT NULL
 );
 
+CREATE TABLE IF NOT EXISTS page_revisions (
+    wikipedia_url  TEXT    PRIMARY KEY,
+    rev_id         INTEGER NOT NULL,
+    last_modified  TEXT    NOT NULL,
+    scraped_at     TEXT    NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS search_results (
+    query       TEXT    NOT NULL,
+    rank        INTEGER NOT NULL,
+    href        TEXT    NOT NULL,
+    title       TEXT,
+    body        TEXT,
+    fetched_at  TEXT    NOT NULL,
+    PRIMARY KEY (query, rank)
+);
+
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+    run_id       INTEGER PRIMARY KEY,
+    params       TEXT    NOT NULL,
+    status       TEXT    NOT NULL DEFAULT 'running',
+    started_at   TEXT    NOT NULL,
+    finished_at  TEXT
+);
+
+CREATE TABLE IF NOT EXISTS pipeline_run_units (
+    run_id       INTEGER NOT NULL REFERENCES pipeline_runs(run_id),
+    unit         TEXT    NOT NULL,
+    started_at   TEXT    NOT NULL,
+    finished_at  TEXT,
+    elapsed_s    REAL,
+    PRIMARY KEY (run_id, unit)
+);
+
 CREATE INDEX IF NOT EXISTS idx_archive_lookups_has_entry
     ON archive_lookups(has_entry);
 CREATE INDEX IF NOT EXISTS idx_archive_matches_org
@@ -312,6 +349,7 @@ def init_schema(conn: sqlite3.Connection) -> None:
 # ── Elections ──────────────────────────────────────────────────────────────
 
 
+@METRICS.timed("camplinks_db_write_seconds")
 def upsert_election(conn: sqlite3.Connection, election: Election) -> int:
     """Insert an election or return the existing ID on conflict.
 
@@ -350,6 +388,7 @@ def upsert_election(conn: sqlite3.Connection, election: Election) -> int:
 # ── Candidates ─────────────────────────────────────────────────────────────
 
 
+@METRICS.timed("camplinks_db_write_seconds")
 def upsert_candidate(
     conn: sqlite3.Connection,
     candidate: Candidate,
@@ -395,21 +434,41 @@ def upsert_candidate(
     return candidate_id
 
 
+def year_filter(
+    year: int | Collection[int], column: str = "e.year"
+) -> tuple[str, list[int]]:
+    """Build a query condition matching one election year or several.
+
+    Args:
+        year: A year, or a collection of years.
+        column: Column holding the year.
+
+    Returns:
+        An ``" AND ..."`` clause and its parameters.
+    """
+    years = [year] if isinstance(year, int) else sorted(set(year))
+    if len(years) == 1:
+        return f" AND {column} = ?", years
+    return f" AND {column} IN ({','.join('?' * len(years))})", years
+
+
 def get_candidates_missing_link(
     conn: sqlite3.Connection,
     link_type: str,
-    year: int | None = None,
+    year: int | Collection[int] | None = None,
     race_type: str | None = None,
     election_stage: str | None = None,
+    candidate_ids: Collection[int] | None = None,
 ) -> list[sqlite3.Row]:
     """Find candidates that lack a specific contact link type.
 
     Args:
         conn: Database connection.
         link_type: The link_type value to check for (e.g. "campaign_site").
-        year: Optional filter by election year.
+        year: Optional filter by election year (or years).
         race_type: Optional filter by race type.
         election_stage: Optional filter by election stage.
+        candidate_ids: Optional filter to these candidates.
 
     Returns:
         List of Row objects with candidate and election fields.
@@ -429,23 +488,28 @@ def get_candidates_missing_link(
     params: list[str | int] = [link_type]
 
     if year is not None:
-        query += " AND e.year = ?"
-        params.append(year)
+        clause, years = year_filter(year)
+        query += clause
+        params.extend(years)
     if race_type is not None:
         query += " AND e.race_type = ?"
         params.append(race_type)
     if election_stage is not None:
         query += " AND e.election_stage = ?"
         params.append(election_stage)
+    if candidate_ids is not None:
+        query += f" AND c.candidate_id IN ({','.join('?' * len(candidate_ids))})"
+        params.extend(candidate_ids)
 
     return conn.execute(query, params).fetchall()
 
 
 def get_candidates_missing_social_links(
     conn: sqlite3.Connection,
-    year: int | None = None,
+    year: int | Collection[int] | None = None,
     race_type: str | None = None,
     election_stage: str | None = None,
+    candidate_ids: Collection[int] | None = None,
 ) -> list[sqlite3.Row]:
     """Find candidates missing at least one social media link type.
 
@@ -454,9 +518,10 @@ def get_candidates_missing_social_links(
 
     Args:
         conn: Database connection.
-        year: Optional filter by election year.
+        year: Optional filter by election year (or years).
         race_type: Optional filter by race type.
         election_stage: Optional filter by election stage.
+        candidate_ids: Optional filter to these candidates.
 
     Returns:
         List of Row objects with candidate and election fields.
@@ -486,14 +551,18 @@ def get_candidates_missing_social_links(
     params: list[str | int] = []
 
     if year is not None:
-        query += " AND e.year = ?"
-        params.append(year)
+        clause, years = year_filter(year)
+        query += clause
+        params.extend(years)
     if race_type is not None:
         query += " AND e.race_type = ?"
         params.append(race_type)
     if election_stage is not None:
         query += " AND e.election_stage = ?"
         params.append(election_stage)
+    if candidate_ids is not None:
+        query += f" AND c.candidate_id IN ({','.join('?' * len(candidate_ids))})"
+        params.extend(candidate_ids)
 
     return conn.execute(query, params).fetchall()
 
@@ -502,9 +571,10 @@ def get_candidates_with_link(
     conn: sqlite3.Connection,
     link_type: str,
     exclude_link_type: str | None = None,
-    year: int | None = None,
+    year: int | Collection[int] | None = None,
     race_type: str | None = None,
     election_stage: str | None = None,
+    candidate_ids: Collection[int] | None = None,
 ) -> list[sqlite3.Row]:
     """Find candidates that have a specific contact link type.
 
@@ -516,9 +586,10 @@ def get_candidates_with_link(
         link_type: The link_type to require (e.g. "campaign_site").
         exclude_link_type: Optional link_type to exclude candidates who
             already have it (e.g. "campaign_site_archived").
-        year: Optional filter by election year.
+        year: Optional filter by election year (or years).
         race_type: Optional filter by race type.
         election_stage: Optional filter by election stage.
+        candidate_ids: Optional filter to these candidates.
 
     Returns:
         List of Row objects with candidate, election, and link fields.
@@ -526,7 +597,7 @@ def get_candidates_with_link(
     query = """\
         SELECT c.candidate_id, c.candidate_name, c.party,
                e.state, e.district, e.year, e.race_type, e.election_stage,
-               cl.url AS campaign_site_url
+               cl.url AS campaign_site_url, cl.source AS link_source
         FROM candidates c
         JOIN elections e ON c.election_id = e.election_id
         JOIN contact_links cl ON cl.candidate_id = c.candidate_id
@@ -545,14 +616,98 @@ def get_candidates_with_link(
         params.append(exclude_link_type)
 
     if year is not None:
-        query += " AND e.year = ?"
-        params.append(year)
+        clause, years = year_filter(year)
+        query += clause
+        params.extend(years)
+    if race_type is not None:
+        query += " AND e.race_type = ?"
+        params.append(race_type)
+    if election_stage is not None:
+        query += " AND e.election_stage = ?"
+        params.append(election_stage)
+    if candidate_ids is not None:
+        query += f" AND c.candidate_id IN ({','.join('?' * len(candidate_ids))})"
+        params.extend(candidate_ids)
+
+    return conn.execute(query, params).fetchall()
+
+
+def get_candidates_missing_wikipedia_url(
+    conn: sqlite3.Connection,
+    year: int | Collection[int] | None = None,
+    race_type: str | None = None,
+    election_stage: str | None = None,
+    candidate_ids: Collection[int] | None = None,
+) -> list[sqlite3.Row]:
+    """Find candidates without a Wikipedia URL.
+
+    Args:
+        conn: Database connection.
+        year: Optional filter by election year (or years).
+        race_type: Optional filter by race type.
+        election_stage: Optional filter by election stage.
+        candidate_ids: Optional filter to these candidates.
+
+    Returns:
+        List of Row objects with candidate_id, candidate_name, and the
+        parent election's state and race_type.
+    """
+    query = """\
+        SELECT c.candidate_id, c.candidate_name, e.state, e.race_type
+        FROM candidates c
+        JOIN elections e ON c.election_id = e.election_id
+        WHERE (c.wikipedia_url IS NULL OR c.wikipedia_url = '')
+    """
+    params: list[str | int] = []
+    if election_stage is not None:
+        query += " AND e.election_stage = ?"
+        params.append(election_stage)
+    if year is not None:
+        clause, years = year_filter(year)
+        query += clause
+        params.extend(years)
     if race_type is not None:
         query += " AND e.race_type = ?"
         params.append(race_type)
+    if candidate_ids is not None:
+        query += f" AND c.candidate_id IN ({','.join('?' * len(candidate_ids))})"
+        params.extend(candidate_ids)
+
+    return conn.execute(query, params).fetchall()
+
+
+def get_candidates_needing_wikipedia_enrichment(
+    conn: sqlite3.Connection,
+    election_stage: str | None = None,
+    candidate_ids: Collection[int] | None = None,
+) -> list[sqlite3.Row]:
+    """Find candidates with a Wikipedia URL but no campaign site link.
+
+    Args:
+        conn: Database connection.
+        election_stage: Optional filter by election stage.
+        candidate_ids: Optional filter to these candidates.
+
+    Returns:
+        List of Row objects with candidate_id and wikipedia_url.
+    """
+    query = """\
+        SELECT c.candidate_id, c.wikipedia_url
+        FROM candidates c
+        JOIN elections e ON c.election_id = e.election_id
+        WHERE c.wikipedia_url != ''
+          AND c.candidate_id NOT IN (
+              SELECT cl.candidate_id FROM contact_links cl
+              WHERE cl.link_type = 'campaign_site'
+          )
+    """
+    params: list[str | int] = []
     if election_stage is not None:
         query += " AND e.election_stage = ?"
         params.append(election_stage)
+    if candidate_ids is not None:
+        query += f" AND c.candidate_id IN ({','.join('?' * len(candidate_ids))})"
+        params.extend(candidate_ids)
 
     return conn.execute(query, params).fetchall()
 
@@ -560,6 +715,7 @@ def get_candidates_with_link(
 # ── Contact links ──────────────────────────────────────────────────────────
 
 
+@METRICS.timed("camplinks_db_write_seconds")
 def upsert_contact_link(
     conn: sqlite3.Connection,
     link: ContactLink,
@@ -625,6 +781,7 @@ def update_candidate_ballotpedia_url(
 # ── Archive of Political Emails ────────────────────────────────────────────
 
 
+@METRICS.timed("camplinks_db_write_seconds")
 def upsert_archive_organization(
     conn: sqlite3.Connection,
     org_id: str,
@@ -688,6 +845,7 @@ def upsert_archive_organization(
     )
 
 
+@METRICS.timed("camplinks_db_write_seconds")
 def upsert_archive_lookup(
     conn: sqlite3.Connection,
     candidate_id: int,
@@ -755,7 +913,7 @@ def link_candidate_to_org(
 
 def get_candidates_needing_archive_lookup(
     conn: sqlite3.Connection,
-    year: int | None = None,
+    year: int | Collection[int] | None = None,
     race_type: str | None = None,
     election_stage: str | None = None,
 ) -> list[sqlite3.Row]:
@@ -763,7 +921,7 @@ def get_candidates_needing_archive_lookup(
 
     Args:
         conn: Database connection.
-        year: Optional filter by election year.
+        year: Optional filter by election year (or years).
         race_type: Optional filter by race type.
         election_stage: Optional filter by election stage.
 
@@ -784,8 +942,9 @@ def get_candidates_needing_archive_lookup(
     params: list[str | int] = []
 
     if year is not None:
-        query += " AND e.year = ?"
-        params.append(year)
+        clause, years = year_filter(year)
+        query += clause
+        params.extend(years)
     if race_type is not None:
         query += " AND e.race_type = ?"
         params.append(race_type)
@@ -794,3 +953,245 @@ def get_candidates_needing_archive_lookup(
         params.append(election_stage)
 
     return conn.execute(query, params).fetchall()
+
+
+# ── Page revisions ─────────────────────────────────────────────────────────
+
+
+def get_page_revisions(
+    conn: sqlite3.Connection,
+    urls: Iterable[str],
+) -> dict[str, int]:
+    """Look up the revision each page was last scraped at.
+
+    Args:
+        conn: Database connection.
+        urls: Wikipedia page URLs (as stored in ``elections.wikipedia_url``).
+
+    Returns:
+        Mapping of URL -> revision ID for pages scraped before.
+    """
+    revisions: dict[str, int] = {}
+    for url in urls:
+        row = conn.execute(
+            "SELECT rev_id FROM page_revisions WHERE wikipedia_url = ?", (url,)
+        ).fetchone()
+        if row is not None:
+            revisions[url] = row[0]
+    return revisions
+
+
+@METRICS.timed("camplinks_db_write_seconds")
+def upsert_page_revision(
+    conn: sqlite3.Connection,
+    url: str,
+    rev_id: int,
+    last_modified: str,
+) -> None:
+    """Record the revision of a page that was just scraped.
+
+    Args:
+        conn: Database connection.
+        url: Wikipedia page URL.
+        rev_id: Revision ID the page was at.
+        last_modified: Timestamp of that revision (ISO 8601).
+    """
+    conn.execute(
+        """\
+        INSERT INTO page_revisions (wikipedia_url, rev_id, last_modified, scraped_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(wikipedia_url) DO UPDATE SET
+            rev_id        = excluded.rev_id,
+            last_modified = excluded.last_modified,
+            scraped_at    = excluded.scraped_at
+        """,
+        (
+            url,
+            rev_id,
+            last_modified,
+            datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        ),
+    )
+
+
+# ── Search results ─────────────────────────────────────────────────────────
+
+
+@METRICS.timed("camplinks_db_write_seconds")
+def save_search_results(
+    conn: sqlite3.Connection,
+    query: str,
+    results: list[dict[str, str]],
+) -> None:
+    """Store the raw results of a web search, replacing earlier ones.
+
+    Args:
+        conn: Database connection.
+        query: Search query as sent.
+        results: Result dicts with ``href``, ``title`` and ``body`` keys,
+            in rank order.
+    """
+    fetched_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    conn.execute("DELETE FROM search_results WHERE query = ?", (query,))
+    conn.executemany(
+        """\
+        INSERT INTO search_results (query, rank, href, title, body, fetched_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (query, rank, r.get("href", ""), r.get("title"), r.get("body"), fetched_at)
+            for rank, r in enumerate(results)
+        ],
+    )
+
+
+def get_search_results(
+    conn: sqlite3.Connection,
+    query: str,
+) -> list[dict[str, str]] | None:
+    """Load the stored results of a web search.
+
+    Args:
+        conn: Database connection.
+        query: Search query as sent.
+
+    Returns:
+        Result dicts in rank order, or None if the query was never stored.
+    """
+    rows = conn.execute(
+        "SELECT href, title, body FROM search_results WHERE query = ? ORDER BY rank",
+        (query,),
+    ).fetchall()
+    if not rows:
+        return None
+    return [
+        {"href": href, "title": title or "", "body": body or ""}
+        for href, title, body in rows
+    ]
+
+
+# ── Pipeline runs ──────────────────────────────────────────────────────────
+
+
+def start_pipeline_run(conn: sqlite3.Connection, params: str) -> int:
+    """Record the start of a pipeline run.
+
+    Args:
+        conn: Database connection.
+        params: The run's parameters, serialized as JSON.
+
+    Returns:
+        The new run_id.
+    """
+    cursor = conn.execute(
+        """\
+        INSERT INTO pipeline_runs (params, started_at) VALUES (?, ?)
+        RETURNING run_id
+        """,
+        (params, datetime.now(timezone.utc).isoformat(timespec="seconds")),
+    )
+    run_id: int = cursor.fetchone()[0]
+    return run_id
+
+
+def find_unfinished_run(conn: sqlite3.Connection, params: str) -> int | None:
+    """Find the latest run with these parameters that did not complete.
+
+    Args:
+        conn: Database connection.
+        params: Run parameters, serialized as by the caller that started
+            the run.
+
+    Returns:
+        The run_id, or None if every such run completed.
+    """
+    row = conn.execute(
+        """\
+        SELECT run_id FROM pipeline_runs
+        WHERE params = ? AND status != 'completed'
+        ORDER BY run_id DESC LIMIT 1
+        """,
+        (params,),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def set_pipeline_run_status(conn: sqlite3.Connection, run_id: int, status: str) -> None:
+    """Update a run's status ("running", "completed" or "failed").
+
+    Args:
+        conn: Database connection.
+        run_id: Run to update.
+        status: New status. Any status but "running" sets finished_at.
+    """
+    finished_at = None
+    if status != "running":
+        finished_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    conn.execute(
+        "UPDATE pipeline_runs SET status = ?, finished_at = ? WHERE run_id = ?",
+        (status, finished_at, run_id),
+    )
+
+
+def get_finished_units(conn: sqlite3.Connection, run_id: int) -> set[str]:
+    """Return the units (stages or scrapers) a run has completed.
+
+    Args:
+        conn: Database connection.
+        run_id: Run to look up.
+
+    Returns:
+        Names of the completed units.
+    """
+    rows = conn.execute(
+        "SELECT unit FROM pipeline_run_units "
+        "WHERE run_id = ? AND finished_at IS NOT NULL",
+        (run_id,),
+    )
+    return {row[0] for row in rows}
+
+
+def start_run_unit(conn: sqlite3.Connection, run_id: int, unit: str) -> None:
+    """Record that a run started a unit, clearing any earlier attempt.
+
+    Args:
+        conn: Database connection.
+        run_id: Owning run.
+        unit: Unit name, e.g. ``"scrape:house"`` or ``"search"``.
+    """
+    conn.execute(
+        """\
+        INSERT INTO pipeline_run_units (run_id, unit, started_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT(run_id, unit) DO UPDATE SET
+            started_at = excluded.started_at,
+            finished_at = NULL,
+            elapsed_s = NULL
+        """,
+        (run_id, unit, datetime.now(timezone.utc).isoformat(timespec="seconds")),
+    )
+
+
+def finish_run_unit(
+    conn: sqlite3.Connection, run_id: int, unit: str, elapsed_s: float
+) -> None:
+    """Record that a run completed a unit.
+
+    Args:
+        conn: Database connection.
+        run_id: Owning run.
+        unit: Unit name.
+        elapsed_s: Seconds the unit took.
+    """
+    conn.execute(
+        """\
+        UPDATE pipeline_run_units SET finished_at = ?, elapsed_s = ?
+        WHERE run_id = ? AND unit = ?
+        """,
+        (
+            datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            elapsed_s,
+            run_id,
+            unit,
+        ),
+    )
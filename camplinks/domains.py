@@ -0,0 +1,234 @@
+"""Domain matching for filtering search results and stored links.
+
+Several places reject URLs whose host belongs to a known non-campaign site
+(social networks, news outlets, reference sites, election-data
+aggregators, ``.gov``). :class:`DomainMatcher` stores those domains in a
+trie keyed on reversed labels (``com`` -> ``facebook`` -> ``m``), so
+classifying a host walks at most one node per label instead of testing
+every listed domain, and matches only whole labels: ``facebook.com``
+matches ``m.facebook.com`` but not ``notfacebook.com``.
+
+The built-in lists are compiled once by :func:`default_matcher`; aggregator
+domains found later can be added from a CSV such as
+``bad_aggregator_urls.csv``.
+"""
+
+from __future__ import annotations
+
+import csv
+import functools
+from collections.abc import Iterable
+from pathlib import Path
+from urllib.parse import urlsplit
+
+SOCIAL = "social"
+NEWS = "news"
+REFERENCE = "reference"
+AGGREGATOR = "aggregator"
+GOVERNMENT = "government"
+
+SOCIAL_DOMAINS: tuple[str, ...] = (
+    "facebook.com",
+    "twitter.com",
+    "x.com",
+    "youtube.com",
+    "linkedin.com",
+    "instagram.com",
+    "reddit.com",
+    "tiktok.com",
+)
+
+NEWS_DOMAINS: tuple[str, ...] = (
+    "nytimes.com",
+    "cnn.com",
+    "foxnews.com",
+    "washingtonpost.com",
+    "politico.com",
+    "nbcnews.com",
+    "abcnews.go.com",
+    "cbsnews.com",
+    "apnews.com",
+    "reuters.com",
+    "thehill.com",
+    "npr.org",
+    "bbc.com",
+    "usatoday.com",
+)
+
+REFERENCE_DOMAINS: tuple[str, ...] = (
+    "ballotpedia.org",
+    "wikipedia.org",
+    "fec.gov",
+    "opensecrets.org",
+    "google.com",
+)
+
+# Candidate directories and voter guides that search results (and
+# Ballotpedia infoboxes) often return in place of a campaign site
+AGGREGATOR_DOMAINS: tuple[str, ...] = (
+    "ourcampaigns.com",
+    "vote-usa.org",
+    "bluevoterguide.org",
+    "lykelect.com",
+    "votesmart.org",
+    "ivoterguide.com",
+    "uselectionatlas.org",
+    "electiondatabase.nhpr.org",
+    "electjon.com",
+    "vote411.org",
+    "dos.elections.myflorida.com",
+    "vote.org",
+    "votesafe.org",
+    "electionfraud.heritage.org",
+    "ballotready.org",
+    "politics1.com",
+    "followthemoney.org",
+    "smartvoter.org",
+)
+
+
+def host_of(url: str) -> str:
+    """Return the lowercased host of *url* without port or trailing dot.
+
+    Args:
+        url: Absolute URL.
+
+    Returns:
+        Host name, or ``""`` if *url* has none.
+    """
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
+    return host.rstrip(".")
+
+
+class _Node:
+    __slots__ = ("category", "children")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.category: str | None = None
+
+
+class DomainMatcher:
+    """Classify hosts by the listed domain they belong to."""
+
+    def __init__(self, domains: Iterable[tuple[str, str]] = ()) -> None:
+        """Build a matcher.
+
+        Args:
+            domains: (domain, category) pairs to add.
+        """
+        self._root = _Node()
+        self._size = 0
+        for domain, category in domains:
+            self.add(domain, category)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, domain: str, category: str) -> None:
+        """Add a domain (and all of its subdomains).
+
+        A single label such as ``"gov"`` matches a whole top-level domain.
+        A leading ``www.`` is ignored. Re-adding a domain replaces its
+        category.
+
+        Args:
+            domain: Domain name, e.g. ``"votesmart.org"``.
+            category: Label returned for matching hosts.
+        """
+        domain = domain.strip().lower().rstrip(".").removeprefix("www.")
+        if not domain:
+            return
+        node = self._root
+        for label in reversed(domain.split(".")):
+            node = node.children.setdefault(label, _Node())
+        if node.category is None:
+            self._size += 1
+        node.category = category
+
+    def extend_from_csv(
+        self,
+        path: str | Path,
+        column: str = "domain",
+        category: str = AGGREGATOR,
+    ) -> int:
+        """Add every domain listed in one column of a CSV file.
+
+        Args:
+            path: CSV file with a header row.
+            column: Column holding domain names.
+            category: Category for the added domains.
+
+        Returns:
+            Number of domains that were not already listed.
+
+        Raises:
+            KeyError: If the CSV has no *column* column.
+        """
+        before = self._size
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            if column not in (reader.fieldnames or []):
+                raise KeyError(f"{path} has no {column!r} column")
+            for row in reader:
+                domain = row[column] or ""
+                if domain and self.match_host(domain) is None:
+                    self.add(domain, category)
+        return self._size - before
+
+    def match_host(self, host: str) -> str | None:
+        """Classify a host name.
+
+        Args:
+            host: Lowercase host name.
+
+        Returns:
+            Category of the most specific listed domain containing *host*,
+            or None.
+        """
+        node = self._root
+        found: str | None = None
+        for label in reversed(host.split(".")):
+            child = node.children.get(label)
+            if child is None:
+                break
+            node = child
+            if node.category is not None:
+                found = node.category
+        return found
+
+    def match(self, url: str) -> str | None:
+        """Classify a URL by its host.
+
+        Args:
+            url: Absolute URL.
+
+        Returns:
+            Category of the URL's domain, or None if it is not listed.
+        """
+        return self.match_host(host_of(url))
+
+
+@functools.lru_cache(maxsize=1)
+def default_matcher() -> DomainMatcher:
+    """Return the shared matcher of non-campaign domains.
+
+    Covers social networks, news outlets, reference sites, election-data
+    aggregators and the ``.gov`` top-level domain. Built on first use.
+
+    Returns:
+        The shared matcher (extensions made to it are seen by all callers).
+    """
+    matcher = DomainMatcher([("gov", GOVERNMENT)])
+    for category, domains in (
+        (SOCIAL, SOCIAL_DOMAINS),
+        (NEWS, NEWS_DOMAINS),
+        (REFERENCE, REFERENCE_DOMAINS),
+        (AGGREGATOR, AGGREGATOR_DOMAINS),
+    ):
+        for domain in domains:
+            matcher.add(domain, category)
+    return matcher
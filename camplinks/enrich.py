@@ -1,22 +1,41 @@
 """Enrich candidates with campaign website URLs from Wikipedia.
 
-For each candidate that has a Wikipedia page, fetches the page and
+For each candidate that has a Wikipedia page, looks at the page and
 extracts the campaign website from the infobox (primary) or External
 links section (fallback). Results are written to the contact_links table.
+
+Pages are read through the MediaWiki API: titles are resolved (following
+redirects) and their wikitext fetched 50 pages per request. Rendered HTML
+is only requested for pages whose website is hidden in a template the
+wikitext reader cannot expand.
 """
 
 from __future__ import annotations
 
 import logging
+import re
 import sqlite3
+from collections.abc import Collection
 
 import requests
 from bs4 import BeautifulSoup, Tag
 from tqdm import tqdm
 
-from camplinks.db import update_candidate_wikipedia_url, upsert_contact_link
-from camplinks.http import ddg_search, fetch_soup
+from camplinks.db import (
+    get_candidates_missing_wikipedia_url,
+    get_candidates_needing_wikipedia_enrichment,
+    update_candidate_wikipedia_url,
+    upsert_contact_link,
+)
+from camplinks.http import ddg_search, parse_html
+from camplinks.mediawiki import (
+    MAX_TITLES,
+    MediaWikiClient,
+    PageRevision,
+    title_from_url,
+)
 from camplinks.models import ContactLink
+from camplinks.profiling import PROFILER
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +109,119 @@ def extract_campaign_website(soup: BeautifulSoup) -> str:
     return ""
 
 
+_INFOBOX_START_RE = re.compile(r"\{\{\s*Infobox\b", re.IGNORECASE)
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+# Templates that only lay out a list of links, and the URL templates
+# themselves: anything else in a website value is resolved on rendering
+_LIST_TEMPLATE_RE = re.compile(
+    r"\{\{\s*(?:plainlist|flatlist|hlist|ubl|unbulleted list)\s*\|?", re.IGNORECASE
+)
+_EXTERNAL_LINKS_RE = re.compile(
+    r"^==\s*External links\s*==\s*$(.*?)(?=^==[^=]|\Z)",
+    re.IGNORECASE | re.MULTILINE | re.DOTALL,
+)
+_URL_TEMPLATE_RE = re.compile(
+    r"\{\{\s*URL\s*\|\s*([^|}\s]+)\s*(?:\|([^}]*))?\}\}", re.IGNORECASE
+)
+_BRACKET_LINK_RE = re.compile(r"\[(https?://[^\s\]]+)(?:\s+([^\]]*))?\]")
+
+
+def _infobox_params(wikitext: str) -> dict[str, str]:
+    """Return the named parameters of the page's infobox template.
+
+    Parameters are split at the template's own pipes, so values holding
+    templates or piped links (``{{Plainlist|...}}``, ``[[a|b]]``) stay
+    whole, including those spanning several lines.
+    """
+    text = _COMMENT_RE.sub("", wikitext)
+    match = _INFOBOX_START_RE.search(text)
+    if match is None:
+        return {}
+    parts: list[str] = []
+    depth = 0
+    start = i = match.end()
+    while i < len(text):
+        pair = text[i : i + 2]
+        if pair in ("{{", "[["):
+            depth += 1
+            i += 2
+        elif pair in ("}}", "]]"):
+            if depth == 0 and pair == "}}":
+                break
+            depth = max(depth - 1, 0)
+            i += 2
+        else:
+            if text[i] == "|" and depth == 0:
+                parts.append(text[start:i])
+                start = i + 1
+            i += 1
+    parts.append(text[start:i])
+    params: dict[str, str] = {}
+    # parts[0] is the rest of the template name
+    for part in parts[1:]:
+        key, eq, value = part.partition("=")
+        if eq:
+            params[key.strip().lower()] = value.strip()
+    return params
+
+
+def _wikitext_links(text: str) -> list[tuple[str, str]]:
+    """Return (url, label) pairs for ``{{URL}}`` templates and ``[url label]``."""
+    links: list[tuple[str, str]] = []
+    for url, label in _URL_TEMPLATE_RE.findall(text):
+        if "://" not in url:
+            url = f"http://{url}"
+        links.append((url, label or ""))
+    links.extend(_BRACKET_LINK_RE.findall(text))
+    return links
+
+
+def extract_campaign_website_wikitext(wikitext: str) -> str | None:
+    """Extract the campaign website URL from a page's wikitext.
+
+    Applies the same rules as :func:`extract_campaign_website` to the
+    infobox ``website`` parameter and the External links section. When the
+    infobox value holds a template other than ``{{URL}}`` and list layouts,
+    the rendered infobox decides, so the External links section is not
+    consulted.
+
+    Args:
+        wikitext: Page wikitext.
+
+    Returns:
+        Campaign website URL, empty string if the page has none, or None if
+        the website is given by a template (e.g. ``{{Official URL}}``) that
+        only the rendered page resolves.
+    """
+    # --- Strategy 1: Infobox "website" parameter ---
+    website = _infobox_params(wikitext).get("website", "")
+    if website:
+        if "{{" in _LIST_TEMPLATE_RE.sub("", _URL_TEMPLATE_RE.sub("", website)):
+            return None
+        links = _wikitext_links(website)
+        for url, label in links:
+            if "campaign" in label.lower():
+                return url
+        if len(links) == 1:
+            return links[0][0]
+        for url, _ in links:
+            if ".gov" not in url:
+                return url
+
+    # --- Strategy 2: External links section ---
+    undetermined = False
+    section = _EXTERNAL_LINKS_RE.search(wikitext)
+    if section:
+        for line in section.group(1).splitlines():
+            if line.startswith("*") and "campaign" in line.lower():
+                links = _wikitext_links(line)
+                if links:
+                    return links[0][0]
+                undetermined = True
+
+    return None if undetermined else ""
+
+
 WIKIPEDIA_BASE = "https://en.wikipedia.org"
 
 
@@ -115,9 +247,10 @@ def find_wikipedia_url(name: str, state: str, race_type: str) -> str:
 
 def enrich_wikipedia_urls(
     conn: sqlite3.Connection,
-    year: int | None = None,
+    year: int | Collection[int] | None = None,
     race_type: str | None = None,
     election_stage: str | None = "general",
+    candidate_ids: Collection[int] | None = None,
 ) -> int:
     """Search for Wikipedia URLs for candidates that don't have one.
 
@@ -126,31 +259,21 @@ def enrich_wikipedia_urls(
 
     Args:
         conn: Open database connection.
-        year: Optional filter by election year.
+        year: Optional filter by election year (or years).
         race_type: Optional filter by race type.
         election_stage: Optional filter by election stage.
+        candidate_ids: Optional filter to these candidates.
 
     Returns:
         Number of Wikipedia URLs found and saved.
     """
-    query = """\
-        SELECT c.candidate_id, c.candidate_name, e.state, e.race_type
-        FROM candidates c
-        JOIN elections e ON c.election_id = e.election_id
-        WHERE (c.wikipedia_url IS NULL OR c.wikipedia_url = '')
-    """
-    params: list[str | int] = []
-    if election_stage is not None:
-        query += " AND e.election_stage = ?"
-        params.append(election_stage)
-    if year is not None:
-        query += " AND e.year = ?"
-        params.append(year)
-    if race_type is not None:
-        query += " AND e.race_type = ?"
-        params.append(race_type)
-
-    rows = conn.execute(query, params).fetchall()
+    rows = get_candidates_missing_wikipedia_url(
+        conn,
+        year=year,
+        race_type=race_type,
+        election_stage=election_stage,
+        candidate_ids=candidate_ids,
+    )
 
     if not rows:
         logger.info("No candidates need Wikipedia URL search.")
@@ -159,16 +282,19 @@ def enrich_wikipedia_urls(
     logger.info("Searching Wikipedia URLs for %d candidates...", len(rows))
 
     found = 0
-    for row in tqdm(rows, desc="Finding Wikipedia URLs", unit="candidate"):
+    for row in PROFILER.units(
+        tqdm(rows, desc="Finding Wikipedia URLs", unit="candidate"), "enrich"
+    ):
         try:
             url = find_wikipedia_url(row["candidate_name"], row["state"], row["race_type"])
             if url:
                 update_candidate_wikipedia_url(conn, row["candidate_id"], url)
+                # Commit per write so concurrent stages are not locked out
+                conn.commit()
                 found += 1
         except Exception as exc:
             logger.error("Wikipedia search failed for %s: %s", row["candidate_name"], exc)
 
-    conn.commit()
     logger.info("Found Wikipedia URLs for %d / %d candidates.", found, len(rows))
     return found
 
@@ -176,79 +302,120 @@ def enrich_wikipedia_urls(
 def enrich_from_wikipedia(
     conn: sqlite3.Connection,
     election_stage: str | None = "general",
+    client: MediaWikiClient | None = None,
+    candidate_ids: Collection[int] | None = None,
 ) -> int:
     """Fetch campaign websites for all candidates with Wikipedia URLs.
 
     Queries candidates that have a wikipedia_url but no campaign_site
-    contact link, fetches their Wikipedia pages, and extracts campaign
-    website URLs.
+    contact link, reads their Wikipedia pages through the MediaWiki API,
+    and extracts campaign website URLs.
 
     Args:
         conn: Open database connection.
         election_stage: Optional filter by election stage. Defaults to
             "general" to avoid enriching primary-only candidates.
+        client: MediaWiki API client (a default client is created if None).
+        candidate_ids: Optional filter to these candidates.
 
     Returns:
         Number of campaign sites found.
     """
-    query = """\
-        SELECT c.candidate_id, c.wikipedia_url
-        FROM candidates c
-        JOIN elections e ON c.election_id = e.election_id
-        WHERE c.wikipedia_url != ''
-          AND c.candidate_id NOT IN (
-              SELECT cl.candidate_id FROM contact_links cl
-              WHERE cl.link_type = 'campaign_site'
-          )
-    """
-    params: list[str] = []
-    if election_stage is not None:
-        query += " AND e.election_stage = ?"
-        params.append(election_stage)
-    rows = conn.execute(query, params).fetchall()
+    rows = get_candidates_needing_wikipedia_enrichment(
+        conn, election_stage=election_stage, candidate_ids=candidate_ids
+    )
 
     if not rows:
         logger.info("No candidates need Wikipedia enrichment.")
         return 0
 
-    # De-duplicate URLs to avoid redundant fetches
-    url_to_ids: dict[str, list[int]] = {}
+    # Group candidates by page title; several URLs may name the same page
+    title_to_ids: dict[str, list[int]] = {}
     for row in rows:
-        url = row["wikipedia_url"]
-        url_to_ids.setdefault(url, []).append(row["candidate_id"])
+        title = title_from_url(row["wikipedia_url"])
+        if title is None:
+            logger.error("Not a Wikipedia article URL: %s", row["wikipedia_url"])
+            continue
+        title_to_ids.setdefault(title, []).append(row["candidate_id"])
 
     logger.info(
         "Enriching %d candidates from %d unique Wikipedia pages...",
         len(rows),
-        len(url_to_ids),
+        len(title_to_ids),
     )
 
+    client = client or MediaWikiClient()
+    titles = list(title_to_ids)
     found = 0
-    for url, candidate_ids in tqdm(
-        url_to_ids.items(), desc="Fetching campaign sites", unit="page"
-    ):
-        try:
-            soup = fetch_soup(url)
-            campaign_url = extract_campaign_website(soup)
-            if campaign_url:
-                for cid in candidate_ids:
-                    upsert_contact_link(
-                        conn,
-                        ContactLink(
-                            candidate_id=cid,
-                            link_type="campaign_site",
-                            url=campaign_url,
-                            source="wikipedia",
-                        ),
-                    )
-                found += 1
-        except requests.RequestException as exc:
-            logger.error("HTTP error for %s: %s", url, exc)
-        except (AttributeError, KeyError, ValueError, TypeError) as exc:
-            logger.error("Error parsing %s: %s", url, exc)
+    pages_checked = 0
+    with tqdm(total=len(titles), desc="Fetching campaign sites", unit="page") as bar:
+        for start in PROFILER.units(range(0, len(titles), MAX_TITLES), "enrich"):
+            chunk = titles[start : start + MAX_TITLES]
+            try:
+                resolved = client.resolve(chunk, content=True)
+            except requests.RequestException as exc:
+                logger.error(
+                    "MediaWiki lookup failed for %d pages: %s", len(chunk), exc
+                )
+                bar.update(len(chunk))
+                continue
+
+            # Redirects can map several titles onto one page
+            page_ids: dict[int, tuple[PageRevision, list[int]]] = {}
+            for title in chunk:
+                page = resolved.get(title)
+                if page is None:
+                    logger.error("Wikipedia page not found: %s", title)
+                    continue
+                entry = page_ids.setdefault(page.page_id, (page, []))
+                entry[1].extend(title_to_ids[title])
+
+            for page, page_candidates in page_ids.values():
+                pages_checked += 1
+                campaign_url = _campaign_website(client, page)
+                if campaign_url:
+                    for cid in page_candidates:
+                        upsert_contact_link(
+                            conn,
+                            ContactLink(
+                                candidate_id=cid,
+                                link_type="campaign_site",
+                                url=campaign_url,
+                                source="wikipedia",
+                            ),
+                        )
+                    # Commit per page: rendering the next one may take a
+                    # request, and concurrent stages must not be locked out
+                    conn.commit()
+                    found += 1
+            bar.update(len(chunk))
 
-    conn.commit()
     logger.info(
-        "Found campaign sites for %d / %d unique pages.", found, len(url_to_ids)
+        "Found campaign sites for %d / %d unique pages (%d API requests).",
+        found,
+        pages_checked,
+        client.requests_made,
     )
     return found
+
+
+def _campaign_website(client: MediaWikiClient, page: PageRevision) -> str:
+    """Find a page's campaign website, rendering it only when necessary.
+
+    Args:
+        client: MediaWiki API client.
+        page: Resolved page with wikitext.
+
+    Returns:
+        Campaign website URL, or empty string if not found.
+    """
+    campaign_url = extract_campaign_website_wikitext(page.wikitext or "")
+    if campaign_url is not None:
+        return campaign_url
+    try:
+        return extract_campaign_website(parse_html(client.parse(page)))
+    except requests.RequestException as exc:
+        logger.error("HTTP error for %s: %s", page.url, exc)
+    except (AttributeError, KeyError, ValueError, TypeError) as exc:
+        logger.error("Error parsing %s: %s", page.url, exc)
+    return ""
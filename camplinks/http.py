@@ -7,12 +7,21 @@ the search module) into one place.
 from __future__ import annotations
 
 import logging
+import sqlite3
+import threading
 import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
 
 import requests
-from bs4 import BeautifulSoup
-from ddgs import DDGS
-from ddgs.exceptions import DDGSException, RatelimitException
+
+from camplinks.db import save_search_results
+from camplinks.metrics import METRICS, RESPONSE_HOOKS, count_delay
+
+# BeautifulSoup and the DuckDuckGo client are imported on first use: stages
+# that only probe URLs (validate, archive) never need them
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, SoupStrainer
 
 logger = logging.getLogger(__name__)
 
@@ -26,14 +35,66 @@ HEADERS: dict[str, str] = {
 BASE_URL = "https://en.wikipedia.org"
 DEFAULT_DELAY_S: float = 0.5
 DDG_DELAY_S: float = 3.0
+DDG_URL = "https://duckduckgo.com"
+
+# Serializes DuckDuckGo queries, so pipeline stages searching from different
+# threads share one crawl delay and back off together when rate limited
+_DDG_LOCK = threading.Lock()
+
+
+def parse_html(html: str, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+    """Parse an HTML document, optionally keeping only some elements.
+
+    With *parse_only*, only matching elements (with their descendants) are
+    built; they become children of the document root in document order, so
+    e.g. headings and tables kept from a Wikipedia page end up as siblings.
+    Skipping the rest of the page cuts parse time and memory substantially.
+
+    Args:
+        html: Raw HTML.
+        parse_only: Optional strainer restricting which elements are kept.
+
+    Returns:
+        Parsed BeautifulSoup document.
+    """
+    from bs4 import BeautifulSoup
+
+    with METRICS.timer("camplinks_parse_seconds"):
+        return BeautifulSoup(html, "lxml", parse_only=parse_only)
+
+
+def fetch_html(url: str, delay_s: float = DEFAULT_DELAY_S) -> str:
+    """Fetch *url* and return the raw response text.
+
+    Args:
+        url: Fully-qualified URL to fetch.
+        delay_s: Polite crawl delay in seconds.
+
+    Returns:
+        Response body as text.
+
+    Raises:
+        requests.HTTPError: If the HTTP response is not OK.
+    """
+    count_delay(url, delay_s)
+    time.sleep(delay_s)
+    resp = requests.get(url, headers=HEADERS, timeout=30, hooks=RESPONSE_HOOKS)
+    resp.raise_for_status()
+    return resp.text
 
 
-def fetch_soup(url: str, delay_s: float = DEFAULT_DELAY_S) -> BeautifulSoup:
+def fetch_soup(
+    url: str,
+    delay_s: float = DEFAULT_DELAY_S,
+    parse_only: SoupStrainer | None = None,
+) -> BeautifulSoup:
     """Fetch *url* and return a parsed BeautifulSoup tree.
 
     Args:
         url: Fully-qualified URL to fetch.
         delay_s: Polite crawl delay in seconds.
+        parse_only: Optional strainer for a restricted parse (see
+            :func:`parse_html`).
 
     Returns:
         Parsed BeautifulSoup document.
@@ -41,16 +102,109 @@ def fetch_soup(url: str, delay_s: float = DEFAULT_DELAY_S) -> BeautifulSoup:
     Raises:
         requests.HTTPError: If the HTTP response is not OK.
     """
+    return parse_html(fetch_html(url, delay_s), parse_only)
+
+
+class PageCache:
+    """Fetch each URL at most once, even when asked from several threads.
+
+    Used for index pages during a pipeline run: some are shared by several
+    scrapers (regular and special House elections list the same page) and
+    some are not year-specific (Ballotpedia's largest cities), so a
+    multi-year run would otherwise fetch them repeatedly. Raw HTML is
+    kept, so every caller gets its own parse tree.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._lock = threading.Lock()
+        self._pages: dict[str, Future[str]] = {}
+
+    def fetch_html(self, url: str, delay_s: float = DEFAULT_DELAY_S) -> str:
+        """Return the body of *url*, fetching it on first use.
+
+        Concurrent callers for the same URL wait for the first fetch. A
+        failed fetch is cached too: every caller gets the same error.
+
+        Args:
+            url: Fully-qualified URL to fetch.
+            delay_s: Polite crawl delay in seconds.
+
+        Returns:
+            Response body as text.
+
+        Raises:
+            requests.HTTPError: If the HTTP response is not OK.
+        """
+        with self._lock:
+            future = self._pages.get(url)
+            owner = future is None
+            if future is None:
+                future = self._pages[url] = Future()
+        if owner:
+            try:
+                future.set_result(fetch_html(url, delay_s))
+            # Re-raised below, and to every waiting caller
+            except BaseException as exc:  # noqa: BLE001
+                future.set_exception(exc)
+        return future.result()
+
+    def fetch_soup(
+        self,
+        url: str,
+        delay_s: float = DEFAULT_DELAY_S,
+        parse_only: SoupStrainer | None = None,
+    ) -> BeautifulSoup:
+        """Return a fresh parse of *url*, fetching it on first use.
+
+        Args:
+            url: Fully-qualified URL to fetch.
+            delay_s: Polite crawl delay in seconds.
+            parse_only: Optional strainer for a restricted parse.
+
+        Returns:
+            Parsed BeautifulSoup document.
+
+        Raises:
+            requests.HTTPError: If the HTTP response is not OK.
+        """
+        return parse_html(self.fetch_html(url, delay_s), parse_only)
+
+
+def page_exists(url: str, delay_s: float = DEFAULT_DELAY_S) -> bool:
+    """Check with a HEAD request whether *url* serves a page.
+
+    Redirects are followed, so a slug that redirects to a canonical page
+    counts as existing.
+
+    Args:
+        url: Fully-qualified URL to probe.
+        delay_s: Polite crawl delay in seconds.
+
+    Returns:
+        True if the final response is 200 OK.
+    """
+    count_delay(url, delay_s)
     time.sleep(delay_s)
-    resp = requests.get(url, headers=HEADERS, timeout=30)
-    resp.raise_for_status()
-    return BeautifulSoup(resp.text, "lxml")
+    try:
+        resp = requests.head(
+            url,
+            headers=HEADERS,
+            timeout=30,
+            allow_redirects=True,
+            hooks=RESPONSE_HOOKS,
+        )
+    except requests.RequestException as exc:
+        logger.error("HEAD %s failed: %s", url, exc)
+        return False
+    return resp.status_code == 200
 
 
 def ddg_search(
     query: str,
     max_results: int = 5,
     max_retries: int = 3,
+    conn: sqlite3.Connection | None = None,
 ) -> list[dict[str, str]]:
     """Run a DuckDuckGo text search with backoff on rate limits.
 
@@ -58,32 +212,51 @@ def ddg_search(
         query: The search query string.
         max_results: Maximum results to return.
         max_retries: How many times to retry on rate limit.
+        conn: If given, the raw results are stored (and committed) in its
+            ``search_results`` table so scoring can be replayed offline.
 
     Returns:
         List of result dicts with 'title', 'href', 'body' keys.
     """
+    from ddgs import DDGS
+    from ddgs.exceptions import DDGSException, RatelimitException
+
     backoff = 30.0
-    for attempt in range(max_retries + 1):
-        try:
-            time.sleep(DDG_DELAY_S)
-            with DDGS() as ddgs:
-                return list(ddgs.text(query, max_results=max_results))
-        except (RatelimitException, DDGSException) as exc:
-            is_rate_limit = isinstance(exc, RatelimitException) or ("429" in str(exc))
-            if is_rate_limit and attempt < max_retries:
-                wait = backoff * (2**attempt)
-                logger.info(
-                    "DDG rate limited, waiting %.0fs (attempt %d/%d)",
-                    wait,
-                    attempt + 1,
-                    max_retries,
+    with _DDG_LOCK:
+        for attempt in range(max_retries + 1):
+            try:
+                count_delay(DDG_URL, DDG_DELAY_S)
+                time.sleep(DDG_DELAY_S)
+                with METRICS.timer("camplinks_ddg_seconds"), DDGS() as ddgs:
+                    results = list(ddgs.text(query, max_results=max_results))
+                METRICS.inc("camplinks_ddg_searches_total", outcome="ok")
+                if conn is not None and results:
+                    save_search_results(conn, query, results)
+                    conn.commit()
+                return results
+            except (RatelimitException, DDGSException) as exc:
+                is_rate_limit = isinstance(exc, RatelimitException) or (
+                    "429" in str(exc)
                 )
-                time.sleep(wait)
-            else:
-                logger.error(
-                    "DDG search failed after %d attempts: %s",
-                    attempt + 1,
-                    exc,
+                METRICS.inc(
+                    "camplinks_ddg_searches_total",
+                    outcome="rate_limited" if is_rate_limit else "failed",
                 )
-                return []
+                if is_rate_limit and attempt < max_retries:
+                    wait = backoff * (2**attempt)
+                    logger.info(
+                        "DDG rate limited, waiting %.0fs (attempt %d/%d)",
+                        wait,
+                        attempt + 1,
+                        max_retries,
+                    )
+                    count_delay(DDG_URL, wait)
+                    time.sleep(wait)
+                else:
+                    logger.error(
+                        "DDG search failed after %d attempts: %s",
+                        attempt + 1,
+                        exc,
+                    )
+                    return []
     return []
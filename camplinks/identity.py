@@ -0,0 +1,386 @@
+"""Person identity across candidacies.
+
+The same person appears as separate ``candidates`` rows for a primary, a
+runoff and a general, and again in later cycles. :class:`PersonIndex`
+groups those rows into people so that what was discovered for one
+candidacy (Wikipedia and Ballotpedia URLs, contact links, archive lookups)
+can be copied to the others without any network calls.
+
+Two candidacies are the same person when they share a Wikipedia or
+Ballotpedia page, or when their normalized names (accents, punctuation,
+middle initials, nicknames and suffixes removed) match within the same
+state (see :func:`normalize_name`). Name matches are only merged when the two groups do not point to
+different Wikipedia or Ballotpedia pages, so namesakes who have their own
+pages stay apart.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+import unicodedata
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass, field
+
+from camplinks.archive import normalize_state
+from camplinks.mediawiki import title_from_url
+
+logger = logging.getLogger(__name__)
+
+_SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv", "v", "md", "phd", "esq"})
+_NICKNAME_RE = re.compile(r"[\"“”][^\"“”]*[\"“”]|\([^)]*\)")
+_NON_ALPHA_RE = re.compile(r"[^a-z\s]")
+
+
+def normalize_name(name: str) -> str:
+    """Reduce a candidate name to a comparable form.
+
+    ``"José A. García Jr."``, ``"Jose Garcia"`` and ``"Jose \"Pepe\" Garcia"``
+    all become ``"jose garcia"``. Only middle initials after a spelled-out
+    first name are dropped: ``"J. Smith"`` stays ``"j smith"``, apart from
+    both ``"K. Smith"`` and ``"John Smith"``.
+
+    Args:
+        name: Candidate name as scraped.
+
+    Returns:
+        Lowercased ASCII name without nicknames, middle initials or suffixes.
+    """
+    name = _NICKNAME_RE.sub(" ", name)
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    name = _NON_ALPHA_RE.sub(" ", name.lower().replace("'", "").replace("-", ""))
+    words = [w for i, w in enumerate(name.split()) if i == 0 or w not in _SUFFIXES]
+    if len(words) > 2 and len(words[0]) > 1:
+        words = [words[0], *(w for w in words[1:-1] if len(w) > 1), words[-1]]
+    return " ".join(words)
+
+
+def person_key(name: str, state: str) -> str:
+    """Build the name-based identity key for a candidacy.
+
+    Args:
+        name: Candidate name.
+        state: State field of the election (``"City, State"`` allowed).
+
+    Returns:
+        ``"normalized name|state"``.
+    """
+    return f"{normalize_name(name)}|{normalize_state(state)}"
+
+
+def _wiki_key(url: str | None) -> str:
+    if not url:
+        return ""
+    return (title_from_url(url) or url).lower()
+
+
+def _bp_key(url: str | None) -> str:
+    return (url or "").rstrip("/").lower()
+
+
+@dataclass
+class _Group:
+    members: list[int] = field(default_factory=list)
+    wiki: set[str] = field(default_factory=set)
+    ballotpedia: set[str] = field(default_factory=set)
+
+
+class PersonIndex:
+    """Union-find over candidacies, keyed by candidate_id."""
+
+    def __init__(
+        self,
+        candidacies: Iterable[tuple[int, str, str, str | None, str | None]] = (),
+    ) -> None:
+        """Group candidacies into people.
+
+        Args:
+            candidacies: (candidate_id, name, state, wikipedia_url,
+                ballotpedia_url) tuples.
+        """
+        self._parent: dict[int, int] = {}
+        self._groups: dict[int, _Group] = {}
+        self._by_name: dict[str, int] = {}
+        self._by_wiki: dict[str, int] = {}
+        self._by_bp: dict[str, int] = {}
+        self._last_id = 0
+        self.add(candidacies)
+
+    def add(
+        self,
+        candidacies: Iterable[tuple[int, str, str, str | None, str | None]],
+    ) -> None:
+        """Add candidacies, grouping them with the people already indexed.
+
+        Candidacies already in the index are ignored.
+
+        Args:
+            candidacies: (candidate_id, name, state, wikipedia_url,
+                ballotpedia_url) tuples.
+        """
+        rows = [row for row in candidacies if row[0] not in self._parent]
+
+        for cid, _, _, wiki_url, bp_url in rows:
+            wiki, bp = _wiki_key(wiki_url), _bp_key(bp_url)
+            self._parent[cid] = cid
+            self._last_id = max(self._last_id, cid)
+            self._groups[cid] = _Group(
+                members=[cid],
+                wiki={wiki} if wiki else set(),
+                ballotpedia={bp} if bp else set(),
+            )
+            # Shared pages are strong evidence: always merge
+            if wiki:
+                self._union(self._by_wiki.setdefault(wiki, cid), cid, force=True)
+            if bp:
+                self._union(self._by_bp.setdefault(bp, cid), cid, force=True)
+
+        for cid, name, state, _, _ in rows:
+            if not normalize_name(name):
+                continue
+            other = self._by_name.setdefault(person_key(name, state), cid)
+            self._union(other, cid, force=False)
+
+    def _find(self, cid: int) -> int:
+        root = cid
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[cid] != root:
+            self._parent[cid], cid = root, self._parent[cid]
+        return root
+
+    def _union(self, a: int, b: int, force: bool) -> None:
+        ra, rb = self._find(a), self._find(b)
+        if ra == rb:
+            return
+        ga, gb = self._groups[ra], self._groups[rb]
+        if not force and (
+            (ga.wiki and gb.wiki and ga.wiki != gb.wiki)
+            or (ga.ballotpedia and gb.ballotpedia and ga.ballotpedia != gb.ballotpedia)
+        ):
+            return
+        if len(ga.members) < len(gb.members):
+            ra, rb, ga, gb = rb, ra, gb, ga
+        self._parent[rb] = ra
+        ga.members.extend(gb.members)
+        ga.wiki |= gb.wiki
+        ga.ballotpedia |= gb.ballotpedia
+        del self._groups[rb]
+
+    @classmethod
+    def from_db(cls, conn: sqlite3.Connection) -> PersonIndex:
+        """Build the index over every candidacy in the database.
+
+        Args:
+            conn: Open database connection.
+
+        Returns:
+            The index.
+        """
+        index = cls()
+        index.refresh(conn)
+        return index
+
+    def refresh(self, conn: sqlite3.Connection) -> int:
+        """Add candidacies inserted since the index was built or refreshed.
+
+        Only new candidate IDs are read, so a long-running stage can keep
+        one index up to date cheaply. URLs found since for candidacies
+        already indexed are not re-read.
+
+        Args:
+            conn: Open database connection.
+
+        Returns:
+            Number of candidacies added.
+        """
+        rows = conn.execute(
+            """\
+            SELECT c.candidate_id, c.candidate_name, e.state,
+                   c.wikipedia_url, c.ballotpedia_url
+            FROM candidates c
+            JOIN elections e ON c.election_id = e.election_id
+            WHERE c.candidate_id > ?
+            ORDER BY c.candidate_id
+            """,
+            (self._last_id,),
+        ).fetchall()
+        self.add(tuple(row) for row in rows)
+        return len(rows)
+
+    def __contains__(self, candidate_id: object) -> bool:
+        """Return whether a candidacy is in the index."""
+        return candidate_id in self._parent
+
+    def person_of(self, candidate_id: int) -> int:
+        """Return the person ID (one of its candidate_ids) of a candidacy."""
+        return self._find(candidate_id)
+
+    def candidacies(self, candidate_id: int) -> list[int]:
+        """Return every candidacy of the same person, sorted."""
+        return sorted(self._groups[self._find(candidate_id)].members)
+
+    def people(self) -> list[list[int]]:
+        """Return the candidacies of each person with more than one."""
+        return [sorted(g.members) for g in self._groups.values() if len(g.members) > 1]
+
+
+def _in_clause(ids: list[int]) -> str:
+    return ",".join("?" * len(ids))
+
+
+def propagate_identities(
+    conn: sqlite3.Connection,
+    index: PersonIndex | None = None,
+    candidate_ids: Collection[int] | None = None,
+) -> dict[str, int]:
+    """Copy what is known about a person to all of their candidacies.
+
+    Fills, for every candidacy of a multi-candidacy person:
+
+    * an empty ``wikipedia_url`` / ``ballotpedia_url`` when the person's
+      other candidacies agree on a single value;
+    * each missing ``contact_links`` type from the most recent candidacy
+      that has it (keeping its source);
+    * a missing ``archive_lookups`` row (and its org matches) from the
+      person's most recent lookup.
+
+    Existing values are never overwritten. Changes are committed.
+
+    Args:
+        conn: Open database connection.
+        index: Prebuilt index (built from the database if None).
+        candidate_ids: Only fill the people with a candidacy among these.
+
+    Returns:
+        Counts of filled values by kind.
+    """
+    index = index or PersonIndex.from_db(conn)
+    people = index.people()
+    if candidate_ids is not None:
+        wanted = {index.person_of(cid) for cid in candidate_ids if cid in index}
+        people = [
+            members for members in people if index.person_of(members[0]) in wanted
+        ]
+    counts = {"wikipedia_url": 0, "ballotpedia_url": 0, "contact_link": 0, "archive": 0}
+    if not people:
+        return counts
+
+    ids = [cid for members in people for cid in members]
+    urls: dict[int, tuple[str, str]] = {}
+    links: dict[int, dict[str, tuple[str, str]]] = {}
+    lookups: dict[int, tuple[object, ...]] = {}
+    matches: dict[int, list[str]] = {}
+    # SQLite limits bound parameters per statement; query in slices
+    for start in range(0, len(ids), 500):
+        chunk = ids[start : start + 500]
+        marks = _in_clause(chunk)
+        for cid, wiki, bp in conn.execute(
+            "SELECT candidate_id, wikipedia_url, ballotpedia_url FROM candidates "
+            f"WHERE candidate_id IN ({marks})",
+            chunk,
+        ):
+            urls[cid] = (wiki or "", bp or "")
+        for cid, link_type, url, source in conn.execute(
+            "SELECT candidate_id, link_type, url, source FROM contact_links "
+            f"WHERE candidate_id IN ({marks})",
+            chunk,
+        ):
+            links.setdefault(cid, {})[link_type] = (url, source)
+        for row in conn.execute(
+            "SELECT candidate_id, has_entry, match_count, total_messages, status, "
+            f"checked_at FROM archive_lookups WHERE candidate_id IN ({marks})",
+            chunk,
+        ):
+            lookups[row[0]] = tuple(row[1:])
+        for cid, org_id in conn.execute(
+            "SELECT candidate_id, org_id FROM candidate_archive_matches "
+            f"WHERE candidate_id IN ({marks})",
+            chunk,
+        ):
+            matches.setdefault(cid, []).append(org_id)
+
+    url_updates: dict[str, list[tuple[str, int]]] = {
+        "wikipedia_url": [],
+        "ballotpedia_url": [],
+    }
+    new_links: list[tuple[int, str, str, str]] = []
+    new_lookups: list[tuple[object, ...]] = []
+    new_matches: list[tuple[int, str]] = []
+
+    for members in people:
+        # Most recent candidacy first: higher candidate_id was scraped later
+        newest_first = sorted(members, reverse=True)
+        for pos, column in enumerate(("wikipedia_url", "ballotpedia_url")):
+            values = {urls[cid][pos] for cid in members} - {""}
+            if len(values) == 1:
+                value = values.pop()
+                url_updates[column].extend(
+                    (value, cid) for cid in members if not urls[cid][pos]
+                )
+
+        known: dict[str, tuple[str, str]] = {}
+        for cid in newest_first:
+            for link_type, link in links.get(cid, {}).items():
+                known.setdefault(link_type, link)
+        for cid in members:
+            have = links.get(cid, {})
+            new_links.extend(
+                (cid, link_type, url, source)
+                for link_type, (url, source) in known.items()
+                if link_type not in have
+            )
+
+        donors = [cid for cid in members if cid in lookups]
+        if donors:
+            donor = max(donors, key=lambda cid: str(lookups[cid][-1]))
+            for cid in members:
+                if cid not in lookups:
+                    new_lookups.append((cid, *lookups[donor]))
+                    new_matches.extend((cid, org) for org in matches.get(donor, []))
+
+    for column, updates in url_updates.items():
+        conn.executemany(
+            f"UPDATE candidates SET {column} = ? WHERE candidate_id = ?", updates
+        )
+        counts[column] = len(updates)
+    conn.executemany(
+        """\
+        INSERT INTO contact_links (candidate_id, link_type, url, source)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(candidate_id, link_type) DO NOTHING
+        """,
+        new_links,
+    )
+    conn.executemany(
+        """\
+        INSERT INTO archive_lookups
+            (candidate_id, has_entry, match_count, total_messages, status, checked_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(candidate_id) DO NOTHING
+        """,
+        new_lookups,
+    )
+    conn.executemany(
+        """\
+        INSERT INTO candidate_archive_matches (candidate_id, org_id)
+        VALUES (?, ?)
+        ON CONFLICT(candidate_id, org_id) DO NOTHING
+        """,
+        new_matches,
+    )
+    conn.commit()
+    counts["contact_link"] = len(new_links)
+    counts["archive"] = len(new_lookups)
+
+    logger.info(
+        "Reused data across %d people with multiple candidacies: %d Wikipedia "
+        "URLs, %d Ballotpedia URLs, %d contact links, %d archive lookups.",
+        len(people),
+        counts["wikipedia_url"],
+        counts["ballotpedia_url"],
+        counts["contact_link"],
+        counts["archive"],
+    )
+    return counts
@@ -0,0 +1,332 @@
+"""Perceptual-hash deduplication for image AI detection.
+
+Campaign logos, headshots and graphics are re-posted constantly, across
+tweets and campaign sites, usually re-encoded or resized along the way. The
+detection scripts in ``detection/images/`` use :class:`ImageDedupIndex` to
+classify one representative per near-duplicate cluster and reuse its verdict
+for the rest.
+
+Each image is reduced to a 64-bit difference hash (dHash): the grayscale
+image is shrunk to 9x8 pixels and each bit records whether a pixel is
+brighter than its right-hand neighbour. Re-encoding and rescaling barely
+change the hash, so two images are treated as the same picture when their
+hashes differ in at most ``max_distance`` bits.
+
+Hashes are cached in the ``image_hashes`` table (keyed by path and
+invalidated by mtime/size), and definitive verdicts ("yes"/"no") are stored
+in ``image_verdicts`` keyed by hash, so later runs and other image sources
+reuse them. Error labels are only kept in memory, so they are retried on the
+next run.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 8
+DEFAULT_MAX_DISTANCE = 4
+DEFINITIVE_LABELS = frozenset({"yes", "no"})
+
+SCHEMA_SQL = """\
+CREATE TABLE IF NOT EXISTS image_hashes (
+    path    TEXT PRIMARY KEY,
+    mtime   REAL NOT NULL,
+    size    INTEGER NOT NULL,
+    phash   TEXT
+);
+
+CREATE TABLE IF NOT EXISTS image_verdicts (
+    phash        TEXT PRIMARY KEY,
+    label        TEXT NOT NULL,
+    source_path  TEXT,
+    recorded_at  TEXT NOT NULL
+);
+"""
+
+
+def dhash(path: Path, hash_size: int = HASH_SIZE) -> int:
+    """Compute the difference hash of an image file.
+
+    Args:
+        path: Path to the image (the first frame is used for animations).
+        hash_size: Side length of the hash grid; the hash has hash_size**2 bits.
+
+    Returns:
+        The hash as a non-negative integer.
+
+    Raises:
+        OSError: If the file cannot be read or decoded as an image.
+    """
+    with Image.open(path) as img:
+        small = img.convert("L").resize(
+            (hash_size + 1, hash_size), Image.Resampling.LANCZOS
+        )
+        pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    """Return the number of differing bits between two hashes.
+
+    Args:
+        a: First hash.
+        b: Second hash.
+
+    Returns:
+        Hamming distance.
+    """
+    return (a ^ b).bit_count()
+
+
+@dataclass
+class _Node:
+    phash: int
+    label: str
+    children: dict[int, _Node] = field(default_factory=dict)
+
+
+class BKTree:
+    """Burkhard-Keller tree over hashes for nearest-neighbour lookup.
+
+    Search only descends into children whose edge distance is within
+    ``max_distance`` of the query's distance to the node, so lookups touch a
+    small fraction of the stored hashes.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty tree."""
+        self._root: _Node | None = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of distinct hashes stored."""
+        return self._size
+
+    def add(self, phash: int, label: str) -> None:
+        """Insert a hash, replacing the label if it is already present.
+
+        Args:
+            phash: Image hash.
+            label: Value to associate with the hash.
+        """
+        if self._root is None:
+            self._root = _Node(phash, label)
+            self._size = 1
+            return
+        node = self._root
+        while True:
+            d = hamming(phash, node.phash)
+            if d == 0:
+                node.label = label
+                return
+            child = node.children.get(d)
+            if child is None:
+                node.children[d] = _Node(phash, label)
+                self._size += 1
+                return
+            node = child
+
+    def nearest(self, phash: int, max_distance: int) -> tuple[int, str] | None:
+        """Find the closest stored hash within max_distance.
+
+        Args:
+            phash: Query hash.
+            max_distance: Largest Hamming distance that counts as a match.
+
+        Returns:
+            (distance, label) of the nearest match, or None.
+        """
+        best: tuple[int, str] | None = None
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            d = hamming(phash, node.phash)
+            if d <= max_distance and (best is None or d < best[0]):
+                best = (d, node.label)
+                if d == 0:
+                    break
+            for edge, child in node.children.items():
+                if d - max_distance <= edge <= d + max_distance:
+                    stack.append(child)
+        return best
+
+
+class ImageDedupIndex:
+    """Cached image hashes plus known verdicts, for skipping near-duplicates.
+
+    Typical use in a detection loop::
+
+        index = ImageDedupIndex(conn)
+        label = index.lookup(path)
+        if label is None:
+            label = classify_image(client, path)
+            index.record(path, label)
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+    ) -> None:
+        """Create the tables if needed and load stored verdicts.
+
+        Args:
+            conn: Open SQLite connection.
+            max_distance: Largest Hamming distance treated as the same image.
+        """
+        self.conn = conn
+        self.max_distance = max_distance
+        self.reused = 0
+        conn.executescript(SCHEMA_SQL)
+        conn.commit()
+        self._verdicts = BKTree()
+        for phash, label in conn.execute("SELECT phash, label FROM image_verdicts"):
+            self._verdicts.add(int(phash, 16), label)
+        self._hashes: dict[str, int | None] = {}
+        logger.info("Loaded %d stored image verdicts.", len(self._verdicts))
+
+    def hash_of(self, path: Path) -> int | None:
+        """Return the image's hash, computing and caching it if needed.
+
+        Args:
+            path: Path to the image file.
+
+        Returns:
+            The dHash, or None if the file is missing or not a readable image.
+        """
+        key = str(path)
+        if key in self._hashes:
+            return self._hashes[key]
+        try:
+            stat = path.stat()
+        except OSError:
+            self._hashes[key] = None
+            return None
+
+        row = self.conn.execute(
+            "SELECT mtime, size, phash FROM image_hashes WHERE path = ?", (key,)
+        ).fetchone()
+        if row is not None and row[0] == stat.st_mtime and row[1] == stat.st_size:
+            phash = int(row[2], 16) if row[2] is not None else None
+        else:
+            try:
+                phash = dhash(path)
+            except (OSError, UnidentifiedImageError, ValueError) as exc:
+                logger.warning("Could not hash %s: %s", path, exc)
+                phash = None
+            self.conn.execute(
+                "INSERT OR REPLACE INTO image_hashes (path, mtime, size, phash)"
+                " VALUES (?, ?, ?, ?)",
+                (
+                    key,
+                    stat.st_mtime,
+                    stat.st_size,
+                    f"{phash:016x}" if phash is not None else None,
+                ),
+            )
+        self._hashes[key] = phash
+        return phash
+
+    def peek(self, path: Path) -> str | None:
+        """Return the verdict of a near-duplicate without counting a reuse.
+
+        For filtering images whose label is applied elsewhere.
+
+        Args:
+            path: Path to the image file.
+
+        Returns:
+            The known label, or None if the image must be classified.
+        """
+        phash = self.hash_of(path)
+        if phash is None:
+            return None
+        match = self._verdicts.nearest(phash, self.max_distance)
+        return match[1] if match is not None else None
+
+    def lookup(self, path: Path) -> str | None:
+        """Return the verdict of a near-duplicate of this image, if known.
+
+        Counts a reuse when there is one; call it where the label is applied.
+
+        Args:
+            path: Path to the image file.
+
+        Returns:
+            The reused label, or None if the image must be classified.
+        """
+        label = self.peek(path)
+        if label is not None:
+            self.reused += 1
+        return label
+
+    def record(self, path: Path, label: str) -> None:
+        """Remember the verdict for an image (without committing).
+
+        Definitive labels are persisted so later runs reuse them; error labels
+        are only shared with near-duplicates in the current run.
+
+        Args:
+            path: Path to the classified image.
+            label: Detection label.
+        """
+        phash = self.hash_of(path)
+        if phash is None:
+            return
+        self._verdicts.add(phash, label)
+        if label in DEFINITIVE_LABELS:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO image_verdicts"
+                " (phash, label, source_path, recorded_at) VALUES (?, ?, ?, ?)",
+                (
+                    f"{phash:016x}",
+                    label,
+                    str(path),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+
+    def representatives(self, paths: Iterable[Path]) -> dict[Path, Path]:
+        """Group unresolved images into near-duplicate clusters.
+
+        Clusters are formed greedily: each image joins the nearest
+        representative within ``max_distance``, otherwise it becomes a new
+        representative, so every member is close to the image that is
+        actually classified. Images that cannot be hashed are their own
+        representative.
+
+        Args:
+            paths: Images without a known verdict.
+
+        Returns:
+            Mapping of each distinct path to its cluster representative.
+        """
+        reps = BKTree()
+        rep_paths: dict[str, Path] = {}
+        assignment: dict[Path, Path] = {}
+        for path in paths:
+            if path in assignment:
+                continue
+            phash = self.hash_of(path)
+            if phash is None:
+                assignment[path] = path
+                continue
+            match = reps.nearest(phash, self.max_distance)
+            if match is None:
+                reps.add(phash, str(path))
+                rep_paths[str(path)] = path
+                assignment[path] = path
+            else:
+                assignment[path] = rep_paths[match[1]]
+        return assignment
@@ -0,0 +1,276 @@
+"""Wikipedia access through the MediaWiki Action API.
+
+Rendered ``/wiki/...`` pages cost one request each and say nothing about
+redirects or revisions. The Action API (``/w/api.php``) resolves up to 50
+titles per request, following redirects and reporting each page's current
+revision ID and timestamp, and can return the wikitext of all 50 pages in
+the same response. Parsed HTML is one request per revision (``action=parse``)
+and is only needed when the wikitext is not enough.
+"""
+
+from __future__ import annotations
+
+import html
+import logging
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+import requests
+
+from camplinks.http import BASE_URL, DEFAULT_DELAY_S, HEADERS
+from camplinks.metrics import RESPONSE_HOOKS, count_delay
+
+logger = logging.getLogger(__name__)
+
+API_URL = f"{BASE_URL}/w/api.php"
+MAX_TITLES = 50
+API_TIMEOUT_S: float = 30.0
+
+
+class MediaWikiError(requests.RequestException):
+    """The API answered with an ``error`` object instead of a result."""
+
+
+@dataclass
+class PageRevision:
+    """The current revision of a Wikipedia page.
+
+    Attributes:
+        title: Canonical page title (after normalization and redirects).
+        page_id: MediaWiki page ID.
+        rev_id: Current revision ID.
+        timestamp: Revision timestamp (ISO 8601, UTC).
+        wikitext: Page wikitext, if requested.
+    """
+
+    title: str
+    page_id: int
+    rev_id: int
+    timestamp: str
+    wikitext: str | None = None
+
+    @property
+    def url(self) -> str:
+        """Canonical ``/wiki/`` URL of the page."""
+        return page_url(self.title)
+
+
+def title_from_url(url: str) -> str | None:
+    """Extract the page title from a Wikipedia article URL.
+
+    Handles ``/wiki/Title`` and ``/w/index.php?title=Title`` forms,
+    percent-encoding, underscores and fragments.
+
+    Args:
+        url: Wikipedia URL.
+
+    Returns:
+        Page title with spaces, or None if *url* is not an article URL.
+    """
+    parts = urlsplit(url)
+    if parts.path.startswith("/wiki/"):
+        raw = parts.path[len("/wiki/") :]
+    elif parts.path == "/w/index.php":
+        raw = parse_qs(parts.query).get("title", [""])[0]
+    else:
+        return None
+    title = unquote(raw).replace("_", " ").strip()
+    return title or None
+
+
+def page_url(title: str) -> str:
+    """Build the ``/wiki/`` URL for a page title.
+
+    Args:
+        title: Page title.
+
+    Returns:
+        Fully-qualified Wikipedia URL.
+    """
+    return f"{BASE_URL}/wiki/{quote(title.replace(' ', '_'), safe=':/(),!*')}"
+
+
+def _chunks(items: list[str], size: int) -> Iterator[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class MediaWikiClient:
+    """Throttled client for the MediaWiki Action API."""
+
+    def __init__(
+        self,
+        api_url: str = API_URL,
+        delay_s: float = DEFAULT_DELAY_S,
+        timeout_s: float = API_TIMEOUT_S,
+        session: Any = None,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            api_url: ``api.php`` endpoint.
+            delay_s: Minimum seconds between requests.
+            timeout_s: HTTP request timeout in seconds.
+            session: Object with a ``requests.Session``-compatible ``get``
+                (defaults to a new session; tests pass a local stand-in).
+        """
+        if session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            session.hooks["response"].extend(RESPONSE_HOOKS["response"])
+        self.session = session
+        self.api_url = api_url
+        self.delay_s = delay_s
+        self.timeout_s = timeout_s
+        self.requests_made = 0
+        self._last_call = 0.0
+
+    def _throttle(self) -> None:
+        """Sleep until at least delay_s has elapsed since the last call."""
+        wait = self.delay_s - (time.monotonic() - self._last_call)
+        if wait > 0:
+            count_delay(self.api_url, wait)
+            time.sleep(wait)
+        self._last_call = time.monotonic()
+
+    def _get(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Call the API and return the decoded JSON result.
+
+        Args:
+            params: Action parameters (format parameters are added).
+
+        Returns:
+            Decoded response.
+
+        Raises:
+            MediaWikiError: If the API reports an error.
+            requests.RequestException: On HTTP or network failure.
+        """
+        self._throttle()
+        resp = self.session.get(
+            self.api_url,
+            params={**params, "format": "json", "formatversion": "2"},
+            timeout=self.timeout_s,
+        )
+        self.requests_made += 1
+        resp.raise_for_status()
+        data: dict[str, Any] = resp.json()
+        if "error" in data:
+            error = data["error"]
+            raise MediaWikiError(f"{error.get('code')}: {error.get('info')}")
+        return data
+
+    def resolve(
+        self, titles: Iterable[str], content: bool = False
+    ) -> dict[str, PageRevision]:
+        """Look up the current revision of many pages, 50 titles per request.
+
+        Titles are normalized and redirects followed, so several inputs can
+        map to the same page. Missing and invalid titles are left out.
+
+        Args:
+            titles: Page titles to look up.
+            content: Also fetch each page's wikitext.
+
+        Returns:
+            Mapping of input title -> current revision of the target page.
+
+        Raises:
+            MediaWikiError: If the API reports an error.
+            requests.RequestException: On HTTP or network failure.
+        """
+        unique = list(dict.fromkeys(titles))
+        resolved: dict[str, PageRevision] = {}
+        for chunk in _chunks(unique, MAX_TITLES):
+            resolved.update(self._resolve_chunk(chunk, content))
+        return resolved
+
+    def _resolve_chunk(
+        self, titles: list[str], content: bool
+    ) -> dict[str, PageRevision]:
+        params: dict[str, Any] = {
+            "action": "query",
+            "prop": "revisions",
+            "rvprop": "ids|timestamp|content" if content else "ids|timestamp",
+            "redirects": "1",
+            "titles": "|".join(titles),
+        }
+        if content:
+            params["rvslots"] = "main"
+
+        renames: dict[str, str] = {}
+        pages: dict[int, PageRevision] = {}
+        by_title: dict[str, int] = {}
+        cont: dict[str, Any] = {}
+        while True:
+            data = self._get({**params, **cont})
+            query = data.get("query", {})
+            for entry in query.get("normalized", []) + query.get("redirects", []):
+                renames[entry["from"]] = entry["to"]
+            for page in query.get("pages", []):
+                revisions = page.get("revisions")
+                if page.get("missing") or page.get("invalid") or not revisions:
+                    continue
+                rev = revisions[0]
+                wikitext = None
+                if content:
+                    wikitext = rev.get("slots", {}).get("main", {}).get("content")
+                pages[page["pageid"]] = PageRevision(
+                    title=page["title"],
+                    page_id=page["pageid"],
+                    rev_id=rev["revid"],
+                    timestamp=rev["timestamp"],
+                    wikitext=wikitext,
+                )
+                by_title[page["title"]] = page["pageid"]
+            # Large wikitext responses are split across continuations.
+            if "continue" not in data:
+                break
+            cont = data["continue"]
+
+        resolved: dict[str, PageRevision] = {}
+        for title in titles:
+            target, seen = title, {title}
+            while target in renames and renames[target] not in seen:
+                target = renames[target]
+                seen.add(target)
+            page_id = by_title.get(target)
+            if page_id is not None:
+                resolved[title] = pages[page_id]
+        return resolved
+
+    def parse(self, page: PageRevision) -> str:
+        """Fetch the rendered HTML of a revision.
+
+        The article body is wrapped in a minimal document with a ``<title>``
+        like the one on ``/wiki/`` pages, so it can be handed to the same
+        parsers.
+
+        Args:
+            page: Revision to render.
+
+        Returns:
+            HTML document.
+
+        Raises:
+            MediaWikiError: If the API reports an error.
+            requests.RequestException: On HTTP or network failure.
+        """
+        data = self._get(
+            {
+                "action": "parse",
+                "oldid": page.rev_id,
+                "prop": "text",
+                "disableeditsection": "1",
+                "disablelimitreport": "1",
+            }
+        )
+        body = data["parse"]["text"]
+        title = html.escape(page.title)
+        return (
+            f"<html><head><title>{title} - Wikipedia</title></head>"
+            f"<body>{body}</body></html>"
+        )
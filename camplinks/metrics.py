@@ -0,0 +1,328 @@
+"""Run metrics: counters and histograms of where pipeline time goes.
+
+A process-wide :data:`METRICS` registry collects, per run:
+
+- ``camplinks_http_responses_total{host,status}``, ``..._bytes_total{host}``
+  and ``camplinks_http_response_seconds{host}`` (time to response headers),
+  from a ``requests`` response hook (:data:`RESPONSE_HOOKS`);
+- ``camplinks_delay_seconds_total{host}``: time spent in crawl delays;
+- ``camplinks_ddg_searches_total{outcome}`` and ``camplinks_ddg_seconds``;
+- ``camplinks_parse_seconds``: HTML parsing in this process (pages parsed
+  in a worker pool are not counted);
+- ``camplinks_cache_lookups_total{cache,result}``: search/validate caches;
+- ``camplinks_db_write_seconds{op}``: the database upsert helpers;
+- ``camplinks_stage_seconds{stage}``: each scraper and pipeline stage.
+
+The registry is thread-safe; the pipeline resets it at the start of a run
+and can dump it as JSON or Prometheus text at the end.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, ParamSpec, TypeVar
+
+import orjson
+
+from camplinks.domains import host_of
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+Labels = tuple[tuple[str, str], ...]
+
+# Upper bounds in seconds, from a fast SQLite write to a slow archive lookup
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.025,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    math.inf,
+)
+
+
+@dataclass
+class Histogram:
+    """Distribution of observed values.
+
+    Attributes:
+        counts: Observations per bucket of :data:`DEFAULT_BUCKETS` (not
+            cumulative).
+        count: Number of observations.
+        total: Sum of observations.
+        max: Largest observation.
+    """
+
+    counts: list[int] = field(default_factory=lambda: [0] * len(DEFAULT_BUCKETS))
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add one observation.
+
+        Args:
+            value: The observed value.
+        """
+        for i, bound in enumerate(DEFAULT_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Return (upper bound, observations at or below it) pairs."""
+        pairs: list[tuple[float, int]] = []
+        running = 0
+        for bound, n in zip(DEFAULT_BUCKETS, self.counts, strict=True):
+            running += n
+            pairs.append((bound, running))
+        return pairs
+
+
+def _labels(labels: dict[str, str]) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _bound(bound: float) -> str:
+    return "+Inf" if math.isinf(bound) else repr(bound)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _prom_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = [*labels, extra] if extra is not None else list(labels)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class MetricsRegistry:
+    """Thread-safe collection of labelled counters and histograms."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Add *value* to a counter.
+
+        Args:
+            name: Counter name.
+            value: Amount to add.
+            **labels: Label values.
+        """
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record an observation in a histogram.
+
+        Args:
+            name: Histogram name.
+            value: Observed value (seconds, for timers).
+            **labels: Label values.
+        """
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            series.setdefault(key, Histogram()).observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Observe how long the block takes, even if it raises.
+
+        Args:
+            name: Histogram name.
+            **labels: Label values.
+
+        Yields:
+            None.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+        """Decorate a function to time its calls, labelled with its name.
+
+        Args:
+            name: Histogram name; the function name is the ``op`` label.
+
+        Returns:
+            The decorator.
+        """
+
+        def decorator(func: Callable[P, R]) -> Callable[P, R]:
+            @functools.wraps(func)
+            def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+                with self.timer(name, op=func.__name__):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def counter(self, name: str, **labels: str) -> float:
+        """Return a counter's value (0 if never incremented).
+
+        Args:
+            name: Counter name.
+            **labels: Label values.
+        """
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0.0)
+
+    def histogram(self, name: str, **labels: str) -> Histogram | None:
+        """Return a histogram, or None if nothing was observed.
+
+        Args:
+            name: Histogram name.
+            **labels: Label values.
+        """
+        with self._lock:
+            return self._histograms.get(name, {}).get(_labels(labels))
+
+    def reset(self) -> None:
+        """Drop every series."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_dict(self) -> dict[str, list[dict[str, Any]]]:
+        """Return every series as plain data.
+
+        Returns:
+            ``{"counters": [...], "histograms": [...]}``, each series with
+            its name and labels, sorted.
+        """
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(key), "value": value}
+                for name, series in sorted(self._counters.items())
+                for key, value in sorted(series.items())
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "labels": dict(key),
+                    "count": hist.count,
+                    "sum": hist.total,
+                    "max": hist.max,
+                    "buckets": {_bound(b): n for b, n in hist.cumulative()},
+                }
+                for name, series in sorted(self._histograms.items())
+                for key, hist in sorted(series.items())
+            ]
+        return {"counters": counters, "histograms": histograms}
+
+    def to_json(self) -> bytes:
+        """Serialize the registry as indented JSON."""
+        return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2)
+
+    def to_prometheus(self) -> str:
+        """Serialize the registry in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_prom_labels(key)} {value:g}")
+            for name, hist_series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, hist in sorted(hist_series.items()):
+                    for bound, n in hist.cumulative():
+                        le = _prom_labels(key, ("le", _bound(bound)))
+                        lines.append(f"{name}_bucket{le} {n}")
+                    lines.append(f"{name}_sum{_prom_labels(key)} {hist.total:g}")
+                    lines.append(f"{name}_count{_prom_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write the registry to *path*.
+
+        Args:
+            path: Output file; Prometheus text if it ends in ``.prom``,
+                JSON otherwise.
+        """
+        with open(path, "wb") as f:
+            if path.endswith(".prom"):
+                f.write(self.to_prometheus().encode())
+            else:
+                f.write(self.to_json())
+
+    def log_summary(self) -> None:
+        """Log stage timings and request counts per host."""
+        data = self.to_dict()
+        for hist in data["histograms"]:
+            if hist["name"] == "camplinks_stage_seconds":
+                logger.info("  %s: %.1fs", hist["labels"]["stage"], hist["sum"])
+        per_host: dict[str, float] = {}
+        for counter in data["counters"]:
+            if counter["name"] == "camplinks_http_responses_total":
+                host = counter["labels"]["host"]
+                per_host[host] = per_host.get(host, 0) + counter["value"]
+        for host, n in sorted(per_host.items(), key=lambda item: -item[1]):
+            logger.info("  %s: %d requests", host, n)
+
+
+METRICS = MetricsRegistry()
+
+
+def record_response(resp: Any, *args: object, **kwargs: object) -> None:
+    """``requests`` response hook: count the response, its size and latency.
+
+    Args:
+        resp: The ``requests.Response``.
+        *args: Unused hook arguments.
+        **kwargs: Unused hook arguments.
+    """
+    host = host_of(resp.url)
+    METRICS.inc(
+        "camplinks_http_responses_total", host=host, status=str(resp.status_code)
+    )
+    METRICS.inc("camplinks_http_response_bytes_total", len(resp.content), host=host)
+    METRICS.observe(
+        "camplinks_http_response_seconds", resp.elapsed.total_seconds(), host=host
+    )
+
+
+# Pass as ``hooks=`` to requests calls, or extend a session's hooks with it
+RESPONSE_HOOKS: dict[str, list[Callable[..., Any]]] = {"response": [record_response]}
+
+
+def count_delay(url: str, seconds: float) -> None:
+    """Count *seconds* of crawl delay before a request to *url*.
+
+    Args:
+        url: URL about to be requested.
+        seconds: Length of the delay.
+    """
+    METRICS.inc("camplinks_delay_seconds_total", seconds, host=host_of(url))
@@ -67,7 +67,7 @@ class ContactLink:
         link_type: E.g. "campaign_site", "campaign_facebook".
         url: The link URL.
         source: How this link was discovered ("wikipedia", "ballotpedia",
-            "web_search").
+            "homepage", "web_search").
     """
 
     candidate_id: int
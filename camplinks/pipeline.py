@@ -1,36 +1,55 @@
 """Pipeline orchestrator — chains scrape, enrich, search, validate, archive.
 
 Each stage is idempotent (upsert semantics) so it is safe to re-run
-any stage without duplicating data.
+any stage without duplicating data. Stages run one after another, or,
+in streaming mode, concurrently (see :mod:`camplinks.streaming`).
+
+A run can cover several years: scrapers fetch every year's index pages
+concurrently (pages shared between years, like the Ballotpedia top-100
+list, only once), and the lookup stages run once over all of the years'
+candidates.
+
+Stage modules are imported when their stage runs, so e.g. a validate-only
+run does not load the HTML parser, the search client or the scrapers.
 """
 
 from __future__ import annotations
 
 import logging
 import sqlite3
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
-from camplinks.archive import lookup_archive_entries
 from camplinks.db import init_schema, migrate_schema, open_db
-from camplinks.enrich import enrich_from_wikipedia, enrich_wikipedia_urls
+from camplinks.metrics import METRICS
 from camplinks.models import DB_FILENAME
-from camplinks.scrapers import get_scraper
-from camplinks.search import search_all_candidates
-from camplinks.validate import validate_campaign_sites
+from camplinks.profiling import PROFILER
+from camplinks.runs import RunManifest
+from camplinks.scrapers import get_scraper, scraper_names
 
 logger = logging.getLogger(__name__)
 
 
 def run_pipeline(
-    year: int,
+    year: int | Sequence[int],
     race: str,
     stage: str | None = None,
     db_path: str = DB_FILENAME,
     election_stage: str | None = None,
+    workers: int = 1,
+    incremental: bool = False,
+    replay_search: bool = False,
+    stream: bool = False,
+    resume: bool = False,
+    metrics_path: str | None = None,
+    profile_dir: str | None = None,
+    profile_sample: int = 1,
 ) -> None:
-    """Run the camplinks pipeline for a given race and year.
+    """Run the camplinks pipeline for a given race and year(s).
 
     Args:
-        year: Election year (e.g. 2024).
+        year: Election year (e.g. 2024), or several years to run together.
         race: Race key (e.g. "house", "senate") or "all" for every
             registered scraper.
         stage: Optional stage filter — "scrape", "enrich", "search",
@@ -42,100 +61,284 @@ def run_pipeline(
         election_stage: Optional election stage filter for
             enrich/search/validate. Defaults to "general" for those
             stages if not specified.
+        workers: Processes used to parse scraped pages. With 1, pages are
+            parsed inline in the fetching thread.
+        incremental: Only re-scrape Wikipedia pages that changed since
+            they were last scraped.
+        replay_search: In the search stage, replay campaign site selection
+            against stored search results instead of searching, and only
+            report what would change.
+        stream: Run the selected scrape, enrich, search and validate
+            stages concurrently, passing candidates from one to the next
+            as they are ready (see :mod:`camplinks.streaming`).
+        resume: Continue the latest unfinished run with the same
+            arguments, skipping the scrapers and stages it completed (see
+            :mod:`camplinks.runs`).
+        metrics_path: Write the run's metrics (requests, bytes, delays,
+            parse, database and stage timings) to this file: Prometheus
+            text if it ends in ``.prom``, JSON otherwise. Stage timings and
+            requests per host are logged either way.
+        profile_dir: Profile the run with cProfile and write the profiles
+            and their top-function summaries to this directory (see
+            :mod:`camplinks.profiling`).
+        profile_sample: With *profile_dir*, profile one in this many state
+            pages and candidates of each stage instead of whole stages.
     """
+    years = [year] if isinstance(year, int) else sorted(set(year))
+    if not years:
+        raise ValueError("No election years given")
+
+    METRICS.reset()
+    PROFILER.configure(profile_dir, profile_sample)
     conn = open_db(db_path)
     migrate_schema(conn)
     init_schema(conn)
 
+    # A replay writes nothing, not even its run record
+    manifest = RunManifest()
+    if not replay_search:
+        params: dict[str, object] = {
+            # A one-year run resumes the same whether given as --years or --year
+            "year": years[0] if len(years) == 1 else years,
+            "race": race,
+            "stage": stage,
+            "election_stage": election_stage,
+            "incremental": incremental,
+            "stream": stream,
+        }
+        manifest = RunManifest.start(conn, params, resume=resume)
+
     try:
-        _run(conn, year, race, stage, election_stage)
+        _run(
+            conn,
+            years,
+            race,
+            stage,
+            election_stage,
+            workers,
+            incremental,
+            replay_search,
+            stream,
+            db_path,
+            manifest,
+        )
+    except BaseException:
+        manifest.finish("failed")
+        raise
+    else:
+        manifest.finish("completed")
     finally:
         conn.close()
+        logger.info("Time per stage and requests per host:")
+        METRICS.log_summary()
+        if metrics_path is not None:
+            METRICS.write(metrics_path)
+            logger.info("Wrote run metrics to %s.", metrics_path)
+        PROFILER.finish()
 
 
 def _run(
     conn: sqlite3.Connection,
-    year: int,
+    years: list[int],
     race: str,
     stage: str | None,
     election_stage: str | None,
+    workers: int = 1,
+    incremental: bool = False,
+    replay_search: bool = False,
+    stream: bool = False,
+    db_path: str = DB_FILENAME,
+    manifest: RunManifest | None = None,
 ) -> None:
     """Internal pipeline execution.
 
     Args:
         conn: Open database connection.
-        year: Election year.
+        years: Election years.
         race: Race key or "all".
         stage: Stage filter or None for all.
         election_stage: Election stage filter for downstream stages.
+        workers: Processes used to parse scraped pages.
+        incremental: Only re-scrape changed Wikipedia pages.
+        replay_search: Replay search selection offline instead of searching.
+        stream: Run scrape, enrich, search and validate concurrently.
+        db_path: Path of the database behind *conn* (streaming threads
+            open their own connections).
+        manifest: Checkpoints of the run; completed units are skipped.
     """
-    from camplinks.scrapers import SCRAPER_REGISTRY
+    manifest = manifest or RunManifest()
 
     # Determine which scrapers to run
-    if race == "all":
-        scraper_names = list(SCRAPER_REGISTRY.keys())
-    else:
-        scraper_names = [race]
+    names = scraper_names() if race == "all" else [race]
 
     run_scrape = stage in (None, "scrape")
-    run_enrich = stage in (None, "enrich")
-    run_search = stage in (None, "search")
-    run_validate = stage in (None, "validate")
-    run_archive = stage == "archive"
+    run_enrich = stage in (None, "enrich") and manifest.pending("enrich")
+    run_search = stage in (None, "search") and manifest.pending("search")
+    run_validate = stage in (None, "validate") and manifest.pending("validate")
+    run_archive = stage == "archive" and manifest.pending("archive")
+
+    # For downstream stages, default to "general" unless explicitly overridden
+    downstream_stage = election_stage if election_stage is not None else "general"
+    scrape = partial(_scrape, conn, years, names, workers, incremental, manifest)
+
+    # Streaming: lookups start on the first scraped candidates instead of
+    # waiting for every scraper to finish
+    if stream and not replay_search:
+        from camplinks.streaming import (
+            STREAM_BUSY_TIMEOUT_MS,
+            STREAM_STAGES,
+            CandidateFeed,
+            StreamError,
+            run_streaming,
+        )
+
+        lookup_stages = [name for name in STREAM_STAGES if stage in (None, name)]
+        if lookup_stages:
+            race_type = None
+            if race != "all":
+                race_type = get_scraper(race).race_type
+            # Scraping now shares the database with the lookup threads
+            conn.execute(f"PRAGMA busy_timeout = {STREAM_BUSY_TIMEOUT_MS}")
+            if manifest.pending("stream"):
+                with manifest.unit("stream"):
+                    stats = run_streaming(
+                        db_path,
+                        CandidateFeed(
+                            years, race_type=race_type, election_stage=downstream_stage
+                        ),
+                        lookup_stages,
+                        scrape=scrape if run_scrape else None,
+                    )
+                    # Leave the unit unfinished so --resume retries them
+                    failed = sum(s.errors for s in stats.values())
+                    if failed:
+                        raise StreamError(
+                            f"{failed} streamed batch(es) failed; "
+                            "rerun with --resume to retry them"
+                        )
+            run_scrape = run_enrich = run_search = run_validate = False
 
     # Stage 1: Scrape
     if run_scrape:
-        for name in scraper_names:
-            scraper_cls = get_scraper(name)
-            scraper = scraper_cls()
-            scraper.scrape_all(year, conn)
+        scrape()
 
-    # For downstream stages, default to "general" unless explicitly overridden
-    downstream_stage = election_stage if election_stage is not None else "general"
+    # Before each lookup stage, copy what is already known about a person
+    # to all of their candidacies so only genuinely new people are looked up.
 
     # Stage 2: Enrich (race-agnostic — enriches all candidates with wiki URLs)
     if run_enrich:
-        race_type_filter = None
-        if race != "all":
-            scraper_cls = get_scraper(race)
-            race_type_filter = scraper_cls.race_type
-        enrich_wikipedia_urls(
-            conn, year=year, race_type=race_type_filter, election_stage=downstream_stage
-        )
-        enrich_from_wikipedia(conn, election_stage=downstream_stage)
+        with manifest.unit("enrich"):
+            from camplinks.enrich import enrich_from_wikipedia, enrich_wikipedia_urls
+            from camplinks.identity import propagate_identities
+
+            propagate_identities(conn)
+            race_type_filter = None
+            if race != "all":
+                scraper_cls = get_scraper(race)
+                race_type_filter = scraper_cls.race_type
+            enrich_wikipedia_urls(
+                conn,
+                year=years,
+                race_type=race_type_filter,
+                election_stage=downstream_stage,
+            )
+            enrich_from_wikipedia(conn, election_stage=downstream_stage)
 
     # Stage 3: Search (race-agnostic — searches for all missing contacts)
     if run_search:
-        race_type = None
-        if race != "all":
-            scraper_cls = get_scraper(race)
-            race_type = scraper_cls.race_type
-        search_all_candidates(
-            conn, year=year, race_type=race_type, election_stage=downstream_stage
-        )
+        with manifest.unit("search"):
+            from camplinks.identity import PersonIndex, propagate_identities
+            from camplinks.search import search_all_candidates
+
+            # A replay only reads the database
+            people = None
+            if not replay_search:
+                people = PersonIndex.from_db(conn)
+                propagate_identities(conn, people)
+            race_type = None
+            if race != "all":
+                scraper_cls = get_scraper(race)
+                race_type = scraper_cls.race_type
+            search_all_candidates(
+                conn,
+                year=years,
+                race_type=race_type,
+                election_stage=downstream_stage,
+                replay=replay_search,
+                people=people,
+            )
 
     # Stage 4: Validate (race-agnostic — validates all campaign_site links)
     if run_validate:
-        race_type = None
-        if race != "all":
-            scraper_cls = get_scraper(race)
-            race_type = scraper_cls.race_type
-        validate_campaign_sites(
-            conn, year=year, race_type=race_type, election_stage=downstream_stage
-        )
+        with manifest.unit("validate"):
+            from camplinks.validate import validate_campaign_sites
+
+            race_type = None
+            if race != "all":
+                scraper_cls = get_scraper(race)
+                race_type = scraper_cls.race_type
+            validate_campaign_sites(
+                conn, year=years, race_type=race_type, election_stage=downstream_stage
+            )
 
     # Stage 5 (opt-in only): Archive lookup against politicalemails.org
     if run_archive:
-        race_type = None
-        if race != "all":
-            scraper_cls = get_scraper(race)
-            race_type = scraper_cls.race_type
-        lookup_archive_entries(
-            conn, year=year, race_type=race_type, election_stage=downstream_stage
-        )
+        with manifest.unit("archive"):
+            from camplinks.archive import lookup_archive_entries
+            from camplinks.identity import propagate_identities
+
+            propagate_identities(conn)
+            race_type = None
+            if race != "all":
+                scraper_cls = get_scraper(race)
+                race_type = scraper_cls.race_type
+            lookup_archive_entries(
+                conn, year=years, race_type=race_type, election_stage=downstream_stage
+            )
 
     # Summary
-    _print_summary(conn, year)
+    for year in years:
+        _print_summary(conn, year)
+
+
+def _scrape(
+    conn: sqlite3.Connection,
+    years: list[int],
+    scraper_names: list[str],
+    workers: int,
+    incremental: bool,
+    manifest: RunManifest,
+) -> None:
+    """Run the scrapers in order, skipping those the run already completed.
+
+    Pages are fetched sequentially (crawl delay) and parsed in a process
+    pool shared by every scraper, so parsing keeps all cores busy. Index
+    pages are fetched through a cache shared by every scraper, so a page
+    used by several scrapers or years is fetched once.
+
+    Args:
+        conn: Open database connection.
+        years: Election years.
+        scraper_names: Registered scraper keys.
+        workers: Processes used to parse scraped pages.
+        incremental: Only re-scrape changed Wikipedia pages.
+        manifest: Checkpoints of the run (one unit per scraper).
+    """
+    from camplinks.http import PageCache
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    cache = PageCache()
+    try:
+        for name in scraper_names:
+            unit = f"scrape:{name}"
+            if not manifest.pending(unit):
+                continue
+            with manifest.unit(unit):
+                scraper = get_scraper(name)()
+                scraper.scrape_years(years, conn, executor, incremental, cache)
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
 
 def _print_summary(conn: sqlite3.Connection, year: int) -> None:
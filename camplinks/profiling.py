@@ -0,0 +1,248 @@
+"""Profiling hooks: cProfile traces of pipeline stages and sampled units.
+
+Off unless configured (``python -m camplinks --profile DIR``). The
+process-wide :data:`PROFILER` then works in one of two modes:
+
+- whole stages (``sample=1``): each scraper (``scrape:house``) and lookup
+  stage (``search``, ...) of the run is profiled from start to end and
+  written to ``DIR/<stage>.prof``;
+- sampled units (``sample=N``): stages are not profiled as a whole;
+  instead one in *N* units of work of each kind -- state pages scraped,
+  candidates looked up -- is profiled, and the samples are merged into
+  ``DIR/<kind>.units.prof`` at the end of the run. This keeps the
+  overhead of a real run low while still covering the parsing, matching
+  and database code each unit goes through.
+
+Each ``.prof`` file (for :mod:`pstats`, snakeviz and the like) gets a
+``.txt`` summary of its top functions by own and cumulative time, and the
+hottest functions are logged.
+
+cProfile only sees the thread that enabled it. In ``--stream`` mode the
+``stream`` stage profile covers the scrapers in the main thread, while
+the lookup stages, in their own threads, are profiled unit by unit.
+Pages parsed in a worker pool (``--workers`` > 1) are not profiled.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import pstats
+import re
+import threading
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from pstats import SortKey
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROFILE_TOP = 30  # functions listed per sort order in each .txt summary
+LOG_TOP = 3  # hottest functions logged per profile
+
+
+def _file_stem(name: str) -> str:
+    """Turn a stage or unit name (``scrape:house``) into a file name."""
+    return re.sub(r"[^\w.-]+", "-", name)
+
+
+def _hottest(stats: pstats.Stats, n: int) -> str:
+    """Describe the *n* functions with the most own time."""
+    functions = sorted(
+        stats.get_stats_profile().func_profiles.items(),
+        key=lambda item: -item[1].tottime,
+    )[:n]
+    return ", ".join(
+        f"{name} ({Path(func.file_name).name}:{func.line_number}) {func.tottime:.2f}s"
+        for name, func in functions
+    )
+
+
+class Profiler:
+    """Thread-safe cProfile wrapper for stages and sampled units of work.
+
+    Attributes:
+        out_dir: Directory profiles are written to, or None when off.
+        sample: Profile one in this many units of each kind; with 1, whole
+            stages are profiled instead.
+        top: Functions listed per sort order in each summary.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a profiler that is off."""
+        self.out_dir: Path | None = None
+        self.sample = 1
+        self.top = PROFILE_TOP
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._seen: Counter[str] = Counter()
+        self._profiled: Counter[str] = Counter()
+        self._units: dict[str, pstats.Stats] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether profiles are being collected."""
+        return self.out_dir is not None
+
+    def configure(
+        self,
+        out_dir: str | Path | None,
+        sample: int = 1,
+        top: int = PROFILE_TOP,
+    ) -> None:
+        """Turn profiling on (or off, with no *out_dir*) and drop old samples.
+
+        Args:
+            out_dir: Directory to write profiles to (created if needed).
+            sample: Profile one in this many units of each kind; with 1,
+                profile whole stages.
+            top: Functions listed per sort order in each summary.
+
+        Raises:
+            ValueError: If *sample* is less than 1.
+        """
+        if sample < 1:
+            raise ValueError(f"Profile sample must be at least 1, got {sample}")
+        self.out_dir = Path(out_dir) if out_dir is not None else None
+        if self.out_dir is not None:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.sample = sample
+        self.top = top
+        with self._lock:
+            self._seen.clear()
+            self._profiled.clear()
+            self._units.clear()
+
+    def _start(self) -> cProfile.Profile | None:
+        """Start profiling this thread, unless it already is."""
+        if getattr(self._local, "active", False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one cProfile at a time per process
+            logger.debug("Another profiler is running; not profiling this unit.")
+            return None
+        self._local.active = True
+        return profile
+
+    def _stop(self, profile: cProfile.Profile) -> None:
+        profile.disable()
+        self._local.active = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile a whole stage (only when not sampling units).
+
+        The profile is written when the block ends, even if it raises.
+
+        Args:
+            name: Stage name, e.g. ``"scrape:house"`` or ``"search"``.
+
+        Yields:
+            None.
+        """
+        profile = self._start() if self.enabled and self.sample == 1 else None
+        try:
+            yield
+        finally:
+            if profile is not None:
+                self._stop(profile)
+                self._save(_file_stem(name), pstats.Stats(profile), name)
+
+    @contextmanager
+    def unit(self, kind: str) -> Iterator[None]:
+        """Profile one unit of work if it is sampled.
+
+        Units on a thread already being profiled (inside a profiled stage)
+        are left to that profile.
+
+        Args:
+            kind: Kind of unit, e.g. ``"scrape"`` for a state page or
+                ``"search"`` for a candidate.
+
+        Yields:
+            None.
+        """
+        profile = None
+        if self.enabled:
+            with self._lock:
+                n = self._seen[kind]
+                self._seen[kind] += 1
+            if n % self.sample == 0:
+                profile = self._start()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                self._stop(profile)
+                with self._lock:
+                    self._profiled[kind] += 1
+                    if kind in self._units:
+                        self._units[kind].add(profile)
+                    else:
+                        self._units[kind] = pstats.Stats(profile)
+
+    def units(self, items: Iterable[T], kind: str) -> Iterator[T]:
+        """Yield *items*, profiling the loop body of the sampled ones.
+
+        ``for row in PROFILER.units(rows, "search"):`` profiles what the
+        loop does with each sampled row, as :meth:`unit` would.
+
+        Args:
+            items: Units of work.
+            kind: Kind of unit (see :meth:`unit`).
+
+        Yields:
+            Each item.
+        """
+        if not self.enabled:
+            yield from items
+            return
+        for item in items:
+            with self.unit(kind):
+                yield item
+
+    def finish(self) -> None:
+        """Write the merged unit profiles and turn profiling off."""
+        if self.out_dir is None:
+            return
+        with self._lock:
+            units = sorted(self._units.items())
+            self._units = {}
+        for kind, stats in units:
+            label = f"{self._profiled[kind]} of {self._seen[kind]} {kind} units"
+            self._save(f"{_file_stem(kind)}.units", stats, label)
+        logger.info("Wrote profiles to %s.", self.out_dir)
+        self.out_dir = None
+
+    def _save(self, stem: str, stats: pstats.Stats, label: str) -> None:
+        """Write a profile and its summary, and log its hottest functions.
+
+        Args:
+            stem: File name without extension.
+            stats: The profile.
+            label: What was profiled, for the log.
+        """
+        if self.out_dir is None:
+            return
+        path = self.out_dir / f"{stem}.prof"
+        stats.dump_stats(path)
+        with open(path.with_suffix(".txt"), "w") as out:
+            summary = pstats.Stats(str(path), stream=out)
+            summary.sort_stats(SortKey.TIME).print_stats(self.top)
+            summary.sort_stats(SortKey.CUMULATIVE).print_stats(self.top)
+        logger.info(
+            "Profiled %s (%.2fs): %s",
+            label,
+            stats.get_stats_profile().total_tt,
+            _hottest(stats, LOG_TOP),
+        )
+
+
+PROFILER = Profiler()
@@ -0,0 +1,144 @@
+"""Pipeline run manifest: checkpoints for resuming interrupted runs.
+
+Every pipeline run is recorded in the ``pipeline_runs`` table with its
+parameters, and each unit of work -- one scraper (``"scrape:house"``), one
+lookup stage (``"enrich"``, ``"search"``, ...) or a streaming run of the
+lookup stages (``"stream"``) -- in ``pipeline_run_units`` with its start,
+completion and duration. Rerunning with ``--resume`` picks up the latest
+unfinished run with the same parameters and skips the units it completed,
+so a crash in the search stage does not mean scraping everything again.
+
+Units are only as fine-grained as the stages: a unit interrupted halfway
+is rerun from its start, which the stages' upsert semantics make safe.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import orjson
+
+from camplinks.db import (
+    find_unfinished_run,
+    finish_run_unit,
+    get_finished_units,
+    set_pipeline_run_status,
+    start_pipeline_run,
+    start_run_unit,
+)
+from camplinks.metrics import METRICS
+from camplinks.profiling import PROFILER
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RunManifest:
+    """Checkpoints of one pipeline run.
+
+    A manifest without a connection records nothing and runs every unit
+    (used for read-only runs).
+
+    Attributes:
+        conn: Database the run is recorded in, or None.
+        run_id: The run's ID in ``pipeline_runs``.
+        done: Units already completed (by this run or the one it resumes).
+    """
+
+    conn: sqlite3.Connection | None = None
+    run_id: int | None = None
+    done: set[str] = field(default_factory=set)
+
+    @classmethod
+    def start(
+        cls,
+        conn: sqlite3.Connection,
+        params: dict[str, object],
+        resume: bool = False,
+    ) -> RunManifest:
+        """Record a new run, or resume the last unfinished one.
+
+        Args:
+            conn: Open database connection.
+            params: Arguments that define the run's work; only a run with
+                identical parameters is resumed.
+            resume: Continue the latest unfinished run with *params*, if
+                there is one.
+
+        Returns:
+            The run's manifest.
+        """
+        key = orjson.dumps(params, option=orjson.OPT_SORT_KEYS).decode()
+        run_id = find_unfinished_run(conn, key) if resume else None
+        done: set[str] = set()
+        if run_id is not None:
+            set_pipeline_run_status(conn, run_id, "running")
+            done = get_finished_units(conn, run_id)
+            logger.info(
+                "Resuming run %d; already completed: %s.",
+                run_id,
+                ", ".join(sorted(done)) or "nothing",
+            )
+        else:
+            if resume:
+                logger.info("No unfinished run with these arguments to resume.")
+            run_id = start_pipeline_run(conn, key)
+        conn.commit()
+        return cls(conn, run_id, done)
+
+    def pending(self, unit: str) -> bool:
+        """Return whether *unit* still has to run, logging a skip if not.
+
+        Args:
+            unit: Unit name, e.g. ``"scrape:house"`` or ``"search"``.
+
+        Returns:
+            False if the unit was already completed.
+        """
+        if unit in self.done:
+            logger.info("Skipping %s (completed by run %s).", unit, self.run_id)
+            return False
+        return True
+
+    @contextmanager
+    def unit(self, unit: str) -> Iterator[None]:
+        """Record the start and, if the block succeeds, completion of a unit.
+
+        The unit's duration is also observed in the
+        ``camplinks_stage_seconds`` metric (see :mod:`camplinks.metrics`),
+        and the unit is profiled if profiling is on (see
+        :mod:`camplinks.profiling`).
+
+        Args:
+            unit: Unit name.
+
+        Yields:
+            None.
+        """
+        if self.conn is not None and self.run_id is not None:
+            start_run_unit(self.conn, self.run_id, unit)
+            self.conn.commit()
+        start = time.perf_counter()
+        with METRICS.timer("camplinks_stage_seconds", stage=unit), PROFILER.stage(unit):
+            yield
+        if self.conn is not None and self.run_id is not None:
+            elapsed = time.perf_counter() - start
+            finish_run_unit(self.conn, self.run_id, unit, elapsed)
+            self.conn.commit()
+            self.done.add(unit)
+
+    def finish(self, status: str) -> None:
+        """Record how the run ended.
+
+        Args:
+            status: "completed" or "failed".
+        """
+        if self.conn is None or self.run_id is None:
+            return
+        set_pipeline_run_status(self.conn, self.run_id, status)
+        self.conn.commit()
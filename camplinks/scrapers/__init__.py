@@ -1,12 +1,33 @@
-"""Race-specific Wikipedia scrapers."""
+"""Race-specific Wikipedia scrapers.
+
+Scrapers are registered lazily: :data:`SCRAPER_MODULES` maps each race
+key to the module defining its scraper, and that module (with its parsing
+dependencies) is only imported when the scraper is first asked for.
+Modules register their class on import with :func:`register_scraper`.
+"""
 
 from __future__ import annotations
 
+import importlib
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from camplinks.scrapers.base import BaseScraper
 
+SCRAPER_MODULES: dict[str, str] = {
+    "attorney_general": "camplinks.scrapers.attorney_general",
+    "bp_governor": "camplinks.scrapers.ballotpedia_governor",
+    "bp_municipal": "camplinks.scrapers.ballotpedia_municipal",
+    "governor": "camplinks.scrapers.governor",
+    "house": "camplinks.scrapers.house",
+    "judicial": "camplinks.scrapers.judicial",
+    "municipal": "camplinks.scrapers.municipal",
+    "senate": "camplinks.scrapers.senate",
+    "special_house": "camplinks.scrapers.special_house",
+    "state_leg_special": "camplinks.scrapers.state_leg_special",
+    "state_leg": "camplinks.scrapers.state_legislative",
+}
+
 SCRAPER_REGISTRY: dict[str, type[BaseScraper]] = {}
 
 
@@ -20,8 +41,20 @@ def register_scraper(name: str, cls: type[BaseScraper]) -> None:
     SCRAPER_REGISTRY[name] = cls
 
 
+def scraper_names() -> list[str]:
+    """List every known race key without importing any scraper.
+
+    Returns:
+        Keys of :data:`SCRAPER_MODULES`, then any scrapers registered
+        from elsewhere.
+    """
+    return list(SCRAPER_MODULES) + [
+        name for name in SCRAPER_REGISTRY if name not in SCRAPER_MODULES
+    ]
+
+
 def get_scraper(name: str) -> type[BaseScraper]:
-    """Retrieve a registered scraper class by name.
+    """Retrieve a scraper class by name, importing its module on first use.
 
     Args:
         name: Lookup key.
@@ -32,4 +65,6 @@ def get_scraper(name: str) -> type[BaseScraper]:
     Raises:
         KeyError: If the name is not registered.
     """
+    if name not in SCRAPER_REGISTRY and name in SCRAPER_MODULES:
+        importlib.import_module(SCRAPER_MODULES[name])
     return SCRAPER_REGISTRY[name]
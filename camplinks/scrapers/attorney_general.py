@@ -8,18 +8,16 @@ from __future__ import annotations
 
 import logging
 import re
-import sqlite3
 
 import requests
 from bs4 import BeautifulSoup
-from tqdm import tqdm
 
-from camplinks.db import upsert_candidate, upsert_election
-from camplinks.http import BASE_URL, fetch_soup
+from camplinks.http import BASE_URL, PageCache
 from camplinks.models import Candidate, Election
 from camplinks.scrapers import register_scraper
 from camplinks.scrapers.base import BaseScraper
 from camplinks.wiki_parsing import (
+    HeadingIndex,
     candidates_from_parsed,
     classify_election_table,
     extract_primary_party,
@@ -83,25 +81,26 @@ class AttorneyGeneralScraper(BaseScraper):
 
         return results
 
-    def scrape_all(self, year: int, conn: sqlite3.Connection) -> int:
-        """Orchestrate AG scrape with fallback for missing index page.
+    def find_pages(self, year: int, cache: PageCache) -> list[tuple[str, str]]:
+        """Find AG election pages, with a fallback for a missing index page.
 
-        The AG index page does not exist for all years. When the index
-        returns 404, falls back to searching the gubernatorial elections
-        page for AG election links.
+        The AG index page does not exist for all years. When it cannot be
+        fetched, falls back to searching the gubernatorial elections page
+        (the governor scraper's index, so usually already cached) for AG
+        election links.
 
         Args:
-            year: Election year to scrape.
-            conn: Open database connection.
+            year: Election year.
+            cache: Index pages fetched during this run.
 
         Returns:
-            Total number of elections inserted/updated.
+            (state, url) pairs; empty if neither page could be fetched.
         """
         logger.info("Fetching %s %d index page...", self.race_type, year)
         index_url = self.build_index_url(year)
 
         try:
-            index_soup = fetch_soup(index_url)
+            index_soup = cache.fetch_soup(index_url)
         except requests.RequestException:
             logger.warning(
                 "AG index page not found for %d, trying gubernatorial page.",
@@ -111,42 +110,12 @@ class AttorneyGeneralScraper(BaseScraper):
                 f"{BASE_URL}/wiki/{year}_United_States_gubernatorial_elections"
             )
             try:
-                index_soup = fetch_soup(fallback_url)
+                index_soup = cache.fetch_soup(fallback_url)
             except requests.RequestException:
                 logger.error("Fallback page also not found for %d.", year)
-                return 0
+                return []
 
-        state_urls = self.collect_state_urls(index_soup, year)
-        logger.info("Found %d AG state pages to scrape.", len(state_urls))
-
-        total_elections = 0
-        for state, url in tqdm(
-            state_urls,
-            desc=f"Scraping {self.race_type} {year}",
-            unit="state",
-        ):
-            try:
-                soup = fetch_soup(url)
-                results = self.parse_state_page(state, soup, year)
-                for election, candidates in results:
-                    election.wikipedia_url = url
-                    eid = upsert_election(conn, election)
-                    for cand in candidates:
-                        upsert_candidate(conn, cand, eid)
-                    total_elections += 1
-                conn.commit()
-            except requests.RequestException as exc:
-                logger.error("Failed to fetch %s: %s", state, exc)
-            except (AttributeError, KeyError, ValueError, TypeError) as exc:
-                logger.error("Error parsing %s: %s", state, exc)
-
-        logger.info(
-            "Scraped %d %s elections for %d.",
-            total_elections,
-            self.race_type,
-            year,
-        )
-        return total_elections
+        return self.collect_state_urls(index_soup, year)
 
     def parse_state_page(
         self,
@@ -167,6 +136,7 @@ class AttorneyGeneralScraper(BaseScraper):
         Returns:
             List of (Election, candidates) tuples for each stage found.
         """
+        index = HeadingIndex(soup)
         tables = soup.find_all(
             "table",
             class_=lambda c: c and "wikitable" in c and "plainrowheaders" in c,
@@ -174,11 +144,13 @@ class AttorneyGeneralScraper(BaseScraper):
 
         results: list[tuple[Election, list[Candidate]]] = []
         for table in tables:
-            stage = classify_election_table(table)
+            stage = classify_election_table(table, index)
             if stage is None:
                 continue
 
-            primary_party = extract_primary_party(table) if stage != "general" else ""
+            primary_party = (
+                extract_primary_party(table, index) if stage != "general" else ""
+            )
 
             parsed: list[dict[str, str | float | bool | None]] = []
             for row in table.find_all("tr", class_="vcard"):
@@ -11,24 +11,24 @@ from __future__ import annotations
 import logging
 import re
 import sqlite3
+from concurrent.futures import Executor
 
 import requests
 from bs4 import BeautifulSoup, Tag
-from tqdm import tqdm
 
-from camplinks.db import upsert_candidate, upsert_election
-from camplinks.http import fetch_soup
+from camplinks.http import PageCache
 from camplinks.models import Candidate, Election
 from camplinks.scrapers import register_scraper
 from camplinks.scrapers.ballotpedia_parsing import (
     BALLOTPEDIA_BASE,
     BALLOTPEDIA_DELAY_S,
+    VOTEBOX_STRAINER,
+    candidates_from_votebox,
     detect_election_stage,
     parse_rcv_votebox,
     parse_votebox,
 )
 from camplinks.scrapers.base import BaseScraper
-from camplinks.wiki_parsing import candidates_from_parsed
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +54,7 @@ class BallotpediaGovernorScraper(BaseScraper):
     """Scraper for US gubernatorial elections from Ballotpedia."""
 
     race_type = "Governor"
+    parse_only = VOTEBOX_STRAINER
 
     def build_index_url(self, year: int) -> str:
         """Build Ballotpedia index URL for gubernatorial elections.
@@ -150,7 +151,7 @@ class BallotpediaGovernorScraper(BaseScraper):
             else:
                 parsed = parse_votebox(vbox)
 
-            candidates = candidates_from_parsed(parsed)
+            candidates = candidates_from_votebox(parsed)
             if candidates:
                 election = Election(
                     state=state,
@@ -163,71 +164,65 @@ class BallotpediaGovernorScraper(BaseScraper):
 
         return results
 
-    def scrape_all(self, year: int, conn: sqlite3.Connection) -> int:
-        """Scrape gubernatorial elections from Ballotpedia.
-
-        Overrides ``BaseScraper.scrape_all()`` for Ballotpedia-specific
-        delay, 404 handling (not every state has a governor race every
-        cycle), and index page parsing.
+    def find_pages(self, year: int, cache: PageCache) -> list[tuple[str, str]]:
+        """Find state election pages, falling back to the full state list.
 
         Args:
-            year: Election year to scrape.
-            conn: Open database connection.
+            year: Election year.
+            cache: Index pages fetched during this run.
 
         Returns:
-            Total number of elections inserted/updated.
+            (state, url) pairs.
         """
         index_url = self.build_index_url(year)
         logger.info("Fetching gubernatorial elections index from Ballotpedia...")
         try:
-            index_soup = fetch_soup(index_url, delay_s=BALLOTPEDIA_DELAY_S)
-            state_urls = self.collect_state_urls(index_soup, year)
+            index_soup = cache.fetch_soup(index_url, delay_s=BALLOTPEDIA_DELAY_S)
+            return self.collect_state_urls(index_soup, year)
         except requests.RequestException as exc:
             logger.error("Failed to fetch index page: %s", exc)
             logger.info("Using fallback state list.")
-            state_urls = self._build_urls_from_fallback(year)
+            return self._build_urls_from_fallback(year)
 
-        logger.info(
-            "Checking %d states for %d gubernatorial elections...",
-            len(state_urls),
-            year,
-        )
+    def scrape_year(
+        self,
+        pages: list[tuple[str, str]],
+        year: int,
+        conn: sqlite3.Connection,
+        executor: Executor | None = None,
+        incremental: bool = False,
+    ) -> int:
+        """Scrape gubernatorial elections from Ballotpedia.
 
-        total_elections = 0
-        for state, url in tqdm(
-            state_urls,
-            desc=f"Scraping Governor (Ballotpedia) {year}",
-            unit="state",
-        ):
-            try:
-                soup = fetch_soup(url, delay_s=BALLOTPEDIA_DELAY_S)
-            except requests.HTTPError as exc:
-                if exc.response is not None and exc.response.status_code == 404:
-                    continue
-                logger.error("Failed to fetch %s: %s", state, exc)
-                continue
-            except requests.RequestException as exc:
-                logger.error("Failed to fetch %s: %s", state, exc)
-                continue
+        Overrides ``BaseScraper.scrape_year()`` for Ballotpedia-specific
+        delay and 404 handling (not every state has a governor race every
+        cycle).
 
-            try:
-                page_results = self.parse_state_page(state, soup, year)
-                for election, candidates in page_results:
-                    election.wikipedia_url = url
-                    eid = upsert_election(conn, election)
-                    for cand in candidates:
-                        upsert_candidate(conn, cand, eid)
-                    total_elections += 1
-                conn.commit()
-            except (AttributeError, KeyError, ValueError, TypeError) as exc:
-                logger.error("Error parsing %s: %s", state, exc)
+        Args:
+            pages: (state, url) pairs from :meth:`find_pages`.
+            year: Election year to scrape.
+            conn: Open database connection.
+            executor: Optional process pool that state pages are parsed in.
+            incremental: Ignored; Ballotpedia has no revision API, so every
+                page is re-scraped.
 
+        Returns:
+            Number of elections inserted/updated.
+        """
         logger.info(
-            "Scraped %d gubernatorial elections for %d from Ballotpedia.",
-            total_elections,
+            "Checking %d states for %d gubernatorial elections...",
+            len(pages),
             year,
         )
-        return total_elections
+        return self.scrape_pages(
+            pages,
+            year,
+            conn,
+            executor,
+            delay_s=BALLOTPEDIA_DELAY_S,
+            missing_ok=True,
+            desc=f"Scraping Governor (Ballotpedia) {year}",
+        )
 
     @staticmethod
     def _build_election_url(state: str, year: int) -> str:
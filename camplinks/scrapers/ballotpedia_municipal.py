@@ -11,24 +11,24 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+from concurrent.futures import Executor
 
 import requests
 from bs4 import BeautifulSoup, Tag
-from tqdm import tqdm
 
-from camplinks.db import upsert_candidate, upsert_election
-from camplinks.http import fetch_soup
+from camplinks.http import PageCache
 from camplinks.models import Candidate, Election
 from camplinks.scrapers import register_scraper
 from camplinks.scrapers.ballotpedia_parsing import (
     BALLOTPEDIA_BASE,
     BALLOTPEDIA_DELAY_S,
+    VOTEBOX_STRAINER,
+    candidates_from_votebox,
     detect_election_stage,
     parse_rcv_votebox,
     parse_votebox,
 )
 from camplinks.scrapers.base import BaseScraper
-from camplinks.wiki_parsing import candidates_from_parsed
 
 logger = logging.getLogger(__name__)
 
@@ -94,6 +94,7 @@ class BallotpediaMunicipalScraper(BaseScraper):
     """Scraper for US mayoral elections from Ballotpedia (top 100 cities)."""
 
     race_type = "Mayor"
+    parse_only = VOTEBOX_STRAINER
 
     def build_index_url(self, year: int) -> str:
         """Return the Ballotpedia top-100 cities page URL.
@@ -213,7 +214,7 @@ class BallotpediaMunicipalScraper(BaseScraper):
             else:
                 parsed = parse_votebox(vbox)
 
-            candidates = candidates_from_parsed(parsed)
+            candidates = candidates_from_votebox(parsed)
             if candidates:
                 election = Election(
                     state=state,
@@ -226,71 +227,68 @@ class BallotpediaMunicipalScraper(BaseScraper):
 
         return results
 
-    def scrape_all(self, year: int, conn: sqlite3.Connection) -> int:
-        """Scrape mayoral elections from Ballotpedia for top 100 cities.
+    def find_pages(self, year: int, cache: PageCache) -> list[tuple[str, str]]:
+        """Build the year's election page URLs for the top 100 cities.
 
-        Overrides ``BaseScraper.scrape_all()`` because the index page
-        is not year-specific, 404 responses are expected (not every
-        city has an election every year), and Ballotpedia requires
-        a longer crawl delay.
+        The city list is not year-specific, so a multi-year run fetches it
+        once (through *cache*) and builds every year's URLs from it.
 
         Args:
-            year: Election year to scrape.
-            conn: Open database connection.
+            year: Election year.
+            cache: Index pages fetched during this run.
 
         Returns:
-            Total number of elections inserted/updated.
+            (``"City, State"``, url) pairs.
         """
         logger.info("Fetching top-100 cities list from Ballotpedia...")
         try:
-            index_soup = fetch_soup(TOP_100_URL, delay_s=BALLOTPEDIA_DELAY_S)
-            city_urls = self.collect_state_urls(index_soup, year)
+            index_soup = cache.fetch_soup(TOP_100_URL, delay_s=BALLOTPEDIA_DELAY_S)
+            return self.collect_state_urls(index_soup, year)
         except requests.RequestException as exc:
             logger.error("Failed to fetch top-100 page: %s", exc)
             logger.info("Using fallback city list.")
-            city_urls = self._build_urls_from_fallback(year)
+            return self._build_urls_from_fallback(year)
+
+    def scrape_year(
+        self,
+        pages: list[tuple[str, str]],
+        year: int,
+        conn: sqlite3.Connection,
+        executor: Executor | None = None,
+        incremental: bool = False,
+    ) -> int:
+        """Scrape mayoral elections from Ballotpedia for top 100 cities.
+
+        Overrides ``BaseScraper.scrape_year()`` because 404 responses are
+        expected (not every city has an election every year) and
+        Ballotpedia requires a longer crawl delay.
+
+        Args:
+            pages: (city_state, url) pairs from :meth:`find_pages`.
+            year: Election year to scrape.
+            conn: Open database connection.
+            executor: Optional process pool that state pages are parsed in.
+            incremental: Ignored; Ballotpedia has no revision API, so every
+                page is re-scraped.
 
+        Returns:
+            Number of elections inserted/updated.
+        """
         logger.info(
             "Checking %d cities for %d mayoral elections...",
-            len(city_urls),
+            len(pages),
             year,
         )
-
-        total_elections = 0
-        for city_state, url in tqdm(
-            city_urls,
+        return self.scrape_pages(
+            pages,
+            year,
+            conn,
+            executor,
+            delay_s=BALLOTPEDIA_DELAY_S,
+            missing_ok=True,
             desc=f"Scraping Mayor (Ballotpedia) {year}",
             unit="city",
-        ):
-            try:
-                soup = fetch_soup(url, delay_s=BALLOTPEDIA_DELAY_S)
-            except requests.HTTPError as exc:
-                if exc.response is not None and exc.response.status_code == 404:
-                    continue
-                logger.error("Failed to fetch %s: %s", city_state, exc)
-                continue
-            except requests.RequestException as exc:
-                logger.error("Failed to fetch %s: %s", city_state, exc)
-                continue
-
-            try:
-                page_results = self.parse_state_page(city_state, soup, year)
-                for election, candidates in page_results:
-                    election.wikipedia_url = url
-                    eid = upsert_election(conn, election)
-                    for cand in candidates:
-                        upsert_candidate(conn, cand, eid)
-                    total_elections += 1
-                conn.commit()
-            except (AttributeError, KeyError, ValueError, TypeError) as exc:
-                logger.error("Error parsing %s: %s", city_state, exc)
-
-        logger.info(
-            "Scraped %d mayoral elections for %d from Ballotpedia.",
-            total_elections,
-            year,
         )
-        return total_elections
 
     @staticmethod
     def _build_election_url(city: str, state: str, year: int) -> str:
@@ -8,11 +8,19 @@ from __future__ import annotations
 
 import re
 
-from bs4 import Tag
+from bs4 import SoupStrainer, Tag
+
+from camplinks.models import Candidate
+from camplinks.wiki_parsing import candidates_from_parsed
 
 BALLOTPEDIA_BASE = "https://ballotpedia.org"
 BALLOTPEDIA_DELAY_S: float = 1.5
 
+# Election pages are only read through their standard and RCV voteboxes.
+VOTEBOX_STRAINER = SoupStrainer(
+    "div", class_=lambda c: c and ("votebox" in c or "rcvvotebox" in c)
+)
+
 _PARTY_RE = re.compile(r"\(([^)]+)\)\s*$")
 
 
@@ -191,3 +199,26 @@ def parse_rcv_votebox(
         return parse_results_rows(tables[0])
 
     return []
+
+
+def candidates_from_votebox(
+    parsed: list[dict[str, str | float | bool | None]],
+) -> list[Candidate]:
+    """Convert parsed votebox rows into candidates.
+
+    Votebox names link to each candidate's Ballotpedia page. Those links
+    are stored as ``ballotpedia_url`` so the contact search can read the
+    page directly instead of searching for it.
+
+    Args:
+        parsed: Rows from :func:`parse_votebox` or :func:`parse_rcv_votebox`.
+
+    Returns:
+        List of Candidate objects.
+    """
+    candidates = candidates_from_parsed(parsed)
+    for candidate in candidates:
+        if candidate.wikipedia_url.startswith(BALLOTPEDIA_BASE):
+            candidate.ballotpedia_url = candidate.wikipedia_url
+            candidate.wikipedia_url = ""
+    return candidates
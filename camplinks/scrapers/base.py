@@ -3,29 +3,62 @@
 from __future__ import annotations
 
 import logging
+import pickle
 import sqlite3
 from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from tqdm import tqdm
 
-from camplinks.db import upsert_candidate, upsert_election
-from camplinks.http import fetch_soup
+from camplinks.db import (
+    get_page_revisions,
+    upsert_candidate,
+    upsert_election,
+    upsert_page_revision,
+)
+from camplinks.http import DEFAULT_DELAY_S, PageCache, fetch_html, parse_html
+from camplinks.mediawiki import MediaWikiClient, PageRevision, title_from_url
 from camplinks.models import Candidate, Election
+from camplinks.profiling import PROFILER
+from camplinks.wiki_parsing import RESULTS_PAGE_STRAINER
 
 logger = logging.getLogger(__name__)
 
+PageResults = list[tuple[Election, list[Candidate]]]
+
+INDEX_FETCH_WORKERS = 4
+
 
 class BaseScraper(ABC):
     """Base class for all race-specific Wikipedia scrapers.
 
     Subclasses implement URL construction and page parsing logic.
-    The shared ``scrape_all`` method handles orchestration, progress
-    tracking, and database writes.
+    The shared ``scrape_all``/``scrape_years`` methods handle orchestration,
+    progress tracking, and database writes. Sources with their own index
+    or fetch rules override ``find_pages`` and ``scrape_year``.
+
+    ``parse_only`` declares which elements ``parse_state_page`` needs, so
+    state pages are parsed restricted to them. Set it to None for a full
+    parse.
+
+    Scraping is split into fetch -> parse -> write stages (see
+    ``scrape_pages``). Given an executor, parsing runs in worker processes,
+    so scrapers must be constructible without arguments and
+    ``parse_state_page`` must return plain (picklable) dataclasses.
+
+    Wikipedia scrapers record the revision each state page was scraped at
+    (``page_revisions`` table); an incremental scrape asks the MediaWiki API
+    for the current revisions and only re-fetches pages that changed.
     """
 
     race_type: str  # e.g. "US House", "US Senate"
+    parse_only: SoupStrainer | None = RESULTS_PAGE_STRAINER
 
     @abstractmethod
     def build_index_url(self, year: int) -> str:
@@ -58,7 +91,7 @@ class BaseScraper(ABC):
         state: str,
         soup: BeautifulSoup,
         year: int,
-    ) -> list[tuple[Election, list[Candidate]]]:
+    ) -> PageResults:
         """Parse a single state page into elections and their candidates.
 
         Args:
@@ -70,47 +103,356 @@ class BaseScraper(ABC):
             List of (Election, [Candidate, ...]) tuples.
         """
 
-    def scrape_all(self, year: int, conn: sqlite3.Connection) -> int:
+    def find_pages(self, year: int, cache: PageCache) -> list[tuple[str, str]]:
+        """Fetch the index page for *year* and list the pages to scrape.
+
+        Args:
+            year: Election year.
+            cache: Index pages fetched during this run.
+
+        Returns:
+            (state, url) pairs.
+        """
+        logger.info("Fetching %s %d index page...", self.race_type, year)
+        index_soup = cache.fetch_soup(self.build_index_url(year))
+        return self.collect_state_urls(index_soup, year)
+
+    def scrape_year(
+        self,
+        pages: list[tuple[str, str]],
+        year: int,
+        conn: sqlite3.Connection,
+        executor: Executor | None = None,
+        incremental: bool = False,
+    ) -> int:
+        """Scrape the pages found for one year.
+
+        Args:
+            pages: (state, url) pairs from :meth:`find_pages`.
+            year: Election year.
+            conn: Open database connection.
+            executor: Optional process pool that state pages are parsed in.
+            incremental: Only re-scrape state pages whose Wikipedia revision
+                changed since they were last scraped.
+
+        Returns:
+            Number of elections inserted/updated.
+        """
+        return self.scrape_pages(
+            pages,
+            year,
+            conn,
+            executor,
+            wiki=MediaWikiClient(),
+            incremental=incremental,
+        )
+
+    def scrape_all(
+        self,
+        year: int,
+        conn: sqlite3.Connection,
+        executor: Executor | None = None,
+        incremental: bool = False,
+    ) -> int:
         """Orchestrate a full scrape: index -> states -> DB.
 
         Args:
             year: Election year to scrape.
             conn: Open database connection.
+            executor: Optional process pool that state pages are parsed in.
+            incremental: Only re-scrape state pages whose Wikipedia revision
+                changed since they were last scraped.
 
         Returns:
             Total number of elections inserted/updated.
         """
-        logger.info("Fetching %s %d index page...", self.race_type, year)
-        index_url = self.build_index_url(year)
-        index_soup = fetch_soup(index_url)
-        state_urls = self.collect_state_urls(index_soup, year)
-        logger.info("Found %d state pages to scrape.", len(state_urls))
-
-        total_elections = 0
-        for state, url in tqdm(
-            state_urls,
-            desc=f"Scraping {self.race_type} {year}",
-            unit="state",
+        return self.scrape_years([year], conn, executor, incremental)
+
+    def scrape_years(
+        self,
+        years: Sequence[int],
+        conn: sqlite3.Connection,
+        executor: Executor | None = None,
+        incremental: bool = False,
+        cache: PageCache | None = None,
+    ) -> int:
+        """Scrape several election years.
+
+        The index pages of all years are fetched concurrently first, then
+        each year's pages are scraped in turn. A year whose index page
+        cannot be fetched (e.g. no such election that year) is logged and
+        skipped; the other years are still scraped.
+
+        Args:
+            years: Election years to scrape.
+            conn: Open database connection.
+            executor: Optional process pool that state pages are parsed in.
+            incremental: Only re-scrape state pages whose Wikipedia revision
+                changed since they were last scraped.
+            cache: Index pages already fetched during this run (shared
+                between scrapers so common pages are fetched once).
+
+        Returns:
+            Total number of elections inserted/updated.
+        """
+        if not years:
+            return 0
+        cache = cache or PageCache()
+        workers = min(len(years), INDEX_FETCH_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            found = list(pool.map(partial(self._find_pages_or_skip, cache), years))
+
+        total = 0
+        for year, pages in zip(years, found, strict=True):
+            if pages is None:
+                continue
+            logger.info(
+                "Found %d %s pages to scrape for %d.", len(pages), self.race_type, year
+            )
+            elections = self.scrape_year(pages, year, conn, executor, incremental)
+            logger.info(
+                "Scraped %d %s elections for %d.", elections, self.race_type, year
+            )
+            total += elections
+        return total
+
+    def _find_pages_or_skip(
+        self, cache: PageCache, year: int
+    ) -> list[tuple[str, str]] | None:
+        """Run :meth:`find_pages`, logging and returning None if it fails."""
+        try:
+            return self.find_pages(year, cache)
+        except requests.RequestException as exc:
+            logger.error(
+                "Failed to fetch the %s %d index page, skipping %d: %s",
+                self.race_type,
+                year,
+                year,
+                exc,
+            )
+            return None
+
+    def scrape_pages(
+        self,
+        pages: Iterable[tuple[str, str]],
+        year: int,
+        conn: sqlite3.Connection,
+        executor: Executor | None = None,
+        delay_s: float = DEFAULT_DELAY_S,
+        missing_ok: bool = False,
+        desc: str | None = None,
+        unit: str = "state",
+        wiki: MediaWikiClient | None = None,
+        incremental: bool = False,
+    ) -> int:
+        """Fetch, parse and store a list of state pages.
+
+        Pages are downloaded one at a time in this thread, honouring the
+        crawl delay. Without an executor each page is parsed inline; with
+        one, the raw HTML is handed to :func:`parse_page` in a worker while
+        the next page downloads. Results are written to the database from
+        this thread in page order, one commit per page.
+
+        With *wiki*, the pages' current revisions are looked up in bulk first
+        and each successfully parsed page's revision is recorded. With
+        *incremental* as well, pages whose revision matches the recorded one
+        are skipped; pages never scraped or not found by the API are always
+        fetched.
+
+        Args:
+            pages: (state, url) pairs.
+            year: Election year.
+            conn: Open database connection.
+            executor: Optional process pool to parse pages in.
+            delay_s: Crawl delay between page fetches.
+            missing_ok: Skip pages that return 404 without logging an error
+                (for sources where not every state has a race every cycle).
+            desc: Progress bar label.
+            unit: Progress bar unit.
+            wiki: MediaWiki API client used to look up page revisions.
+            incremental: Skip pages unchanged since they were last scraped.
+
+        Returns:
+            Number of elections inserted/updated.
+        """
+        pages = list(pages)
+        current: dict[str, PageRevision] = {}
+        if wiki is not None:
+            current = self._current_revisions(wiki, pages)
+        if incremental and current:
+            known = get_page_revisions(conn, current)
+            changed = [
+                (state, url)
+                for state, url in pages
+                if url not in current or known.get(url) != current[url].rev_id
+            ]
+            logger.info(
+                "%d of %d pages changed since they were last scraped.",
+                len(changed),
+                len(pages),
+            )
+            pages = changed
+
+        pending: deque[tuple[str, str, str, Future[PageResults]]] = deque()
+        total = 0
+        for state, url in PROFILER.units(
+            tqdm(pages, desc=desc or f"Scraping {self.race_type} {year}", unit=unit),
+            "scrape",
         ):
             try:
-                soup = fetch_soup(url)
-                results = self.parse_state_page(state, soup, year)
-                for election, candidates in results:
-                    election.wikipedia_url = url
-                    eid = upsert_election(conn, election)
-                    for cand in candidates:
-                        upsert_candidate(conn, cand, eid)
-                    total_elections += 1
-                conn.commit()
+                html = fetch_html(url, delay_s)
+            except requests.HTTPError as exc:
+                status = exc.response.status_code if exc.response is not None else 0
+                if not (missing_ok and status == 404):
+                    logger.error("Failed to fetch %s: %s", state, exc)
+                continue
             except requests.RequestException as exc:
                 logger.error("Failed to fetch %s: %s", state, exc)
-            except (AttributeError, KeyError, ValueError, TypeError) as exc:
-                logger.error("Error parsing %s: %s", state, exc)
+                continue
 
-        logger.info(
-            "Scraped %d %s elections for %d.",
-            total_elections,
-            self.race_type,
-            year,
-        )
-        return total_elections
+            if executor is not None:
+                try:
+                    future = executor.submit(parse_page, type(self), state, html, year)
+                except BrokenProcessPool:
+                    logger.error(
+                        "Parse workers died; parsing the remaining pages inline."
+                    )
+                    executor = None
+                else:
+                    pending.append((state, url, html, future))
+            if executor is None:
+                parse = partial(self._parse_html, state, html, year)
+                total += self._store(conn, state, url, parse, current.get(url))
+                continue
+            while pending and pending[0][3].done():
+                total += self._store_parsed(conn, year, *pending.popleft(), current)
+
+        while pending:
+            total += self._store_parsed(conn, year, *pending.popleft(), current)
+        return total
+
+    def _store_parsed(
+        self,
+        conn: sqlite3.Connection,
+        year: int,
+        state: str,
+        url: str,
+        html: str,
+        future: Future[PageResults],
+        current: dict[str, PageRevision],
+    ) -> int:
+        """Store a page parsed in a worker, parsing it inline if the pool failed.
+
+        A worker that crashes breaks the whole pool, and a page whose results
+        cannot be pickled fails in transit; neither is the page's fault, so
+        the page is parsed again in this process rather than dropped.
+
+        Args:
+            conn: Open database connection.
+            year: Election year.
+            state: State name.
+            url: Page URL.
+            html: Raw page HTML, for the inline fallback.
+            future: The worker's parse of the page.
+            current: Current revision per page URL (see :meth:`scrape_pages`).
+
+        Returns:
+            Number of elections written.
+        """
+
+        def results() -> PageResults:
+            try:
+                return future.result()
+            except (BrokenProcessPool, pickle.PicklingError) as exc:
+                logger.warning(
+                    "Parse worker failed on %s (%s); parsing inline.", state, exc
+                )
+                return self._parse_html(state, html, year)
+
+        return self._store(conn, state, url, results, current.get(url))
+
+    @staticmethod
+    def _current_revisions(
+        wiki: MediaWikiClient, pages: list[tuple[str, str]]
+    ) -> dict[str, PageRevision]:
+        """Look up the current revision of each page URL.
+
+        Args:
+            wiki: MediaWiki API client.
+            pages: (state, url) pairs.
+
+        Returns:
+            Mapping of URL -> current revision; empty if the lookup failed.
+        """
+        titles = {url: title_from_url(url) for _, url in pages}
+        try:
+            resolved = wiki.resolve(t for t in titles.values() if t is not None)
+        except requests.RequestException as exc:
+            logger.error("Revision lookup failed, scraping all pages: %s", exc)
+            return {}
+        return {
+            url: resolved[title]
+            for url, title in titles.items()
+            if title is not None and title in resolved
+        }
+
+    def _parse_html(self, state: str, html: str, year: int) -> PageResults:
+        """Parse raw page HTML with this scraper's strainer."""
+        return self.parse_state_page(state, parse_html(html, self.parse_only), year)
+
+    @staticmethod
+    def _store(
+        conn: sqlite3.Connection,
+        state: str,
+        url: str,
+        get_results: Callable[[], PageResults],
+        revision: PageRevision | None = None,
+    ) -> int:
+        """Write one page's parse results and commit.
+
+        Args:
+            conn: Open database connection.
+            state: State name (for error messages).
+            url: Source page URL recorded on each election.
+            get_results: Returns the parsed page; parse errors raised here
+                (inline or re-raised from a worker) are logged and skipped.
+            revision: Page revision to record once the results are written.
+
+        Returns:
+            Number of elections written.
+        """
+        try:
+            results = get_results()
+        except (AttributeError, KeyError, ValueError, TypeError) as exc:
+            logger.error("Error parsing %s: %s", state, exc)
+            return 0
+        for election, candidates in results:
+            election.wikipedia_url = url
+            eid = upsert_election(conn, election)
+            for cand in candidates:
+                upsert_candidate(conn, cand, eid)
+        if revision is not None:
+            upsert_page_revision(conn, url, revision.rev_id, revision.timestamp)
+        conn.commit()
+        return len(results)
+
+
+def parse_page(
+    scraper_cls: type[BaseScraper],
+    state: str,
+    html: str,
+    year: int,
+) -> PageResults:
+    """Parse one raw state page; the unit of work run in parse workers.
+
+    Args:
+        scraper_cls: Scraper whose ``parse_only`` and ``parse_state_page``
+            are used.
+        state: Human-readable state name.
+        html: Raw page HTML.
+        year: Election year.
+
+    Returns:
+        List of (Election, [Candidate, ...]) tuples.
+    """
+    return scraper_cls()._parse_html(state, html, year)
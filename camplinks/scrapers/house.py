@@ -18,6 +18,7 @@ from camplinks.scrapers import register_scraper
 from camplinks.scrapers.base import BaseScraper
 from camplinks.wiki_parsing import (
     INCUMBENT_RE,
+    HeadingIndex,
     candidates_from_parsed,
     classify_election_table,
     extract_district_number,
@@ -246,6 +247,7 @@ class HouseScraper(BaseScraper):
             List of (Election, candidates) tuples, one per district.
         """
         results: list[tuple[Election, list[Candidate]]] = []
+        index = HeadingIndex(soup)
         is_california = state.lower() == "california"
 
         if is_california:
@@ -264,7 +266,7 @@ class HouseScraper(BaseScraper):
                 ):
                     continue
 
-                h2 = find_preceding_heading(table, ("h2",))
+                h2 = find_preceding_heading(table, ("h2",), index)
                 district = extract_district_number(
                     h2.get_text(strip=True) if h2 else cap_text
                 )
@@ -278,15 +280,15 @@ class HouseScraper(BaseScraper):
                 class_=lambda c: c and "wikitable" in c and "plainrowheaders" in c,
             )
             for table in tables:
-                stage = classify_election_table(table)
+                stage = classify_election_table(table, index)
                 if stage is None:
                     continue
 
                 primary_party = (
-                    extract_primary_party(table) if stage != "general" else ""
+                    extract_primary_party(table, index) if stage != "general" else ""
                 )
 
-                h2 = find_preceding_heading(table, ("h2",))
+                h2 = find_preceding_heading(table, ("h2",), index)
                 district = extract_district_number(
                     h2.get_text(strip=True) if h2 else "At-Large"
                 )
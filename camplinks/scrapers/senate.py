@@ -17,6 +17,7 @@ from camplinks.models import Candidate, Election
 from camplinks.scrapers import register_scraper
 from camplinks.scrapers.base import BaseScraper
 from camplinks.wiki_parsing import (
+    HeadingIndex,
     classify_election_table,
     extract_primary_party,
     parse_candidate_row,
@@ -84,6 +85,7 @@ class SenateScraper(BaseScraper):
         Returns:
             List of (Election, candidates) tuples for each stage found.
         """
+        index = HeadingIndex(soup)
         tables = soup.find_all(
             "table",
             class_=lambda c: c and "wikitable" in c and "plainrowheaders" in c,
@@ -91,11 +93,13 @@ class SenateScraper(BaseScraper):
 
         results: list[tuple[Election, list[Candidate]]] = []
         for table in tables:
-            stage = classify_election_table(table)
+            stage = classify_election_table(table, index)
             if stage is None:
                 continue
 
-            primary_party = extract_primary_party(table) if stage != "general" else ""
+            primary_party = (
+                extract_primary_party(table, index) if stage != "general" else ""
+            )
 
             parsed: list[dict[str, str | float | bool | None]] = []
             for row in table.find_all("tr", class_="vcard"):
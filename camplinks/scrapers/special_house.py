@@ -17,6 +17,7 @@ from camplinks.models import Candidate, Election
 from camplinks.scrapers import register_scraper
 from camplinks.scrapers.base import BaseScraper
 from camplinks.wiki_parsing import (
+    HeadingIndex,
     candidates_from_parsed,
     classify_election_table,
     extract_district_number,
@@ -108,17 +109,20 @@ class SpecialHouseScraper(BaseScraper):
 
         results: list[tuple[Election, list[Candidate]]] = []
 
+        index = HeadingIndex(soup)
         tables = soup.find_all(
             "table",
             class_=lambda c: c and "wikitable" in c and "plainrowheaders" in c,
         )
 
         for table in tables:
-            stage = classify_election_table(table)
+            stage = classify_election_table(table, index)
             if stage is None:
                 continue
 
-            primary_party = extract_primary_party(table) if stage != "general" else ""
+            primary_party = (
+                extract_primary_party(table, index) if stage != "general" else ""
+            )
 
             parsed: list[dict[str, str | float | bool | None]] = []
             for row in table.find_all("tr", class_="vcard"):
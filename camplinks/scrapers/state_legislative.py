@@ -19,6 +19,7 @@ from camplinks.models import Candidate, Election
 from camplinks.scrapers import register_scraper
 from camplinks.scrapers.base import BaseScraper
 from camplinks.wiki_parsing import (
+    HeadingIndex,
     candidates_from_parsed,
     classify_election_table,
     extract_district_number,
@@ -169,21 +170,24 @@ class StateLegislativeScraper(BaseScraper):
 
         results: list[tuple[Election, list[Candidate]]] = []
 
+        index = HeadingIndex(soup)
         tables = soup.find_all(
             "table",
             class_=lambda c: c and "wikitable" in c and "plainrowheaders" in c,
         )
         for table in tables:
-            stage = classify_election_table(table)
+            stage = classify_election_table(table, index)
             if stage is None:
                 continue
 
-            primary_party = extract_primary_party(table) if stage != "general" else ""
+            primary_party = (
+                extract_primary_party(table, index) if stage != "general" else ""
+            )
 
             # Look for h2 district heading first, fall back to h3
-            h2 = find_preceding_heading(table, ("h2",))
+            h2 = find_preceding_heading(table, ("h2",), index)
             if h2 is None:
-                h2 = find_preceding_heading(table, ("h3",))
+                h2 = find_preceding_heading(table, ("h3",), index)
             heading_text = h2.get_text(strip=True) if h2 else ""
             district = extract_district_number(heading_text)
 
@@ -211,7 +215,7 @@ class StateLegislativeScraper(BaseScraper):
             for table in soup.find_all(
                 "table", class_=lambda c: c and "wikitable" in c
             ):
-                h2 = find_preceding_heading(table, ("h2", "h3"))
+                h2 = find_preceding_heading(table, ("h2", "h3"), index)
                 heading_text = h2.get_text(strip=True) if h2 else ""
 
                 if not heading_text or "district" not in heading_text.lower():
@@ -1,8 +1,9 @@
 """Find campaign websites and contact info via Ballotpedia and web search.
 
 Two-tier strategy:
-  1. Search DuckDuckGo for the candidate's Ballotpedia page, then scrape
-     all contact/social links from the Ballotpedia infobox.
+  1. Find the candidate's Ballotpedia page (a link harvested while
+     scraping, a name slug, or a DuckDuckGo search as a last resort), then
+     scrape all contact/social links from the Ballotpedia infobox.
   2. For candidates still missing a campaign website, run a general web
      search and apply heuristics to identify likely campaign URLs.
 
@@ -13,12 +14,18 @@ from __future__ import annotations
 
 import logging
 import sqlite3
-from urllib.parse import urlparse
+from collections.abc import Collection
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Protocol
+from urllib.parse import quote, urlparse
 
+import polars as pl
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from tqdm import tqdm
 
+from camplinks.archive import normalize_state
 from camplinks.cache import (
     CACHE_FILE,
     SAVE_INTERVAL,
@@ -29,47 +36,45 @@ from camplinks.cache import (
 from camplinks.db import (
     get_candidates_missing_link,
     get_candidates_missing_social_links,
+    get_candidates_with_link,
+    get_search_results,
     update_candidate_ballotpedia_url,
     upsert_contact_link,
 )
-from camplinks.http import ddg_search, fetch_soup
+from camplinks.domains import default_matcher, host_of
+from camplinks.http import ddg_search, fetch_soup, page_exists
+from camplinks.identity import PersonIndex, person_key
+from camplinks.metrics import METRICS
 from camplinks.models import BALLOTPEDIA_LABEL_MAP, ContactLink
+from camplinks.profiling import PROFILER
+from camplinks.scrapers.ballotpedia_parsing import BALLOTPEDIA_BASE
 
 logger = logging.getLogger(__name__)
 
 BALLOTPEDIA_DELAY_S: float = 1.5
-
-# Domains to skip in Tier-2 web search scoring
-SKIP_DOMAINS: frozenset[str] = frozenset(
-    {
-        "ballotpedia.org",
-        "wikipedia.org",
-        "fec.gov",
-        "opensecrets.org",
-        "facebook.com",
-        "twitter.com",
-        "x.com",
-        "youtube.com",
-        "linkedin.com",
-        "instagram.com",
-        "reddit.com",
-        "tiktok.com",
-        "nytimes.com",
-        "cnn.com",
-        "foxnews.com",
-        "washingtonpost.com",
-        "politico.com",
-        "nbcnews.com",
-        "abcnews.go.com",
-        "cbsnews.com",
-        "apnews.com",
-        "reuters.com",
-        "thehill.com",
-        "npr.org",
-        "bbc.com",
-        "usatoday.com",
-    }
+# Characters Ballotpedia keeps unescaped in page slugs
+SLUG_SAFE_CHARS = "_.,'()-"
+
+# Tier-2 scoring: words suggesting a campaign in the domain / result text
+CAMPAIGN_DOMAIN_WORDS: tuple[str, ...] = (
+    "forcongress",
+    "forsenate",
+    "elect",
+    "vote",
+    "campaign",
+    "committee",
 )
+CAMPAIGN_TEXT_WORDS: tuple[str, ...] = ("campaign", "congress", "senate")
+# Netloc and path of an absolute URL, as urllib.parse.urlparse splits them
+_URL_PARTS_RE = r"^[A-Za-z][A-Za-z0-9+.\-]*://([^/?#]*)([^?#;]*)"
+
+
+class SearchFn(Protocol):
+    """A web search: :func:`ddg_search` or a stand-in with its signature."""
+
+    def __call__(self, query: str, max_results: int = ...) -> list[dict[str, str]]:
+        """Return result dicts with 'title', 'href', 'body' keys."""
+        ...
 
 
 # ── Tier 1: Ballotpedia ───────────────────────────────────────────────────
@@ -79,6 +84,7 @@ def find_ballotpedia_url(
     name: str,
     state: str,
     race_type: str = "congress",
+    search: SearchFn | None = None,
 ) -> str:
     """Search DDG for a candidate's Ballotpedia page.
 
@@ -86,12 +92,14 @@ def find_ballotpedia_url(
         name: Candidate full name.
         state: US state name.
         race_type: Race keyword for search (e.g. "congress", "senate").
+        search: Search function (defaults to :func:`ddg_search`).
 
     Returns:
         The Ballotpedia page URL, or empty string if not found.
     """
+    search = search or ddg_search
     query = f'site:ballotpedia.org "{name}" {state} {race_type} 2024'
-    results = ddg_search(query, max_results=5)
+    results = search(query, max_results=5)
     for r in results:
         href = r.get("href", "")
         if "ballotpedia.org/" in href and "/wiki/" not in href:
@@ -99,6 +107,124 @@ def find_ballotpedia_url(
     return ""
 
 
+def ballotpedia_slugs(name: str) -> list[str]:
+    """Build likely Ballotpedia page URLs from a candidate's name.
+
+    Ballotpedia titles candidate pages with the name as commonly written
+    (``John_Whitmire``, ``Jane_A._Doe``), so the full name and the
+    first-last form cover most candidates.
+
+    Args:
+        name: Candidate full name.
+
+    Returns:
+        Up to two candidate URLs, most specific first.
+    """
+    words = name.replace('"', "").split()
+    if len(words) < 2:
+        return []
+    slugs = ["_".join(words), f"{words[0]}_{words[-1]}"]
+    return [
+        f"{BALLOTPEDIA_BASE}/{quote(slug, safe=SLUG_SAFE_CHARS)}"
+        for slug in dict.fromkeys(slugs)
+    ]
+
+
+def _is_candidate_page(soup: BeautifulSoup, state: str) -> bool:
+    """Check that a Ballotpedia page is a person page mentioning *state*."""
+    if soup.find("div", class_="infobox person") is None:
+        return False
+    return normalize_state(state).lower() in soup.get_text(" ").lower()
+
+
+@dataclass
+class BallotpediaDiscovery:
+    """Locate candidates' Ballotpedia pages, searching only as a last resort.
+
+    Pages are tried in order of cost:
+
+    1. the candidate's stored ``ballotpedia_url``, harvested from the
+       election pages the ``bp_governor`` / ``bp_municipal`` scrapers
+       read (or copied from another candidacy of the same person);
+    2. a page built from the name slug that answers a HEAD probe and turns
+       out to be a person page mentioning the candidate's state;
+    3. a DuckDuckGo ``site:ballotpedia.org`` search.
+
+    Attributes:
+        delay_s: Crawl delay for Ballotpedia requests.
+        harvested: Pages read from stored links.
+        from_slug: Pages found by slug construction.
+        searched: DDG searches run.
+        search: Search function (defaults to :func:`ddg_search`).
+    """
+
+    delay_s: float = BALLOTPEDIA_DELAY_S
+    harvested: int = 0
+    from_slug: int = 0
+    searched: int = 0
+    search: SearchFn | None = field(default=None, repr=False)
+
+    @property
+    def searches_avoided(self) -> int:
+        """DDG searches saved by harvested links and slugs."""
+        return self.harvested + self.from_slug
+
+    def _fetch(self, url: str, name: str) -> BeautifulSoup | None:
+        try:
+            return fetch_soup(url, delay_s=self.delay_s)
+        except requests.RequestException as exc:
+            logger.error("Ballotpedia fetch failed for %s: %s", name, exc)
+            return None
+
+    def find(
+        self,
+        name: str,
+        state: str,
+        race_type: str = "congress",
+        known_url: str = "",
+    ) -> tuple[str, BeautifulSoup | None]:
+        """Find and fetch a candidate's Ballotpedia page.
+
+        Args:
+            name: Candidate full name.
+            state: State name (``"City, State"`` allowed).
+            race_type: Race keyword for the search fallback.
+            known_url: Ballotpedia URL already known for the candidate.
+
+        Returns:
+            Tuple of (page URL, parsed page); ``("", None)`` if not found,
+            and the URL with None if the page could not be fetched.
+        """
+        if known_url:
+            self.harvested += 1
+            return known_url, self._fetch(known_url, name)
+
+        for url in ballotpedia_slugs(name):
+            if not page_exists(url, delay_s=self.delay_s):
+                continue
+            soup = self._fetch(url, name)
+            if soup is not None and _is_candidate_page(soup, state):
+                self.from_slug += 1
+                return url, soup
+
+        self.searched += 1
+        url = find_ballotpedia_url(name, state, race_type, self.search)
+        if not url:
+            return "", None
+        return url, self._fetch(url, name)
+
+    def report(self) -> None:
+        """Log how pages were found and how many searches were avoided."""
+        logger.info(
+            "Ballotpedia pages: %d from stored links, %d from name "
+            "slugs, %d DDG searches (%d searches avoided).",
+            self.harvested,
+            self.from_slug,
+            self.searched,
+            self.searches_avoided,
+        )
+
+
 def extract_all_contact_links(soup: BeautifulSoup) -> dict[str, str]:
     """Extract all contact/social links from a Ballotpedia candidate page.
 
@@ -169,11 +295,9 @@ def score_campaign_url(
     parsed = urlparse(url)
     domain = parsed.netloc.lower()
 
-    for skip in SKIP_DOMAINS:
-        if skip in domain:
-            return 0.0
-
-    if ".gov" in domain:
+    # Social, news, reference, aggregator and .gov sites are never
+    # campaign sites
+    if default_matcher().match_host(host_of(url)) is not None:
         return 0.0
 
     last = candidate_last_name.lower().replace("'", "").replace("-", "")
@@ -182,15 +306,7 @@ def score_campaign_url(
     if weight_name and last in domain_clean:
         score += 0.4
 
-    campaign_words = [
-        "forcongress",
-        "forsenate",
-        "elect",
-        "vote",
-        "campaign",
-        "committee",
-    ]
-    for word in campaign_words:
+    for word in CAMPAIGN_DOMAIN_WORDS:
         if word in domain_clean:
             score += 0.2
             break
@@ -199,7 +315,7 @@ def score_campaign_url(
         score += 0.1
 
     combined = f"{title} {body}".lower()
-    if "campaign" in combined or "congress" in combined or "senate" in combined:
+    if any(word in combined for word in CAMPAIGN_TEXT_WORDS):
         score += 0.1
     if "official" in combined:
         score += 0.05
@@ -213,11 +329,78 @@ def score_campaign_url(
     return min(score, 1.0)
 
 
+def score_campaign_urls(
+    results: pl.DataFrame,
+    weight_name: bool = True,
+) -> pl.Series:
+    """Score many search results at once.
+
+    Column-wise equivalent of :func:`score_campaign_url`: every feature is
+    computed with polars string expressions over the whole frame, and the
+    domain filter runs once per distinct host. Used to re-rank stored
+    search results offline, e.g. when tuning the thresholds.
+
+    Args:
+        results: Frame with string columns ``url``, ``title``, ``body``,
+            ``last_name`` and ``state``.
+        weight_name: Whether to boost score when last name appears in domain.
+
+    Returns:
+        Float64 series of scores named ``"score"``, aligned with *results*.
+    """
+    text = ("url", "title", "body", "last_name", "state")
+    frame = results.select(pl.col(c).cast(pl.String).fill_null("") for c in text)
+    frame = frame.with_columns(
+        pl.col("url").str.extract(_URL_PARTS_RE, 1).fill_null("").alias("netloc"),
+        pl.col("url")
+        .str.extract(_URL_PARTS_RE, 2)
+        .fill_null(pl.col("url"))
+        .alias("path"),
+    )
+
+    matcher = default_matcher()
+    netlocs = frame["netloc"].unique().to_list()
+    skipped = [n for n in netlocs if matcher.match_host(host_of(f"//{n}"))]
+
+    domain = pl.col("netloc").str.to_lowercase()
+    domain_clean = domain.str.replace_all(r"[-.]", "")
+    last = pl.col("last_name").str.to_lowercase().str.replace_all(r"['-]", "")
+    combined = pl.concat_str("title", "body", separator=" ").str.to_lowercase()
+
+    def points(condition: pl.Expr, value: float) -> pl.Expr:
+        return pl.when(condition).then(value).otherwise(0.0)
+
+    # Summed in the same order as score_campaign_url for identical floats
+    score = (
+        pl.lit(0.0)
+        + points(
+            domain_clean.str.contains(last, literal=True), 0.4 if weight_name else 0.0
+        )
+        + points(domain_clean.str.contains_any(list(CAMPAIGN_DOMAIN_WORDS)), 0.2)
+        + points(pl.col("path").is_in(["", "/", "/index.html"]), 0.1)
+        + points(combined.str.contains_any(list(CAMPAIGN_TEXT_WORDS)), 0.1)
+        + points(combined.str.contains("official", literal=True), 0.05)
+        + points(
+            combined.str.contains(pl.col("state").str.to_lowercase(), literal=True),
+            0.05,
+        )
+        + points(domain.str.ends_with(".com") | domain.str.ends_with(".org"), 0.05)
+    )
+    scored = frame.select(
+        pl.when(pl.col("netloc").is_in(skipped))
+        .then(0.0)
+        .otherwise(pl.min_horizontal(score, pl.lit(1.0)))
+        .alias("score")
+    )
+    return scored["score"]
+
+
 def search_campaign_site_web(
     name: str,
     state: str,
     district: str,
     race_type: str = "congress",
+    search: SearchFn | None = None,
 ) -> str:
     """Search the open web for a candidate's campaign website.
 
@@ -229,10 +412,13 @@ def search_campaign_site_web(
         state: State name.
         district: District identifier.
         race_type: Race keyword for search queries.
+        search: Search function (defaults to :func:`ddg_search`; replay
+            passes one that reads stored results).
 
     Returns:
         Campaign website URL, or empty string.
     """
+    search = search or ddg_search
     last_name = name.split()[-1] if name.split() else name
 
     queries = [
@@ -244,7 +430,7 @@ def search_campaign_site_web(
     best_score = 0.0
 
     for query in queries:
-        results = ddg_search(query, max_results=8)
+        results = search(query, max_results=8)
         for r in results:
             href = r.get("href", "")
             title = r.get("title", "")
@@ -268,7 +454,7 @@ def search_campaign_site_web(
     ]
 
     for query in fallback_queries:
-        results = ddg_search(query, max_results=8)
+        results = search(query, max_results=8)
         for r in results:
             href = r.get("href", "")
             title = r.get("title", "")
@@ -297,10 +483,10 @@ SOCIAL_LINK_TYPES: tuple[str, ...] = (
     "campaign_instagram",
 )
 
-_SOCIAL_DOMAIN_MAP: dict[str, str] = {
-    "campaign_facebook": "facebook.com",
-    "campaign_x": "x.com",
-    "campaign_instagram": "instagram.com",
+_SOCIAL_DOMAIN_MAP: dict[str, tuple[str, ...]] = {
+    "campaign_facebook": ("facebook.com",),
+    "campaign_x": ("x.com", "twitter.com"),
+    "campaign_instagram": ("instagram.com",),
 }
 
 _SOCIAL_QUERY_TERMS: dict[str, str] = {
@@ -309,33 +495,149 @@ _SOCIAL_QUERY_TERMS: dict[str, str] = {
     "campaign_instagram": "instagram",
 }
 
+# First path segments of share buttons, posts and other non-profile pages
+_NON_PROFILE_PATHS: frozenset[str] = frozenset(
+    {
+        "sharer",
+        "sharer.php",
+        "share",
+        "share.php",
+        "dialog",
+        "plugins",
+        "intent",
+        "hashtag",
+        "search",
+        "explore",
+        "home",
+        "login",
+        "p",
+        "reel",
+        "reels",
+        "watch",
+        "tr",
+    }
+)
+
+SOCIAL_RESULTS_PER_QUERY = 10
+
+
+def classify_social_url(url: str) -> str | None:
+    """Classify a URL as a social media profile link.
+
+    Share buttons, individual posts and other non-profile pages on the
+    same sites are rejected.
+
+    Args:
+        url: Any URL (search result or homepage link).
 
-def search_social_link(
+    Returns:
+        ``"campaign_facebook"``, ``"campaign_x"`` or ``"campaign_instagram"``;
+        None if *url* is not a profile on one of those platforms.
+    """
+    parsed = urlparse(url)
+    host = parsed.netloc.lower().split(":")[0]
+    for prefix in ("www.", "m.", "mobile."):
+        host = host.removeprefix(prefix)
+    segments = [seg for seg in parsed.path.split("/") if seg]
+    if not segments or segments[0].lower() in _NON_PROFILE_PATHS:
+        return None
+    if len(segments) > 1 and segments[1] in ("status", "posts", "videos", "photos"):
+        return None
+    for link_type, domains in _SOCIAL_DOMAIN_MAP.items():
+        if host in domains:
+            return link_type
+    return None
+
+
+def search_social_links(
     name: str,
     state: str,
     race_type: str,
-    link_type: str,
-) -> str:
-    """Search the open web for a candidate's social media profile.
+    link_types: tuple[str, ...] = SOCIAL_LINK_TYPES,
+    search: SearchFn | None = None,
+) -> dict[str, str]:
+    """Search the open web once for several social media profiles.
+
+    A single query names every wanted platform and each result is
+    classified with :func:`classify_social_url`, so one search can fill
+    all of them.
 
     Args:
         name: Candidate full name.
         state: State name.
         race_type: Race keyword for search.
-        link_type: One of "campaign_facebook", "campaign_x", "campaign_instagram".
+        link_types: Link types to look for.
+        search: Search function (defaults to :func:`ddg_search`).
 
     Returns:
-        Social media URL, or empty string if not found.
+        Dict mapping link type to the first matching profile URL.
     """
-    domain = _SOCIAL_DOMAIN_MAP[link_type]
-    term = _SOCIAL_QUERY_TERMS[link_type]
-    query = f'"{name}" {state} {race_type} campaign {term} site:{domain}'
-    results = ddg_search(query, max_results=5)
+    search = search or ddg_search
+    terms = " OR ".join(_SOCIAL_QUERY_TERMS[lt] for lt in link_types)
+    query = f'"{name}" {state} {race_type} campaign {terms}'
+    results = search(query, max_results=SOCIAL_RESULTS_PER_QUERY)
+    found: dict[str, str] = {}
     for r in results:
         href = r.get("href", "")
-        if domain in href:
-            return href
-    return ""
+        link_type = classify_social_url(href)
+        if link_type in link_types and link_type not in found:
+            found[link_type] = href
+    return found
+
+
+def harvest_social_links(url: str) -> dict[str, str]:
+    """Collect social media profile links from a campaign homepage.
+
+    Campaign sites link their profiles from the header or footer, so one
+    plain page fetch often answers what would otherwise take searches.
+
+    Args:
+        url: Campaign homepage URL.
+
+    Returns:
+        Dict mapping link type to the first profile URL on the page.
+    """
+    try:
+        soup = fetch_soup(url, parse_only=SoupStrainer("a"))
+    except requests.RequestException as exc:
+        logger.error("Could not fetch campaign site %s: %s", url, exc)
+        return {}
+    found: dict[str, str] = {}
+    for a in soup.find_all("a", href=True):
+        href = str(a["href"])
+        link_type = classify_social_url(href)
+        if link_type and link_type not in found:
+            found[link_type] = href
+    return found
+
+
+def _existing_links(
+    conn: sqlite3.Connection, candidate_ids: list[int]
+) -> dict[int, dict[str, str]]:
+    """Load the social and campaign site links of many candidates at once.
+
+    Args:
+        conn: Open database connection.
+        candidate_ids: Candidates to load.
+
+    Returns:
+        Mapping of candidate_id -> {link_type: url}.
+    """
+    link_types = ("campaign_site", *SOCIAL_LINK_TYPES)
+    type_marks = ",".join("?" * len(link_types))
+    links: dict[int, dict[str, str]] = {}
+    # SQLite limits bound parameters per statement; query in slices
+    for start in range(0, len(candidate_ids), 500):
+        chunk = candidate_ids[start : start + 500]
+        rows = conn.execute(
+            "SELECT candidate_id, link_type, url FROM contact_links "
+            f"WHERE link_type IN ({type_marks}) "
+            f"AND candidate_id IN ({','.join('?' * len(chunk))})",
+            (*link_types, *chunk),
+        )
+        for cid, link_type, url in rows:
+            links.setdefault(cid, {})[link_type] = url
+    return links
 
 
 # ── Orchestration ──────────────────────────────────────────────────────────
@@ -359,11 +661,26 @@ def _race_keyword(race_type: str) -> str:
     return mapping.get(race_type, "election")
 
 
+def _known_ballotpedia_url(row: sqlite3.Row) -> str:
+    """Return the Ballotpedia page already stored for a candidate row.
+
+    Databases scraped before votebox links were stored as
+    ``ballotpedia_url`` have them in ``wikipedia_url``; those are used too.
+    """
+    if row["ballotpedia_url"]:
+        return str(row["ballotpedia_url"])
+    wiki_url = row["wikipedia_url"] or ""
+    return wiki_url if wiki_url.startswith(BALLOTPEDIA_BASE) else ""
+
+
 def find_candidate_info(
     name: str,
     state: str,
     district: str,
     race_type: str = "congress",
+    ballotpedia_url: str = "",
+    discovery: BallotpediaDiscovery | None = None,
+    search: SearchFn | None = None,
 ) -> dict[str, str]:
     """Find all available contact info for a single candidate.
 
@@ -375,25 +692,29 @@ def find_candidate_info(
         state: State name.
         district: District identifier.
         race_type: Race keyword for search.
+        ballotpedia_url: Candidate's Ballotpedia page, if already known.
+        discovery: Page discovery engine (a fresh one if None); pass one
+            to accumulate its counts across candidates.
+        search: Search function (defaults to :func:`ddg_search`).
 
     Returns:
         Dict mapping contact labels to URLs.
     """
     contacts: dict[str, str] = {}
+    discovery = discovery or BallotpediaDiscovery(search=search)
 
-    bp_url = find_ballotpedia_url(name, state, race_type)
-    if bp_url:
+    bp_url, soup = discovery.find(name, state, race_type, ballotpedia_url)
+    if soup is not None:
         try:
-            soup = fetch_soup(bp_url, delay_s=BALLOTPEDIA_DELAY_S)
             contacts = extract_all_contact_links(soup)
             contacts["_ballotpedia_url"] = bp_url
-        except requests.RequestException as exc:
-            logger.error("Ballotpedia fetch failed for %s: %s", name, exc)
         except (AttributeError, KeyError, ValueError, TypeError) as exc:
             logger.error("Ballotpedia parse error for %s: %s", name, exc)
 
     if "campaign website" not in contacts:
-        campaign_url = search_campaign_site_web(name, state, district, race_type)
+        campaign_url = search_campaign_site_web(
+            name, state, district, race_type, search
+        )
         if campaign_url:
             contacts["campaign website"] = campaign_url
 
@@ -402,21 +723,24 @@ def find_candidate_info(
 
 def search_social_links_for_candidates(
     conn: sqlite3.Connection,
-    year: int | None = None,
+    year: int | Collection[int] | None = None,
     race_type: str | None = None,
     election_stage: str | None = "general",
+    candidate_ids: Collection[int] | None = None,
 ) -> int:
-    """Find missing social media links for candidates via web search.
+    """Find missing social media links for candidates.
 
     For each candidate missing any of campaign_facebook, campaign_x, or
-    campaign_instagram, attempts a targeted DDG site-scoped search for
-    each missing link type.
+    campaign_instagram, the links on the candidate's campaign homepage are
+    checked first; one DDG search covering all still-missing platforms is
+    run only if something is left.
 
     Args:
         conn: Open database connection.
-        year: Optional filter by election year.
+        year: Optional filter by election year (or years).
         race_type: Optional filter by race type.
         election_stage: Optional filter by election stage.
+        candidate_ids: Optional filter to these candidates.
 
     Returns:
         Number of new social media links found.
@@ -426,6 +750,7 @@ def search_social_links_for_candidates(
         year=year,
         race_type=race_type,
         election_stage=election_stage,
+        candidate_ids=candidate_ids,
     )
 
     if not targets:
@@ -436,67 +761,244 @@ def search_social_links_for_candidates(
         "Found %d candidates missing at least one social media link.", len(targets)
     )
 
+    existing = _existing_links(conn, [row["candidate_id"] for row in targets])
+    search = partial(ddg_search, conn=conn)
     found_count = 0
-    for row in tqdm(targets, desc="Searching social media links", unit="candidate"):
+    searches = 0
+    for row in PROFILER.units(
+        tqdm(targets, desc="Searching social media links", unit="candidate"),
+        "search",
+    ):
         cid = row["candidate_id"]
-        name = row["candidate_name"]
-        state = row["state"]
-        rt = row["race_type"]
-        keyword = _race_keyword(rt)
+        have = existing.get(cid, {})
+        missing = tuple(lt for lt in SOCIAL_LINK_TYPES if lt not in have)
+        if not missing:
+            continue
 
-        existing = {
-            r[0]
-            for r in conn.execute(
-                "SELECT link_type FROM contact_links WHERE candidate_id = ?", (cid,)
-            ).fetchall()
-        }
+        found: dict[str, tuple[str, str]] = {}
+        homepage = have.get("campaign_site")
+        if homepage:
+            for lt, url in harvest_social_links(homepage).items():
+                if lt in missing:
+                    found[lt] = (url, "homepage")
+
+        still_missing = tuple(lt for lt in missing if lt not in found)
+        if still_missing:
+            keyword = _race_keyword(row["race_type"])
+            results = search_social_links(
+                row["candidate_name"], row["state"], keyword, still_missing, search
+            )
+            searches += 1
+            for lt, url in results.items():
+                found[lt] = (url, "web_search")
+
+        for lt, (url, source) in found.items():
+            upsert_contact_link(
+                conn,
+                ContactLink(candidate_id=cid, link_type=lt, url=url, source=source),
+            )
+        if found:
+            conn.commit()
+            found_count += len(found)
+    logger.info(
+        "Found %d new social media links (%d searches for %d candidates).",
+        found_count,
+        searches,
+        len(targets),
+    )
+    return found_count
 
-        for lt in SOCIAL_LINK_TYPES:
-            if lt in existing:
-                continue
-            url = search_social_link(name, state, keyword, lt)
-            if url:
-                upsert_contact_link(
-                    conn,
-                    ContactLink(
-                        candidate_id=cid,
-                        link_type=lt,
-                        url=url,
-                        source="web_search",
-                    ),
+
+# ── Offline replay ─────────────────────────────────────────────────────────
+
+
+@dataclass
+class StoredSearch:
+    """Answer searches from the ``search_results`` table, without network.
+
+    Attributes:
+        conn: Database holding the stored results.
+        hits: Queries answered from stored results.
+        misses: Queries with no stored results (answered with none).
+    """
+
+    conn: sqlite3.Connection
+    hits: int = 0
+    misses: int = 0
+
+    def __call__(self, query: str, max_results: int = 5) -> list[dict[str, str]]:
+        """Return the stored results of *query*, like :func:`ddg_search`."""
+        results = get_search_results(self.conn, query)
+        if results is None:
+            self.misses += 1
+            return []
+        self.hits += 1
+        return results[:max_results]
+
+
+@dataclass
+class ReplayChange:
+    """A campaign site choice that differs when replayed.
+
+    Attributes:
+        candidate_id: Candidate primary key.
+        candidate_name: Candidate name.
+        old_url: Campaign site currently stored ("" if none).
+        new_url: Campaign site chosen on replay ("" if none).
+    """
+
+    candidate_id: int
+    candidate_name: str
+    old_url: str
+    new_url: str
+
+
+def replay_campaign_site_search(
+    conn: sqlite3.Connection,
+    year: int | Collection[int] | None = None,
+    race_type: str | None = None,
+    election_stage: str | None = "general",
+) -> list[ReplayChange]:
+    """Re-run Tier-2 campaign site selection against stored search results.
+
+    Covers candidates whose campaign site came from web search or who have
+    none, re-scoring the results stored by earlier searches with the
+    current heuristics. Nothing is fetched and nothing is written.
+
+    Args:
+        conn: Open database connection.
+        year: Optional filter by election year (or years).
+        race_type: Optional filter by race type.
+        election_stage: Optional filter by election stage.
+
+    Returns:
+        The candidates whose chosen campaign site would change.
+    """
+    missing = get_candidates_missing_link(
+        conn,
+        "campaign_site",
+        year=year,
+        race_type=race_type,
+        election_stage=election_stage,
+    )
+    searched = get_candidates_with_link(
+        conn,
+        "campaign_site",
+        year=year,
+        race_type=race_type,
+        election_stage=election_stage,
+    )
+    targets: list[tuple[sqlite3.Row, str]] = [(row, "") for row in missing]
+    targets.extend(
+        (row, row["campaign_site_url"])
+        for row in searched
+        if row["link_source"] == "web_search"
+    )
+
+    changes: list[ReplayChange] = []
+    replayed = 0
+    for row, old_url in targets:
+        stored = StoredSearch(conn)
+        new_url = search_campaign_site_web(
+            row["candidate_name"],
+            row["state"],
+            row["district"] or "",
+            _race_keyword(row["race_type"]),
+            stored,
+        )
+        if not stored.hits:
+            continue  # never searched on the web (or searched before storage)
+        replayed += 1
+        if new_url != old_url:
+            changes.append(
+                ReplayChange(
+                    row["candidate_id"], row["candidate_name"], old_url, new_url
                 )
-                conn.commit()
-                found_count += 1
-    logger.info("Found %d new social media links.", found_count)
-    return found_count
+            )
+
+    for change in changes:
+        logger.info(
+            "%s (%d): %s -> %s",
+            change.candidate_name,
+            change.candidate_id,
+            change.old_url or "(none)",
+            change.new_url or "(none)",
+        )
+    logger.info(
+        "Replayed %d / %d candidates from stored search results: "
+        "%d chosen campaign sites would change.",
+        replayed,
+        len(targets),
+        len(changes),
+    )
+    return changes
+
+
+def _person_cache_key(
+    people: PersonIndex,
+    cid: int,
+    name: str,
+    state: str,
+    race_type: str,
+    district: str,
+    row: sqlite3.Row,
+) -> str:
+    """Return the search cache key of a candidacy (see search_all_candidates)."""
+    members = people.candidacies(cid) if cid in people else [cid]
+    if len(members) > 1:
+        return f"person|{members[0]}|{person_key(name, state)}"
+    return f"person|{person_key(name, state)}|{race_type}|{district}|{row['year']}"
 
 
 def search_all_candidates(
     conn: sqlite3.Connection,
     cache_path: str = CACHE_FILE,
-    year: int | None = None,
+    year: int | Collection[int] | None = None,
     race_type: str | None = None,
     election_stage: str | None = "general",
+    replay: bool = False,
+    candidate_ids: Collection[int] | None = None,
+    people: PersonIndex | None = None,
+    cache: dict[str, dict[str, str]] | None = None,
 ) -> int:
     """Find contact info for all candidates missing a campaign site.
 
     Args:
         conn: Open database connection.
         cache_path: Path for the incremental cache file.
-        year: Optional filter by election year.
+        year: Optional filter by election year (or years).
         race_type: Optional filter by race type.
         election_stage: Optional filter by election stage. Defaults to
             "general" to avoid searching for primary-only candidates.
+        replay: Instead of searching, replay campaign site selection
+            against stored search results and report what would change
+            (see :func:`replay_campaign_site_search`).
+        candidate_ids: Optional filter to these candidates (not applied
+            to a replay).
+        people: Prebuilt person index (built from the database if None);
+            candidacies it groups into one person share cached results.
+        cache: Search cache already loaded by the caller, updated in place
+            and saved by the caller (loaded from and saved to *cache_path*
+            if None).
 
     Returns:
-        Number of candidates with new contact info found.
+        Number of candidates with new contact info found (with *replay*,
+        the number whose campaign site would change).
     """
+    if replay:
+        return len(
+            replay_campaign_site_search(
+                conn, year=year, race_type=race_type, election_stage=election_stage
+            )
+        )
+
     targets = get_candidates_missing_link(
         conn,
         "campaign_site",
         year=year,
         race_type=race_type,
         election_stage=election_stage,
+        candidate_ids=candidate_ids,
     )
 
     if not targets:
@@ -505,13 +1007,22 @@ def search_all_candidates(
 
     logger.info("Found %d candidates needing search.", len(targets))
 
-    cache = load_cache(cache_path)
-    logger.info("Loaded cache with %d entries.", len(cache))
+    own_cache = cache is None
+    if cache is None:
+        cache = load_cache(cache_path)
+        logger.info("Loaded cache with %d entries.", len(cache))
+    people = people or PersonIndex.from_db(conn)
 
     processed = 0
     found_count = 0
-
-    for row in tqdm(targets, desc="Searching candidate contacts", unit="candidate"):
+    # Raw results are stored alongside the candidates for offline replay
+    search = partial(ddg_search, conn=conn)
+    discovery = BallotpediaDiscovery(search=search)
+
+    for row in PROFILER.units(
+        tqdm(targets, desc="Searching candidate contacts", unit="candidate"),
+        "search",
+    ):
         cid = row["candidate_id"]
         name = row["candidate_name"]
         state = row["state"]
@@ -519,17 +1030,37 @@ def search_all_candidates(
         party = row["party"]
         rt = row["race_type"]
 
-        cache_key = make_cache_key(party, state, district, name)
-
-        if cache_key in cache:
-            contacts = cache[cache_key]
+        # Candidacies PersonIndex groups into one person (primary and
+        # general, later cycles) share results under their first candidacy;
+        # any other candidacy only shares them with its own race, district
+        # and year, so namesakes search separately. Entries written under
+        # the old per-candidacy key are still read.
+        cache_key = _person_cache_key(people, cid, name, state, rt, district, row)
+        legacy_key = make_cache_key(party, state, district, name)
+        cached = cache.get(cache_key, cache.get(legacy_key))
+        METRICS.inc(
+            "camplinks_cache_lookups_total",
+            cache="search",
+            result="miss" if cached is None else "hit",
+        )
+
+        if cached is not None:
+            contacts = dict(cached)
         else:
             keyword = _race_keyword(rt)
-            contacts = find_candidate_info(name, state, district, keyword)
-            cache[cache_key] = contacts
+            contacts = find_candidate_info(
+                name,
+                state,
+                district,
+                keyword,
+                ballotpedia_url=_known_ballotpedia_url(row),
+                discovery=discovery,
+                search=search,
+            )
+            cache[cache_key] = dict(contacts)
             processed += 1
 
-            if processed % SAVE_INTERVAL == 0:
+            if own_cache and processed % SAVE_INTERVAL == 0:
                 save_cache(cache, cache_path)
 
         # Write contact links to DB
@@ -552,11 +1083,13 @@ def search_all_candidates(
                 )
                 any_found = True
 
+        # Commit per candidate so concurrent stages are not locked out
+        conn.commit()
         if any_found:
             found_count += 1
 
-    conn.commit()
-    save_cache(cache, cache_path)
+    if own_cache:
+        save_cache(cache, cache_path)
 
     logger.info(
         "Found contact info for %d / %d candidates (%d new searches).",
@@ -564,12 +1097,14 @@ def search_all_candidates(
         len(targets),
         processed,
     )
+    discovery.report()
 
     search_social_links_for_candidates(
         conn,
         year=year,
         race_type=race_type,
         election_stage=election_stage,
+        candidate_ids=candidate_ids,
     )
 
     return found_count
@@ -0,0 +1,468 @@
+"""Streaming pipeline: overlap scraping with the lookup stages.
+
+The default pipeline runs its stages as barriers -- every scraper
+finishes before enrichment starts, and so on -- so requests to different
+hosts never overlap. In streaming mode each lookup stage runs in its own
+thread with its own database connection, and candidates flow through
+bounded queues::
+
+    scrape (main thread) -> database -> feed -> enrich -> search -> validate
+
+The feed polls the database for candidates with IDs above the last one
+it saw, so scraped candidates are looked up while later pages are still
+being scraped. Existing candidates are fed first, matching what a
+barrier run would process. Each stage handles a batch by calling the
+same idempotent stage function as a barrier run, restricted to the
+batch's candidates, then hands the batch on; a stage skips candidates
+that need nothing, and per-candidate order (enrich before search before
+validate) is preserved.
+
+Each stage paces requests to its own hosts: enrichment reads Wikipedia
+through its MediaWiki client, search queries DuckDuckGo and Ballotpedia,
+validation probes campaign sites and the Wayback Machine. DuckDuckGo,
+used by both enrichment and search, is serialized in
+:func:`camplinks.http.ddg_search`. The bounded queues keep a slow stage
+from accumulating work in memory; the database buffers the rest.
+
+If scraping raises (or is interrupted), or a stage thread dies, every
+thread stops after its current batch instead of draining the queues, and
+:func:`run_streaming` raises.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Collection, Sequence
+from dataclasses import dataclass, field
+from functools import partial
+
+from camplinks.cache import CACHE_FILE, SAVE_INTERVAL, load_cache, save_cache
+from camplinks.db import open_db, year_filter
+from camplinks.enrich import enrich_from_wikipedia, enrich_wikipedia_urls
+from camplinks.identity import PersonIndex, propagate_identities
+from camplinks.mediawiki import MediaWikiClient
+from camplinks.search import search_all_candidates
+from camplinks.validate import VALIDATE_CACHE_FILE, validate_campaign_sites
+
+logger = logging.getLogger(__name__)
+
+STREAM_STAGES: tuple[str, ...] = ("enrich", "search", "validate")
+STREAM_QUEUE_SIZE = 4  # batches buffered between two stages
+STREAM_BATCH_SIZE = 100  # candidates per batch (one bound parameter each)
+STREAM_POLL_S: float = 5.0
+STREAM_BUSY_TIMEOUT_MS = 60_000
+STREAM_STOP_CHECK_S: float = 0.5  # how often blocked threads check for a stop
+
+Batch = list[int]
+Cache = dict[str, dict[str, str]]
+# A stage function may also have a close() method, called when its thread ends
+StageFn = Callable[[sqlite3.Connection, Batch], object]
+
+
+class StreamError(RuntimeError):
+    """A streaming thread died, or batches failed in a stage."""
+
+
+def _open_worker_db(db_path: str) -> sqlite3.Connection:
+    """Open a connection for one streaming thread.
+
+    Writers on other connections commit after each candidate, so a
+    generous busy timeout covers waiting for their short transactions.
+
+    Args:
+        db_path: Path to the SQLite database file.
+
+    Returns:
+        An open connection.
+    """
+    conn = open_db(db_path)
+    conn.execute(f"PRAGMA busy_timeout = {STREAM_BUSY_TIMEOUT_MS}")
+    return conn
+
+
+def _put(
+    q: queue.Queue[Batch | None], item: Batch | None, stop: threading.Event
+) -> bool:
+    """Put *item* on *q*, giving up once *stop* is set.
+
+    Returns:
+        Whether the item was queued.
+    """
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=STREAM_STOP_CHECK_S)
+        except queue.Full:
+            continue
+        return True
+    return False
+
+
+def _get(q: queue.Queue[Batch | None], stop: threading.Event) -> Batch | None:
+    """Take the next batch from *q*, or None at its end or once *stop* is set."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=STREAM_STOP_CHECK_S)
+        except queue.Empty:
+            continue
+    return None
+
+
+# ── Stage functions ────────────────────────────────────────────────────────
+
+
+def _reuse_identities(
+    people: PersonIndex, conn: sqlite3.Connection, ids: Batch
+) -> None:
+    """Copy what is known about the batch's people to their candidacies.
+
+    The stage's index is brought up to date with newly scraped candidacies
+    and only the batch's people are filled, so each batch costs its own
+    size rather than a pass over the whole database.
+    """
+    people.refresh(conn)
+    propagate_identities(conn, people, candidate_ids=ids)
+
+
+def _enrich_batch(
+    client: MediaWikiClient,
+    people: PersonIndex,
+    conn: sqlite3.Connection,
+    ids: Batch,
+) -> None:
+    """Find Wikipedia pages, then campaign sites listed on them."""
+    _reuse_identities(people, conn, ids)
+    enrich_wikipedia_urls(conn, election_stage=None, candidate_ids=ids)
+    enrich_from_wikipedia(conn, election_stage=None, client=client, candidate_ids=ids)
+
+
+def _search_batch(
+    people: PersonIndex, conn: sqlite3.Connection, ids: Batch, cache: Cache
+) -> None:
+    """Search the web for contacts of candidates still missing a site."""
+    _reuse_identities(people, conn, ids)
+    search_all_candidates(
+        conn, election_stage=None, candidate_ids=ids, people=people, cache=cache
+    )
+
+
+def _validate_batch(conn: sqlite3.Connection, ids: Batch, cache: Cache) -> None:
+    """Check campaign sites and look up archives of dead ones."""
+    validate_campaign_sites(conn, election_stage=None, candidate_ids=ids, cache=cache)
+
+
+class _CachedStage:
+    """A batch function whose JSON cache is loaded once per stage thread.
+
+    Called on its own, a stage function loads and rewrites its whole cache
+    file, which per batch would add up to batches x cache size of I/O.
+    Here the cache is loaded on the first batch and passed to each call,
+    and saved every :data:`~camplinks.cache.SAVE_INTERVAL` new entries and
+    when the thread ends.
+    """
+
+    def __init__(
+        self, fn: Callable[[sqlite3.Connection, Batch, Cache], object], path: str
+    ) -> None:
+        self.fn = fn
+        self.path = path
+        self.cache: Cache | None = None
+        self._saved = 0  # cache entries when last loaded or saved
+
+    def __call__(self, conn: sqlite3.Connection, ids: Batch) -> None:
+        if self.cache is None:
+            self.cache = load_cache(self.path)
+            self._saved = len(self.cache)
+        self.fn(conn, ids, self.cache)
+        if len(self.cache) - self._saved >= SAVE_INTERVAL:
+            self.close()
+
+    def close(self) -> None:
+        """Save the cache if it has new entries."""
+        if self.cache is not None and len(self.cache) > self._saved:
+            save_cache(self.cache, self.path)
+            self._saved = len(self.cache)
+
+
+def stage_functions() -> dict[str, StageFn]:
+    """Return the batch function of each streaming stage.
+
+    Filters are applied by the feed, so the stage functions are called
+    with only a candidate ID filter. Enrich and search each keep a person
+    index (see :mod:`camplinks.identity`), and search and validate their
+    cache, used only from their thread.
+
+    Returns:
+        Mapping of stage name -> function(conn, candidate_ids).
+    """
+    return {
+        "enrich": partial(_enrich_batch, MediaWikiClient(), PersonIndex()),
+        "search": _CachedStage(partial(_search_batch, PersonIndex()), CACHE_FILE),
+        "validate": _CachedStage(_validate_batch, VALIDATE_CACHE_FILE),
+    }
+
+
+# ── Threads ────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class StageStats:
+    """Work done by one streaming stage.
+
+    Attributes:
+        batches: Batches processed.
+        candidates: Candidates in those batches.
+        busy_s: Seconds spent inside the stage function.
+        errors: Batches whose stage function raised.
+    """
+
+    batches: int = 0
+    candidates: int = 0
+    busy_s: float = 0.0
+    errors: int = 0
+
+
+@dataclass
+class _Stage:
+    """One lookup stage running in its own thread."""
+
+    name: str
+    fn: StageFn
+    inbox: queue.Queue[Batch | None]
+    outbox: queue.Queue[Batch | None] | None
+    stats: StageStats = field(default_factory=StageStats)
+    error: BaseException | None = None
+
+    def run(self, db_path: str, stop: threading.Event) -> None:
+        """Process batches until the end of the inbox or until *stop* is set.
+
+        If the thread dies, it sets *stop* so the threads around it do not
+        block on its queues.
+        """
+        try:
+            conn = _open_worker_db(db_path)
+            try:
+                self._consume(conn, stop)
+            finally:
+                conn.close()
+                close = getattr(self.fn, "close", None)
+                if close is not None:
+                    close()
+        except BaseException as exc:
+            logger.exception("Stream stage %s died", self.name)
+            self.error = exc
+            stop.set()
+        finally:
+            if self.outbox is not None:
+                _put(self.outbox, None, stop)
+
+    def _consume(self, conn: sqlite3.Connection, stop: threading.Event) -> None:
+        while (batch := _get(self.inbox, stop)) is not None:
+            start = time.perf_counter()
+            try:
+                self.fn(conn, batch)
+            except Exception:
+                # Keep consuming, or the stages upstream would block
+                logger.exception("Stream stage %s failed on a batch", self.name)
+                conn.rollback()
+                self.stats.errors += 1
+            self.stats.busy_s += time.perf_counter() - start
+            self.stats.batches += 1
+            self.stats.candidates += len(batch)
+            if self.outbox is not None and not _put(self.outbox, batch, stop):
+                return
+
+
+@dataclass
+class CandidateFeed:
+    """Feed candidates into the first stage as they appear in the database.
+
+    Attributes:
+        year: Election year (or years) of the candidates to feed.
+        race_type: Race type to feed, or None for every race.
+        election_stage: Election stage to feed, or None for every stage.
+        batch_size: Candidates per batch.
+        poll_s: Seconds between polls while scraping continues.
+        fed: Candidates fed so far.
+        error: What killed the feed thread, if it died.
+    """
+
+    year: int | Collection[int]
+    race_type: str | None = None
+    election_stage: str | None = None
+    batch_size: int = STREAM_BATCH_SIZE
+    poll_s: float = STREAM_POLL_S
+    fed: int = 0
+    error: BaseException | None = None
+
+    def poll(
+        self,
+        conn: sqlite3.Connection,
+        after_id: int,
+        outbox: queue.Queue[Batch | None],
+        stop: threading.Event,
+    ) -> int:
+        """Feed matching candidates with IDs above *after_id*.
+
+        Args:
+            conn: Open database connection.
+            after_id: Highest candidate ID already fed.
+            outbox: Queue of the first stage (blocks while it is full).
+            stop: Set when the stream is stopping; feeding stops too.
+
+        Returns:
+            Highest candidate ID fed.
+        """
+        query = """\
+            SELECT c.candidate_id FROM candidates c
+            JOIN elections e ON c.election_id = e.election_id
+            WHERE c.candidate_id > ? AND c.candidate_name != ''
+        """
+        params: list[str | int] = [after_id]
+        clause, years = year_filter(self.year)
+        query += clause
+        params.extend(years)
+        if self.race_type is not None:
+            query += " AND e.race_type = ?"
+            params.append(self.race_type)
+        if self.election_stage is not None:
+            query += " AND e.election_stage = ?"
+            params.append(self.election_stage)
+        query += " ORDER BY c.candidate_id"
+        ids = [row[0] for row in conn.execute(query, params)]
+        for start in range(0, len(ids), self.batch_size):
+            batch = ids[start : start + self.batch_size]
+            if not _put(outbox, batch, stop):
+                return after_id
+            self.fed += len(batch)
+            after_id = batch[-1]
+        return after_id
+
+    def run(
+        self,
+        db_path: str,
+        outbox: queue.Queue[Batch | None],
+        scrape_done: threading.Event,
+        stop: threading.Event,
+    ) -> None:
+        """Poll until scraping is done, then feed the rest and stop.
+
+        Args:
+            db_path: Path to the SQLite database file.
+            outbox: Queue of the first stage.
+            scrape_done: Set once no more candidates will be inserted.
+            stop: Set when the stream is stopping (also set by this thread
+                if it dies).
+        """
+        try:
+            conn = _open_worker_db(db_path)
+            try:
+                last_id = 0
+                while not stop.is_set():
+                    # Checked before polling, so the last poll sees every row
+                    finished = scrape_done.is_set()
+                    last_id = self.poll(conn, last_id, outbox, stop)
+                    if finished:
+                        break
+                    scrape_done.wait(self.poll_s)
+            finally:
+                conn.close()
+        except BaseException as exc:
+            logger.exception("Stream feed died")
+            self.error = exc
+            stop.set()
+        finally:
+            _put(outbox, None, stop)
+
+
+def run_streaming(
+    db_path: str,
+    feed: CandidateFeed,
+    stages: Sequence[str] = STREAM_STAGES,
+    scrape: Callable[[], None] | None = None,
+    queue_size: int = STREAM_QUEUE_SIZE,
+    functions: dict[str, StageFn] | None = None,
+) -> dict[str, StageStats]:
+    """Run *scrape* while streaming candidates through the lookup stages.
+
+    Args:
+        db_path: Path to the SQLite database file (each thread opens its
+            own connection).
+        feed: Which candidates to feed, and how often to poll.
+        stages: Lookup stages to run, in pipeline order (a subset of
+            :data:`STREAM_STAGES`); candidates skip the others.
+        scrape: Scrapes into the database in the calling thread, or None
+            to stream only the candidates already stored.
+        queue_size: Batches buffered between two stages.
+        functions: Batch function of each stage (default:
+            :func:`stage_functions`).
+
+    Returns:
+        Statistics of each stage that ran.
+
+    Raises:
+        ValueError: If *stages* is empty.
+        StreamError: If the feed or a stage thread died.
+    """
+    if not stages:
+        raise ValueError("Streaming needs at least one lookup stage")
+    functions = functions or stage_functions()
+    inbox: queue.Queue[Batch | None] = queue.Queue(maxsize=queue_size)
+    feed_queue = inbox
+    workers: list[_Stage] = []
+    for i, name in enumerate(stages):
+        outbox: queue.Queue[Batch | None] | None = None
+        if i < len(stages) - 1:
+            outbox = queue.Queue(maxsize=queue_size)
+        workers.append(_Stage(name, functions[name], inbox, outbox))
+        if outbox is not None:
+            inbox = outbox
+
+    scrape_done = threading.Event()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=feed.run,
+            args=(db_path, feed_queue, scrape_done, stop),
+            name="stream-feed",
+        ),
+        *(
+            threading.Thread(
+                target=w.run, args=(db_path, stop), name=f"stream-{w.name}"
+            )
+            for w in workers
+        ),
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    try:
+        if scrape is not None:
+            scrape()
+    except BaseException:
+        # Stop after the batches in progress instead of looking up the rest
+        stop.set()
+        raise
+    finally:
+        scrape_done.set()
+        for thread in threads:
+            thread.join()
+
+    elapsed = time.perf_counter() - start
+    logger.info("Streamed %d candidates in %.1fs.", feed.fed, elapsed)
+    for w in workers:
+        logger.info(
+            "  %-8s %d batches, %d candidates, busy %.1fs (%d failed batches)",
+            w.name,
+            w.stats.batches,
+            w.stats.candidates,
+            w.stats.busy_s,
+            w.stats.errors,
+        )
+    for name, error in [("feed", feed.error), *((w.name, w.error) for w in workers)]:
+        if error is not None:
+            raise StreamError(f"Stream {name} thread died: {error}") from error
+    return {w.name: w.stats for w in workers}
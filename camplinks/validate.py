@@ -12,6 +12,7 @@ import logging
 import random
 import sqlite3
 import time
+from collections.abc import Collection
 from urllib.parse import urlparse
 
 import orjson
@@ -21,7 +22,9 @@ from tqdm import tqdm
 from camplinks.cache import load_cache, make_cache_key, save_cache
 from camplinks.db import get_candidates_with_link, upsert_contact_link
 from camplinks.http import HEADERS
+from camplinks.metrics import METRICS, RESPONSE_HOOKS, count_delay
 from camplinks.models import ContactLink
+from camplinks.profiling import PROFILER
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +54,7 @@ def check_url_accessible(url: str) -> bool:
             headers=HEADERS,
             timeout=HEAD_TIMEOUT_S,
             allow_redirects=True,
+            hooks=RESPONSE_HOOKS,
         )
         if resp.status_code == 405:
             resp = requests.get(
@@ -58,6 +62,7 @@ def check_url_accessible(url: str) -> bool:
                 headers=HEADERS,
                 timeout=HEAD_TIMEOUT_S,
                 allow_redirects=True,
+                hooks=RESPONSE_HOOKS,
             )
         return resp.status_code < 400
     except requests.RequestException:
@@ -92,6 +97,7 @@ def query_wayback(url: str, year: int) -> str:
     BACKOFF = [30, 60, 120]
     rows = None
     for attempt in range(3):
+        count_delay(WAYBACK_CDX_URL, WAYBACK_DELAY_S * (attempt + 1))
         time.sleep(WAYBACK_DELAY_S * (attempt + 1))
         try:
             resp = requests.get(
@@ -99,6 +105,7 @@ def query_wayback(url: str, year: int) -> str:
                 params=params,
                 headers=HEADERS,
                 timeout=60,
+                hooks=RESPONSE_HOOKS,
             )
             if resp.status_code == 429:
                 backoff = BACKOFF[min(attempt, len(BACKOFF) - 1)]
@@ -106,6 +113,7 @@ def query_wayback(url: str, year: int) -> str:
                     "Wayback CDX 429 for %s (attempt %d/3), sleeping %ds",
                     url, attempt + 1, backoff,
                 )
+                count_delay(WAYBACK_CDX_URL, backoff)
                 time.sleep(backoff)
                 continue
             resp.raise_for_status()
@@ -138,9 +146,11 @@ def query_wayback(url: str, year: int) -> str:
 def validate_campaign_sites(
     conn: sqlite3.Connection,
     cache_path: str = VALIDATE_CACHE_FILE,
-    year: int | None = None,
+    year: int | Collection[int] | None = None,
     race_type: str | None = None,
     election_stage: str | None = "general",
+    candidate_ids: Collection[int] | None = None,
+    cache: dict[str, dict[str, str]] | None = None,
 ) -> int:
     """Validate campaign site URLs and archive inaccessible ones.
 
@@ -151,10 +161,14 @@ def validate_campaign_sites(
     Args:
         conn: Open database connection.
         cache_path: Path for the incremental validation cache file.
-        year: Optional filter by election year.
+        year: Optional filter by election year (or years).
         race_type: Optional filter by race type.
         election_stage: Optional filter by election stage. Defaults to
             "general" to avoid validating primary-only candidates.
+        candidate_ids: Optional filter to these candidates.
+        cache: Validation cache already loaded by the caller, updated in
+            place and saved by the caller (loaded from and saved to
+            *cache_path* if None).
 
     Returns:
         Number of archived URLs found and saved.
@@ -166,20 +180,26 @@ def validate_campaign_sites(
         year=year,
         race_type=race_type,
         election_stage=election_stage,
+        candidate_ids=candidate_ids,
     )
     if not targets:
         logger.info("No campaign sites to validate.")
         return 0
 
     logger.info("Found %d campaign sites to validate.", len(targets))
-    cache = load_cache(cache_path)
+    own_cache = cache is None
+    if cache is None:
+        cache = load_cache(cache_path)
 
     archived_count = 0
     accessible_count = 0
     inaccessible_count = 0
     processed = 0
 
-    for row in tqdm(targets, desc="Validating campaign sites", unit="candidate"):
+    for row in PROFILER.units(
+        tqdm(targets, desc="Validating campaign sites", unit="candidate"),
+        "validate",
+    ):
         cid: int = row["candidate_id"]
         url: str = row["campaign_site_url"]
         key = make_cache_key(
@@ -189,7 +209,13 @@ def validate_campaign_sites(
             row["candidate_name"],
         )
 
-        if key in cache:
+        hit = key in cache
+        METRICS.inc(
+            "camplinks_cache_lookups_total",
+            cache="validate",
+            result="hit" if hit else "miss",
+        )
+        if hit:
             entry = cache[key]
         else:
             accessible = check_url_accessible(url)
@@ -211,7 +237,7 @@ def validate_campaign_sites(
             cache[key] = entry
             processed += 1
 
-            if processed % VALIDATE_SAVE_INTERVAL == 0:
+            if own_cache and processed % VALIDATE_SAVE_INTERVAL == 0:
                 save_cache(cache, cache_path)
 
         if entry["status"] == "accessible":
@@ -229,10 +255,12 @@ def validate_campaign_sites(
                         source="wayback",
                     ),
                 )
+                # Commit per write so concurrent stages are not locked out
+                conn.commit()
                 archived_count += 1
 
-    conn.commit()
-    save_cache(cache, cache_path)
+    if own_cache:
+        save_cache(cache, cache_path)
 
     logger.info(
         "Validation complete: %d checked, %d accessible, "
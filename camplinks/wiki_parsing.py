@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import re
 
-from bs4 import Tag
+from bs4 import SoupStrainer, Tag
 
 from camplinks.http import BASE_URL
 from camplinks.models import Candidate
@@ -25,9 +25,91 @@ _PRIMARY_PARTY_RE = re.compile(
 )
 
 
+# Elements the Wikipedia results scrapers read from a state page: the title,
+# section headings and tables. Headings nested in other containers (e.g. a
+# table of contents) are also kept and become siblings of the tables.
+RESULTS_PAGE_STRAINER = SoupStrainer(["title", "h2", "h3", "h4", "table"])
+
+_INDEXED_HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+
+class HeadingIndex:
+    """Precomputed preceding-heading lookups for the elements of a page.
+
+    :func:`find_preceding_heading` walks ``previous_sibling`` backwards from
+    each table, so a page with hundreds of result tables costs quadratic
+    time, and scrapers repeat the walk several times per table. The index
+    instead walks the children of each table's parent once, recording for
+    every child the most recent heading of each level seen so far. Lookups
+    are then constant time and return exactly what
+    :func:`find_preceding_heading` would.
+
+    Parents are indexed on construction for every ``<table>`` under *root*
+    and lazily for any other element that is looked up.
+    """
+
+    def __init__(self, root: Tag) -> None:
+        """Index the parents of every table under *root*.
+
+        Args:
+            root: Parsed page (or any subtree of it).
+        """
+        # id(child) -> {heading name: (sibling position, order in wrapper, tag)}
+        self._before: dict[int, dict[str, tuple[int, int, Tag]]] = {}
+        self._indexed: set[int] = set()
+        for table in root.find_all("table"):
+            if table.parent is not None:
+                self._index_parent(table.parent)
+
+    def _index_parent(self, parent: Tag) -> None:
+        if id(parent) in self._indexed:
+            return
+        self._indexed.add(id(parent))
+        last: dict[str, tuple[int, int, Tag]] = {}
+        for pos, child in enumerate(parent.children):
+            if not isinstance(child, Tag):
+                continue
+            self._before[id(child)] = dict(last)
+            if child.name in _INDEXED_HEADINGS:
+                last[child.name] = (pos, 0, child)
+            elif child.name == "div" and "mw-heading" in (child.get("class") or []):
+                seen: set[str] = set()
+                for order, inner in enumerate(child.find_all(_INDEXED_HEADINGS)):
+                    if inner.name not in seen:
+                        seen.add(inner.name)
+                        last[inner.name] = (pos, order, inner)
+
+    def preceding(self, element: Tag, heading_tags: tuple[str, ...]) -> Tag | None:
+        """Return the nearest heading before *element* among its siblings.
+
+        Args:
+            element: Element to look up.
+            heading_tags: Tuple of tag names to match (e.g. ``("h2",)``).
+
+        Returns:
+            The same Tag :func:`find_preceding_heading` returns, or None.
+        """
+        if any(tag not in _INDEXED_HEADINGS for tag in heading_tags):
+            return find_preceding_heading(element, heading_tags)
+        if element.parent is None:
+            return None
+        if id(element) not in self._before:
+            self._index_parent(element.parent)
+        before = self._before.get(id(element), {})
+        best: tuple[int, int, Tag] | None = None
+        for tag in heading_tags:
+            entry = before.get(tag)
+            if entry is None:
+                continue
+            if best is None or (entry[0], -entry[1]) > (best[0], -best[1]):
+                best = entry
+        return best[2] if best else None
+
+
 def find_preceding_heading(
     element: Tag,
     heading_tags: tuple[str, ...],
+    index: HeadingIndex | None = None,
 ) -> Tag | None:
     """Walk backward through siblings to find the nearest heading tag.
 
@@ -38,10 +120,14 @@ def find_preceding_heading(
     Args:
         element: Starting element.
         heading_tags: Tuple of tag names to match (e.g. ``("h2",)``).
+        index: Optional :class:`HeadingIndex` for the page; when given the
+            lookup is answered from the index instead of walking siblings.
 
     Returns:
         The first matching heading Tag, or None.
     """
+    if index is not None:
+        return index.preceding(element, heading_tags)
     prev = element.previous_sibling
     while prev is not None:
         if isinstance(prev, Tag):
@@ -79,7 +165,10 @@ def extract_district_number(heading_text: str) -> str:
     return m3.group(1) if m3 else "At-Large"
 
 
-def classify_election_table(table: Tag) -> str | None:
+def classify_election_table(
+    table: Tag,
+    index: HeadingIndex | None = None,
+) -> str | None:
     """Classify a wikitable as general, primary, runoff, or unknown.
 
     Checks the caption and the preceding h3/h4 heading to determine
@@ -87,6 +176,7 @@ def classify_election_table(table: Tag) -> str | None:
 
     Args:
         table: A ``<table>`` element.
+        index: Optional :class:`HeadingIndex` for the page.
 
     Returns:
         ``"general"``, ``"primary"``, ``"runoff"``, or None if
@@ -102,7 +192,7 @@ def classify_election_table(table: Tag) -> str | None:
         if "election" in cap_text:
             return "general"
 
-    heading = find_preceding_heading(table, ("h3", "h4"))
+    heading = find_preceding_heading(table, ("h3", "h4"), index)
     if heading:
         h_text = heading.get_text(strip=True).lower()
         if "runoff" in h_text:
@@ -115,7 +205,10 @@ def classify_election_table(table: Tag) -> str | None:
     return None
 
 
-def is_general_election_table(table: Tag) -> bool:
+def is_general_election_table(
+    table: Tag,
+    index: HeadingIndex | None = None,
+) -> bool:
     """Heuristic: does this plainrowheaders table represent a general election?
 
     Thin wrapper around :func:`classify_election_table` for backward
@@ -123,14 +216,15 @@ def is_general_election_table(table: Tag) -> bool:
 
     Args:
         table: A ``<table>`` element.
+        index: Optional :class:`HeadingIndex` for the page.
 
     Returns:
         True if this appears to be a general-election results table.
     """
-    return classify_election_table(table) == "general"
+    return classify_election_table(table, index) == "general"
 
 
-def extract_primary_party(table: Tag) -> str:
+def extract_primary_party(table: Tag, index: HeadingIndex | None = None) -> str:
     """Extract the party name from the heading above a primary election table.
 
     Primary tables on Wikipedia are typically under h2 headings like
@@ -138,12 +232,13 @@ def extract_primary_party(table: Tag) -> str:
 
     Args:
         table: A ``<table>`` element identified as a primary table.
+        index: Optional :class:`HeadingIndex` for the page.
 
     Returns:
         Party name (e.g. "Republican", "Democratic"), or empty string.
     """
     for heading_tags in (("h2",), ("h3",)):
-        heading = find_preceding_heading(table, heading_tags)
+        heading = find_preceding_heading(table, heading_tags, index)
         if heading:
             h_text = heading.get_text(strip=True)
             m = _PRIMARY_PARTY_RE.search(h_text)
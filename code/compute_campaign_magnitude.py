@@ -27,21 +27,31 @@ Candidates with no eligible data across all modalities are written as
 "no_relevant_data". Candidates with no tweets and no campaign site content
 at all are left NULL.
 
-Adds campaign_ai_magnitude column to candidates table if absent, then updates
-all candidates that have data in at least one modality.
+Adds campaign_ai_magnitude column to candidates table if absent, then computes
+every candidate's magnitude with a single grouped query (one GROUP BY pass per
+modality rather than four queries per candidate) and writes them back in one
+bulk update.
+
+Incremental runs: triggers on tweets and campaign_site_content record the
+candidate_id of every inserted, deleted, or re-scored row in a
+magnitude_dirty table. By default only those candidates (plus any whose
+magnitude has never been computed) are recomputed, so the job is cheap enough
+to run after every detection batch. The first run after the triggers are
+installed, or a run with --full, recomputes everyone.
 
 Usage:
     python code/compute_campaign_magnitude.py
+    python code/compute_campaign_magnitude.py --full
 """
 
 from __future__ import annotations
 
+import argparse
 import logging
 import sqlite3
+from collections.abc import Iterable
 from pathlib import Path
 
-from tqdm import tqdm
-
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
@@ -61,6 +71,61 @@ def ensure_column(conn: sqlite3.Connection) -> None:
         logger.info("Added campaign_ai_magnitude column to candidates.")
 
 
+# Columns whose changes can alter a candidate's magnitude.
+_TRACKED_COLUMNS: dict[str, str] = {
+    "tweets": "candidate_id, token_length, assistance_score, image_AI_result",
+    "campaign_site_content": (
+        "candidate_id, content_type, token_length, assistance_score, image_AI_result"
+    ),
+}
+
+
+def ensure_change_tracking(conn: sqlite3.Connection) -> bool:
+    """Create the magnitude_dirty table and the triggers that populate it.
+
+    Args:
+        conn: Open SQLite connection.
+
+    Returns:
+        True if tracking was installed by this call, meaning changes made
+        before now were not recorded and a full recompute is required.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'magnitude_dirty'"
+    ).fetchone()
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS magnitude_dirty "
+        "(candidate_id INTEGER PRIMARY KEY)"
+    )
+    for table, columns in _TRACKED_COLUMNS.items():
+        conn.executescript(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_magnitude_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                INSERT OR IGNORE INTO magnitude_dirty VALUES (NEW.candidate_id);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS {table}_magnitude_update
+            AFTER UPDATE OF {columns} ON {table}
+            BEGIN
+                INSERT OR IGNORE INTO magnitude_dirty VALUES (OLD.candidate_id);
+                INSERT OR IGNORE INTO magnitude_dirty VALUES (NEW.candidate_id);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS {table}_magnitude_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                INSERT OR IGNORE INTO magnitude_dirty VALUES (OLD.candidate_id);
+            END;
+            """
+        )
+    conn.commit()
+    if not exists:
+        logger.info("Installed magnitude change tracking.")
+    return not exists
+
+
 def text_fraction(
     tweet_rows: list[tuple[int, float]],
     site_rows: list[tuple[int, float]],
@@ -106,95 +171,211 @@ def image_fraction(
     return sum(1 for result in combined_image_results if result == "yes") / len(combined_image_results)
 
 
-def main() -> None:
-    """Entry point."""
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.execute("PRAGMA journal_mode = WAL")
+# ── Set-based computation ─────────────────────────────────────────────────────
+
+# One pass over tweets and campaign_site_content: each modality is reduced to
+# per-candidate aggregates with GROUP BY, then LEFT JOINed onto candidates so
+# every candidate gets exactly one row. {targets} is either empty or a filter
+# restricting every scan to the candidates in temp.magnitude_targets.
+MAGNITUDE_SQL = """\
+WITH text_rows AS (
+    SELECT candidate_id, token_length, assistance_score
+    FROM tweets
+    WHERE assistance_score IS NOT NULL
+      AND token_length IS NOT NULL
+      {targets}
+    UNION ALL
+    SELECT candidate_id, token_length, assistance_score
+    FROM campaign_site_content
+    WHERE content_type = 'text'
+      AND assistance_score IS NOT NULL
+      AND token_length IS NOT NULL
+      {targets}
+),
+image_rows AS (
+    SELECT candidate_id, image_AI_result
+    FROM tweets
+    WHERE image_AI_result IN ('yes', 'no')
+      {targets}
+    UNION ALL
+    SELECT candidate_id, image_AI_result
+    FROM campaign_site_content
+    WHERE content_type = 'image'
+      AND image_AI_result IN ('yes', 'no')
+      {targets}
+),
+text_agg AS (
+    SELECT candidate_id,
+           COUNT(*) AS n_text,
+           SUM(CASE WHEN token_length > 0 THEN token_length * assistance_score END)
+               AS weighted_score,
+           SUM(CASE WHEN token_length > 0 THEN token_length END) AS total_tokens
+    FROM text_rows
+    GROUP BY candidate_id
+),
+image_agg AS (
+    SELECT candidate_id,
+           COUNT(*) AS n_images,
+           SUM(image_AI_result = 'yes') AS n_ai_images
+    FROM image_rows
+    GROUP BY candidate_id
+)
+SELECT c.candidate_id,
+       COALESCE(t.n_text, 0),
+       t.weighted_score,
+       t.total_tokens,
+       COALESCE(i.n_images, 0),
+       COALESCE(i.n_ai_images, 0)
+FROM candidates c
+LEFT JOIN text_agg t ON t.candidate_id = c.candidate_id
+LEFT JOIN image_agg i ON i.candidate_id = c.candidate_id
+WHERE 1 = 1 {c_targets}
+ORDER BY c.candidate_id
+"""
 
-    ensure_column(conn)
+_TARGET_FILTER = "AND {col} IN (SELECT candidate_id FROM temp.magnitude_targets)"
 
-    candidate_ids = [
-        r[0] for r in conn.execute("SELECT candidate_id FROM candidates").fetchall()
-    ]
 
-    logger.info("Computing magnitude for %d candidates.", len(candidate_ids))
+def compute_magnitudes(
+    conn: sqlite3.Connection,
+    candidate_ids: Iterable[int] | None = None,
+) -> dict[int, float | str]:
+    """Compute campaign_ai_magnitude for many candidates in one grouped query.
 
-    updated = 0
-    for cid in tqdm(sorted(candidate_ids), desc="Computing magnitude", unit="candidate"):
+    Produces the same values as applying :func:`text_fraction` and
+    :func:`image_fraction` to each candidate's rows individually.
 
-        # ── Tweets: text ─────────────────────────────────────────────────────
-        tweet_text_rows = conn.execute(
-            """
-            SELECT token_length, assistance_score
-            FROM tweets
-            WHERE candidate_id = ?
-              AND assistance_score IS NOT NULL
-              AND token_length IS NOT NULL
-            """,
-            (cid,),
-        ).fetchall()
+    Args:
+        conn: Open SQLite connection with tweets and campaign_site_content.
+        candidate_ids: Optional subset of candidates to compute. If None,
+            every candidate is computed.
+
+    Returns:
+        Mapping of candidate_id to magnitude, or ``"no_relevant_data"`` for
+        candidates with no eligible rows in any modality.
+    """
+    if candidate_ids is None:
+        sql = MAGNITUDE_SQL.format(targets="", c_targets="")
+    else:
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS magnitude_targets "
+            "(candidate_id INTEGER PRIMARY KEY)"
+        )
+        conn.execute("DELETE FROM temp.magnitude_targets")
+        conn.executemany(
+            "INSERT OR IGNORE INTO temp.magnitude_targets VALUES (?)",
+            ((cid,) for cid in candidate_ids),
+        )
+        sql = MAGNITUDE_SQL.format(
+            targets=_TARGET_FILTER.format(col="candidate_id"),
+            c_targets=_TARGET_FILTER.format(col="c.candidate_id"),
+        )
+
+    magnitudes: dict[int, float | str] = {}
+    for cid, n_text, weighted, tokens, n_images, n_ai in conn.execute(sql):
+        if not n_text and not n_images:
+            magnitudes[cid] = "no_relevant_data"
+            continue
+        text_part = weighted / tokens if tokens else 0.0
+        image_part = n_ai / n_images if n_images else 0.0
+        magnitudes[cid] = text_part + image_part
+    return magnitudes
+
+
+def write_magnitudes(
+    conn: sqlite3.Connection,
+    magnitudes: dict[int, float | str],
+) -> int:
+    """Write magnitudes to candidates.campaign_ai_magnitude in one bulk update.
 
-        # ── Tweets: images ───────────────────────────────────────────────────
-        tweet_image_results = [
-            r[0] for r in conn.execute(
-                """
-                SELECT image_AI_result
-                FROM tweets
-                WHERE candidate_id = ?
-                  AND image_AI_result IN ('yes', 'no')
-                """,
-                (cid,),
-            ).fetchall()
-        ]
-
-        # ── Campaign site: text ───────────────────────────────────────────────
-        site_text_rows = conn.execute(
+    Args:
+        conn: Open SQLite connection.
+        magnitudes: Mapping of candidate_id to magnitude.
+
+    Returns:
+        Number of candidates updated.
+    """
+    conn.executemany(
+        "UPDATE candidates SET campaign_ai_magnitude = ? WHERE candidate_id = ?",
+        [(magnitude, cid) for cid, magnitude in magnitudes.items()],
+    )
+    conn.commit()
+    return len(magnitudes)
+
+
+def recompute_dirty(conn: sqlite3.Connection) -> int:
+    """Recompute only candidates marked dirty or never computed.
+
+    The dirty set is snapshotted and cleared inside the same write
+    transaction as the update, so rows re-scored by a concurrent
+    detection run are picked up by the next call rather than lost.
+
+    Args:
+        conn: Open SQLite connection with change tracking installed.
+
+    Returns:
+        Number of candidates updated.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    candidate_ids = [
+        r[0]
+        for r in conn.execute(
+            """
+            SELECT candidate_id FROM magnitude_dirty
+            UNION
+            SELECT candidate_id FROM candidates WHERE campaign_ai_magnitude IS NULL
             """
-            SELECT token_length, assistance_score
-            FROM campaign_site_content
-            WHERE candidate_id = ?
-              AND content_type = 'text'
-              AND assistance_score IS NOT NULL
-              AND token_length IS NOT NULL
-            """,
-            (cid,),
         ).fetchall()
+    ]
+    if not candidate_ids:
+        conn.commit()
+        return 0
+    magnitudes = compute_magnitudes(conn, candidate_ids)
+    conn.execute(
+        "DELETE FROM magnitude_dirty "
+        "WHERE candidate_id IN (SELECT candidate_id FROM temp.magnitude_targets)"
+    )
+    return write_magnitudes(conn, magnitudes)
 
-        # ── Campaign site: images ─────────────────────────────────────────────
-        site_image_results = [
-            r[0] for r in conn.execute(
-                """
-                SELECT image_AI_result
-                FROM campaign_site_content
-                WHERE candidate_id = ?
-                  AND content_type = 'image'
-                  AND image_AI_result IN ('yes', 'no')
-                """,
-                (cid,),
-            ).fetchall()
-        ]
-
-        has_any_data = any([
-            tweet_text_rows, tweet_image_results,
-            site_text_rows, site_image_results,
-        ])
-
-        magnitude: float | str
-        if not has_any_data:
-            magnitude = "no_relevant_data"
-        else:
-            magnitude = (
-                text_fraction(tweet_text_rows, site_text_rows)
-                + image_fraction(tweet_image_results, site_image_results)
-            )
 
-        conn.execute(
-            "UPDATE candidates SET campaign_ai_magnitude = ? WHERE candidate_id = ?",
-            (magnitude, cid),
-        )
-        updated += 1
+def recompute_all(conn: sqlite3.Connection) -> int:
+    """Recompute every candidate and clear the dirty set.
+
+    Args:
+        conn: Open SQLite connection with change tracking installed.
+
+    Returns:
+        Number of candidates updated.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    magnitudes = compute_magnitudes(conn)
+    conn.execute("DELETE FROM magnitude_dirty")
+    return write_magnitudes(conn, magnitudes)
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(
+        description="Compute per-candidate AI magnitude scores."
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Recompute every candidate instead of only changed ones.",
+    )
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(str(DB_PATH), isolation_level=None)
+    conn.execute("PRAGMA journal_mode = WAL")
+
+    ensure_column(conn)
+    newly_tracked = ensure_change_tracking(conn)
+
+    if args.full or newly_tracked:
+        updated = recompute_all(conn)
+    else:
+        updated = recompute_dirty(conn)
 
-    conn.commit()
     conn.close()
     logger.info("Done. Updated %d candidates.", updated)
 
@@ -4,22 +4,42 @@ Queries campaign_site_content where content_type = 'image', image_path is set,
 and image_AI_result IS NULL. For each row, loads the local image file,
 sends it to GPT-5.4-mini, and upserts the result into image_AI_result.
 
+Images are deduplicated by perceptual hash (see camplinks.image_hash): only the
+first image of each near-duplicate cluster is sent to the model, and its verdict
+is reused for re-posted logos, headshots and graphics, including verdicts
+stored by earlier runs or by the tweet detection scripts. Pass --no-dedup to
+classify every image.
+
 Requires OPENAI_API_KEY in environment or .env file.
 """
 
 from __future__ import annotations
 
+import argparse
 import base64
 import logging
 import os
 import sqlite3
+import sys
 import time
+from functools import partial
 from pathlib import Path
+from typing import Any
 
 from dotenv import load_dotenv
 from openai import OpenAI
 from tqdm import tqdm
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from camplinks.batch_jobs import (  # noqa: E402
+    MIME_MAP,
+    BatchRunner,
+    write_back,
+    write_image_request,
+    yes_no_label,
+)
+from camplinks.image_hash import DEFAULT_MAX_DISTANCE, ImageDedupIndex  # noqa: E402
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
@@ -31,15 +51,8 @@ PROMPT = "Is this an AI-generated image? Answer in one word: yes or no"
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
 MAX_RETRIES = 3
 RETRY_BACKOFF = [10, 30, 60]
-
-MIME_MAP = {
-    ".jpg": "image/jpeg",
-    ".jpeg": "image/jpeg",
-    ".png": "image/png",
-    ".webp": "image/webp",
-    ".gif": "image/gif",
-}
-
+STATE_FILE = Path(__file__).parent / "camp_sites_batch_state.json"
+BATCH_SIZE = 300
 
 def classify_image(client: OpenAI, image_path: Path) -> str:
     """Ask GPT-5.4-mini whether an image is AI-generated.
@@ -92,8 +105,98 @@ def classify_image(client: OpenAI, image_path: Path) -> str:
     return "API error"
 
 
+def run_batch(
+    conn: sqlite3.Connection,
+    client: OpenAI,
+    rows: list[tuple[int, str, str]],
+    index: ImageDedupIndex | None,
+    test: bool = False,
+) -> int:
+    """Classify campaign site images through the OpenAI Batch API.
+
+    Submits one request per near-duplicate cluster (or per image without an
+    index) unless batches from an earlier run are still pending, then waits
+    for every pending batch and writes verdicts to all matching rows.
+
+    Args:
+        conn: Open SQLite connection.
+        client: Authenticated OpenAI client.
+        rows: (content_id, candidate_name, image_path) rows to classify.
+        index: Dedup index, or None to submit every image.
+        test: Submit only the first batch.
+
+    Returns:
+        Number of rows labeled.
+    """
+    runner = BatchRunner(client, STATE_FILE, batch_size=BATCH_SIZE)
+    images: dict[int, Path] = {}
+    for content_id, _, image_path_str in rows:
+        abs_path = IMAGE_ROOT / image_path_str
+        if abs_path.suffix.lower() in IMAGE_EXTENSIONS and abs_path.exists():
+            images[content_id] = abs_path
+    labels: dict[Path, str] = {}
+
+    def resolve() -> int:
+        resolved: dict[int, str] = {}
+        for content_id, path in images.items():
+            label = labels.get(path)
+            if label is None and index is not None:
+                label = index.lookup(path)
+            if label is not None:
+                resolved[content_id] = label
+        for content_id in resolved:
+            del images[content_id]
+        written = write_back(
+            conn, "campaign_site_content", "content_id", "image_AI_result", resolved
+        )
+        conn.commit()
+        return written
+
+    saved = 0
+    if not runner.pending:
+        if index is not None:
+            saved += resolve()
+            assignment = index.representatives(images.values())
+            conn.commit()
+        else:
+            assignment = {p: p for p in images.values()}
+        reps = list(dict.fromkeys(assignment.values()))
+        logger.info("%d images -> %d requests after dedup.", len(images), len(reps))
+        write = partial(write_image_request, model=MODEL, prompt=PROMPT,
+                        max_completion_tokens=30)
+        runner.submit(
+            ((str(p), partial(write, image_path=p)) for p in reps),
+            max_batches=1 if test else None,
+        )
+    else:
+        logger.info("Resuming — %d batches already submitted.", len(runner.pending))
+
+    def on_results(results: dict[str, dict[str, Any] | None]) -> None:
+        nonlocal saved
+        for key, body in results.items():
+            label = yes_no_label(body)
+            labels[Path(key)] = label
+            if index is not None:
+                index.record(Path(key), label)
+        saved += resolve()
+
+    runner.collect(on_results)
+    return saved
+
+
 def main() -> None:
     """Entry point."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="Classify every image, even near-duplicates.")
+    parser.add_argument("--max-distance", type=int, default=DEFAULT_MAX_DISTANCE,
+                        help="Max hash bit difference treated as the same image.")
+    parser.add_argument("--batch", action="store_true",
+                        help="Use the OpenAI Batch API instead of synchronous calls.")
+    parser.add_argument("--test", action="store_true",
+                        help="With --batch, submit only the first batch.")
+    args = parser.parse_args()
+
     load_dotenv()
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -117,6 +220,13 @@ def main() -> None:
 
         logger.info("Found %d campaign site images to classify.", len(rows))
 
+        index = None if args.no_dedup else ImageDedupIndex(conn, args.max_distance)
+
+        if args.batch:
+            labeled = run_batch(conn, client, rows, index, test=args.test)
+            logger.info("Done. %d images labeled via batch.", labeled)
+            return
+
         processed = skipped = 0
 
         for content_id, candidate_name, image_path_str in tqdm(rows, desc="Classifying images", unit="image"):
@@ -131,7 +241,11 @@ def main() -> None:
                 skipped += 1
                 continue
 
-            label = classify_image(client, abs_path)
+            label = index.lookup(abs_path) if index else None
+            if label is None:
+                label = classify_image(client, abs_path)
+                if index:
+                    index.record(abs_path, label)
             logger.info("[%s] %s -> %s", candidate_name, abs_path.name, label)
 
             conn.execute(
@@ -150,6 +264,8 @@ def main() -> None:
         "Done. %d images classified, %d skipped (not found or invalid).",
         processed, skipped,
     )
+    if index:
+        logger.info("%d verdicts reused from near-duplicate images.", index.reused)
 
 
 if __name__ == "__main__":
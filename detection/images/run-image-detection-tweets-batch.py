@@ -2,10 +2,15 @@
 
 Splits tweets with images into batches of BATCH_SIZE, submits each as an
 OpenAI batch job (50% cheaper than synchronous calls), polls for completion,
-and writes results back to the tweets table as image_AI_result.
+and writes results back to the tweets table as image_AI_result. Submission,
+state, polling and parsing are handled by camplinks.batch_jobs.BatchRunner.
 
-Each image in a tweet gets its own request (custom_id = "{tweet_db_id}_{img_idx}").
-A tweet is labeled "yes" if any image is AI-generated, "no" if all are human.
+Images are deduplicated by perceptual hash first (see camplinks.image_hash):
+images whose near-duplicate already has a stored verdict are resolved without a
+request, and the rest are clustered so only one representative per cluster is
+submitted. Verdicts are propagated to every tweet whose images fall in the
+cluster. A tweet is labeled "yes" if any image is AI-generated, "no" if all are
+human. Pass --no-dedup to submit every image.
 
 Skips .mp4 and other video files. Skips tweets already labeled.
 Saves a batch_state.json file to resume if interrupted.
@@ -16,18 +21,26 @@ Requires OPENAI_API_KEY in environment or .env file.
 from __future__ import annotations
 
 import argparse
-import base64
 import logging
 import os
+import re
 import sqlite3
-import tempfile
-import time
+import sys
+from functools import partial
 from pathlib import Path
+from typing import Any
 
-import orjson
 from dotenv import load_dotenv
 from openai import OpenAI
-from tqdm import tqdm
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from camplinks.batch_jobs import (  # noqa: E402
+    BatchRunner,
+    write_back,
+    write_image_request,
+    yes_no_label,
+)
+from camplinks.image_hash import DEFAULT_MAX_DISTANCE, ImageDedupIndex  # noqa: E402
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
@@ -41,26 +54,11 @@ POLL_INTERVAL_S = 60      # seconds between status checks
 MODEL = "gpt-5.4-mini"
 PROMPT = "Is this an AI-generated image? Answer in one word: yes or no"
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
-MIME_MAP = {
-    ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
-    ".png": "image/png", ".webp": "image/webp", ".gif": "image/gif",
-}
+LEGACY_ID_RE = re.compile(r"^(\d+)_\d+$")
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def encode_image(path: Path) -> str:
-    """Base64-encode a local image file.
-
-    Args:
-        path: Absolute path to the image.
-
-    Returns:
-        Base64-encoded string.
-    """
-    return base64.standard_b64encode(path.read_bytes()).decode("utf-8")
-
-
 def get_image_paths(image_paths_str: str) -> list[Path]:
     """Return valid local image paths from a comma-separated image_paths string.
 
@@ -87,177 +85,63 @@ def get_image_paths(image_paths_str: str) -> list[Path]:
     return paths
 
 
-def build_request(tweet_db_id: int, img_idx: int, img_path: Path) -> dict:
-    """Build a single JSONL batch request object for one image.
+def aggregate_labels(labels: list[str]) -> str:
+    """Combine per-image labels into a tweet label.
 
     Args:
-        tweet_db_id: DB primary key of the tweet.
-        img_idx: Index of this image within the tweet.
-        img_path: Local path to the image file.
+        labels: Labels of the tweet's images.
 
     Returns:
-        Dict formatted for OpenAI batch JSONL input.
+        "yes" if any image is AI-generated, "API error" if any image errored,
+        otherwise "no".
     """
-    suffix = img_path.suffix.lower()
-    mime = MIME_MAP.get(suffix, "image/jpeg")
-    b64 = encode_image(img_path)
-    return {
-        "custom_id": f"{tweet_db_id}_{img_idx}",
-        "method": "POST",
-        "url": "/v1/chat/completions",
-        "body": {
-            "model": MODEL,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "image_url", "image_url": {"url": f"data:{mime};base64,{b64}"}},
-                        {"type": "text", "text": PROMPT},
-                    ],
-                }
-            ],
-            "max_completion_tokens": 10,
-        },
-    }
-
-
-# ── State persistence ─────────────────────────────────────────────────────────
-
-def load_state() -> dict:
-    """Load batch state from disk for resumability.
+    if "yes" in labels:
+        return "yes"
+    if "API error" in labels or "output error" in labels:
+        return "API error"
+    return "no"
 
-    Returns:
-        Dict with 'pending_batches' list of {batch_id, tweet_db_ids}.
-    """
-    if STATE_FILE.exists():
-        return orjson.loads(STATE_FILE.read_bytes())
-    return {"pending_batches": []}
 
+def resolve_tweets(
+    conn: sqlite3.Connection,
+    tweets: dict[int, list[Path]],
+    labels: dict[Path, str],
+    index: ImageDedupIndex | None,
+) -> int:
+    """Write labels for tweets whose images all have a verdict.
 
-def save_state(state: dict) -> None:
-    """Persist batch state to disk.
+    Resolved tweets are removed from *tweets*. Does not commit.
 
     Args:
-        state: State dict to write.
-    """
-    STATE_FILE.write_bytes(orjson.dumps(state))
-
-
-# ── Batch submission ──────────────────────────────────────────────────────────
-
-def submit_batch(client: OpenAI, tweet_chunk: list[tuple[int, str]]) -> str | None:
-    """Build a JSONL file for a chunk of tweets and submit as an OpenAI batch.
-
-    Args:
-        client: Authenticated OpenAI client.
-        tweet_chunk: List of (tweet_db_id, image_paths_str) tuples.
+        conn: Open SQLite connection.
+        tweets: Mapping of tweet_db_id -> image paths, still unlabeled.
+        labels: Verdicts for images that were submitted.
+        index: Dedup index used to reuse near-duplicate verdicts, or None.
 
     Returns:
-        OpenAI batch ID, or None if no valid images in the chunk.
+        Number of tweets labeled.
     """
-    lines = []
-    for tweet_db_id, image_paths_str in tweet_chunk:
-        img_paths = get_image_paths(image_paths_str)
-        for idx, img_path in enumerate(img_paths):
-            req = build_request(tweet_db_id, idx, img_path)
-            lines.append(orjson.dumps(req))
-
-    if not lines:
-        return None
-
-    jsonl_bytes = b"\n".join(lines)
-
-    with tempfile.NamedTemporaryFile(suffix=".jsonl", delete=False) as tmp:
-        tmp.write(jsonl_bytes)
-        tmp_path = tmp.name
-
-    try:
-        with open(tmp_path, "rb") as f:
-            uploaded = client.files.create(file=f, purpose="batch")
-        batch = client.batches.create(
-            input_file_id=uploaded.id,
-            endpoint="/v1/chat/completions",
-            completion_window="24h",
-        )
-        logger.info("Submitted batch %s (%d requests, %d tweets).",
-                    batch.id, len(lines), len(tweet_chunk))
-        return batch.id
-    finally:
-        os.unlink(tmp_path)
-
-
-# ── Result processing ─────────────────────────────────────────────────────────
-
-def parse_results(result_content: str) -> dict[int, str]:
-    """Parse batch output JSONL and aggregate per-tweet labels.
-
-    A tweet is "yes" if any image is AI-generated. "no" if all are human.
-    "output error" / "API error" if issues occurred.
-
-    Args:
-        result_content: Raw JSONL string from OpenAI output file.
-
-    Returns:
-        Dict mapping tweet_db_id -> label.
-    """
-    tweet_results: dict[int, list[str]] = {}
-
-    for line in result_content.strip().splitlines():
-        item = orjson.loads(line)
-        custom_id = item["custom_id"]
-        tweet_db_id = int(custom_id.split("_")[0])
-
-        if item.get("error"):
-            label = "API error"
-        else:
-            content = item["response"]["body"]["choices"][0]["message"]["content"]
-            answer = content.strip().lower()
-            if answer == "yes":
-                label = "yes"
-            elif answer == "no":
-                label = "no"
-            else:
-                label = "output error"
-
-        tweet_results.setdefault(tweet_db_id, []).append(label)
-
-    aggregated: dict[int, str] = {}
-    for tweet_db_id, labels in tweet_results.items():
-        if "yes" in labels:
-            aggregated[tweet_db_id] = "yes"
-        elif "API error" in labels or "output error" in labels:
-            aggregated[tweet_db_id] = "API error"
-        else:
-            aggregated[tweet_db_id] = "no"
-
-    return aggregated
-
-
-def collect_batch(client: OpenAI, batch_id: str) -> dict[int, str] | None:
-    """Poll a batch until complete and return parsed results.
-
-    Args:
-        client: Authenticated OpenAI client.
-        batch_id: OpenAI batch ID to poll.
-
-    Returns:
-        Dict of tweet_db_id -> label, or None if batch failed.
-    """
-    while True:
-        batch = client.batches.retrieve(batch_id)
-        logger.info("Batch %s status: %s (%s/%s completed)",
-                    batch_id, batch.status,
-                    batch.request_counts.completed,
-                    batch.request_counts.total)
-
-        if batch.status == "completed":
-            content = client.files.content(batch.output_file_id).text
-            return parse_results(content)
-        elif batch.status in ("failed", "expired", "cancelled"):
-            logger.error("Batch %s ended with status: %s", batch_id, batch.status)
-            return None
+    resolved: dict[int, str] = {}
+    for tweet_db_id, paths in tweets.items():
+        image_labels = []
+        reused = 0
+        for path in paths:
+            label = labels.get(path)
+            if label is None and index is not None:
+                label = index.peek(path)
+                reused += label is not None
+            image_labels.append(label)
+        if "yes" not in image_labels and None in image_labels:
+            continue
+        known = [label for label in image_labels if label is not None]
+        resolved[tweet_db_id] = aggregate_labels(known)
+        if index is not None:
+            # Count reuses only for tweets that are labeled now
+            index.reused += reused
 
-        time.sleep(POLL_INTERVAL_S)
+    for tweet_db_id in resolved:
+        del tweets[tweet_db_id]
+    return write_back(conn, "tweets", "tweet_db_id", "image_AI_result", resolved)
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
@@ -267,6 +151,10 @@ def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--test", action="store_true",
                         help="Submit only the first batch to verify the pipeline works.")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="Submit every image, even near-duplicates.")
+    parser.add_argument("--max-distance", type=int, default=DEFAULT_MAX_DISTANCE,
+                        help="Max hash bit difference treated as the same image.")
     args = parser.parse_args()
 
     load_dotenv()
@@ -274,8 +162,12 @@ def main() -> None:
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY environment variable is not set.")
 
-    client = OpenAI(api_key=api_key)
-    state = load_state()
+    runner = BatchRunner(
+        OpenAI(api_key=api_key),
+        STATE_FILE,
+        batch_size=BATCH_SIZE,
+        poll_interval_s=POLL_INTERVAL_S,
+    )
 
     with sqlite3.connect(str(DB_PATH), timeout=30) as conn:
         conn.execute("PRAGMA journal_mode = WAL")
@@ -296,77 +188,72 @@ def main() -> None:
             """
         ).fetchall()
 
-    # Filter to only tweets with at least one valid image (no videos)
-    rows = [(tid, ip) for tid, ip in rows
-            if any(Path(p.strip()).suffix.lower() in IMAGE_EXTENSIONS
-                   for p in ip.split(",") if p.strip())]
-
-    logger.info("%d tweets with images to classify.", len(rows))
-
-    # ── Phase 1: Submit batches ───────────────────────────────────────────────
-    if not state["pending_batches"]:
-        # Split by image count, not tweet count
-        chunks: list[list[tuple[int, str]]] = []
-        current_chunk: list[tuple[int, str]] = []
-        current_img_count = 0
-        for tweet_db_id, image_paths_str in rows:
-            img_count = sum(
-                1 for p in image_paths_str.split(",")
-                if p.strip() and Path(p.strip()).suffix.lower() in IMAGE_EXTENSIONS
+        # Only tweets with at least one valid image (no videos)
+        tweets = {tid: paths for tid, ip in rows if (paths := get_image_paths(ip))}
+        logger.info("%d tweets with images to classify.", len(tweets))
+
+        index = None if args.no_dedup else ImageDedupIndex(conn, args.max_distance)
+        labels: dict[Path, str] = {}
+
+        # ── Phase 1: Submit batches ───────────────────────────────────────────
+        if not runner.pending:
+            if index is not None:
+                reused = resolve_tweets(conn, tweets, labels, index)
+                conn.commit()
+                logger.info("%d tweets labeled from stored verdicts.", reused)
+
+            unresolved = [p for paths in tweets.values() for p in paths]
+            if index is not None:
+                unresolved = [p for p in unresolved if index.peek(p) is None]
+                assignment = index.representatives(unresolved)
+                conn.commit()
+            else:
+                assignment = {p: p for p in unresolved}
+            reps = list(dict.fromkeys(assignment.values()))
+            logger.info("%d distinct images -> %d requests after dedup.",
+                        len(assignment), len(reps))
+
+            write = partial(write_image_request, model=MODEL, prompt=PROMPT)
+            submitted = runner.submit(
+                ((str(p), partial(write, image_path=p)) for p in reps),
+                max_batches=1 if args.test else None,
             )
-            if current_img_count + img_count > BATCH_SIZE and current_chunk:
-                chunks.append(current_chunk)
-                current_chunk = []
-                current_img_count = 0
-            current_chunk.append((tweet_db_id, image_paths_str))
-            current_img_count += img_count
-        if current_chunk:
-            chunks.append(current_chunk)
-
-        if args.test:
-            chunks = chunks[:1]
-            logger.info("TEST MODE: submitting only the first batch (%d tweets).", len(chunks[0]))
+            logger.info("Submitted %d batches of up to %d images each.",
+                        submitted, BATCH_SIZE)
         else:
-            logger.info("Submitting %d batches of up to %d images each.", len(chunks), BATCH_SIZE)
-
-        for chunk in tqdm(chunks, desc="Submitting batches", unit="batch"):
-            tweet_ids = [t[0] for t in chunk]
-            batch_id = submit_batch(client, chunk)
-            if batch_id:
-                state["pending_batches"].append({"batch_id": batch_id, "tweet_ids": tweet_ids})
-                save_state(state)
-            time.sleep(1)
-    else:
-        logger.info("Resuming — %d batches already submitted.", len(state["pending_batches"]))
-
-    # ── Phase 2: Collect results ──────────────────────────────────────────────
-    total_saved = 0
-    remaining = []
-
-    for entry in tqdm(state["pending_batches"], desc="Collecting batches", unit="batch"):
-        results = collect_batch(client, entry["batch_id"])
-        if results is None:
-            remaining.append(entry)
-            continue
-
-        with sqlite3.connect(str(DB_PATH), timeout=30) as conn:
-            conn.execute("PRAGMA journal_mode = WAL")
-            for tweet_db_id, label in results.items():
-                conn.execute(
-                    "UPDATE tweets SET image_AI_result = ? WHERE tweet_db_id = ?",
-                    (label, tweet_db_id),
+            logger.info("Resuming — %d batches already submitted.", len(runner.pending))
+
+        # ── Phase 2: Collect results ──────────────────────────────────────────
+        total_saved = 0
+
+        def on_results(results: dict[str, dict[str, Any] | None]) -> None:
+            nonlocal total_saved
+            legacy: dict[int, list[str]] = {}
+            for key, body in results.items():
+                label = yes_no_label(body)
+                if m := LEGACY_ID_RE.match(key):
+                    # Batch submitted before dedup: one request per tweet image.
+                    legacy.setdefault(int(m.group(1)), []).append(label)
+                    continue
+                labels[Path(key)] = label
+                if index is not None:
+                    index.record(Path(key), label)
+            if legacy:
+                for tid in legacy:
+                    tweets.pop(tid, None)
+                total_saved += write_back(
+                    conn, "tweets", "tweet_db_id", "image_AI_result",
+                    {tid: aggregate_labels(ls) for tid, ls in legacy.items()},
                 )
+            total_saved += resolve_tweets(conn, tweets, labels, index)
             conn.commit()
-            total_saved += len(results)
 
-    state["pending_batches"] = remaining
-    save_state(state)
+        runner.collect(on_results)
 
-    if not remaining:
-        STATE_FILE.unlink(missing_ok=True)
-        logger.info("All batches complete. %d tweets labeled.", total_saved)
-    else:
-        logger.warning("%d batches failed — re-run to retry.", len(remaining))
+    if index is not None:
+        logger.info("%d verdicts reused from near-duplicate images.", index.reused)
+    logger.info("All batches collected. %d tweets labeled, %d still unlabeled.",
+                total_saved, len(tweets))
 
 
 if __name__ == "__main__":
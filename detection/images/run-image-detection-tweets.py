@@ -8,15 +8,22 @@ sends each .jpg/.png image (base64-encoded) to GPT-4o-mini with the prompt:
 If any image in the tweet is labeled "yes", the tweet is labeled "yes".
 Rows with only video paths (.mp4) are skipped. Saves every SAVE_INTERVAL rows.
 
+Images are deduplicated by perceptual hash (see camplinks.image_hash): an image
+whose near-duplicate was already classified, in this run, an earlier run, or
+by the campaign-site script, reuses that verdict instead of calling the model.
+Pass --no-dedup to classify every image.
+
 Requires OPENAI_API_KEY in environment or .env file.
 """
 
 from __future__ import annotations
 
+import argparse
 import base64
 import logging
 import os
 import sqlite3
+import sys
 import time
 from pathlib import Path
 
@@ -24,6 +31,9 @@ from dotenv import load_dotenv
 from openai import OpenAI
 from tqdm import tqdm
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from camplinks.image_hash import DEFAULT_MAX_DISTANCE, ImageDedupIndex  # noqa: E402
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
@@ -103,12 +113,18 @@ def classify_image(client: OpenAI, image_path: Path) -> str:
     return "API error"
 
 
-def classify_tweet_images(client: OpenAI, image_paths_str: str) -> str | None:
+def classify_tweet_images(
+    client: OpenAI,
+    image_paths_str: str,
+    index: ImageDedupIndex | None = None,
+) -> str | None:
     """Classify all images in a tweet and return aggregate label.
 
     Args:
         client: Authenticated OpenAI client.
         image_paths_str: Pipe-separated local image paths from tweets.image_paths.
+        index: Optional dedup index; near-duplicates of already classified
+            images reuse their verdict instead of calling the model.
 
     Returns:
         "yes" if any image is AI-generated, "no" if all are human,
@@ -128,7 +144,11 @@ def classify_tweet_images(client: OpenAI, image_paths_str: str) -> str | None:
         if not img_path.exists():
             logger.warning("Image not found, skipping: %s", img_path)
             continue
-        label = classify_image(client, img_path)
+        label = index.lookup(img_path) if index else None
+        if label is None:
+            label = classify_image(client, img_path)
+            if index:
+                index.record(img_path, label)
         logger.info("  %s -> %s", img_path.name, label)
         if label == "yes":
             return "yes"
@@ -140,6 +160,13 @@ def classify_tweet_images(client: OpenAI, image_paths_str: str) -> str | None:
 
 def main() -> None:
     """Entry point."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="Classify every image, even near-duplicates.")
+    parser.add_argument("--max-distance", type=int, default=DEFAULT_MAX_DISTANCE,
+                        help="Max hash bit difference treated as the same image.")
+    args = parser.parse_args()
+
     load_dotenv()
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -166,11 +193,13 @@ def main() -> None:
 
         logger.info("Found %d tweets with images to classify.", len(rows))
 
+        index = None if args.no_dedup else ImageDedupIndex(conn, args.max_distance)
+
         processed = 0
         skipped = 0
 
         for tweet_db_id, candidate_name, image_paths in tqdm(rows, desc="Classifying images", unit="tweet"):
-            label = classify_tweet_images(client, image_paths)
+            label = classify_tweet_images(client, image_paths, index)
 
             if label is None:
                 skipped += 1
@@ -195,6 +224,8 @@ def main() -> None:
         "Done. %d tweets classified, %d skipped (video-only).",
         processed, skipped,
     )
+    if index:
+        logger.info("%d verdicts reused from near-duplicate images.", index.reused)
 
 
 def _column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
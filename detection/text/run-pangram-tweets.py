@@ -1,96 +1,113 @@
 """Run Pangram AI text detection on tweets rows missing text_AI_result.
 
 Queries camplinks.db for tweets where text_AI_result IS NULL and text IS NOT NULL,
-calls the Pangram API on the tweet text, and writes results back to the DB.
-Saves progress every SAVE_INTERVAL rows (resumable).
-
-Requires PANGRAM_API_KEY in environment or .env file.
+and scores the tweet text with the Pangram API via :mod:`camplinks.pangram`:
+texts are submitted concurrently (--workers at a time), identical tweets
+(retweets, copy-pasted posts) are scored once, and results are cached by text
+hash in the pangram_cache table. Every result is committed as it arrives
+(resumable).
+
+Requires PANGRAM_API_KEY in environment or .env file, unless --stub is given.
+
+Usage:
+    python detection/text/run-pangram-tweets.py
+    python detection/text/run-pangram-tweets.py --workers 16
+    python detection/text/run-pangram-tweets.py --stub --db /tmp/camplinks-copy.db
 """
 
 from __future__ import annotations
 
+import argparse
 import logging
 import os
 import sqlite3
-import time
-from collections import Counter
+import sys
 from pathlib import Path
 
-import numpy as np
 from dotenv import load_dotenv
-from pangram import Pangram
-from tqdm import tqdm
+
+# Make the camplinks package importable when run as a plain script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from camplinks.pangram import (  # noqa: E402
+    DEFAULT_WORKERS,
+    UNABLE_TO_RUN,
+    PangramPredictor,
+    PangramResult,
+    StubPangramClient,
+    run_detection,
+)
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
 DB_PATH = str(Path(__file__).parent.parent.parent / "camplinks.db")
-SAVE_INTERVAL = 25
-UNABLE_TO_RUN = "unable to run"
-MAX_RETRIES = 3
-RETRY_BACKOFF = [10, 60]
 
 
-def check_ai(text: str, client: Pangram) -> tuple[str, float | None, str, float, float, int]:
-    """Run Pangram prediction on tweet text with retry on failure.
+def write_result(conn: sqlite3.Connection, tweet_db_id: int, result: PangramResult) -> None:
+    """Write one Pangram result to a tweets row.
 
     Args:
-        text: Tweet text to classify.
-        client: Authenticated Pangram client.
-
-    Returns:
-        Tuple of (text_AI_result, assistance_score, confidence, fraction_ai,
-        fraction_human, num_ai_segments). All values are UNABLE_TO_RUN on failure.
+        conn: Open SQLite connection.
+        tweet_db_id: tweets primary key.
+        result: Prediction to store.
     """
-    result = None
-    for attempt in range(MAX_RETRIES):
-        try:
-            result = client.predict(text)
-            break
-        except Exception as exc:
-            wait = RETRY_BACKOFF[min(attempt, len(RETRY_BACKOFF) - 1)]
-            logger.error(
-                "Pangram API error (attempt %d/%d): %s — retrying in %ds",
-                attempt + 1, MAX_RETRIES, exc, wait,
-            )
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(wait)
-
-    if result is None:
-        return (UNABLE_TO_RUN,) * 6  # type: ignore[return-value]
-
-    ai_label: str = result["prediction_short"]
-    fraction_ai: float = result["fraction_ai"]
-    fraction_human: float = result["fraction_human"]
-    num_ai_segments: int = result["num_ai_segments"]
-
-    confidence_vals: list[str] = []
-    assistance_vals: list[float] = []
-    for window in result["windows"]:
-        confidence_vals.append(window["confidence"])
-        assistance_vals.append(window["ai_assistance_score"])
-
-    confidence: str = Counter(confidence_vals).most_common(1)[0][0] if confidence_vals else UNABLE_TO_RUN
-    assistance_score: float = float(np.mean(assistance_vals)) if assistance_vals else 0.0
-
-    return (ai_label, assistance_score, confidence, fraction_ai, fraction_human, num_ai_segments)
+    conn.execute(
+        """
+        UPDATE tweets
+        SET text_AI_result         = ?,
+            assistance_score = ?,
+            confidence       = ?,
+            fraction_ai      = ?,
+            fraction_human   = ?,
+            num_ai_segments  = ?
+        WHERE tweet_db_id = ?
+        """,
+        (
+            result.text_AI_result,
+            result.assistance_score,
+            result.confidence,
+            result.fraction_ai,
+            result.fraction_human,
+            result.num_ai_segments,
+            tweet_db_id,
+        ),
+    )
 
 
 def main() -> None:
     """Entry point."""
-    load_dotenv()
-    api_key = os.getenv("PANGRAM_API_KEY")
-    if not api_key:
-        raise RuntimeError("PANGRAM_API_KEY environment variable is not set.")
-
-    pangram_client = Pangram(api_key=api_key)
-
-    with sqlite3.connect(DB_PATH) as conn:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Concurrent Pangram requests.")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database path.")
+    parser.add_argument("--stub", action="store_true",
+                        help="Use a local stub instead of the Pangram API (benchmarking).")
+    parser.add_argument("--stub-latency", type=float, default=0.5,
+                        help="Seconds per stub prediction.")
+    args = parser.parse_args()
+
+    client: PangramPredictor
+    if args.stub:
+        # Resolved, so ./camplinks.db or a symlink to it is caught too
+        if Path(args.db).resolve() == Path(DB_PATH).resolve():
+            raise RuntimeError("--stub writes fake scores; pass --db pointing at a copy.")
+        client = StubPangramClient(latency_s=args.stub_latency)
+    else:
+        from pangram import Pangram
+
+        load_dotenv()
+        api_key = os.getenv("PANGRAM_API_KEY")
+        if not api_key:
+            raise RuntimeError("PANGRAM_API_KEY environment variable is not set.")
+        client = Pangram(api_key=api_key)
+
+    with sqlite3.connect(args.db) as conn:
         conn.execute("PRAGMA journal_mode = WAL")
 
         rows = conn.execute(
             """
-            SELECT tweet_db_id, candidate_name, text
+            SELECT tweet_db_id, text
             FROM tweets
             WHERE (text_AI_result IS NULL OR text_AI_result = '')
               AND text IS NOT NULL
@@ -101,49 +118,14 @@ def main() -> None:
 
         logger.info("Found %d tweets to process.", len(rows))
 
-        processed = unable = 0
-
-        for tweet_db_id, candidate_name, text in tqdm(rows, desc="Running Pangram", unit="tweet"):
-            (
-                ai_label, assistance_score, confidence,
-                fraction_ai, fraction_human, num_ai_segments,
-            ) = check_ai(text, pangram_client)
-
-            if ai_label == UNABLE_TO_RUN:
-                unable += 1
-
-            logger.info("[%s] tweet %s -> %s", candidate_name, tweet_db_id, ai_label)
-
-            conn.execute(
-                """
-                UPDATE tweets
-                SET text_AI_result         = ?,
-                    assistance_score = ?,
-                    confidence       = ?,
-                    fraction_ai      = ?,
-                    fraction_human   = ?,
-                    num_ai_segments  = ?
-                WHERE tweet_db_id = ?
-                """,
-                (
-                    ai_label,
-                    None if assistance_score == UNABLE_TO_RUN else assistance_score,
-                    confidence,
-                    None if fraction_ai == UNABLE_TO_RUN else fraction_ai,
-                    None if fraction_human == UNABLE_TO_RUN else fraction_human,
-                    None if num_ai_segments == UNABLE_TO_RUN else num_ai_segments,
-                    tweet_db_id,
-                ),
-            )
-            processed += 1
-
-            if processed % SAVE_INTERVAL == 0:
-                conn.commit()
-                logger.info("Progress: %d/%d (last: %s -> %s)", processed, len(rows), candidate_name, ai_label)
-
-        conn.commit()
-
-    logger.info("Done. %d tweets processed, %d unable to run.", processed, unable)
+        stats = run_detection(conn, rows, client, write_result, max_workers=args.workers)
+
+    logger.info(
+        "Done. %d tweets processed (%d distinct texts, %d cached, %d API calls), "
+        "%d %s.",
+        stats.rows, stats.unique_texts, stats.cache_hits, stats.api_calls,
+        stats.unable, UNABLE_TO_RUN,
+    )
 
 
 if __name__ == "__main__":
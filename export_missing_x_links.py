@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import csv
 import logging
+import sqlite3
+from typing import Any
 from urllib.parse import urlparse
 
 from camplinks.db import open_db
@@ -30,37 +32,54 @@ def is_valid_profile(url: str) -> bool:
         return False
 
 
+def query_x_links(
+    conn: sqlite3.Connection,
+) -> tuple[list[tuple[Any, ...]], list[tuple[Any, ...]]]:
+    """Find candidates whose campaign_x URL is invalid or missing.
+
+    Args:
+        conn: Open SQLite connection.
+
+    Returns:
+        Rows (candidate_id, candidate_name, state, race_type, year, url) of
+        candidates with an invalid URL, and rows without the url of
+        candidates with none.
+    """
+    invalid = conn.execute(
+        """
+        SELECT c.candidate_id, c.candidate_name, e.state, e.race_type, e.year, cl.url
+        FROM candidates c
+        JOIN elections e ON c.election_id = e.election_id
+        JOIN contact_links cl ON cl.candidate_id = c.candidate_id
+        WHERE cl.link_type = 'campaign_x' AND c.candidate_name != ''
+        ORDER BY e.year, e.race_type, e.state
+        """
+    ).fetchall()
+    invalid_rows = [
+        (cid, name, state, rt, yr, url)
+        for cid, name, state, rt, yr, url in invalid
+        if not is_valid_profile(url)
+    ]
+
+    no_x = conn.execute(
+        """
+        SELECT c.candidate_id, c.candidate_name, e.state, e.race_type, e.year
+        FROM candidates c
+        JOIN elections e ON c.election_id = e.election_id
+        WHERE c.candidate_name != ''
+          AND c.candidate_id NOT IN (
+              SELECT candidate_id FROM contact_links WHERE link_type = 'campaign_x'
+          )
+        ORDER BY e.year, e.race_type, e.state
+        """
+    ).fetchall()
+    return invalid_rows, no_x
+
+
 def main() -> None:
     """Entry point."""
     with open_db(DB_FILENAME) as conn:
-        invalid = conn.execute(
-            """
-            SELECT c.candidate_id, c.candidate_name, e.state, e.race_type, e.year, cl.url
-            FROM candidates c
-            JOIN elections e ON c.election_id = e.election_id
-            JOIN contact_links cl ON cl.candidate_id = c.candidate_id
-            WHERE cl.link_type = 'campaign_x' AND c.candidate_name != ''
-            ORDER BY e.year, e.race_type, e.state
-            """
-        ).fetchall()
-        invalid_rows = [
-            (cid, name, state, rt, yr, url)
-            for cid, name, state, rt, yr, url in invalid
-            if not is_valid_profile(url)
-        ]
-
-        no_x = conn.execute(
-            """
-            SELECT c.candidate_id, c.candidate_name, e.state, e.race_type, e.year
-            FROM candidates c
-            JOIN elections e ON c.election_id = e.election_id
-            WHERE c.candidate_name != ''
-              AND c.candidate_id NOT IN (
-                  SELECT candidate_id FROM contact_links WHERE link_type = 'campaign_x'
-              )
-            ORDER BY e.year, e.race_type, e.state
-            """
-        ).fetchall()
+        invalid_rows, no_x = query_x_links(conn)
 
     fieldnames = ["candidate_id", "candidate_name", "state", "race_type", "year", "invalid_url"]
     rows = (
@@ -16,6 +16,7 @@ Usage:
     python scrape_tweets.py --year 2024
     python scrape_tweets.py --year 2024 --race "US House"
     python scrape_tweets.py --csv data/results/no_compliance_sample.csv
+    python scrape_tweets.py --profile profiles --profile-sample 20
 """
 
 from __future__ import annotations
@@ -37,6 +38,7 @@ from dotenv import load_dotenv
 from tqdm import tqdm
 
 from camplinks.models import DB_FILENAME
+from camplinks.profiling import PROFILER
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
@@ -592,7 +594,9 @@ def scrape_tweets(
 
     total_saved = 0
 
-    for row in tqdm(rows, desc="Scraping tweets", unit="candidate"):
+    for row in PROFILER.units(
+        tqdm(rows, desc="Scraping tweets", unit="candidate"), "scrape_tweets"
+    ):
         handle = extract_handle(row["x_url"])
         if not handle:
             logger.error("Could not parse handle from %s", row["x_url"])
@@ -688,13 +692,35 @@ if __name__ == "__main__":
             "querying by compliance filter."
         ),
     )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="DIR",
+        help="Profile the run with cProfile; write profiles and summaries to DIR.",
+    )
+    parser.add_argument(
+        "--profile-sample",
+        type=int,
+        default=1,
+        metavar="N",
+        help="With --profile, profile one in N candidates instead of the whole run.",
+    )
     args = parser.parse_args()
+    if args.profile_sample < 1:
+        parser.error("--profile-sample must be at least 1")
+    if args.profile_sample != 1 and args.profile is None:
+        parser.error("--profile-sample requires --profile")
 
-    scrape_tweets(
-        api_key=api_key,
-        db_path=args.db,
-        year=args.year,
-        race_type=args.race,
-        candidate_name=args.candidate,
-        csv_path=args.csv,
-    )
+    PROFILER.configure(args.profile, args.profile_sample)
+    try:
+        with PROFILER.stage("scrape_tweets"):
+            scrape_tweets(
+                api_key=api_key,
+                db_path=args.db,
+                year=args.year,
+                race_type=args.race,
+                candidate_name=args.candidate,
+                csv_path=args.csv,
+            )
+    finally:
+        PROFILER.finish()
@@ -0,0 +1,166 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from bs4 import BeautifulSoup
+
+from camplinks.http import parse_html
+from camplinks.mediawiki import MediaWikiClient
+from camplinks.scrapers import get_scraper, scraper_names
+
+
+def _restricted(parse: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap parse_state_page so it sees the page as fetch_soup would build it."""
+
+    def wrapper(self: Any, state: str, soup: BeautifulSoup, year: int) -> Any:
+        return parse(self, state, parse_html(str(soup), self.parse_only), year)
+
+    return wrapper
+
+
+@pytest.fixture(params=["full", "restricted"])
+def parse_mode(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run a scraper test against both full and strainer-restricted parses.
+
+    In ``restricted`` mode every registered scraper's ``parse_state_page``
+    re-parses its input with the scraper's declared ``parse_only`` strainer,
+    exactly as ``scrape_all`` does when fetching state pages.
+    """
+    if request.param == "restricted":
+        for cls in map(get_scraper, scraper_names()):
+            if cls.parse_only is not None:
+                monkeypatch.setattr(
+                    cls, "parse_state_page", _restricted(cls.parse_state_page)
+                )
+    return str(request.param)
+
+
+class _FakeResponse:
+    def __init__(self, data: dict[str, Any]) -> None:
+        self._data = data
+        self.status_code = 200
+
+    def json(self) -> dict[str, Any]:
+        return self._data
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+class FakeMediaWiki:
+    """Local stand-in for the MediaWiki Action API.
+
+    Implements the ``session.get`` interface :class:`MediaWikiClient` uses,
+    answering ``action=query`` (normalization, redirects, missing pages,
+    revision IDs and wikitext) and ``action=parse`` from in-memory pages.
+    Wikitext responses are split into continuations of ``content_per_response``
+    pages, like the real API does for large batches.
+    """
+
+    def __init__(self, content_per_response: int = 50) -> None:
+        self.content_per_response = content_per_response
+        self.pages: dict[str, dict[str, Any]] = {}
+        self.redirects: dict[str, str] = {}
+        self.calls: list[dict[str, Any]] = []
+        self._next_revid = 1000
+
+    @staticmethod
+    def normalize(title: str) -> str:
+        title = title.replace("_", " ").strip()
+        return title[:1].upper() + title[1:]
+
+    def add_page(
+        self,
+        title: str,
+        wikitext: str = "",
+        html: str = "",
+        timestamp: str = "2024-11-06T00:00:00Z",
+    ) -> dict[str, Any]:
+        """Create (or replace) a page and return its record."""
+        self._next_revid += 1
+        page = {
+            "pageid": len(self.pages) + 1,
+            "title": title,
+            "revid": self._next_revid,
+            "timestamp": timestamp,
+            "wikitext": wikitext,
+            "html": html,
+        }
+        self.pages[title] = page
+        return page
+
+    def edit(self, title: str, html: str, timestamp: str) -> None:
+        """Save a new revision of an existing page."""
+        self._next_revid += 1
+        self.pages[title].update(revid=self._next_revid, html=html, timestamp=timestamp)
+
+    def get(
+        self, url: str, params: dict[str, Any], timeout: float | None = None
+    ) -> _FakeResponse:
+        self.calls.append(params)
+        if params["action"] == "parse":
+            return _FakeResponse(self._parse(int(params["oldid"])))
+        return _FakeResponse(self._query(params))
+
+    def _parse(self, revid: int) -> dict[str, Any]:
+        for page in self.pages.values():
+            if page["revid"] == revid:
+                return {"parse": {"title": page["title"], "text": page["html"]}}
+        return {"error": {"code": "nosuchrevid", "info": f"No revision {revid}"}}
+
+    def _query(self, params: dict[str, Any]) -> dict[str, Any]:
+        normalized, redirects, pages = [], [], []
+        seen: set[str] = set()
+        for title in params["titles"].split("|"):
+            norm = self.normalize(title)
+            if norm != title:
+                normalized.append({"from": title, "to": norm})
+            if norm in self.redirects:
+                redirects.append({"from": norm, "to": self.redirects[norm]})
+                norm = self.redirects[norm]
+            if norm in seen:
+                continue
+            seen.add(norm)
+            page = self.pages.get(norm)
+            if page is None:
+                pages.append({"ns": 0, "title": norm, "missing": True})
+                continue
+            rev: dict[str, Any] = {
+                "revid": page["revid"],
+                "timestamp": page["timestamp"],
+            }
+            if "content" in params["rvprop"]:
+                rev["slots"] = {"main": {"content": page["wikitext"]}}
+            pages.append({"pageid": page["pageid"], "title": norm, "revisions": [rev]})
+
+        data: dict[str, Any] = {"query": {"pages": pages}}
+        if normalized:
+            data["query"]["normalized"] = normalized
+        if redirects:
+            data["query"]["redirects"] = redirects
+        if "content" in params["rvprop"]:
+            start = int(params.get("rvcontinue", 0))
+            end = start + self.content_per_response
+            existing = [p for p in pages if "revisions" in p]
+            for i, page in enumerate(existing):
+                if not start <= i < end:
+                    del page["revisions"]
+            if end < len(existing):
+                data["continue"] = {"rvcontinue": str(end), "continue": "||"}
+        return data
+
+
+@pytest.fixture()
+def fake_wiki() -> FakeMediaWiki:
+    """An empty local MediaWiki API."""
+    return FakeMediaWiki()
+
+
+@pytest.fixture()
+def wiki_client(fake_wiki: FakeMediaWiki) -> MediaWikiClient:
+    """A MediaWiki client talking to ``fake_wiki`` without delays."""
+    return MediaWikiClient(session=fake_wiki, delay_s=0)
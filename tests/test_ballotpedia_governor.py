@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import pytest
 from bs4 import BeautifulSoup
 
 from camplinks.scrapers.ballotpedia_governor import (
@@ -10,6 +11,8 @@ from camplinks.scrapers.ballotpedia_governor import (
 )
 from camplinks.scrapers.ballotpedia_parsing import BALLOTPEDIA_BASE
 
+pytestmark = pytest.mark.usefixtures("parse_mode")
+
 
 def _soup(html: str) -> BeautifulSoup:
     return BeautifulSoup(html, "lxml")
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import sqlite3
+
+import pytest
 from bs4 import BeautifulSoup
 
 from camplinks.scrapers.ballotpedia_municipal import (
@@ -19,6 +22,8 @@ from camplinks.scrapers.ballotpedia_parsing import (
 
 # ── HTML fixtures ─────────────────────────────────────────────────────────
 
+pytestmark = pytest.mark.usefixtures("parse_mode")
+
 
 def _soup(html: str) -> BeautifulSoup:
     return BeautifulSoup(html, "lxml")
@@ -332,6 +337,13 @@ class TestParseStatePageMultiStage:
             assert election.race_type == "Mayor"
             assert election.year == 2023
 
+    def test_candidate_links_stored_as_ballotpedia_url(self) -> None:
+        scraper = BallotpediaMunicipalScraper()
+        results = scraper.parse_state_page("Houston, Texas", _soup(VOTEBOX_HTML), 2023)
+        candidate = results[0][1][0]
+        assert candidate.ballotpedia_url == f"{BALLOTPEDIA_BASE}/John_Whitmire"
+        assert candidate.wikipedia_url == ""
+
 
 class TestParseStatePageEmpty:
     """Tests for parse_state_page() with no results."""
@@ -398,3 +410,40 @@ class TestBuildIndexUrl:
     def test_returns_top_100_url(self) -> None:
         scraper = BallotpediaMunicipalScraper()
         assert scraper.build_index_url(2024) == TOP_100_URL
+
+
+# ── TestScrapeYears ───────────────────────────────────────────────────────
+
+
+class TestScrapeYears:
+    """Tests for scraping several years in one run."""
+
+    def test_top_100_list_fetched_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        fetched: list[str] = []
+        scraped: dict[int, list[tuple[str, str]]] = {}
+
+        def fake_fetch(url: str, delay_s: float = 0.0) -> str:
+            fetched.append(url)
+            return TOP_100_TABLE_HTML
+
+        def fake_scrape_pages(
+            self: BallotpediaMunicipalScraper,
+            pages: list[tuple[str, str]],
+            year: int,
+            *args: object,
+            **kwargs: object,
+        ) -> int:
+            scraped[year] = pages
+            return len(pages)
+
+        monkeypatch.setattr("camplinks.http.fetch_html", fake_fetch)
+        monkeypatch.setattr(
+            BallotpediaMunicipalScraper, "scrape_pages", fake_scrape_pages
+        )
+        total = BallotpediaMunicipalScraper().scrape_years(
+            [2023, 2024, 2025], sqlite3.connect(":memory:")
+        )
+        assert fetched == [TOP_100_URL]
+        assert total == 9
+        assert sorted(scraped) == [2023, 2024, 2025]
+        assert scraped[2025][0][1].endswith("New_York,_New_York_(2025)")
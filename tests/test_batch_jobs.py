@@ -0,0 +1,225 @@
+"""Unit tests for camplinks.batch_jobs."""
+
+from __future__ import annotations
+
+import base64
+import io
+import sqlite3
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from typing import IO, Any
+
+import orjson
+import pytest
+
+from camplinks.batch_jobs import (
+    BatchRunner,
+    iter_results,
+    write_back,
+    write_image_request,
+    yes_no_label,
+)
+
+
+def _answer(custom_id: str, text: str) -> dict[str, Any]:
+    return {
+        "custom_id": custom_id,
+        "response": {
+            "status_code": 200,
+            "body": {"choices": [{"message": {"content": text}}]},
+        },
+        "error": None,
+    }
+
+
+class FakeOpenAI:
+    """Minimal stand-in for the files/batches parts of the OpenAI client.
+
+    Each batch "completes" with an answer equal to the request's prompt text,
+    except for custom_ids listed in ``fail_ids``, which go to the error file.
+    """
+
+    def __init__(self, status: str = "completed") -> None:
+        self.status = status
+        self.fail_ids: set[str] = set()
+        self.uploads: dict[str, list[dict[str, Any]]] = {}
+        self.batches_created: list[str] = []
+        self.contents: dict[str, str] = {}
+        self.files = SimpleNamespace(create=self._upload, content=self._content)
+        self.batches = SimpleNamespace(create=self._create, retrieve=self._retrieve)
+
+    def _upload(self, file: IO[bytes], purpose: str) -> SimpleNamespace:
+        file_id = f"file_{len(self.uploads)}"
+        self.uploads[file_id] = [
+            orjson.loads(line) for line in file.read().splitlines()
+        ]
+        return SimpleNamespace(id=file_id)
+
+    def _create(self, input_file_id: str, **_: Any) -> SimpleNamespace:
+        batch_id = f"batch_{input_file_id}"
+        self.batches_created.append(batch_id)
+        return SimpleNamespace(id=batch_id)
+
+    def _retrieve(self, batch_id: str) -> SimpleNamespace:
+        requests = self.uploads[batch_id.removeprefix("batch_")]
+        ok, failed = [], []
+        for req in requests:
+            cid = req["custom_id"]
+            if cid in self.fail_ids:
+                failed.append({"custom_id": cid, "response": None, "error": {"x": 1}})
+            else:
+                text = req["body"]["messages"][0]["content"][1]["text"]
+                ok.append(_answer(cid, text))
+        out_id, err_id = f"{batch_id}_out", f"{batch_id}_err"
+        self.contents[out_id] = "\n".join(orjson.dumps(r).decode() for r in ok)
+        self.contents[err_id] = "\n".join(orjson.dumps(r).decode() for r in failed)
+        return SimpleNamespace(
+            status=self.status,
+            request_counts=SimpleNamespace(completed=len(ok), total=len(requests)),
+            output_file_id=out_id if ok and self.status == "completed" else None,
+            error_file_id=err_id if failed else None,
+        )
+
+    def _content(self, file_id: str) -> SimpleNamespace:
+        return SimpleNamespace(text=self.contents[file_id])
+
+
+@pytest.fixture()
+def image(tmp_path: Path) -> Path:
+    """A binary file larger than one base64 read chunk."""
+    path = tmp_path / "img.png"
+    path.write_bytes(bytes(range(256)) * 2000)
+    return path
+
+
+def _items(answers: list[str], image: Path) -> list[tuple[str, Any]]:
+    return [
+        (f"key{i}", partial(write_image_request, image_path=image, model="m", prompt=a))
+        for i, a in enumerate(answers)
+    ]
+
+
+class TestWriteImageRequest:
+    """Tests for write_image_request()."""
+
+    def test_streams_valid_request(self, image: Path) -> None:
+        buf = io.BytesIO()
+        write_image_request(buf, "req_0", image, model="m", prompt="Is it AI?")
+        line = buf.getvalue()
+        assert line.endswith(b"\n") and line.count(b"\n") == 1
+        req = orjson.loads(line)
+        assert req["custom_id"] == "req_0"
+        content = req["body"]["messages"][0]["content"]
+        url = content[0]["image_url"]["url"]
+        assert url.startswith("data:image/png;base64,")
+        assert base64.b64decode(url.split(",", 1)[1]) == image.read_bytes()
+        assert content[1]["text"] == "Is it AI?"
+
+
+class TestParsing:
+    """Tests for iter_results() and yes_no_label()."""
+
+    def test_iter_results(self) -> None:
+        content = "\n".join(
+            [
+                orjson.dumps(_answer("a", "Yes")).decode(),
+                orjson.dumps({"custom_id": "b", "error": {"code": "x"}}).decode(),
+                orjson.dumps(
+                    {"custom_id": "c", "response": {"status_code": 500, "body": {}}}
+                ).decode(),
+                "",
+            ]
+        )
+        results = dict(iter_results(content))
+        assert results["b"] is None and results["c"] is None
+        assert yes_no_label(results["a"]) == "yes"
+
+    @pytest.mark.parametrize(
+        ("body", "label"),
+        [
+            (None, "API error"),
+            ({"choices": [{"message": {"content": " No "}}]}, "no"),
+            ({"choices": [{"message": {"content": "maybe"}}]}, "output error"),
+            ({"choices": []}, "output error"),
+        ],
+    )
+    def test_yes_no_label(self, body: dict[str, Any] | None, label: str) -> None:
+        assert yes_no_label(body) == label
+
+
+class TestWriteBack:
+    """Tests for write_back()."""
+
+    @pytest.fixture()
+    def conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, label TEXT)")
+        conn.executemany("INSERT INTO t VALUES (?, ?)", [(1, None), (2, "old")])
+        return conn
+
+    def test_only_fills_empty_cells(self, conn: sqlite3.Connection) -> None:
+        assert write_back(conn, "t", "id", "label", {1: "yes", 2: "yes"}) == 1
+        assert write_back(conn, "t", "id", "label", {1: "no"}) == 0
+        assert dict(conn.execute("SELECT id, label FROM t")) == {1: "yes", 2: "old"}
+
+    def test_overwrite(self, conn: sqlite3.Connection) -> None:
+        assert write_back(conn, "t", "id", "label", {2: "new"}, overwrite=True) == 1
+
+    def test_rejects_bad_identifiers(self, conn: sqlite3.Connection) -> None:
+        with pytest.raises(ValueError):
+            write_back(conn, "t; DROP TABLE t", "id", "label", {1: "x"})
+
+
+class TestBatchRunner:
+    """Tests for BatchRunner submit/collect."""
+
+    def test_chunks_and_collects(self, tmp_path: Path, image: Path) -> None:
+        client = FakeOpenAI()
+        state = tmp_path / "state.json"
+        runner = BatchRunner(client, state, batch_size=2, poll_interval_s=0)
+        assert runner.submit(_items(["yes", "no", "yes"], image)) == 2
+        assert state.exists()
+
+        collected: dict[str, str] = {}
+        runner.collect(
+            lambda r: collected.update({k: yes_no_label(b) for k, b in r.items()})
+        )
+        assert collected == {"key0": "yes", "key1": "no", "key2": "yes"}
+        assert not state.exists()
+
+    def test_max_batches(self, tmp_path: Path, image: Path) -> None:
+        runner = BatchRunner(FakeOpenAI(), tmp_path / "s.json", batch_size=1)
+        assert runner.submit(_items(["a", "b", "c"], image), max_batches=1) == 1
+        assert len(runner.pending) == 1
+
+    def test_resume_from_state_file(self, tmp_path: Path, image: Path) -> None:
+        client = FakeOpenAI()
+        state = tmp_path / "state.json"
+        BatchRunner(client, state).submit(_items(["no"], image))
+
+        resumed = BatchRunner(client, state, poll_interval_s=0)
+        assert [job.batch_id for job in resumed.pending] == client.batches_created
+        seen: list[str] = []
+        resumed.collect(lambda r: seen.extend(r))
+        assert seen == ["key0"]
+
+    def test_errored_requests_reported(self, tmp_path: Path, image: Path) -> None:
+        client = FakeOpenAI()
+        client.fail_ids = {"req_1"}
+        runner = BatchRunner(client, tmp_path / "s.json", poll_interval_s=0)
+        runner.submit(_items(["yes", "no"], image))
+        results: dict[str, Any] = {}
+        runner.collect(results.update)
+        assert results["key1"] is None
+        assert yes_no_label(results["key0"]) == "yes"
+
+    def test_failed_batch_is_dropped(self, tmp_path: Path, image: Path) -> None:
+        client = FakeOpenAI(status="expired")
+        state = tmp_path / "s.json"
+        runner = BatchRunner(client, state, poll_interval_s=0)
+        runner.submit(_items(["yes"], image))
+        calls: list[Any] = []
+        runner.collect(calls.append)
+        assert calls == []
+        assert runner.pending == [] and not state.exists()
@@ -0,0 +1,176 @@
+"""Tests for camplinks.cassette (record/replay of HTTP traffic)."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import orjson
+import pytest
+import requests
+
+from camplinks.cassette import (
+    Cassette,
+    Recording,
+    ReplayServer,
+    ddg_key,
+    recording,
+    replaying,
+)
+from camplinks.http import ddg_search, fetch_html, page_exists
+from camplinks.metrics import METRICS
+
+HTML = "text/html; charset=utf-8"
+OHIO = "https://en.wikipedia.org/wiki/Ohio"
+
+
+class _Origin(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path == "/old":
+            self.send_response(301)
+            self.send_header("Location", "/page")
+            self.end_headers()
+            return
+        body = "<p>Ohió</p>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", HTML)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def origin() -> Iterator[str]:
+    """A live server to record from."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Origin)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture()
+def cassette(tmp_path: Path) -> Iterator[Cassette]:
+    store = Cassette(str(tmp_path / "run.cassette"))
+    yield store
+    store.close()
+
+
+def _page(body: str, elapsed_s: float = 0.0) -> Recording:
+    return Recording(200, {"Content-Type": HTML}, body.encode(), elapsed_s)
+
+
+class TestRecording:
+    """Tests for recording responses into a cassette."""
+
+    def test_records_every_hop_of_a_redirect(
+        self, cassette: Cassette, origin: str
+    ) -> None:
+        with recording(cassette):
+            html = fetch_html(f"{origin}/old", delay_s=0)
+        assert html == "<p>Ohió</p>"
+        hop = cassette.get("GET", f"{origin}/old")
+        page = cassette.get("GET", f"{origin}/page")
+        assert hop is not None and hop.status == 301
+        assert hop.headers == {"Location": "/page"}
+        assert page is not None and page.body.decode() == html
+        assert page.elapsed_s > 0
+
+    def test_records_ddg_searches(self, cassette: Cassette) -> None:
+        results = [{"title": "Jane Doe", "href": "https://janedoe.com", "body": ""}]
+        client = MagicMock()
+        client.text.return_value = results
+        with (
+            patch("ddgs.DDGS", return_value=client),
+            patch("camplinks.http.time.sleep"),
+            recording(cassette),
+        ):
+            assert ddg_search("Jane Doe campaign") == results
+        found = cassette.get("GET", ddg_key("Jane Doe campaign", 5))
+        assert found is not None
+        assert found.body.startswith(b'[{"title":"Jane Doe"')
+
+    def test_transient_error_keeps_good_recording(self, cassette: Cassette) -> None:
+        cassette.save("GET", OHIO, _page("ok"))
+        cassette.save("GET", OHIO, Recording(429, {}, b"", 0.0))
+        found = cassette.get("GET", OHIO)
+        assert found is not None and found.status == 200
+
+    def test_head_falls_back_to_get(self, cassette: Cassette) -> None:
+        cassette.save("GET", OHIO, _page("ok"))
+        assert cassette.get("HEAD", OHIO) is not None
+        assert cassette.get("HEAD", OHIO + "_(state)") is None
+
+
+class TestReplay:
+    """Tests for replaying a cassette through the local server."""
+
+    def test_replays_under_the_original_url(self, cassette: Cassette) -> None:
+        cassette.save("GET", OHIO, _page("<p>Ohió</p>"))
+        METRICS.reset()
+        with ReplayServer(cassette, latency_s=0) as server, replaying(server):
+            assert fetch_html(OHIO, delay_s=0) == "<p>Ohió</p>"
+            assert page_exists(OHIO, delay_s=0)
+            assert not page_exists(OHIO + "_(state)", delay_s=0)
+        assert server.stats == {"replayed": 2, "missing": 1}
+        assert METRICS.counter(
+            "camplinks_http_responses_total", host="en.wikipedia.org", status="200"
+        )
+        METRICS.reset()
+
+    def test_follows_relative_redirects(self, cassette: Cassette) -> None:
+        old = "https://en.wikipedia.org/wiki/OH"
+        cassette.save("GET", old, Recording(301, {"Location": "/wiki/Ohio"}, b"", 0.0))
+        cassette.save("GET", OHIO, _page("ohio"))
+        with ReplayServer(cassette, latency_s=0) as server, replaying(server):
+            assert fetch_html(old, delay_s=0) == "ohio"
+
+    def test_injects_rate_limits(self, cassette: Cassette) -> None:
+        cassette.save("GET", OHIO, _page("ohio"))
+        server = ReplayServer(cassette, latency_s=0, rate_limit_rate=1.0)
+        with server, replaying(server), pytest.raises(requests.HTTPError) as exc:
+            fetch_html(OHIO, delay_s=0)
+        assert exc.value.response.status_code == 429
+        assert exc.value.response.headers["Retry-After"] == "1"
+        assert server.stats == {"rate_limited": 1}
+
+    def test_replays_recorded_latency(self, cassette: Cassette) -> None:
+        cassette.save("GET", OHIO, _page("ohio", elapsed_s=0.2))
+        with ReplayServer(cassette) as server, replaying(server):
+            resp = requests.get(OHIO, timeout=5)
+        assert resp.elapsed.total_seconds() >= 0.2
+
+    def test_replays_ddg_searches(self, cassette: Cassette) -> None:
+        results = [{"title": "Jane Doe", "href": "https://janedoe.com", "body": ""}]
+        query = '"Jane Doe" Ohio campaign'
+        cassette.save(
+            "GET",
+            ddg_key(query, 5),
+            Recording(
+                200, {"Content-Type": "application/json"}, orjson.dumps(results), 0.0
+            ),
+        )
+        with (
+            patch("camplinks.http.time.sleep"),
+            ReplayServer(cassette, latency_s=0) as server,
+            replaying(server),
+        ):
+            assert ddg_search(query) == results
+
+    def test_ddg_rate_limits_are_retried(self, cassette: Cassette) -> None:
+        server = ReplayServer(cassette, latency_s=0, rate_limit_rate=1.0)
+        with (
+            patch("camplinks.http.time.sleep") as sleep,
+            server,
+            replaying(server),
+        ):
+            assert ddg_search("anything", max_retries=2) == []
+        assert server.stats == {"rate_limited": 3}
+        assert [c.args[0] for c in sleep.call_args_list].count(30.0) == 1
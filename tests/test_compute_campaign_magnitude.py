@@ -0,0 +1,293 @@
+"""Unit tests for code/compute_campaign_magnitude.py."""
+
+from __future__ import annotations
+
+import importlib.util
+import random
+import sqlite3
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+from camplinks.db import init_schema, upsert_candidate, upsert_election
+from camplinks.models import Candidate, Election
+
+_SCRIPT = Path(__file__).parent.parent / "code" / "compute_campaign_magnitude.py"
+
+
+def _load_script() -> ModuleType:
+    """Import the script by path (``code`` shadows the stdlib module)."""
+    spec = importlib.util.spec_from_file_location("compute_campaign_magnitude", _SCRIPT)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+mag = _load_script()
+
+
+@pytest.fixture()
+def db() -> sqlite3.Connection:
+    """Create an in-memory database with candidates, tweets and site content."""
+    conn = sqlite3.connect(":memory:")
+    init_schema(conn)
+    conn.executescript(
+        """\
+        CREATE TABLE tweets (
+            tweet_db_id      INTEGER PRIMARY KEY,
+            candidate_id     INTEGER NOT NULL,
+            token_length     INTEGER,
+            assistance_score REAL,
+            image_AI_result  TEXT
+        );
+        CREATE TABLE campaign_site_content (
+            content_id       INTEGER PRIMARY KEY,
+            candidate_id     INTEGER NOT NULL,
+            content_type     TEXT,
+            token_length     INTEGER,
+            assistance_score REAL,
+            image_AI_result  TEXT
+        );
+        """
+    )
+    mag.ensure_column(conn)
+    return conn
+
+
+def _add_candidates(conn: sqlite3.Connection, n: int) -> list[int]:
+    """Insert *n* candidates in one election and return their ids."""
+    eid = upsert_election(
+        conn, Election(state="Ohio", race_type="US House", year=2024, district="1")
+    )
+    return [
+        upsert_candidate(
+            conn, Candidate(party="Democratic", candidate_name=f"C{i}"), eid
+        )
+        for i in range(n)
+    ]
+
+
+def _per_candidate_magnitudes(conn: sqlite3.Connection) -> dict[int, float | str]:
+    """Reference implementation: the original four-queries-per-candidate loop."""
+    out: dict[int, float | str] = {}
+    for (cid,) in conn.execute("SELECT candidate_id FROM candidates").fetchall():
+        tweet_text = conn.execute(
+            "SELECT token_length, assistance_score FROM tweets WHERE candidate_id = ?"
+            " AND assistance_score IS NOT NULL AND token_length IS NOT NULL",
+            (cid,),
+        ).fetchall()
+        tweet_images = [
+            r[0]
+            for r in conn.execute(
+                "SELECT image_AI_result FROM tweets WHERE candidate_id = ?"
+                " AND image_AI_result IN ('yes', 'no')",
+                (cid,),
+            ).fetchall()
+        ]
+        site_text = conn.execute(
+            "SELECT token_length, assistance_score FROM campaign_site_content"
+            " WHERE candidate_id = ? AND content_type = 'text'"
+            " AND assistance_score IS NOT NULL AND token_length IS NOT NULL",
+            (cid,),
+        ).fetchall()
+        site_images = [
+            r[0]
+            for r in conn.execute(
+                "SELECT image_AI_result FROM campaign_site_content"
+                " WHERE candidate_id = ? AND content_type = 'image'"
+                " AND image_AI_result IN ('yes', 'no')",
+                (cid,),
+            ).fetchall()
+        ]
+        if not any([tweet_text, tweet_images, site_text, site_images]):
+            out[cid] = "no_relevant_data"
+        else:
+            out[cid] = mag.text_fraction(tweet_text, site_text) + mag.image_fraction(
+                tweet_images, site_images
+            )
+    return out
+
+
+def _assert_same(
+    actual: dict[int, float | str], expected: dict[int, float | str]
+) -> None:
+    """Compare magnitude dicts, allowing float summation-order differences."""
+    assert actual.keys() == expected.keys()
+    for cid, value in expected.items():
+        if isinstance(value, str):
+            assert actual[cid] == value
+        else:
+            assert actual[cid] == pytest.approx(value)
+
+
+class TestComputeMagnitudes:
+    """Tests for the set-based compute_magnitudes()."""
+
+    def test_no_data_is_marked(self, db: sqlite3.Connection) -> None:
+        (cid,) = _add_candidates(db, 1)
+        assert mag.compute_magnitudes(db) == {cid: "no_relevant_data"}
+
+    def test_combines_all_modalities(self, db: sqlite3.Connection) -> None:
+        (cid,) = _add_candidates(db, 1)
+        db.executemany(
+            "INSERT INTO tweets (candidate_id, token_length, assistance_score,"
+            " image_AI_result) VALUES (?, ?, ?, ?)",
+            [(cid, 100, 0.5, "yes"), (cid, 300, 0.1, "no")],
+        )
+        db.executemany(
+            "INSERT INTO campaign_site_content (candidate_id, content_type,"
+            " token_length, assistance_score, image_AI_result) VALUES (?, ?, ?, ?, ?)",
+            [(cid, "text", 600, 0.0, None), (cid, "image", None, None, "no")],
+        )
+        # text: (100*0.5 + 300*0.1) / 1000 = 0.08; images: 1 of 3 are AI
+        assert mag.compute_magnitudes(db)[cid] == pytest.approx(0.08 + 1 / 3)
+
+    def test_zero_length_text_counts_as_data(self, db: sqlite3.Connection) -> None:
+        (cid,) = _add_candidates(db, 1)
+        db.execute(
+            "INSERT INTO tweets (candidate_id, token_length, assistance_score)"
+            " VALUES (?, 0, 0.9)",
+            (cid,),
+        )
+        assert mag.compute_magnitudes(db)[cid] == 0.0
+
+    def test_matches_per_candidate_output(self, db: sqlite3.Connection) -> None:
+        rng = random.Random(26)
+        cids = _add_candidates(db, 60)
+        labels = ["yes", "no", "API error", None]
+        for _ in range(600):
+            db.execute(
+                "INSERT INTO tweets (candidate_id, token_length, assistance_score,"
+                " image_AI_result) VALUES (?, ?, ?, ?)",
+                (
+                    rng.choice(cids),
+                    rng.choice([None, 0, rng.randint(1, 500)]),
+                    rng.choice([None, rng.random()]),
+                    rng.choice(labels),
+                ),
+            )
+            db.execute(
+                "INSERT INTO campaign_site_content (candidate_id, content_type,"
+                " token_length, assistance_score, image_AI_result)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    rng.choice(cids),
+                    rng.choice(["text", "image"]),
+                    rng.choice([None, 0, rng.randint(1, 5000)]),
+                    rng.choice([None, rng.random()]),
+                    rng.choice(labels),
+                ),
+            )
+        _assert_same(mag.compute_magnitudes(db), _per_candidate_magnitudes(db))
+
+
+class TestWriteMagnitudes:
+    """Tests for the bulk write-back."""
+
+    def test_writes_every_candidate(self, db: sqlite3.Connection) -> None:
+        a, b = _add_candidates(db, 2)
+        updated = mag.write_magnitudes(db, {a: 0.25, b: "no_relevant_data"})
+        assert updated == 2
+        rows = dict(
+            db.execute(
+                "SELECT candidate_id, campaign_ai_magnitude FROM candidates"
+            ).fetchall()
+        )
+        assert rows == {a: 0.25, b: "no_relevant_data"}
+
+
+class TestIncrementalRecompute:
+    """Tests for trigger-driven dirty tracking."""
+
+    def _seed(self, db: sqlite3.Connection) -> list[int]:
+        cids = _add_candidates(db, 3)
+        db.executemany(
+            "INSERT INTO tweets (candidate_id, token_length, assistance_score)"
+            " VALUES (?, 100, 0.2)",
+            [(cid,) for cid in cids],
+        )
+        db.commit()
+        return cids
+
+    def test_first_install_requests_full_run(self, db: sqlite3.Connection) -> None:
+        assert mag.ensure_change_tracking(db) is True
+        assert mag.ensure_change_tracking(db) is False
+
+    def test_triggers_mark_changed_candidates(self, db: sqlite3.Connection) -> None:
+        mag.ensure_change_tracking(db)
+        _, b, c = self._seed(db)
+        mag.recompute_all(db)
+        db.execute(
+            "UPDATE tweets SET assistance_score = 0.9 WHERE candidate_id = ?", (b,)
+        )
+        db.execute(
+            "INSERT INTO campaign_site_content (candidate_id, content_type,"
+            " image_AI_result) VALUES (?, 'image', 'yes')",
+            (c,),
+        )
+        db.commit()
+        dirty = {r[0] for r in db.execute("SELECT candidate_id FROM magnitude_dirty")}
+        assert dirty == {b, c}
+
+    def test_untracked_column_update_is_ignored(self, db: sqlite3.Connection) -> None:
+        mag.ensure_change_tracking(db)
+        self._seed(db)
+        mag.recompute_all(db)
+        db.execute("ALTER TABLE tweets ADD COLUMN note TEXT")
+        db.execute("UPDATE tweets SET note = 'x'")
+        db.commit()
+        assert db.execute("SELECT COUNT(*) FROM magnitude_dirty").fetchone()[0] == 0
+
+    def test_recompute_dirty_only_touches_dirty(self, db: sqlite3.Connection) -> None:
+        mag.ensure_change_tracking(db)
+        a, b, _ = self._seed(db)
+        mag.recompute_all(db)
+        db.execute(
+            "UPDATE candidates SET campaign_ai_magnitude = -1 WHERE candidate_id = ?",
+            (a,),
+        )
+        db.execute(
+            "UPDATE tweets SET assistance_score = 0.9 WHERE candidate_id = ?", (b,)
+        )
+        db.commit()
+
+        assert mag.recompute_dirty(db) == 1
+        stored = dict(
+            db.execute("SELECT candidate_id, campaign_ai_magnitude FROM candidates")
+        )
+        assert stored[a] == -1  # untouched: not dirty
+        assert stored[b] == pytest.approx(0.9)
+        assert db.execute("SELECT COUNT(*) FROM magnitude_dirty").fetchone()[0] == 0
+
+    def test_new_candidates_are_computed(self, db: sqlite3.Connection) -> None:
+        mag.ensure_change_tracking(db)
+        self._seed(db)
+        mag.recompute_all(db)
+        eid = db.execute("SELECT election_id FROM elections").fetchone()[0]
+        new = upsert_candidate(
+            db, Candidate(party="Republican", candidate_name="New"), eid
+        )
+        db.commit()
+        assert mag.recompute_dirty(db) == 1
+        value = db.execute(
+            "SELECT campaign_ai_magnitude FROM candidates WHERE candidate_id = ?",
+            (new,),
+        ).fetchone()[0]
+        assert value == "no_relevant_data"
+
+    def test_incremental_matches_full(self, db: sqlite3.Connection) -> None:
+        mag.ensure_change_tracking(db)
+        cids = self._seed(db)
+        mag.recompute_all(db)
+        db.execute("DELETE FROM tweets WHERE candidate_id = ?", (cids[0],))
+        db.execute(
+            "UPDATE tweets SET token_length = 5 WHERE candidate_id = ?", (cids[1],)
+        )
+        db.commit()
+        mag.recompute_dirty(db)
+        stored = dict(
+            db.execute("SELECT candidate_id, campaign_ai_magnitude FROM candidates")
+        )
+        _assert_same(stored, mag.compute_magnitudes(db))
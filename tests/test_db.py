@@ -8,9 +8,13 @@ import pytest
 
 from camplinks.db import (
     get_candidates_missing_link,
+    get_candidates_missing_wikipedia_url,
+    get_candidates_needing_wikipedia_enrichment,
     get_candidates_with_link,
+    get_search_results,
     init_schema,
     migrate_schema,
+    save_search_results,
     upsert_candidate,
     upsert_contact_link,
     upsert_election,
@@ -207,6 +211,25 @@ class TestGetCandidatesMissingLink:
         assert len(missing_2024) == 1
         assert missing_2024[0]["candidate_name"] == "Alice"
 
+        both = get_candidates_missing_link(db, "campaign_site", year=[2022, 2024])
+        assert sorted(r["candidate_name"] for r in both) == ["Alice", "Bob"]
+        assert get_candidates_missing_link(db, "campaign_site", year=[2020]) == []
+
+    def test_filter_by_candidate_ids(self, db: sqlite3.Connection) -> None:
+        e = Election(state="Ohio", race_type="US House", year=2024, district="5")
+        eid = upsert_election(db, e)
+        ids = [
+            upsert_candidate(db, Candidate(party="Republican", candidate_name=n), eid)
+            for n in ("Alice", "Bob", "Carol")
+        ]
+        db.commit()
+
+        missing = get_candidates_missing_link(
+            db, "campaign_site", candidate_ids=ids[1:]
+        )
+        assert [r["candidate_name"] for r in missing] == ["Bob", "Carol"]
+        assert get_candidates_missing_link(db, "campaign_site", candidate_ids=[]) == []
+
     def test_skips_empty_names(self, db: sqlite3.Connection) -> None:
         e = Election(state="Ohio", race_type="US House", year=2024, district="5")
         eid = upsert_election(db, e)
@@ -296,6 +319,34 @@ class TestGetCandidatesWithLink:
         assert len(rows) == 0
 
 
+class TestWikipediaTargets:
+    """Tests for the enrich stage's target queries."""
+
+    def test_missing_url_then_missing_site(self, db: sqlite3.Connection) -> None:
+        eid = upsert_election(
+            db, Election(state="Ohio", race_type="US House", year=2024, district="5")
+        )
+        alice = Candidate(
+            party="Republican",
+            candidate_name="Alice",
+            wikipedia_url="https://en.wikipedia.org/wiki/Alice",
+        )
+        alice_id = upsert_candidate(db, alice, eid)
+        upsert_candidate(db, Candidate(party="Democratic", candidate_name="Bob"), eid)
+        db.commit()
+
+        missing = get_candidates_missing_wikipedia_url(db, year=2024)
+        assert [row["candidate_name"] for row in missing] == ["Bob"]
+        assert get_candidates_missing_wikipedia_url(db, year=2022) == []
+
+        [target] = get_candidates_needing_wikipedia_enrichment(db)
+        assert target["candidate_id"] == alice_id
+        upsert_contact_link(
+            db, ContactLink(alice_id, "campaign_site", "https://alice.com", "wikipedia")
+        )
+        assert get_candidates_needing_wikipedia_enrichment(db) == []
+
+
 class TestElectionStageUpsert:
     """Tests for election_stage field in upserts."""
 
@@ -448,3 +499,26 @@ class TestGetCandidatesMissingLinkElectionStage:
 
         all_stages = get_candidates_missing_link(db, "campaign_site")
         assert len(all_stages) == 2
+
+
+class TestSearchResults:
+    """Tests for the raw search result store."""
+
+    def test_round_trip_and_replace(self, db: sqlite3.Connection) -> None:
+        assert get_search_results(db, "q") is None
+        save_search_results(
+            db,
+            "q",
+            [
+                {"href": "https://a.com", "title": "A", "body": "first"},
+                {"href": "https://b.com", "title": "B", "body": "second"},
+            ],
+        )
+        assert get_search_results(db, "q") == [
+            {"href": "https://a.com", "title": "A", "body": "first"},
+            {"href": "https://b.com", "title": "B", "body": "second"},
+        ]
+        save_search_results(db, "q", [{"href": "https://c.com"}])
+        assert get_search_results(db, "q") == [
+            {"href": "https://c.com", "title": "", "body": ""}
+        ]
@@ -0,0 +1,80 @@
+"""Unit tests for camplinks.domains."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from camplinks.domains import (
+    AGGREGATOR,
+    GOVERNMENT,
+    NEWS,
+    REFERENCE,
+    SOCIAL,
+    DomainMatcher,
+    default_matcher,
+    host_of,
+)
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("https://www.facebook.com/JaneDoe", SOCIAL),
+        ("https://m.facebook.com/JaneDoe", SOCIAL),
+        ("https://abcnews.go.com/Politics/story", NEWS),
+        ("https://go.com/", None),
+        ("https://en.wikipedia.org/wiki/Jane_Doe", REFERENCE),
+        ("https://www.fec.gov/data/candidate/H0OH01234/", REFERENCE),
+        ("https://governor.ohio.gov/", GOVERNMENT),
+        ("https://justfacts.votesmart.org/candidate/1", AGGREGATOR),
+        ("HTTPS://OURCAMPAIGNS.COM:443/CandidateDetail.html", AGGREGATOR),
+        # Whole labels only: the old substring test rejected these
+        ("https://janefox.com/", None),
+        ("https://notfacebook.com/", None),
+        ("https://governmentreform2024.org/", None),
+        ("https://janedoeforcongress.com/", None),
+        ("not a url", None),
+    ],
+)
+def test_default_matcher(url: str, expected: str | None) -> None:
+    assert default_matcher().match(url) == expected
+
+
+def test_host_of() -> None:
+    assert host_of("https://User@WWW.Example.COM.:8080/x") == "www.example.com"
+    assert host_of("/relative/path") == ""
+
+
+class TestDomainMatcher:
+    """Tests for DomainMatcher construction and extension."""
+
+    def test_add_ignores_www_and_counts_once(self) -> None:
+        matcher = DomainMatcher([("www.example.com", "a"), ("example.com", "b")])
+        assert len(matcher) == 1
+        assert matcher.match_host("sub.example.com") == "b"
+
+    def test_most_specific_domain_wins(self) -> None:
+        matcher = DomainMatcher([("example.com", "a"), ("news.example.com", "b")])
+        assert matcher.match_host("x.news.example.com") == "b"
+        assert matcher.match_host("shop.example.com") == "a"
+
+    def test_extend_from_csv(self, tmp_path: Path) -> None:
+        path = tmp_path / "bad.csv"
+        path.write_text(
+            "candidate_id,domain\n"
+            "1,newguide.org\n"
+            "2,sub.newguide.org\n"
+            "3,ourcampaigns.com\n"
+            "4,\n"
+        )
+        matcher = DomainMatcher([("ourcampaigns.com", AGGREGATOR)])
+        assert matcher.extend_from_csv(path) == 1
+        assert matcher.match("https://newguide.org/jane") == AGGREGATOR
+
+    def test_extend_from_csv_requires_column(self, tmp_path: Path) -> None:
+        path = tmp_path / "bad.csv"
+        path.write_text("candidate_id,url\n1,https://a.com\n")
+        with pytest.raises(KeyError, match="domain"):
+            DomainMatcher().extend_from_csv(path)
@@ -0,0 +1,242 @@
+"""Unit tests for camplinks.identity."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from camplinks.db import init_schema, upsert_candidate, upsert_election
+from camplinks.identity import (
+    PersonIndex,
+    normalize_name,
+    person_key,
+    propagate_identities,
+)
+from camplinks.models import Candidate, Election
+from camplinks.search import search_all_candidates
+
+WIKI = "https://en.wikipedia.org/wiki/"
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("José A. García Jr.", "jose garcia"),
+        ('Robert "Bobby" Smith III', "robert smith"),
+        ("Mary O'Connor-Lee", "mary oconnorlee"),
+        ("  JOHN   DOE ", "john doe"),
+        ("John A. B. Smith", "john smith"),
+        ("J. Smith", "j smith"),
+        ("J. Robert Smith", "j robert smith"),
+        ("V. Smith", "v smith"),
+    ],
+)
+def test_normalize_name(name: str, expected: str) -> None:
+    assert normalize_name(name) == expected
+
+
+def test_person_key_uses_state_of_city() -> None:
+    assert person_key("Jane Doe", "Boise, Idaho") == person_key("jane doe", "Idaho")
+
+
+@pytest.mark.parametrize("other", ["K. Smith", "John Smith"])
+def test_first_initial_is_not_dropped(other: str) -> None:
+    assert person_key("J. Smith", "Texas") != person_key(other, "Texas")
+    index = PersonIndex(
+        [(1, "J. Smith", "Texas", None, None), (2, other, "Texas", None, None)]
+    )
+    assert index.people() == []
+
+
+class TestPersonIndex:
+    """Tests for PersonIndex grouping."""
+
+    def test_name_and_state(self) -> None:
+        index = PersonIndex(
+            [
+                (1, "Jane Doe", "Ohio", None, None),
+                (2, "Jane A. Doe", "Ohio", "", ""),
+                (3, "Jane Doe", "Texas", None, None),
+            ]
+        )
+        assert index.people() == [[1, 2]]
+        assert index.person_of(1) == index.person_of(2) != index.person_of(3)
+
+    def test_shared_page_links_different_spellings(self) -> None:
+        index = PersonIndex(
+            [
+                (1, "Bob Smith", "Ohio", f"{WIKI}Robert_Smith", None),
+                (2, "Robert Smith", "Ohio", f"{WIKI}Robert_Smith", None),
+                (3, "Rob Smith", "Ohio", None, "https://ballotpedia.org/Rob_Smith"),
+                (
+                    4,
+                    "Robert J. Smith",
+                    "Ohio",
+                    None,
+                    "https://ballotpedia.org/Rob_Smith/",
+                ),
+            ]
+        )
+        # 1-2 share a Wikipedia page, 3-4 a Ballotpedia page; 2 and 4 then
+        # match by name without conflicting pages
+        assert index.people() == [[1, 2, 3, 4]]
+
+    def test_namesakes_with_different_pages_stay_apart(self) -> None:
+        index = PersonIndex(
+            [
+                (1, "John Smith", "Texas", f"{WIKI}John_Smith_(judge)", None),
+                (2, "John Smith", "Texas", f"{WIKI}John_Smith_(rancher)", None),
+                (3, "John Smith", "Texas", None, None),
+            ]
+        )
+        assert index.person_of(1) != index.person_of(2)
+        assert index.candidacies(3) == [1, 3]
+
+    def test_refresh_adds_new_candidacies(self) -> None:
+        conn = sqlite3.connect(":memory:")
+        init_schema(conn)
+        first = upsert_election(conn, Election("Ohio", "US House", 2022, "3"))
+        upsert_candidate(conn, Candidate("Democratic", "Jane Doe"), first)
+        index = PersonIndex.from_db(conn)
+        assert 1 in index
+        assert 2 not in index
+
+        second = upsert_election(conn, Election("Ohio", "US House", 2024, "3"))
+        upsert_candidate(conn, Candidate("Democratic", "Jane Doe"), second)
+        assert index.refresh(conn) == 1
+        assert index.refresh(conn) == 0
+        assert index.people() == [[1, 2]]
+
+
+@pytest.fixture()
+def conn() -> sqlite3.Connection:
+    """Database with one person running in a primary and a general."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    init_schema(conn)
+    primary = upsert_election(
+        conn, Election("Ohio", "US House", 2024, "3", election_stage="primary")
+    )
+    general = upsert_election(conn, Election("Ohio", "US House", 2024, "4"))
+    upsert_candidate(
+        conn,
+        Candidate("Democratic", "Jane Doe", wikipedia_url=f"{WIKI}Jane_Doe"),
+        primary,
+    )
+    upsert_candidate(conn, Candidate("Democratic Party", "Jane A. Doe"), general)
+    upsert_candidate(conn, Candidate("Republican", "Jim Roe"), general)
+    conn.commit()
+    return conn
+
+
+class TestPropagateIdentities:
+    """Tests for propagate_identities()."""
+
+    def test_copies_urls_links_and_archive(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """\
+            INSERT INTO contact_links (candidate_id, link_type, url, source)
+            VALUES (1, 'campaign_site', 'https://janedoe.com', 'wikipedia'),
+                   (2, 'campaign_x', 'https://x.com/janedoe', 'web_search');
+            INSERT INTO archive_organizations
+                (org_id, name, archive_url, last_fetched_at)
+            VALUES ('9', 'Jane Doe', 'https://a/9', '2024-01-01');
+            INSERT INTO archive_lookups VALUES (1, 1, 1, 42, 'single', '2024-01-01');
+            INSERT INTO candidate_archive_matches VALUES (1, '9');
+            """
+        )
+        counts = propagate_identities(conn)
+        assert counts == {
+            "wikipedia_url": 1,
+            "ballotpedia_url": 0,
+            "contact_link": 2,
+            "archive": 1,
+        }
+        wiki = conn.execute(
+            "SELECT wikipedia_url FROM candidates WHERE candidate_id = 2"
+        ).fetchone()[0]
+        assert wiki == f"{WIKI}Jane_Doe"
+        links = conn.execute(
+            "SELECT candidate_id, link_type, source FROM contact_links ORDER BY 1, 2"
+        ).fetchall()
+        assert [tuple(r) for r in links] == [
+            (1, "campaign_site", "wikipedia"),
+            (1, "campaign_x", "web_search"),
+            (2, "campaign_site", "wikipedia"),
+            (2, "campaign_x", "web_search"),
+        ]
+        assert (
+            conn.execute(
+                "SELECT total_messages FROM archive_lookups WHERE candidate_id = 2"
+            ).fetchone()[0]
+            == 42
+        )
+        assert propagate_identities(conn)["contact_link"] == 0
+
+    def test_limited_to_people_of_given_candidates(
+        self, conn: sqlite3.Connection
+    ) -> None:
+        conn.execute(
+            "INSERT INTO contact_links (candidate_id, link_type, url, source) "
+            "VALUES (1, 'campaign_site', 'https://janedoe.com', 'wikipedia')"
+        )
+        index = PersonIndex.from_db(conn)
+        assert propagate_identities(conn, index, candidate_ids=[3])["contact_link"] == 0
+        assert propagate_identities(conn, index, candidate_ids=[2])["contact_link"] == 1
+
+    def test_search_reuses_person_cache(
+        self, conn: sqlite3.Connection, tmp_path: Path
+    ) -> None:
+        fake_find = MagicMock(return_value={"campaign website": "https://jane.com"})
+        with (
+            patch("camplinks.search.find_candidate_info", fake_find),
+            patch("camplinks.search.search_social_links_for_candidates"),
+        ):
+            search_all_candidates(
+                conn, cache_path=str(tmp_path / "cache.json"), election_stage=None
+            )
+        searched = sorted(call.args[0] for call in fake_find.call_args_list)
+        assert searched == ["Jane Doe", "Jim Roe"]
+        sites = conn.execute(
+            "SELECT COUNT(*) FROM contact_links WHERE link_type = 'campaign_site'"
+        ).fetchone()[0]
+        assert sites == 3
+
+    def test_search_cache_keeps_namesakes_apart(self, tmp_path: Path) -> None:
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        init_schema(conn)
+        # Different Wikipedia pages: PersonIndex keeps them apart
+        for year, page in (
+            (2018, "John_Smith_(judge)"),
+            (2024, "John_Smith_(rancher)"),
+        ):
+            eid = upsert_election(conn, Election("Texas", "US House", year, "7"))
+            upsert_candidate(
+                conn,
+                Candidate("Democratic", "John Smith", wikipedia_url=WIKI + page),
+                eid,
+            )
+        conn.commit()
+        fake_find = MagicMock(
+            side_effect=[
+                {"campaign website": "https://smith2018.com"},
+                {"campaign website": "https://smith2024.com"},
+            ]
+        )
+        with (
+            patch("camplinks.search.find_candidate_info", fake_find),
+            patch("camplinks.search.search_social_links_for_candidates"),
+        ):
+            search_all_candidates(conn, cache_path=str(tmp_path / "cache.json"))
+        assert fake_find.call_count == 2
+        sites = conn.execute(
+            "SELECT url FROM contact_links WHERE link_type = 'campaign_site'"
+        ).fetchall()
+        assert sorted(r[0] for r in sites) == [
+            "https://smith2018.com",
+            "https://smith2024.com",
+        ]
@@ -0,0 +1,149 @@
+"""Unit tests for camplinks.image_hash."""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from camplinks.image_hash import BKTree, ImageDedupIndex, dhash, hamming
+
+
+def _pattern(seed: int) -> Image.Image:
+    """Return a 256x256 RGB image of smooth random blobs."""
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, 256, size=(8, 8, 3), dtype=np.uint8)
+    return Image.fromarray(coarse).resize((256, 256), Image.Resampling.BICUBIC)
+
+
+def _save(img: Image.Image, path: Path, **kwargs: object) -> Path:
+    img.save(path, **kwargs)
+    return path
+
+
+@pytest.fixture()
+def images(tmp_path: Path) -> dict[str, Path]:
+    """A logo, a resized/recompressed repost of it, and an unrelated image."""
+    logo = _pattern(1)
+    return {
+        "logo": _save(logo, tmp_path / "logo.png"),
+        "repost": _save(logo.resize((180, 180)), tmp_path / "repost.jpg", quality=70),
+        "other": _save(_pattern(2), tmp_path / "other.png"),
+    }
+
+
+@pytest.fixture()
+def index() -> ImageDedupIndex:
+    """Index backed by an in-memory database."""
+    return ImageDedupIndex(sqlite3.connect(":memory:"))
+
+
+class TestDhash:
+    """Tests for dhash() and hamming()."""
+
+    def test_repost_is_near_duplicate(self, images: dict[str, Path]) -> None:
+        assert hamming(dhash(images["logo"]), dhash(images["repost"])) <= 4
+
+    def test_different_images_are_far(self, images: dict[str, Path]) -> None:
+        assert hamming(dhash(images["logo"]), dhash(images["other"])) > 10
+
+    def test_non_image_raises(self, tmp_path: Path) -> None:
+        bad = tmp_path / "bad.jpg"
+        bad.write_bytes(b"not an image")
+        with pytest.raises(OSError):
+            dhash(bad)
+
+
+class TestBKTree:
+    """Tests for BKTree.nearest() against a brute-force scan."""
+
+    def test_matches_brute_force(self) -> None:
+        rng = random.Random(29)
+        hashes = [rng.getrandbits(64) for _ in range(300)]
+        tree = BKTree()
+        for i, h in enumerate(hashes):
+            tree.add(h, str(i))
+        for _ in range(50):
+            base = rng.choice(hashes)
+            query = base ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64))
+            expected = min(hamming(query, h) for h in hashes)
+            match = tree.nearest(query, 6)
+            assert match is not None and match[0] == expected
+
+    def test_no_match_beyond_distance(self) -> None:
+        tree = BKTree()
+        tree.add(0, "zero")
+        assert tree.nearest(0b11111, 4) is None
+        assert tree.nearest(0b1111, 4) == (4, "zero")
+
+
+class TestImageDedupIndex:
+    """Tests for verdict reuse and clustering."""
+
+    def test_verdict_reused_for_repost(
+        self, index: ImageDedupIndex, images: dict[str, Path]
+    ) -> None:
+        assert index.lookup(images["logo"]) is None
+        index.record(images["logo"], "yes")
+        assert index.lookup(images["repost"]) == "yes"
+        assert index.lookup(images["other"]) is None
+        assert index.reused == 1
+
+    def test_peek_does_not_count_reuse(
+        self, index: ImageDedupIndex, images: dict[str, Path]
+    ) -> None:
+        index.record(images["logo"], "yes")
+        assert index.peek(images["repost"]) == "yes"
+        assert index.peek(images["other"]) is None
+        assert index.reused == 0
+        assert index.lookup(images["repost"]) == "yes"
+        assert index.reused == 1
+
+    def test_verdicts_persist_across_runs(
+        self, index: ImageDedupIndex, images: dict[str, Path]
+    ) -> None:
+        index.record(images["logo"], "no")
+        index.conn.commit()
+        again = ImageDedupIndex(index.conn)
+        assert again.lookup(images["repost"]) == "no"
+
+    def test_error_labels_not_persisted(
+        self, index: ImageDedupIndex, images: dict[str, Path]
+    ) -> None:
+        index.record(images["logo"], "API error")
+        assert index.lookup(images["repost"]) == "API error"
+        assert ImageDedupIndex(index.conn).lookup(images["repost"]) is None
+
+    def test_representatives_cluster_near_duplicates(
+        self, index: ImageDedupIndex, images: dict[str, Path]
+    ) -> None:
+        paths = [images["logo"], images["other"], images["repost"], images["logo"]]
+        assignment = index.representatives(paths)
+        assert assignment == {
+            images["logo"]: images["logo"],
+            images["other"]: images["other"],
+            images["repost"]: images["logo"],
+        }
+
+    def test_unreadable_image_is_its_own_representative(
+        self, index: ImageDedupIndex, tmp_path: Path
+    ) -> None:
+        bad = tmp_path / "bad.png"
+        bad.write_bytes(b"garbage")
+        missing = tmp_path / "missing.png"
+        assert index.representatives([bad, missing]) == {bad: bad, missing: missing}
+        index.record(bad, "yes")
+        assert index.lookup(bad) is None
+
+    def test_hash_cache_invalidated_on_change(
+        self, index: ImageDedupIndex, tmp_path: Path
+    ) -> None:
+        path = _save(_pattern(1), tmp_path / "img.png")
+        first = index.hash_of(path)
+        _save(_pattern(2), path)
+        fresh = ImageDedupIndex(index.conn)
+        assert fresh.hash_of(path) != first
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import pytest
 from bs4 import BeautifulSoup
 
 from camplinks.scrapers.judicial import JudicialScraper, _parse_retention_table
 
+pytestmark = pytest.mark.usefixtures("parse_mode")
+
 
 def _make_soup(html: str) -> BeautifulSoup:
     """Create a BeautifulSoup from raw HTML."""
@@ -0,0 +1,224 @@
+"""Tests for camplinks.mediawiki and API-based Wikipedia enrichment."""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import TYPE_CHECKING
+
+import pytest
+
+from camplinks.db import init_schema
+from camplinks.enrich import enrich_from_wikipedia, extract_campaign_website_wikitext
+from camplinks.mediawiki import (
+    MediaWikiClient,
+    MediaWikiError,
+    page_url,
+    title_from_url,
+)
+
+if TYPE_CHECKING:
+    from conftest import FakeMediaWiki
+
+
+class TestTitles:
+    """Tests for title_from_url() and page_url()."""
+
+    @pytest.mark.parametrize(
+        ("url", "title"),
+        [
+            ("https://en.wikipedia.org/wiki/Jane_Doe", "Jane Doe"),
+            (
+                "https://en.wikipedia.org/wiki/Jos%C3%A9_Garc%C3%ADa#Career",
+                "José García",
+            ),
+            ("https://en.wikipedia.org/w/index.php?title=Jane_Doe&oldid=1", "Jane Doe"),
+            ("https://en.wikipedia.org/wiki/", None),
+            ("https://ballotpedia.org/Jane_Doe", None),
+        ],
+    )
+    def test_title_from_url(self, url: str, title: str | None) -> None:
+        assert title_from_url(url) == title
+
+    def test_round_trip(self) -> None:
+        title = "Bill Smith (Ohio politician)"
+        assert page_url(title).endswith("/wiki/Bill_Smith_(Ohio_politician)")
+        assert title_from_url(page_url(title)) == title
+
+
+class TestResolve:
+    """Tests for MediaWikiClient.resolve()."""
+
+    def test_normalizes_and_follows_redirects(
+        self, fake_wiki: FakeMediaWiki, wiki_client: MediaWikiClient
+    ) -> None:
+        page = fake_wiki.add_page("Jane Doe")
+        fake_wiki.redirects["Janet Doe"] = "Jane Doe"
+        resolved = wiki_client.resolve(["jane_Doe", "Janet Doe", "Nobody"])
+        assert set(resolved) == {"jane_Doe", "Janet Doe"}
+        assert resolved["Janet Doe"].rev_id == page["revid"]
+        assert resolved["jane_Doe"].title == "Jane Doe"
+        assert resolved["jane_Doe"].wikitext is None
+
+    def test_batches_fifty_titles_per_request(
+        self, fake_wiki: FakeMediaWiki, wiki_client: MediaWikiClient
+    ) -> None:
+        titles = [f"Person {i}" for i in range(120)]
+        for title in titles:
+            fake_wiki.add_page(title, wikitext=f"text of {title}")
+        resolved = wiki_client.resolve(titles + titles[:5])
+        assert len(resolved) == 120
+        assert wiki_client.requests_made == 3
+
+    def test_follows_content_continuation(
+        self, fake_wiki: FakeMediaWiki, wiki_client: MediaWikiClient
+    ) -> None:
+        fake_wiki.content_per_response = 4
+        titles = [f"Person {i}" for i in range(10)]
+        for title in titles:
+            fake_wiki.add_page(title, wikitext=f"text of {title}")
+        resolved = wiki_client.resolve(titles, content=True)
+        assert {t: p.wikitext for t, p in resolved.items()} == {
+            t: f"text of {t}" for t in titles
+        }
+        assert wiki_client.requests_made == 3
+
+    def test_parse_wraps_body(
+        self, fake_wiki: FakeMediaWiki, wiki_client: MediaWikiClient
+    ) -> None:
+        fake_wiki.add_page("A & B", html='<div class="mw-parser-output">x</div>')
+        page = wiki_client.resolve(["A & B"])["A & B"]
+        html = wiki_client.parse(page)
+        assert "<title>A &amp; B - Wikipedia</title>" in html
+        assert '<div class="mw-parser-output">x</div>' in html
+
+    def test_api_error_raises(self, wiki_client: MediaWikiClient) -> None:
+        page = type("P", (), {"rev_id": 1, "title": "Gone"})()
+        with pytest.raises(MediaWikiError, match="nosuchrevid"):
+            wiki_client.parse(page)  # type: ignore[arg-type]
+
+
+class TestExtractWikitext:
+    """Tests for extract_campaign_website_wikitext()."""
+
+    @pytest.mark.parametrize(
+        ("wikitext", "expected"),
+        [
+            (
+                "{{Infobox officeholder\n| website = {{URL|janedoe.com}}\n}}",
+                "http://janedoe.com",
+            ),
+            (
+                (
+                    "{{Infobox officeholder\n| website = {{URL|https://x.gov|Official}} "
+                    "{{URL|https://jane.com|Campaign website}}\n}}"
+                ),
+                "https://jane.com",
+            ),
+            (
+                (
+                    "{{Infobox person\n| website = [https://a.gov Office] "
+                    "[https://jane.org Site]\n}}"
+                ),
+                "https://jane.org",
+            ),
+            (
+                # A list spanning lines, after a piped link
+                (
+                    "{{Infobox officeholder\n| party = [[Democratic Party|Democratic]]\n"
+                    "| website = {{Plainlist|\n* {{URL|https://doe.house.gov|Office}}\n"
+                    "* {{URL|https://doe2024.com|Campaign}}\n}}\n}}"
+                ),
+                "https://doe2024.com",
+            ),
+            (
+                (
+                    "== External links ==\n* [https://house.gov/doe Official]\n"
+                    "* [https://doe2024.com Campaign website]\n== Other ==\n"
+                ),
+                "https://doe2024.com",
+            ),
+            ("{{Infobox person\n| website = {{Official URL}}\n}}", None),
+            (
+                # The rendered infobox decides, not the External links section
+                (
+                    "{{Infobox person\n| website = {{Official URL}}\n}}\n"
+                    "== External links ==\n* [https://doe2024.com Campaign website]\n"
+                ),
+                None,
+            ),
+            ("== External links ==\n* {{Official website|x}} campaign site\n", None),
+            ("{{Infobox person\n| name = Jane Doe\n}}", ""),
+            # Not the infobox
+            ("{{Cite web\n| website = {{URL|cited.com}}\n}}", ""),
+        ],
+    )
+    def test_extract(self, wikitext: str, expected: str | None) -> None:
+        assert extract_campaign_website_wikitext(wikitext) == expected
+
+
+class TestEnrichFromWikipedia:
+    """Tests for enrich_from_wikipedia() over the API."""
+
+    @pytest.fixture()
+    def conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        init_schema(conn)
+        conn.execute(
+            "INSERT INTO elections (state, race_type, year, district, election_stage) "
+            "VALUES ('Ohio', 'US House', 2024, '1', 'general')"
+        )
+        return conn
+
+    def _add_candidate(self, conn: sqlite3.Connection, name: str, url: str) -> None:
+        conn.execute(
+            "INSERT INTO candidates (election_id, party, candidate_name, wikipedia_url) "
+            "VALUES (1, 'Independent', ?, ?)",
+            (name, url),
+        )
+
+    def _sites(self, conn: sqlite3.Connection) -> dict[str, str]:
+        rows = conn.execute(
+            """\
+            SELECT c.candidate_name, cl.url FROM contact_links cl
+            JOIN candidates c ON c.candidate_id = cl.candidate_id
+            WHERE cl.link_type = 'campaign_site'
+            """
+        )
+        return {r[0]: r[1] for r in rows}
+
+    def test_bulk_enrichment(
+        self,
+        conn: sqlite3.Connection,
+        fake_wiki: FakeMediaWiki,
+        wiki_client: MediaWikiClient,
+    ) -> None:
+        for i in range(75):
+            fake_wiki.add_page(
+                f"Person {i}",
+                wikitext=f"{{{{Infobox person\n| website = {{{{URL|p{i}.com}}}}\n}}}}",
+            )
+            self._add_candidate(conn, f"P{i}", page_url(f"Person {i}"))
+        fake_wiki.add_page(
+            "Templated",
+            wikitext="{{Infobox person\n| website = {{Official URL}}\n}}",
+            html=(
+                '<table class="infobox"><tr><th class="infobox-label">Website</th>'
+                '<td class="infobox-data"><a class="external" href="https://t.com">'
+                "Campaign website</a></td></tr></table>"
+            ),
+        )
+        fake_wiki.redirects["Tmpl"] = "Templated"
+        self._add_candidate(conn, "T1", page_url("Templated"))
+        self._add_candidate(conn, "T2", "https://en.wikipedia.org/wiki/Tmpl")
+        self._add_candidate(conn, "Ghost", page_url("No such page"))
+
+        found = enrich_from_wikipedia(conn, client=wiki_client)
+
+        sites = self._sites(conn)
+        assert found == 76
+        assert sites["P3"] == "http://p3.com"
+        assert sites["T1"] == sites["T2"] == "https://t.com"
+        assert "Ghost" not in sites
+        # 78 titles: two 50-title queries plus one parse for the templated page
+        assert wiki_client.requests_made == 3
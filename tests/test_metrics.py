@@ -0,0 +1,119 @@
+"""Unit tests for camplinks.metrics."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import orjson
+import pytest
+
+from camplinks.db import init_schema, upsert_election
+from camplinks.metrics import METRICS, MetricsRegistry, record_response
+from camplinks.models import Election
+from camplinks.runs import RunManifest
+
+
+@pytest.fixture()
+def registry() -> MetricsRegistry:
+    return MetricsRegistry()
+
+
+@pytest.fixture()
+def metrics() -> Iterator[MetricsRegistry]:
+    """The process-wide registry, emptied around the test."""
+    METRICS.reset()
+    yield METRICS
+    METRICS.reset()
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry."""
+
+    def test_counters_are_labelled(self, registry: MetricsRegistry) -> None:
+        registry.inc("requests", host="a.org")
+        registry.inc("requests", 2, host="a.org")
+        registry.inc("requests", host="b.org")
+        assert registry.counter("requests", host="a.org") == 3
+        assert registry.counter("requests", host="b.org") == 1
+        assert registry.counter("requests", host="c.org") == 0
+
+    def test_timer_observes_failed_blocks(self, registry: MetricsRegistry) -> None:
+        with pytest.raises(ValueError), registry.timer("work", step="parse"):
+            raise ValueError("bad page")
+        hist = registry.histogram("work", step="parse")
+        assert hist is not None
+        assert hist.count == 1
+
+    def test_timed_labels_with_function_name(self, registry: MetricsRegistry) -> None:
+        @registry.timed("calls")
+        def upsert(x: int) -> int:
+            return x + 1
+
+        assert upsert(1) == 2
+        assert upsert.__name__ == "upsert"
+        hist = registry.histogram("calls", op="upsert")
+        assert hist is not None
+        assert hist.count == 1
+
+    def test_prometheus_text(self, registry: MetricsRegistry) -> None:
+        registry.inc("camplinks_requests_total", host='we"ird')
+        registry.observe("camplinks_seconds", 0.02)
+        registry.observe("camplinks_seconds", 3.0)
+        text = registry.to_prometheus()
+        assert "# TYPE camplinks_requests_total counter" in text
+        assert 'camplinks_requests_total{host="we\\"ird"} 1' in text
+        assert "# TYPE camplinks_seconds histogram" in text
+        assert 'camplinks_seconds_bucket{le="0.025"} 1' in text
+        assert 'camplinks_seconds_bucket{le="5.0"} 2' in text
+        assert 'camplinks_seconds_bucket{le="+Inf"} 2' in text
+        assert "camplinks_seconds_sum 3.02" in text
+        assert "camplinks_seconds_count 2" in text
+
+    def test_write_picks_format_from_extension(
+        self, registry: MetricsRegistry, tmp_path: Path
+    ) -> None:
+        registry.inc("hits", cache="search")
+        registry.observe("seconds", 0.5, stage="search")
+        registry.write(str(tmp_path / "m.json"))
+        registry.write(str(tmp_path / "m.prom"))
+
+        data = orjson.loads((tmp_path / "m.json").read_bytes())
+        assert data["counters"] == [
+            {"name": "hits", "labels": {"cache": "search"}, "value": 1.0}
+        ]
+        [hist] = data["histograms"]
+        assert (hist["count"], hist["sum"], hist["buckets"]["+Inf"]) == (1, 0.5, 1)
+        assert (tmp_path / "m.prom").read_text().startswith("# TYPE hits counter")
+
+
+def test_response_hook_counts_per_host(metrics: MetricsRegistry) -> None:
+    resp = MagicMock(
+        url="https://en.wikipedia.org/wiki/Ohio",
+        status_code=200,
+        content=b"x" * 1500,
+        elapsed=timedelta(milliseconds=120),
+    )
+    record_response(resp)
+    record_response(resp)
+    host = "en.wikipedia.org"
+    assert metrics.counter("camplinks_http_responses_total", host=host, status="200")
+    assert metrics.counter("camplinks_http_response_bytes_total", host=host) == 3000
+    hist = metrics.histogram("camplinks_http_response_seconds", host=host)
+    assert hist is not None
+    assert hist.total == pytest.approx(0.24)
+
+
+def test_stages_and_db_writes_are_timed(metrics: MetricsRegistry) -> None:
+    conn = sqlite3.connect(":memory:")
+    init_schema(conn)
+    with RunManifest().unit("scrape:governor"):
+        upsert_election(conn, Election(state="Ohio", race_type="Governor", year=2026))
+    stage = metrics.histogram("camplinks_stage_seconds", stage="scrape:governor")
+    write = metrics.histogram("camplinks_db_write_seconds", op="upsert_election")
+    assert stage is not None
+    assert write is not None
+    assert stage.total >= write.total
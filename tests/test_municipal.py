@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import pytest
 from bs4 import BeautifulSoup
 
 from camplinks.scrapers.municipal import (
@@ -10,6 +11,8 @@ from camplinks.scrapers.municipal import (
     _is_results_table,
 )
 
+pytestmark = pytest.mark.usefixtures("parse_mode")
+
 
 def _make_soup(html: str) -> BeautifulSoup:
     """Create a BeautifulSoup from raw HTML."""
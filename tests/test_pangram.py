@@ -0,0 +1,170 @@
+"""Unit tests for camplinks.pangram detection runner."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Hashable
+from typing import Any
+
+import pytest
+
+from camplinks.pangram import (
+    FAILED,
+    UNABLE_TO_RUN,
+    PangramResult,
+    StubPangramClient,
+    get_cached,
+    init_cache,
+    predict_with_retry,
+    run_detection,
+    summarize_prediction,
+    text_hash,
+)
+
+RAW_PREDICTION: dict[str, Any] = {
+    "prediction_short": "AI",
+    "fraction_ai": 0.8,
+    "fraction_ai_assisted": 0.1,
+    "fraction_human": 0.1,
+    "num_ai_segments": 2,
+    "windows": [
+        {"confidence": "High", "ai_assistance_score": 0.9},
+        {"confidence": "High", "ai_assistance_score": 0.7},
+        {"confidence": "Low", "ai_assistance_score": 0.2},
+    ],
+}
+
+
+@pytest.fixture()
+def db() -> sqlite3.Connection:
+    """In-memory database with a minimal tweets table."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE tweets (tweet_db_id INTEGER PRIMARY KEY, text TEXT,"
+        " text_AI_result TEXT, assistance_score REAL)"
+    )
+    return conn
+
+
+def _write(conn: sqlite3.Connection, key: Hashable, result: PangramResult) -> None:
+    conn.execute(
+        "UPDATE tweets SET text_AI_result = ?, assistance_score = ?"
+        " WHERE tweet_db_id = ?",
+        (result.text_AI_result, result.assistance_score, key),
+    )
+
+
+def _seed(conn: sqlite3.Connection, texts: list[str]) -> list[tuple[int, str]]:
+    conn.executemany("INSERT INTO tweets (text) VALUES (?)", [(t,) for t in texts])
+    conn.commit()
+    return conn.execute("SELECT tweet_db_id, text FROM tweets").fetchall()
+
+
+class TestSummarizePrediction:
+    """Tests for summarize_prediction()."""
+
+    def test_aggregates_windows(self) -> None:
+        result = summarize_prediction(RAW_PREDICTION)
+        assert result.text_AI_result == "AI"
+        assert result.confidence == "High"
+        assert result.assistance_score == pytest.approx(0.6)
+        assert result.num_ai_segments == 2
+
+    def test_no_windows(self) -> None:
+        result = summarize_prediction({**RAW_PREDICTION, "windows": []})
+        assert result.assistance_score == 0.0
+        assert result.confidence == UNABLE_TO_RUN
+
+
+class TestPredictWithRetry:
+    """Tests for predict_with_retry()."""
+
+    def test_returns_failed_after_retries(self) -> None:
+        class Broken:
+            calls = 0
+
+            def predict(self, text: str) -> dict[str, Any]:
+                self.calls += 1
+                raise RuntimeError("boom")
+
+        client = Broken()
+        assert predict_with_retry(client, "x", backoff=(0,)) is FAILED
+        assert client.calls == 3
+
+
+class TestRunDetection:
+    """Tests for run_detection()."""
+
+    def test_duplicate_texts_scored_once(self, db: sqlite3.Connection) -> None:
+        rows = _seed(db, ["same text", "same text", "other text"])
+        client = StubPangramClient()
+        stats = run_detection(db, rows, client, _write, max_workers=2)
+        assert client.calls == 2
+        assert stats.rows == 3
+        assert stats.unique_texts == 2
+        labels = [r[0] for r in db.execute("SELECT text_AI_result FROM tweets")]
+        assert None not in labels
+        assert labels[0] == labels[1]
+
+    def test_cache_reused_across_runs(self, db: sqlite3.Connection) -> None:
+        rows = _seed(db, ["a", "b"])
+        run_detection(db, rows, StubPangramClient(), _write)
+
+        client = StubPangramClient()
+        stats = run_detection(db, rows, client, _write)
+        assert client.calls == 0
+        assert stats.cache_hits == 2
+
+    def test_results_persisted_as_they_arrive(self, db: sqlite3.Connection) -> None:
+        rows = _seed(db, ["a", "b", "c"])
+        seen: list[int] = []
+
+        def _crash_after_two(
+            conn: sqlite3.Connection, key: Hashable, result: PangramResult
+        ) -> None:
+            if len(seen) == 2:
+                raise KeyboardInterrupt
+            seen.append(int(str(key)))
+            _write(conn, key, result)
+
+        with pytest.raises(KeyboardInterrupt):
+            run_detection(db, rows, StubPangramClient(), _crash_after_two, 1)
+        db.rollback()
+        assert len(get_cached(db, [text_hash(t) for t in "abc"])) >= 2
+        done = db.execute(
+            "SELECT COUNT(*) FROM tweets WHERE text_AI_result IS NOT NULL"
+        ).fetchone()[0]
+        assert done == 2
+
+    def test_failures_written_but_not_cached(self, db: sqlite3.Connection) -> None:
+        rows = _seed(db, ["a"])
+        stats = run_detection(
+            db, rows, StubPangramClient(), _write, predict=lambda c, t: FAILED
+        )
+        assert stats.unable == 1
+        assert db.execute("SELECT text_AI_result FROM tweets").fetchone()[0] == (
+            UNABLE_TO_RUN
+        )
+        init_cache(db)
+        assert get_cached(db, [text_hash("a")]) == {}
+
+    def test_concurrency_is_bounded(self, db: sqlite3.Connection) -> None:
+        rows = _seed(db, [f"text {i}" for i in range(20)])
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def _predict(client: Any, text: str) -> PangramResult:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            return summarize_prediction(RAW_PREDICTION)
+
+        run_detection(db, rows, StubPangramClient(), _write, 4, predict=_predict)
+        assert 1 < peak <= 4
@@ -0,0 +1,108 @@
+"""Unit tests for camplinks.profiling."""
+
+from __future__ import annotations
+
+import pstats
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from camplinks.__main__ import main
+from camplinks.db import init_schema, upsert_election
+from camplinks.models import Election
+from camplinks.profiling import PROFILER, Profiler
+from camplinks.runs import RunManifest
+
+
+@pytest.fixture()
+def profiler() -> Iterator[Profiler]:
+    """The process-wide profiler, turned off after the test."""
+    yield PROFILER
+    PROFILER.configure(None)
+
+
+def _calls(path: Path, function: str) -> int:
+    """Count the calls of *function* recorded in a profile file."""
+    profile = pstats.Stats(str(path)).get_stats_profile()
+    return sum(
+        int(func.ncalls.split("/")[0])
+        for name, func in profile.func_profiles.items()
+        if name == function
+    )
+
+
+def _work() -> int:
+    return sum(i * i for i in range(1000))
+
+
+def test_stages_are_profiled(profiler: Profiler, tmp_path: Path) -> None:
+    profiler.configure(tmp_path)
+    conn = sqlite3.connect(":memory:")
+    init_schema(conn)
+    with RunManifest().unit("scrape:governor"):
+        upsert_election(conn, Election(state="Ohio", race_type="Governor", year=2026))
+    profiler.finish()
+
+    assert _calls(tmp_path / "scrape-governor.prof", "upsert_election") == 1
+    summary = (tmp_path / "scrape-governor.txt").read_text()
+    assert "Ordered by: internal time" in summary
+    assert "Ordered by: cumulative time" in summary
+    assert "upsert_election" in summary
+    assert not profiler.enabled
+
+
+def test_samples_one_in_n_units(profiler: Profiler, tmp_path: Path) -> None:
+    profiler.configure(tmp_path, sample=3)
+    with RunManifest().unit("search"):
+        for _ in profiler.units(range(7), "search"):
+            _work()
+    profiler.finish()
+
+    # Units 0, 3 and 6 are profiled, the stage as a whole is not
+    assert _calls(tmp_path / "search.units.prof", "_work") == 3
+    assert (tmp_path / "search.units.txt").exists()
+    assert not (tmp_path / "search.prof").exists()
+
+
+def test_unit_profile_ends_when_loop_breaks(profiler: Profiler, tmp_path: Path) -> None:
+    profiler.configure(tmp_path, sample=2)
+    for i in profiler.units(range(10), "scrape"):
+        _work()
+        if i == 2:
+            break
+    with profiler.unit("scrape"):
+        pass
+    profiler.finish()
+
+    # The third unit was profiled until the break; the fourth is not sampled
+    assert _calls(tmp_path / "scrape.units.prof", "_work") == 2
+
+
+def test_units_inside_a_profiled_stage_are_left_to_it(
+    profiler: Profiler, tmp_path: Path
+) -> None:
+    profiler.configure(tmp_path)
+    with profiler.stage("validate"):
+        for _ in profiler.units(range(3), "validate"):
+            _work()
+    profiler.finish()
+
+    assert _calls(tmp_path / "validate.prof", "_work") == 3
+    assert not (tmp_path / "validate.units.prof").exists()
+
+
+def test_off_by_default(tmp_path: Path) -> None:
+    profiler = Profiler()
+    with profiler.stage("search"):
+        assert list(profiler.units(range(3), "search")) == [0, 1, 2]
+    profiler.finish()
+    assert not profiler.enabled
+    with pytest.raises(ValueError):
+        profiler.configure(tmp_path, sample=0)
+
+
+def test_cli_requires_profile_for_sampling() -> None:
+    with pytest.raises(SystemExit):
+        main(["--year", "2024", "--race", "house", "--profile-sample", "50"])
@@ -0,0 +1,160 @@
+"""Unit tests for camplinks.runs and resuming pipeline runs."""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from camplinks.db import init_schema
+from camplinks.pipeline import run_pipeline
+from camplinks.runs import RunManifest
+from camplinks.streaming import StageStats, StreamError
+
+PARAMS: dict[str, object] = {"year": 2024, "race": "house", "stage": None}
+
+STAGE_MODULES = {
+    "enrich_wikipedia_urls": "camplinks.enrich",
+    "enrich_from_wikipedia": "camplinks.enrich",
+    "validate_campaign_sites": "camplinks.validate",
+    "propagate_identities": "camplinks.identity",
+}
+
+
+@pytest.fixture()
+def conn() -> sqlite3.Connection:
+    db = sqlite3.connect(":memory:")
+    db.row_factory = sqlite3.Row
+    init_schema(db)
+    return db
+
+
+def _failed_run(conn: sqlite3.Connection) -> RunManifest:
+    manifest = RunManifest.start(conn, PARAMS)
+    with manifest.unit("scrape:house"):
+        pass
+    with pytest.raises(RuntimeError), manifest.unit("search"):
+        raise RuntimeError("network down")
+    manifest.finish("failed")
+    return manifest
+
+
+class TestRunManifest:
+    """Tests for RunManifest."""
+
+    def test_records_units_and_status(self, conn: sqlite3.Connection) -> None:
+        manifest = _failed_run(conn)
+        units = conn.execute(
+            "SELECT unit, finished_at IS NOT NULL, elapsed_s IS NOT NULL "
+            "FROM pipeline_run_units WHERE run_id = ? ORDER BY unit",
+            (manifest.run_id,),
+        ).fetchall()
+        assert [tuple(u) for u in units] == [
+            ("scrape:house", 1, 1),
+            ("search", 0, 0),
+        ]
+        status = conn.execute(
+            "SELECT status, finished_at IS NOT NULL FROM pipeline_runs"
+        ).fetchone()
+        assert tuple(status) == ("failed", 1)
+
+    def test_resume_skips_completed_units(self, conn: sqlite3.Connection) -> None:
+        first = _failed_run(conn)
+        resumed = RunManifest.start(conn, dict(reversed(PARAMS.items())), resume=True)
+        assert resumed.run_id == first.run_id
+        assert not resumed.pending("scrape:house")
+        assert resumed.pending("search")
+        with resumed.unit("search"):
+            pass
+        resumed.finish("completed")
+        assert conn.execute("SELECT status FROM pipeline_runs").fetchone()[0] == (
+            "completed"
+        )
+
+    def test_resume_needs_same_params_and_unfinished_run(
+        self, conn: sqlite3.Connection
+    ) -> None:
+        first = _failed_run(conn)
+        other = RunManifest.start(conn, {**PARAMS, "year": 2022}, resume=True)
+        assert other.run_id != first.run_id
+        assert other.done == set()
+
+        done = RunManifest.start(conn, PARAMS, resume=True)
+        done.finish("completed")
+        assert RunManifest.start(conn, PARAMS, resume=True).run_id != done.run_id
+
+    def test_without_connection_records_nothing(self) -> None:
+        manifest = RunManifest()
+        with manifest.unit("search"):
+            pass
+        manifest.finish("completed")
+        assert manifest.pending("search")
+
+
+def _stage_mocks() -> dict[str, MagicMock]:
+    return {name: MagicMock(return_value=0) for name in STAGE_MODULES}
+
+
+def _patched_stages(
+    scraper: MagicMock, search: MagicMock, stages: dict[str, MagicMock]
+) -> ExitStack:
+    """Patch the stage functions where the pipeline imports them from."""
+    stack = ExitStack()
+    stack.enter_context(patch("camplinks.pipeline.get_scraper", return_value=scraper))
+    stack.enter_context(patch("camplinks.search.search_all_candidates", search))
+    for name, module in STAGE_MODULES.items():
+        stack.enter_context(patch(f"{module}.{name}", stages[name]))
+    return stack
+
+
+def test_run_pipeline_resumes_after_failure(tmp_path: Path) -> None:
+    scraper = MagicMock()
+    scraper.race_type = "US House"
+    search = MagicMock(side_effect=[RuntimeError("network down"), 0])
+    stages = _stage_mocks()
+    db_path = str(tmp_path / "runs.db")
+    with _patched_stages(scraper, search, stages):
+        with pytest.raises(RuntimeError):
+            run_pipeline(2024, "house", db_path=db_path)
+        run_pipeline(2024, "house", db_path=db_path, resume=True)
+
+    assert scraper.return_value.scrape_years.call_count == 1
+    assert stages["enrich_from_wikipedia"].call_count == 1
+    assert search.call_count == 2
+    assert stages["validate_campaign_sites"].call_count == 1
+
+
+def test_failed_stream_batches_are_retried_on_resume(tmp_path: Path) -> None:
+    scraper = MagicMock()
+    scraper.race_type = "US House"
+    stream = MagicMock(
+        side_effect=[{"search": StageStats(batches=2, errors=1)}, {}],
+    )
+    db_path = str(tmp_path / "runs.db")
+    with (
+        _patched_stages(scraper, MagicMock(), _stage_mocks()),
+        patch("camplinks.streaming.run_streaming", stream),
+    ):
+        with pytest.raises(StreamError, match=r"1 streamed batch\(es\) failed"):
+            run_pipeline(2024, "house", db_path=db_path, stream=True)
+        run_pipeline(2024, "house", db_path=db_path, stream=True, resume=True)
+
+    assert stream.call_count == 2
+
+
+def test_run_pipeline_over_several_years(tmp_path: Path) -> None:
+    scraper = MagicMock()
+    scraper.race_type = "US House"
+    search = MagicMock(return_value=0)
+    stages = _stage_mocks()
+    with _patched_stages(scraper, search, stages):
+        run_pipeline([2024, 2022, 2024], "house", db_path=str(tmp_path / "y.db"))
+
+    # One scrape over both years, one lookup pass over their union
+    scraper.return_value.scrape_years.assert_called_once()
+    assert scraper.return_value.scrape_years.call_args.args[0] == [2022, 2024]
+    assert search.call_args.kwargs["year"] == [2022, 2024]
+    assert stages["validate_campaign_sites"].call_args.kwargs["year"] == [2022, 2024]
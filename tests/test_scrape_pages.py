@@ -0,0 +1,368 @@
+"""Tests for the fetch -> parse -> write stages of BaseScraper."""
+
+from __future__ import annotations
+
+import logging
+import pickle
+import sqlite3
+import threading
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from camplinks.db import get_page_revisions, init_schema
+from camplinks.http import PageCache
+from camplinks.mediawiki import MediaWikiClient, title_from_url
+from camplinks.scrapers.base import parse_page
+from camplinks.scrapers.governor import GovernorScraper
+
+if TYPE_CHECKING:
+    from conftest import FakeMediaWiki
+
+_PAGE = """
+<html><head><title>{state} election</title></head><body>
+<div class="mw-heading mw-heading3"><h3>General election</h3></div>
+<table class="wikitable plainrowheaders">
+<caption>General election results</caption>
+<tr><th>Party</th><th>Candidate</th><th>Votes</th><th>%</th></tr>
+<tr class="vcard">
+  <td class="org">Democratic</td>
+  <th class="fn"><b><a href="/wiki/{state}_D">{state} Dem</a></b></th>
+  <td>1500000</td><td>55.2</td>
+</tr>
+<tr class="vcard">
+  <td class="org">Republican</td>
+  <th class="fn"><a href="/wiki/{state}_R">{state} Rep</a></th>
+  <td>1200000</td><td>44.8</td>
+</tr>
+</table>
+</body></html>
+"""
+
+_STATES = ["Virginia", "New Jersey", "Ohio", "Texas", "Utah"]
+
+
+def _url(state: str) -> str:
+    return f"https://en.wikipedia.org/wiki/2025_{state.replace(' ', '_')}_election"
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = MagicMock(status_code=status)
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+@pytest.fixture()
+def conn() -> Iterator[sqlite3.Connection]:
+    """In-memory database with schema."""
+    conn = sqlite3.connect(":memory:")
+    init_schema(conn)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture()
+def fetched() -> list[str]:
+    """URLs requested from the fake page server, in order."""
+    return []
+
+
+@pytest.fixture()
+def pages(
+    monkeypatch: pytest.MonkeyPatch, fetched: list[str]
+) -> dict[str, str | Exception]:
+    """Serve synthetic state pages instead of fetching them."""
+    served: dict[str, str | Exception] = {
+        _url(state): _PAGE.format(state=state) for state in _STATES
+    }
+
+    def fake_fetch(url: str, delay_s: float = 0.0) -> str:
+        fetched.append(url)
+        body = served[url]
+        if isinstance(body, Exception):
+            raise body
+        return body
+
+    monkeypatch.setattr("camplinks.scrapers.base.fetch_html", fake_fetch)
+    return served
+
+
+def _rows(conn: sqlite3.Connection) -> list[tuple[object, ...]]:
+    return conn.execute(
+        """\
+        SELECT e.state, e.wikipedia_url, c.candidate_name, c.is_winner
+        FROM elections e JOIN candidates c ON c.election_id = e.election_id
+        ORDER BY e.election_id, c.candidate_name
+        """
+    ).fetchall()
+
+
+class TestScrapePages:
+    """Tests for BaseScraper.scrape_pages()."""
+
+    def test_pool_matches_inline(
+        self, conn: sqlite3.Connection, pages: dict[str, str | Exception]
+    ) -> None:
+        items = [(state, _url(state)) for state in _STATES]
+        scraper = GovernorScraper()
+        assert scraper.scrape_pages(items, 2025, conn) == len(_STATES)
+        inline = _rows(conn)
+
+        pooled_conn = sqlite3.connect(":memory:")
+        init_schema(pooled_conn)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            total = scraper.scrape_pages(items, 2025, pooled_conn, pool)
+        assert total == len(_STATES)
+        assert _rows(pooled_conn) == inline
+        assert inline[0] == ("Virginia", _url("Virginia"), "Virginia Dem", "won")
+
+    @pytest.mark.parametrize(
+        "failure",
+        [BrokenProcessPool("worker died"), pickle.PicklingError("unpicklable")],
+    )
+    def test_failed_workers_fall_back_to_inline(
+        self,
+        conn: sqlite3.Connection,
+        pages: dict[str, str | Exception],
+        failure: Exception,
+    ) -> None:
+        items = [(state, _url(state)) for state in _STATES]
+        scraper = GovernorScraper()
+        assert scraper.scrape_pages(items, 2025, conn) == len(_STATES)
+        inline = _rows(conn)
+
+        class FailingPool(Executor):
+            """Fails the first page like a dead worker, then refuses work."""
+
+            submitted = 0
+
+            def submit(self, fn, /, *args, **kwargs):  # type: ignore[no-untyped-def]
+                self.submitted += 1
+                if self.submitted > 1:
+                    raise BrokenProcessPool("pool is broken")
+                future: Future[object] = Future()
+                future.set_exception(failure)
+                return future
+
+        pooled_conn = sqlite3.connect(":memory:")
+        init_schema(pooled_conn)
+        total = scraper.scrape_pages(items, 2025, pooled_conn, FailingPool())
+        assert total == len(_STATES)
+        assert _rows(pooled_conn) == inline
+
+    def test_fetch_errors_skip_page(
+        self,
+        conn: sqlite3.Connection,
+        pages: dict[str, str | Exception],
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        pages[_url("Ohio")] = _http_error(404)
+        pages[_url("Utah")] = requests.ConnectionError("down")
+        items = [(state, _url(state)) for state in _STATES]
+        with caplog.at_level(logging.ERROR):
+            total = GovernorScraper().scrape_pages(items, 2025, conn, missing_ok=True)
+        assert total == 3
+        messages = [r.getMessage() for r in caplog.records]
+        assert any("Utah" in m for m in messages)
+        assert not any("Ohio" in m for m in messages)
+
+    def test_failed_index_skips_only_that_year(
+        self,
+        conn: sqlite3.Connection,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        items = [(state, _url(state)) for state in _STATES]
+
+        def find_pages(self: GovernorScraper, year: int, cache: object) -> list:
+            if year == 2023:
+                raise _http_error(404)
+            return items
+
+        scraped: list[int] = []
+
+        def scrape_year(
+            self: GovernorScraper, pages: list, year: int, *args: object
+        ) -> int:
+            scraped.append(year)
+            return len(pages)
+
+        monkeypatch.setattr(GovernorScraper, "find_pages", find_pages)
+        monkeypatch.setattr(GovernorScraper, "scrape_year", scrape_year)
+        with caplog.at_level(logging.ERROR):
+            total = GovernorScraper().scrape_years([2023, 2025], conn)
+        assert total == len(items)
+        assert scraped == [2025]
+        assert "index page, skipping 2023" in caplog.text
+
+    def test_404_logged_unless_missing_ok(
+        self,
+        conn: sqlite3.Connection,
+        pages: dict[str, str | Exception],
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        pages[_url("Ohio")] = _http_error(404)
+        with caplog.at_level(logging.ERROR):
+            GovernorScraper().scrape_pages([("Ohio", _url("Ohio"))], 2025, conn)
+        assert "Failed to fetch Ohio" in caplog.text
+
+    def test_parse_errors_are_logged(
+        self,
+        conn: sqlite3.Connection,
+        pages: dict[str, str | Exception],
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        def broken(*args: object) -> None:
+            raise ValueError("bad table")
+
+        monkeypatch.setattr(GovernorScraper, "parse_state_page", broken)
+        with caplog.at_level(logging.ERROR):
+            total = GovernorScraper().scrape_pages([("Ohio", _url("Ohio"))], 2025, conn)
+        assert total == 0
+        assert "Error parsing Ohio: bad table" in caplog.text
+
+
+class TestIncremental:
+    """Tests for revision tracking and incremental scrapes."""
+
+    @pytest.fixture()
+    def wiki(self, fake_wiki: FakeMediaWiki) -> FakeMediaWiki:
+        for state in _STATES[:-1]:
+            title = title_from_url(_url(state))
+            assert title is not None
+            fake_wiki.add_page(title)
+        return fake_wiki
+
+    def _scrape(
+        self,
+        conn: sqlite3.Connection,
+        wiki_client: MediaWikiClient,
+        incremental: bool = True,
+    ) -> int:
+        items = [(state, _url(state)) for state in _STATES]
+        return GovernorScraper().scrape_pages(
+            items, 2025, conn, wiki=wiki_client, incremental=incremental
+        )
+
+    def test_records_revisions(
+        self,
+        conn: sqlite3.Connection,
+        pages: dict[str, str | Exception],
+        wiki: FakeMediaWiki,
+        wiki_client: MediaWikiClient,
+    ) -> None:
+        assert self._scrape(conn, wiki_client, incremental=False) == 5
+        revisions = get_page_revisions(conn, [_url(s) for s in _STATES])
+        # Utah has no page in the API, so it has no recorded revision
+        assert set(revisions) == {_url(s) for s in _STATES[:-1]}
+        title = title_from_url(_url("Ohio"))
+        assert title is not None
+        assert revisions[_url("Ohio")] == wiki.pages[title]["revid"]
+
+    def test_only_changed_pages_are_refetched(
+        self,
+        conn: sqlite3.Connection,
+        pages: dict[str, str | Exception],
+        fetched: list[str],
+        wiki: FakeMediaWiki,
+        wiki_client: MediaWikiClient,
+    ) -> None:
+        assert self._scrape(conn, wiki_client) == 5
+        fetched.clear()
+
+        assert self._scrape(conn, wiki_client) == 1
+        assert fetched == [_url("Utah")]
+        fetched.clear()
+
+        title = title_from_url(_url("Texas"))
+        assert title is not None
+        wiki.edit(title, html="", timestamp="2025-11-20T00:00:00Z")
+        assert self._scrape(conn, wiki_client) == 2
+        assert fetched == [_url("Texas"), _url("Utah")]
+        row = conn.execute(
+            "SELECT last_modified FROM page_revisions WHERE wikipedia_url = ?",
+            (_url("Texas"),),
+        ).fetchone()
+        assert row[0] == "2025-11-20T00:00:00Z"
+
+    def test_parse_failure_is_retried(
+        self,
+        conn: sqlite3.Connection,
+        pages: dict[str, str | Exception],
+        fetched: list[str],
+        wiki: FakeMediaWiki,
+        wiki_client: MediaWikiClient,
+    ) -> None:
+        pages[_url("Ohio")] = _http_error(503)
+        self._scrape(conn, wiki_client)
+        pages[_url("Ohio")] = _PAGE.format(state="Ohio")
+        fetched.clear()
+        self._scrape(conn, wiki_client)
+        assert _url("Ohio") in fetched
+
+    def test_lookup_failure_scrapes_everything(
+        self,
+        conn: sqlite3.Connection,
+        pages: dict[str, str | Exception],
+        fetched: list[str],
+        wiki: FakeMediaWiki,
+        wiki_client: MediaWikiClient,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        self._scrape(conn, wiki_client)
+        down = MagicMock(side_effect=requests.ConnectionError("down"))
+        monkeypatch.setattr(wiki, "get", down)
+        fetched.clear()
+        assert self._scrape(conn, wiki_client) == 5
+        assert len(fetched) == 5
+
+
+class TestPageCache:
+    """Tests for PageCache, which fetches index pages once per run."""
+
+    def test_concurrent_callers_share_one_fetch(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        calls: list[str] = []
+        release = threading.Event()
+
+        def slow_fetch(url: str, delay_s: float = 0.0) -> str:
+            calls.append(url)
+            release.wait(5)
+            return _PAGE.format(state="Ohio")
+
+        monkeypatch.setattr("camplinks.http.fetch_html", slow_fetch)
+        cache = PageCache()
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(cache.fetch_soup, _url("Ohio")) for _ in range(4)]
+            release.set()
+            soups = [future.result() for future in futures]
+        assert calls == [_url("Ohio")]
+        assert all(soup.title.string == "Ohio election" for soup in soups)
+        # Each caller gets its own parse tree
+        assert len({id(soup) for soup in soups}) == 4
+
+    def test_errors_are_cached(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        fetch = MagicMock(side_effect=_http_error(404))
+        monkeypatch.setattr("camplinks.http.fetch_html", fetch)
+        cache = PageCache()
+        for _ in range(2):
+            with pytest.raises(requests.HTTPError):
+                cache.fetch_html(_url("Ohio"))
+        assert fetch.call_count == 1
+
+
+class TestParsePage:
+    """Tests for parse_page(), the worker entry point."""
+
+    def test_results_are_picklable(self) -> None:
+        results = parse_page(GovernorScraper, "Ohio", _PAGE.format(state="Ohio"), 2025)
+        assert pickle.loads(pickle.dumps(results)) == results
+        election, candidates = results[0]
+        assert election.state == "Ohio"
+        assert [c.candidate_name for c in candidates] == ["Ohio Dem", "Ohio Rep"]
@@ -2,17 +2,28 @@
 
 from __future__ import annotations
 
+import sqlite3
 from unittest.mock import MagicMock, patch
 
+import polars as pl
 import pytest
 from bs4 import BeautifulSoup
 
 from camplinks.cache import load_cache, make_cache_key, save_cache
+from camplinks.db import get_search_results, init_schema, save_search_results
+from camplinks.http import ddg_search
 from camplinks.search import (
+    BallotpediaDiscovery,
+    ballotpedia_slugs,
+    classify_social_url,
     extract_all_contact_links,
     find_ballotpedia_url,
+    find_candidate_info,
+    replay_campaign_site_search,
     score_campaign_url,
+    score_campaign_urls,
     search_campaign_site_web,
+    search_social_links_for_candidates,
 )
 
 
@@ -158,6 +169,27 @@ class TestScoreCampaignUrl:
             == 0.0
         )
 
+    def test_aggregator_zero_score(self) -> None:
+        assert (
+            score_campaign_url(
+                "https://justfacts.votesmart.org/candidate/biography/1/jane-smith",
+                "Jane Smith",
+                "Campaign for Congress",
+                "Smith",
+                "Ohio",
+            )
+            == 0.0
+        )
+
+    def test_listed_domain_inside_name_not_skipped(self) -> None:
+        # "x.com" is a substring of the host but not its domain
+        assert (
+            score_campaign_url(
+                "https://janefox.com/", "Jane Fox", "Campaign", "Fox", "Ohio"
+            )
+            > 0.5
+        )
+
     def test_social_media_zero_score(self) -> None:
         for domain in ("facebook.com", "x.com", "twitter.com", "instagram.com"):
             assert (
@@ -209,6 +241,41 @@ class TestScoreCampaignUrl:
         assert score >= 0.5
 
 
+_RESULTS = [
+    (
+        "https://www.smithforcongress.com/",
+        "John Smith for Congress",
+        "",
+        "Smith",
+        "Ohio",
+    ),
+    (
+        "https://elect-jane.org/index.html",
+        "Official site",
+        "Ohio",
+        "O'Neil-Day",
+        "Ohio",
+    ),
+    ("https://janefox.com/about", "Jane", "senate race", "Fox", "Texas"),
+    ("https://user@SMITH.net:8080", "", "", "Smith", "Ohio"),
+    ("https://www.facebook.com/smith", "Campaign", "Ohio", "Smith", "Ohio"),
+    ("https://smith.house.gov/", "Official", "", "Smith", "Ohio"),
+    ("not a url", "campaign", "", "", ""),
+    ("https://votesmith.com/;params", "", "", "", "Ohio"),
+]
+
+
+@pytest.mark.parametrize("weight_name", [True, False])
+def test_score_campaign_urls_matches_scalar(weight_name: bool) -> None:
+    frame = pl.DataFrame(
+        _RESULTS, schema=["url", "title", "body", "last_name", "state"], orient="row"
+    )
+    batch = score_campaign_urls(frame, weight_name=weight_name)
+    expected = [score_campaign_url(*r, weight_name=weight_name) for r in _RESULTS]
+    assert batch.to_list() == expected
+    assert batch.name == "score"
+
+
 # ---------------------------------------------------------------------------
 # Cache helpers
 # ---------------------------------------------------------------------------
@@ -289,6 +356,104 @@ class TestFindBallotpediaUrl:
         assert result == ""
 
 
+# ---------------------------------------------------------------------------
+# BallotpediaDiscovery (mocked)
+# ---------------------------------------------------------------------------
+_PERSON_PAGE = """
+<html><body>
+<div class="infobox person">
+  <div class="widget-row value-only Democrat">Contact</div>
+  <div class="widget-row value-only white">
+    <a href="https://janedoe.com">Campaign website</a>
+  </div>
+</div>
+<p>Jane Doe is a candidate for Governor of {state}.</p>
+</body></html>
+"""
+
+
+class TestBallotpediaDiscovery:
+    """Tests for harvested-link / slug / search page discovery."""
+
+    @pytest.fixture()
+    def web(self) -> dict[str, str]:
+        """Pages served by the fake Ballotpedia, keyed by URL."""
+        return {}
+
+    @pytest.fixture(autouse=True)
+    def fake_web(
+        self, web: dict[str, str], monkeypatch: pytest.MonkeyPatch
+    ) -> MagicMock:
+        def fetch(url: str, delay_s: float = 0.0) -> BeautifulSoup:
+            return BeautifulSoup(web[url], "lxml")
+
+        ddg = MagicMock(return_value=[])
+        monkeypatch.setattr("camplinks.search.fetch_soup", fetch)
+        monkeypatch.setattr(
+            "camplinks.search.page_exists", lambda url, delay_s=0.0: url in web
+        )
+        monkeypatch.setattr("camplinks.search.ddg_search", ddg)
+        return ddg
+
+    def test_slugs(self) -> None:
+        assert ballotpedia_slugs("Jane A. Doe") == [
+            "https://ballotpedia.org/Jane_A._Doe",
+            "https://ballotpedia.org/Jane_Doe",
+        ]
+        assert ballotpedia_slugs("Jane Doe") == ["https://ballotpedia.org/Jane_Doe"]
+        assert ballotpedia_slugs("Cher") == []
+
+    def test_known_url_skips_search(
+        self, web: dict[str, str], fake_web: MagicMock
+    ) -> None:
+        web["https://ballotpedia.org/Jane_Doe_(Ohio)"] = _PERSON_PAGE.format(
+            state="Ohio"
+        )
+        discovery = BallotpediaDiscovery(delay_s=0)
+        contacts = find_candidate_info(
+            "Jane Doe",
+            "Ohio",
+            "",
+            ballotpedia_url="https://ballotpedia.org/Jane_Doe_(Ohio)",
+            discovery=discovery,
+        )
+        assert contacts == {
+            "campaign website": "https://janedoe.com",
+            "_ballotpedia_url": "https://ballotpedia.org/Jane_Doe_(Ohio)",
+        }
+        assert (discovery.harvested, discovery.searched) == (1, 0)
+        fake_web.assert_not_called()
+
+    def test_slug_used_when_page_matches(
+        self, web: dict[str, str], fake_web: MagicMock
+    ) -> None:
+        web["https://ballotpedia.org/Jane_Doe"] = _PERSON_PAGE.format(state="Ohio")
+        discovery = BallotpediaDiscovery(delay_s=0)
+        url, soup = discovery.find("Jane A. Doe", "Columbus, Ohio")
+        assert url == "https://ballotpedia.org/Jane_Doe"
+        assert soup is not None
+        assert discovery.searches_avoided == 1
+        fake_web.assert_not_called()
+
+    def test_namesake_slug_falls_back_to_search(
+        self, web: dict[str, str], fake_web: MagicMock
+    ) -> None:
+        web["https://ballotpedia.org/Jane_Doe"] = _PERSON_PAGE.format(state="Texas")
+        web["https://ballotpedia.org/Jane_Doe_(Ohio)"] = _PERSON_PAGE.format(
+            state="Ohio"
+        )
+        fake_web.return_value = [{"href": "https://ballotpedia.org/Jane_Doe_(Ohio)"}]
+        discovery = BallotpediaDiscovery(delay_s=0)
+        url, _ = discovery.find("Jane Doe", "Ohio")
+        assert url == "https://ballotpedia.org/Jane_Doe_(Ohio)"
+        assert (discovery.from_slug, discovery.searched) == (0, 1)
+
+    def test_not_found(self, fake_web: MagicMock) -> None:
+        discovery = BallotpediaDiscovery(delay_s=0)
+        assert discovery.find("Nobody Known", "Ohio") == ("", None)
+        assert discovery.searched == 1
+
+
 # ---------------------------------------------------------------------------
 # search_campaign_site_web (mocked)
 # ---------------------------------------------------------------------------
@@ -335,3 +500,185 @@ class TestSearchCampaignSiteWeb:
         ]
         search_campaign_site_web("John Smith", "Ohio", "5")
         assert mock_ddg.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# Social media discovery (mocked)
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("https://www.facebook.com/JaneDoeForOhio", "campaign_facebook"),
+        ("https://m.facebook.com/JaneDoeForOhio/", "campaign_facebook"),
+        ("https://twitter.com/janedoe", "campaign_x"),
+        ("https://x.com/janedoe", "campaign_x"),
+        ("https://instagram.com/janedoe/", "campaign_instagram"),
+        ("https://www.facebook.com/sharer/sharer.php?u=x", None),
+        ("https://x.com/intent/tweet?text=hi", None),
+        ("https://x.com/janedoe/status/123", None),
+        ("https://www.instagram.com/p/Cabc123/", None),
+        ("https://facebook.com/", None),
+        ("https://notfacebook.com/janedoe", None),
+    ],
+)
+def test_classify_social_url(url: str, expected: str | None) -> None:
+    assert classify_social_url(url) == expected
+
+
+class TestSearchSocialLinks:
+    """Tests for search_social_links_for_candidates()."""
+
+    @pytest.fixture()
+    def conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        init_schema(conn)
+        conn.executescript(
+            """\
+            INSERT INTO elections (state, race_type, year, district, election_stage)
+            VALUES ('Ohio', 'Governor', 2026, '', 'general');
+            INSERT INTO candidates (election_id, party, candidate_name)
+            VALUES (1, 'Democratic', 'Jane Doe'), (1, 'Republican', 'Jim Roe');
+            INSERT INTO contact_links (candidate_id, link_type, url, source)
+            VALUES (1, 'campaign_site', 'https://janedoe.com', 'ballotpedia'),
+                   (2, 'campaign_facebook', 'https://facebook.com/roe', 'ballotpedia');
+            """
+        )
+        return conn
+
+    def _links(self, conn: sqlite3.Connection) -> set[tuple[int, str, str, str]]:
+        rows = conn.execute(
+            "SELECT candidate_id, link_type, url, source FROM contact_links "
+            "WHERE link_type != 'campaign_site'"
+        )
+        return {tuple(r) for r in rows}
+
+    def test_homepage_then_one_search(
+        self, conn: sqlite3.Connection, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        homepage = BeautifulSoup(
+            '<a href="https://facebook.com/sharer.php?u=1">Share</a>'
+            '<a href="https://www.facebook.com/JaneDoeOH">Facebook</a>'
+            '<a href="https://x.com/janedoe">X</a>',
+            "lxml",
+        )
+        monkeypatch.setattr(
+            "camplinks.search.fetch_soup", MagicMock(return_value=homepage)
+        )
+        results = {
+            "Jane Doe": [
+                {"href": "https://www.instagram.com/p/post1/"},
+                {"href": "https://www.instagram.com/janedoe/"},
+            ],
+            "Jim Roe": [
+                {"href": "https://twitter.com/jimroe"},
+                {"href": "https://www.instagram.com/jimroe/"},
+                {"href": "https://x.com/jimroe2"},
+            ],
+        }
+        ddg = MagicMock(
+            side_effect=lambda query, max_results, conn: results[query.split('"')[1]]
+        )
+        monkeypatch.setattr("camplinks.search.ddg_search", ddg)
+
+        found = search_social_links_for_candidates(conn)
+
+        assert found == 5
+        assert self._links(conn) == {
+            (1, "campaign_facebook", "https://www.facebook.com/JaneDoeOH", "homepage"),
+            (1, "campaign_x", "https://x.com/janedoe", "homepage"),
+            (
+                1,
+                "campaign_instagram",
+                "https://www.instagram.com/janedoe/",
+                "web_search",
+            ),
+            (2, "campaign_facebook", "https://facebook.com/roe", "ballotpedia"),
+            (2, "campaign_x", "https://twitter.com/jimroe", "web_search"),
+            (
+                2,
+                "campaign_instagram",
+                "https://www.instagram.com/jimroe/",
+                "web_search",
+            ),
+        }
+        # One search per candidate, naming only the platforms still missing
+        queries = [call.args[0] for call in ddg.call_args_list]
+        assert len(queries) == 2
+        assert "facebook" not in queries[0]
+        assert "instagram" in queries[0]
+        assert "twitter" in queries[1]
+
+
+# ---------------------------------------------------------------------------
+# Stored search results and replay
+# ---------------------------------------------------------------------------
+class TestSearchReplay:
+    """Tests for storing raw results and replaying Tier-2 selection."""
+
+    @pytest.fixture()
+    def conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        init_schema(conn)
+        conn.executescript(
+            """\
+            INSERT INTO elections (state, race_type, year, district, election_stage)
+            VALUES ('Ohio', 'US House', 2024, '3', 'general');
+            INSERT INTO candidates (election_id, party, candidate_name)
+            VALUES (1, 'Democratic', 'Jane Smith'), (1, 'Republican', 'Jim Roe'),
+                   (1, 'Green', 'Never Searched');
+            INSERT INTO contact_links (candidate_id, link_type, url, source)
+            VALUES (1, 'campaign_site', 'https://smithlaw.net/about', 'web_search');
+            """
+        )
+        return conn
+
+    def test_ddg_search_stores_results(
+        self, conn: sqlite3.Connection, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        ddgs = MagicMock()
+        ddgs.__enter__.return_value.text.return_value = [
+            {"href": "https://a.com", "title": "A", "body": "x"}
+        ]
+        monkeypatch.setattr("ddgs.DDGS", lambda: ddgs)
+        monkeypatch.setattr("camplinks.http.time.sleep", lambda s: None)
+        results = ddg_search("jane smith ohio", conn=conn)
+        assert get_search_results(conn, "jane smith ohio") == results
+
+    def test_replay_reports_changed_choices(
+        self, conn: sqlite3.Connection, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        stored = {
+            "Jane Smith": [
+                {"href": "https://smithlaw.net/about", "title": "Smith Law"},
+                {
+                    "href": "https://janesmithforcongress.com/",
+                    "title": "Jane Smith for Congress",
+                    "body": "Official campaign, Ohio",
+                },
+            ],
+            "Jim Roe": [{"href": "https://example.com/roe", "title": "Roe"}],
+        }
+
+        # Record what an earlier run would have stored for every query
+        def record(query: str, max_results: int = 5) -> list[dict[str, str]]:
+            results = stored[query.split('"')[1]]
+            save_search_results(conn, query, results)
+            return results
+
+        for name in stored:
+            search_campaign_site_web(name, "Ohio", "3", "congress", record)
+        monkeypatch.setattr(
+            "camplinks.search.ddg_search", MagicMock(side_effect=AssertionError)
+        )
+
+        changes = replay_campaign_site_search(conn)
+
+        assert [(c.candidate_name, c.old_url, c.new_url) for c in changes] == [
+            (
+                "Jane Smith",
+                "https://smithlaw.net/about",
+                "https://janesmithforcongress.com/",
+            )
+        ]
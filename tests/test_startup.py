@@ -0,0 +1,49 @@
+"""Startup-time checks: the CLI must not import what its stages don't need.
+
+Imports are listed with ``python -X importtime`` in a fresh interpreter.
+The import time itself is tracked by ``benchmarks/cli_startup.py``.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+# Third-party packages that only scraping and searching need
+HEAVY_MODULES = {"bs4", "lxml", "ddgs", "polars", "tqdm", "requests"}
+
+
+def _import_times(*modules: str) -> dict[str, int]:
+    """Import *modules* in a fresh interpreter.
+
+    Returns:
+        Cumulative import time in microseconds of every module loaded.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def _top_level(times: dict[str, int]) -> set[str]:
+    return {name.partition(".")[0] for name in times}
+
+
+def test_cli_startup_is_light() -> None:
+    times = _import_times("camplinks.__main__")
+    assert not _top_level(times) & HEAVY_MODULES
+    assert not any(name.startswith("camplinks.scrapers.") for name in times)
+
+
+def test_validate_stage_skips_parsers_and_search_client() -> None:
+    times = _import_times("camplinks.pipeline", "camplinks.validate")
+    assert not _top_level(times) & {"bs4", "lxml", "ddgs", "polars"}
@@ -0,0 +1,233 @@
+"""Unit tests for camplinks.streaming."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import orjson
+import pytest
+
+from camplinks import streaming
+from camplinks.db import init_schema, open_db, upsert_candidate, upsert_election
+from camplinks.models import Candidate, Election
+from camplinks.streaming import (
+    Cache,
+    CandidateFeed,
+    StageFn,
+    StreamError,
+    _CachedStage,
+    run_streaming,
+)
+
+
+@pytest.fixture()
+def db_path(tmp_path: Path) -> str:
+    path = str(tmp_path / "stream.db")
+    conn = open_db(path)
+    init_schema(conn)
+    conn.close()
+    return path
+
+
+def _add(conn: sqlite3.Connection, year: int, *names: str) -> list[int]:
+    eid = upsert_election(conn, Election(state="Ohio", race_type="Mayor", year=year))
+    ids = [
+        upsert_candidate(conn, Candidate(party="Independent", candidate_name=n), eid)
+        for n in names
+    ]
+    conn.commit()
+    return ids
+
+
+class _Recorder:
+    """Stage functions that record which candidates each stage saw."""
+
+    def __init__(self) -> None:
+        self.seen: list[tuple[str, int]] = []
+        self._lock = threading.Lock()
+
+    def stage(
+        self, name: str, hook: Callable[[list[int]], None] | None = None
+    ) -> StageFn:
+        def fn(conn: sqlite3.Connection, ids: list[int]) -> None:
+            with self._lock:
+                self.seen.extend((name, cid) for cid in ids)
+            if hook is not None:
+                hook(ids)
+
+        return fn
+
+    def stages_of(self, cid: int) -> list[str]:
+        return [name for name, seen in self.seen if seen == cid]
+
+
+class TestRunStreaming:
+    """Tests for run_streaming()."""
+
+    def test_lookups_start_before_scraping_ends(self, db_path: str) -> None:
+        conn = open_db(db_path)
+        first_validated = threading.Event()
+        recorder = _Recorder()
+        first: list[int] = []
+
+        def scrape() -> None:
+            first.extend(_add(conn, 2024, "Jane Doe", "Jim Roe"))
+            # Only returns in time if validation runs while scraping
+            assert first_validated.wait(5)
+            _add(conn, 2025, "Ann Other")  # not fed: other year
+            _add(conn, 2024, "Joe Late")
+
+        functions = {
+            "enrich": recorder.stage("enrich"),
+            "search": recorder.stage("search"),
+            "validate": recorder.stage(
+                "validate",
+                lambda ids: first_validated.set() if set(first) <= set(ids) else None,
+            ),
+        }
+        stats = run_streaming(
+            db_path,
+            CandidateFeed(2024, poll_s=0.01),
+            scrape=scrape,
+            functions=functions,
+        )
+        conn.close()
+
+        fed = {cid for _, cid in recorder.seen}
+        assert len(fed) == 3
+        for cid in fed:
+            assert recorder.stages_of(cid) == ["enrich", "search", "validate"]
+        assert stats["validate"].candidates == 3
+        assert stats["enrich"].errors == 0
+
+    def test_runs_only_selected_stages_on_stored_candidates(self, db_path: str) -> None:
+        conn = open_db(db_path)
+        ids = _add(conn, 2024, "Jane Doe", "Jim Roe", "Joe Late")
+        _add(conn, 2022, "Jane Doe")
+        conn.close()
+        recorder = _Recorder()
+
+        stats = run_streaming(
+            db_path,
+            CandidateFeed(2024, race_type="Mayor", election_stage="general"),
+            stages=["search"],
+            functions={"search": recorder.stage("search")},
+        )
+        assert recorder.seen == [("search", cid) for cid in ids]
+        assert list(stats) == ["search"]
+
+    def test_failing_batch_does_not_stall_later_stages(self, db_path: str) -> None:
+        conn = open_db(db_path)
+        ids = _add(conn, 2024, "A One", "B Two", "C Three", "D Four")
+        conn.close()
+        recorder = _Recorder()
+
+        def fail(conn: sqlite3.Connection, ids: list[int]) -> None:
+            raise sqlite3.OperationalError("database is locked")
+
+        stats = run_streaming(
+            db_path,
+            CandidateFeed(2024, batch_size=1),
+            stages=["enrich", "search"],
+            queue_size=1,
+            functions={"enrich": fail, "search": recorder.stage("search")},
+        )
+        assert stats["enrich"].errors == 4
+        assert sorted(cid for _, cid in recorder.seen) == ids
+
+    def test_scrape_failure_stops_the_lookups(self, db_path: str) -> None:
+        conn = open_db(db_path)
+        _add(conn, 2024, *(f"Candidate {i}" for i in range(50)))
+        conn.close()
+        started = threading.Event()
+        recorder = _Recorder()
+
+        def scrape() -> None:
+            assert started.wait(5)
+            raise RuntimeError("scraper crashed")
+
+        with pytest.raises(RuntimeError, match="scraper crashed"):
+            run_streaming(
+                db_path,
+                CandidateFeed(2024, batch_size=1),
+                stages=["enrich", "search"],
+                scrape=scrape,
+                queue_size=1,
+                functions={
+                    "enrich": recorder.stage("enrich", lambda ids: started.set()),
+                    "search": recorder.stage("search"),
+                },
+            )
+        # Only the batches already under way are finished
+        assert len(recorder.stages_of(1)) <= 2
+        assert len(recorder.seen) < 10
+
+    def test_dead_stage_does_not_block_the_stream(
+        self, db_path: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        conn = open_db(db_path)
+        _add(conn, 2024, *(f"Candidate {i}" for i in range(10)))
+        conn.close()
+        open_worker_db = streaming._open_worker_db
+
+        def failing_open(path: str) -> sqlite3.Connection:
+            if threading.current_thread().name == "stream-search":
+                raise sqlite3.OperationalError("unable to open database file")
+            return open_worker_db(path)
+
+        monkeypatch.setattr(streaming, "_open_worker_db", failing_open)
+        recorder = _Recorder()
+        with pytest.raises(StreamError, match="search"):
+            run_streaming(
+                db_path,
+                CandidateFeed(2024, batch_size=1),
+                stages=["enrich", "search"],
+                queue_size=1,
+                functions={
+                    "enrich": recorder.stage("enrich"),
+                    "search": recorder.stage("search"),
+                },
+            )
+        assert recorder.stages_of(1) in ([], ["enrich"])
+        assert len(recorder.seen) < 10
+
+    def test_stage_cache_is_loaded_and_saved_once(
+        self, db_path: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        conn = open_db(db_path)
+        ids = _add(conn, 2024, "A One", "B Two", "C Three")
+        conn.close()
+        cache_path = tmp_path / "cache.json"
+        cache_path.write_bytes(orjson.dumps({"old": {}}))
+        io: list[str] = []
+        load, save = streaming.load_cache, streaming.save_cache
+
+        def counted_load(path: str) -> Cache:
+            io.append("load")
+            return load(path)
+
+        def counted_save(cache: Cache, path: str) -> None:
+            io.append("save")
+            save(cache, path)
+
+        monkeypatch.setattr(streaming, "load_cache", counted_load)
+        monkeypatch.setattr(streaming, "save_cache", counted_save)
+
+        def search(conn: sqlite3.Connection, ids: list[int], cache: Cache) -> None:
+            cache.update({str(cid): {} for cid in ids})
+
+        run_streaming(
+            db_path,
+            CandidateFeed(2024, batch_size=1),
+            stages=["search"],
+            functions={"search": _CachedStage(search, str(cache_path))},
+        )
+        assert io == ["load", "save"]
+        assert set(orjson.loads(cache_path.read_bytes())) == {"old", *map(str, ids)}
+
+    def test_requires_a_stage(self, db_path: str) -> None:
+        with pytest.raises(ValueError, match="at least one"):
+            run_streaming(db_path, CandidateFeed(2024), stages=[])
@@ -0,0 +1,79 @@
+"""Tests for benchmarks/synthetic_db.py."""
+
+from __future__ import annotations
+
+import importlib.util
+import sqlite3
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+from camplinks.db import get_candidates_missing_link, get_candidates_with_link
+
+_ROOT = Path(__file__).parent.parent
+
+
+def _load_script(path: Path) -> ModuleType:
+    """Import a script by path (neither directory is a package)."""
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+synthetic_db = _load_script(_ROOT / "benchmarks" / "synthetic_db.py")
+mag = _load_script(_ROOT / "code" / "compute_campaign_magnitude.py")
+
+
+@pytest.fixture(scope="module")
+def built(tmp_path_factory: pytest.TempPathFactory) -> tuple[Path, dict[str, int]]:
+    path = tmp_path_factory.mktemp("synthetic") / "synthetic.db"
+    counts = synthetic_db.build(str(path), 500, seed=3)
+    return path, counts
+
+
+def test_builds_requested_candidates(built: tuple[Path, dict[str, int]]) -> None:
+    path, counts = built
+    assert counts["candidates"] == 500
+    for table in ("elections", "contact_links", "tweets", "campaign_site_content"):
+        assert counts[table] > 0
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    assert conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0] == 500
+
+
+def test_is_deterministic(built: tuple[Path, dict[str, int]], tmp_path: Path) -> None:
+    _, counts = built
+    assert synthetic_db.build(str(tmp_path / "again.db"), 500, seed=3) == counts
+    with pytest.raises(FileExistsError):
+        synthetic_db.build(str(tmp_path / "again.db"), 500, seed=3)
+
+
+def test_stage_queries_and_magnitudes_run(built: tuple[Path, dict[str, int]]) -> None:
+    path, _ = built
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    missing = get_candidates_missing_link(conn, "campaign_site")
+    with_site = get_candidates_with_link(conn, "campaign_site")
+    unnamed = conn.execute(
+        "SELECT COUNT(*) FROM candidates WHERE candidate_name = ''"
+    ).fetchone()[0]
+    assert 0 < len(missing) < len(with_site)
+    assert len(missing) + len(with_site) + unnamed == 500
+
+    mag.ensure_column(conn)
+    magnitudes = mag.compute_magnitudes(conn)
+    scores = [m for m in magnitudes.values() if isinstance(m, float)]
+    assert scores
+    assert all(0 <= m <= 4 for m in scores)
+
+
+def test_describe_reference_leaves_no_files(tmp_path: Path) -> None:
+    reference = tmp_path / "camplinks.db.bak"
+    reference.write_bytes((_ROOT / "camplinks.db.bak").read_bytes())
+    described = synthetic_db.describe_reference(str(reference))
+    assert sum(described["party"].values()) > 0
+    assert described["candidates per election"]["2"] > 0
+    assert [p.name for p in tmp_path.iterdir()] == ["camplinks.db.bak"]
@@ -14,6 +14,7 @@ from camplinks.db import (
     upsert_contact_link,
     upsert_election,
 )
+from camplinks.metrics import RESPONSE_HOOKS
 from camplinks.models import Candidate, ContactLink, Election
 from camplinks.validate import (
     check_url_accessible,
@@ -90,6 +91,7 @@ class TestCheckUrlAccessible:
             headers=pytest.importorskip("camplinks.http").HEADERS,
             timeout=10,
             allow_redirects=True,
+            hooks=RESPONSE_HOOKS,
         )
 
 
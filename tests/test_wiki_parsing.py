@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import random
+
 from bs4 import BeautifulSoup
 
+from camplinks.http import parse_html
 from camplinks.wiki_parsing import (
+    RESULTS_PAGE_STRAINER,
+    HeadingIndex,
     classify_election_table,
     extract_district_number,
     extract_primary_party,
@@ -94,6 +99,84 @@ class TestFindPrecedingHeading:
         assert find_preceding_heading(table, ("h2",)) is None
 
 
+def _random_page(rng: random.Random, depth: int = 0) -> str:
+    """Build a random mix of headings, mw-heading wrappers, tables and text."""
+    parts: list[str] = []
+    for _ in range(rng.randint(3, 12)):
+        kind = rng.random()
+        level = rng.choice(["h2", "h3", "h4"])
+        if kind < 0.2:
+            parts.append(f"<{level}>{level} {len(parts)}</{level}>")
+        elif kind < 0.4:
+            inner = f"<{level}>wrapped {len(parts)}</{level}>"
+            if rng.random() < 0.2:
+                inner += "<h4>extra</h4>"
+            parts.append(f'<div class="mw-heading">{inner}</div>')
+        elif kind < 0.75:
+            parts.append(f"<table><tr><td>{len(parts)}</td></tr></table>")
+        elif kind < 0.85 and depth < 2:
+            parts.append(f"<div>{_random_page(rng, depth + 1)}</div>")
+        else:
+            parts.append("text <p>para</p>")
+    return "".join(parts)
+
+
+class TestHeadingIndex:
+    """HeadingIndex must agree with the sibling walk it replaces."""
+
+    def test_matches_find_preceding_heading(self) -> None:
+        rng = random.Random(31)
+        queries = [("h2",), ("h3",), ("h2", "h3"), ("h3", "h4"), ("h4", "h2")]
+        for _ in range(40):
+            soup = BeautifulSoup(f"<div>{_random_page(rng)}</div>", "lxml")
+            index = HeadingIndex(soup)
+            for table in soup.find_all("table"):
+                for tags in queries:
+                    expected = find_preceding_heading(table, tags)
+                    assert find_preceding_heading(table, tags, index) is expected
+
+    def test_lazily_indexes_non_table_elements(self) -> None:
+        html = "<div><h2>District 7</h2><ul><li>x</li></ul></div>"
+        soup = BeautifulSoup(html, "lxml")
+        index = HeadingIndex(soup)
+        ul = soup.find("ul")
+        assert ul is not None
+        heading = index.preceding(ul, ("h2",))
+        assert heading is not None and heading.get_text() == "District 7"
+
+    def test_classify_and_party_with_index(self) -> None:
+        html = (
+            '<div><div class="mw-heading"><h2>Democratic primary</h2></div>'
+            "<h3>Results</h3><table><caption>x</caption></table></div>"
+        )
+        soup = BeautifulSoup(html, "lxml")
+        index = HeadingIndex(soup)
+        table = soup.find("table")
+        assert table is not None
+        assert classify_election_table(table, index) == "general"
+        assert extract_primary_party(table, index) == "Democratic"
+
+
+class TestResultsPageStrainer:
+    """Restricted parsing keeps headings and tables in document order."""
+
+    def test_keeps_headings_and_tables_as_siblings(self) -> None:
+        html = (
+            "<html><head><title>T</title></head><body><p>prose</p>"
+            '<div class="mw-heading"><h2>District 1</h2></div>'
+            "<div><p>more</p><table id='a'></table></div>"
+            "<h3>Results</h3><table id='b'></table></body></html>"
+        )
+        soup = parse_html(html, RESULTS_PAGE_STRAINER)
+        names = [c.name for c in soup.children]
+        assert names == ["title", "h2", "table", "h3", "table"]
+        assert soup.find("p") is None
+        table = soup.find("table", id="a")
+        assert table is not None
+        heading = find_preceding_heading(table, ("h2",))
+        assert heading is not None and heading.get_text() == "District 1"
+
+
 # ---------------------------------------------------------------------------
 # is_general_election_table
 # ---------------------------------------------------------------------------
@@ -38,29 +38,8 @@ from urllib.parse import urlparse
 
 import httpx
 
+from camplinks.domains import default_matcher, host_of
 
-DENYLIST = {
-    "ourcampaigns.com", "vote-usa.org", "stage.vote-usa.org",
-    "bluevoterguide.org", "lykelect.com",
-    "votesmart.org", "justfacts.votesmart.org",
-    "ivoterguide.com",
-    "uselectionatlas.org", "mail.uselectionatlas.org",
-    "electiondatabase.nhpr.org", "electjon.com",
-    "onyourballot.vote411.org", "vote411.org",
-    "dos.elections.myflorida.com",
-    "vote.org", "votesafe.org",
-    "electionfraud.heritage.org", "ballotready.org",
-    "politics1.com", "followthemoney.org",
-    "ballotpedia.org", "opensecrets.org", "fec.gov",
-    "wikipedia.org", "en.wikipedia.org",
-    "linkedin.com",
-    "facebook.com", "m.facebook.com",
-    "twitter.com", "x.com",
-    "instagram.com", "youtube.com", "tiktok.com",
-    "smartvoter.org", "google.com",
-}
-
-GOV_HOST_RE = re.compile(r"(^|\.)gov$")
 
 CAMPAIGN_SIGNALS = [
     re.compile(r"\bdonate\b", re.I),
@@ -88,25 +67,9 @@ WAYBACK_AVAILABLE = "https://archive.org/wayback/available"
 USER_AGENT = "Mozilla/5.0 (compatible; CampaignValidator/1.0)"
 
 
-def domain_of(url: str) -> str:
-    try:
-        host = urlparse(url).netloc.lower()
-    except Exception:
-        return ""
-    return host[4:] if host.startswith("www.") else host
-
-
 def is_denied(url: str) -> bool:
-    host = domain_of(url)
-    if not host:
-        return True
-    if host in DENYLIST:
-        return True
-    if any(host.endswith("." + d) for d in DENYLIST):
-        return True
-    if GOV_HOST_RE.search(host):
-        return True
-    return False
+    host = host_of(url)
+    return not host or default_matcher().match_host(host) is not None
 
 
 def score_url(url: str, candidate_name: str) -> float:
@@ -310,6 +273,10 @@ async def main():
 
     with open(args.input, newline="", encoding="utf-8") as f:
         rows = list(csv.DictReader(f))
+    # Aggregator domains flagged in the input are denied as search results too
+    if rows and "domain" in rows[0]:
+        added = default_matcher().extend_from_csv(args.input)
+        print(f"Added {added} aggregator domains from {args.input}")
     if args.limit:
         rows = rows[: args.limit]
 